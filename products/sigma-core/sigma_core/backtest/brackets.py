@@ -0,0 +1,194 @@
+"""ATR bracket simulator (stop / target / time stop) over bar arrays.
+
+Trades are simulated together: the walk advances one bar offset at a time for every open trade,
+so the Python loop runs at most `max_bars` times regardless of how many sessions or trades there
+are. Bars must be in time order; sessions are contiguous runs of equal `session_ids`.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+ENTRY_MODES = ('next_session_open', 'same_bar')
+
+
+def session_bounds(session_ids) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(session index per bar, first bar per session, one-past-last bar per session)."""
+    ids = np.asarray(session_ids)
+    n = len(ids)
+    if n == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    change = np.ones(n, dtype=bool)
+    change[1:] = ids[1:] != ids[:-1]
+    starts = np.flatnonzero(change)
+    ends = np.append(starts[1:], n)
+    return np.cumsum(change) - 1, starts, ends
+
+
+def simulate_brackets(
+    opens,
+    highs,
+    lows,
+    closes,
+    session_ids,
+    atr,
+    *,
+    signal_idx=None,
+    sides=None,
+    entry_mode: str = 'next_session_open',
+    atr_mult_stop: float = 1.5,
+    atr_mult_target: float = 3.0,
+    max_bars: int = 2,
+) -> pd.DataFrame:
+    """Simulate one bracket per signal bar; returns one row per trade.
+
+    entry_mode='next_session_open' enters at the open of the first bar of the session after the
+    signal bar and watches that bar onwards; 'same_bar' enters at the signal bar's close and
+    watches the following bars. Either way the watch window stays inside the entry session and
+    lasts at most `max_bars` bars. Signals default to the last bar of every session
+    (next_session_open) or the first (same_bar); sides are +1 (long) / -1 (short), default long.
+    Stop/target come from the ATR at the entry bar; the target is checked before the stop within a
+    bar (missing highs/lows count as the entry price). Time-stopped trades exit on the close of the
+    first bar past the window, which is the legacy `/backtest` parity convention; same_bar trades
+    never exit past their session's last bar. Signals without a next session (next_session_open),
+    a bar left in their session (same_bar), an entry price or an ATR are skipped.
+    """
+    if entry_mode not in ENTRY_MODES:
+        raise ValueError(f"entry_mode must be one of {ENTRY_MODES}")
+    o, h, l, c, a = (np.asarray(x, dtype=float) for x in (opens, highs, lows, closes, atr))
+    n = len(o)
+    sess, starts, ends = session_bounds(session_ids)
+    if signal_idx is None:
+        signal_idx = ends - 1 if entry_mode == 'next_session_open' else starts
+    sig = np.asarray(signal_idx, dtype=np.int64)
+    side = np.ones(len(sig)) if sides is None else np.asarray(sides, dtype=float)
+
+    if entry_mode == 'next_session_open':
+        nxt = sess[sig] + 1 if n else sig
+        ok = nxt < len(starts)
+        sig, side, nxt = sig[ok], side[ok], nxt[ok]
+        entry_idx = starts[nxt]
+        entry = o[entry_idx]
+        first = entry_idx
+        sess_end = ends[nxt]
+    else:
+        entry_idx = sig
+        entry = c[entry_idx]
+        first = entry_idx + 1
+        sess_end = ends[sess[entry_idx]] if n else sig
+    atr_e = a[entry_idx]
+    ok = np.isfinite(entry) & np.isfinite(atr_e) & (first < sess_end)
+    sig, side, entry_idx, entry, first, sess_end, atr_e = (x[ok] for x in (sig, side, entry_idx, entry, first, sess_end, atr_e))
+
+    stop = entry - side * atr_mult_stop * atr_e
+    target = entry + side * atr_mult_target * atr_e
+    window_end = np.minimum(first + max(1, int(max_bars)), sess_end)
+    outcome = np.zeros(len(entry), dtype=np.int8)  # 1 target, -1 stop, 0 time stop
+    bars = np.zeros(len(entry), dtype=np.int64)
+    open_ = first < window_end
+    longs = side > 0
+    for off in range(max(1, int(max_bars))):
+        k = first + off
+        live = open_ & (k < window_end)
+        if not live.any():
+            break
+        kk = np.minimum(k, n - 1)
+        hk = np.where(np.isnan(h[kk]), entry, h[kk])
+        lk = np.where(np.isnan(l[kk]), entry, l[kk])
+        tgt = live & np.where(longs, hk >= target, lk <= target)
+        stp = live & ~tgt & np.where(longs, lk <= stop, hk >= stop)
+        outcome[tgt] = 1
+        outcome[stp] = -1
+        hit = tgt | stp
+        bars[live] = off + np.where(hit[live], 0, 1)
+        open_ &= ~hit
+
+    timed = outcome == 0
+    exit_idx = np.where(timed, np.minimum(first + bars, n - 1), first + bars)
+    if entry_mode == 'same_bar':
+        exit_idx = np.minimum(exit_idx, sess_end - 1)
+    exit_px = np.where(outcome == 1, target, np.where(outcome == -1, stop, c[np.minimum(exit_idx, n - 1)] if n else 0.0))
+    risk = np.maximum(1e-9, np.abs(entry - stop))
+    ret = side * (exit_px - entry) / np.maximum(1e-9, entry)
+    rr = np.where(outcome == -1, -1.0, side * (exit_px - entry) / risk)
+    return pd.DataFrame({
+        'signal_idx': sig,
+        'entry_idx': entry_idx,
+        'side': side.astype(np.int8),
+        'entry': entry,
+        'stop': stop,
+        'target': target,
+        'exit_idx': exit_idx,
+        'exit_px': exit_px,
+        'outcome': pd.Categorical.from_codes(outcome + 1, ['stop', 'time', 'target']),
+        'bars': bars,
+        'ret': ret,
+        'rr': rr,
+    })
+
+
+def bracket_summary(trades: pd.DataFrame, br: Dict[str, Any], entry_mode: str = 'next_session_open') -> Dict[str, Any]:
+    """Summary dict reported as `parity` by /backtest and sweeps."""
+    n = len(trades)
+    if n == 0:
+        return {'ok': False, 'trades': 0}
+    return {
+        'ok': True,
+        'trades': int(n),
+        'hit_rate': float((trades['outcome'] == 'target').sum() / n),
+        'avg_rr': float(trades['rr'].sum() / n),
+        'avg_return_pct': float(trades['ret'].sum() / n * 100.0),
+        'entry_mode': entry_mode,
+        'atr_mult_stop': float(br.get('atr_mult_stop', 1.5)),
+        'atr_mult_target': float(br.get('atr_mult_target', 3.0)),
+        'time_stop_minutes': int(br.get('time_stop_minutes', 120)),
+    }
+
+
+def bracket_parity(df: pd.DataFrame, br: Dict[str, Any], *, return_trades: bool = False):
+    """Bracket parity for a matrix frame: sessions by calendar date, ATR from the first `atr_*` column
+    (else a rolling high-low proxy), one long trade per session per `br['entry_mode']` (unsupported
+    modes fall back to next_session_open with a warning). Returns the summary dict (and the trades
+    frame when return_trades)."""
+    trades = pd.DataFrame()
+    try:
+        ts = None
+        for col in ('datetime', 'timestamp', 'ts', 'dt'):
+            if col in df.columns:
+                ts = pd.to_datetime(df[col]); break
+        if ts is None:
+            # date + hour_et: the hour never moves a bar to another day, so the date alone is the session
+            ts = pd.to_datetime(df['date']) if ('date' in df.columns and 'hour_et' in df.columns) else pd.Series(pd.to_datetime(df.index), index=df.index)
+        dates = ts.dt.normalize().to_numpy()
+        atr_period = int(br.get('atr_period', 14))
+        bar_minutes = float(br.get('bar_minutes', 60))
+        max_bars = max(1, int(round(int(br.get('time_stop_minutes', 120)) / bar_minutes)))
+        close = pd.to_numeric(df['close'], errors='coerce') if 'close' in df.columns else None
+        fallback = df.get('close')
+        opens = pd.to_numeric(df.get('open', fallback), errors='coerce')
+        highs = pd.to_numeric(df.get('high', fallback), errors='coerce')
+        lows = pd.to_numeric(df.get('low', fallback), errors='coerce')
+        if any(df.columns.str.startswith('atr_')):
+            atr = pd.to_numeric(df.filter(like='atr_').iloc[:, 0], errors='coerce')
+        else:
+            atr = (highs - lows).abs().rolling(atr_period, min_periods=1).mean()
+        entry_mode = str(br.get('entry_mode', 'next_session_open'))
+        if entry_mode not in ENTRY_MODES:
+            logger.warning("bracket parity: unsupported entry_mode %r; using next_session_open", entry_mode)
+            entry_mode = 'next_session_open'
+        trades = simulate_brackets(
+            opens, highs, lows, close if close is not None else opens, dates, atr,
+            entry_mode=entry_mode,
+            atr_mult_stop=float(br.get('atr_mult_stop', 1.5)),
+            atr_mult_target=float(br.get('atr_mult_target', 3.0)),
+            max_bars=max_bars,
+        )
+        out = bracket_summary(trades, br, entry_mode)
+    except Exception:
+        out = {'ok': False}
+    return (out, trades) if return_trades else out
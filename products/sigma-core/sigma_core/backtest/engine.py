@@ -1,5 +1,13 @@
 import argparse
-from typing import Dict, List, Tuple, Optional
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple, Optional
 from pathlib import Path
 import numpy as np
 import pandas as pd
@@ -14,6 +22,8 @@ import matplotlib
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 
+logger = logging.getLogger(__name__)
+
 
 def _extract_dir_probs(y_proba: np.ndarray, classes: List[str]) -> Tuple[np.ndarray, np.ndarray]:
     c2i = {c: i for i, c in enumerate(classes)}
@@ -62,6 +72,349 @@ def _positions_top_pct(y_proba: np.ndarray, classes: List[str], top_pct: float,
     return pos
 
 
+GRID_METRICS = ("hit_rate", "cum_ret", "sharpe_hourly", "trades")
+# Upper bound on grid points x rows materialized per broadcast chunk
+_GRID_CELLS = 4_000_000
+
+
+def _grid_metrics(sign: np.ndarray, pos: np.ndarray, outcome: np.ndarray, gate: Optional[np.ndarray], slippage_bps: float) -> np.ndarray:
+    """(G, N) signs/positions -> (G, len(GRID_METRICS)). hit_rate is ungated (the threshold pick proxy)."""
+    hit = np.mean(np.where(sign * outcome > 0, 1.0, 0.0), axis=1)
+    if gate is not None:
+        pos = pos * gate
+    pnl = pos * outcome
+    pnl -= np.where(pos != 0, slippage_bps/10000.0, 0.0)
+    sharpe = np.mean(pnl, axis=1) / (np.std(pnl, axis=1) + 1e-9)
+    return np.column_stack([hit, np.sum(pnl, axis=1), sharpe, np.sum(np.abs(pos) > 0, axis=1)])
+
+
+def _chunks(n_grid: int, n_rows: int):
+    step = max(1, _GRID_CELLS // max(1, n_rows))
+    for i in range(0, n_grid, step):
+        yield slice(i, min(n_grid, i + step))
+
+
+def threshold_grid(p_up: np.ndarray, p_down: np.ndarray, outcome: np.ndarray, thresholds, *, size_by_conf: bool = False,
+                   conf_cap: float = 1.0, slippage_bps: float = 1.0, gate: Optional[np.ndarray] = None) -> np.ndarray:
+    """Score every threshold at once: returns (len(thresholds), len(GRID_METRICS)).
+
+    Same positions as `_positions_threshold` per threshold; outcome is +1 (UP), -1 (DOWN) or 0.
+    """
+    thr = np.asarray(thresholds, dtype=float)
+    out = np.empty((len(thr), len(GRID_METRICS)))
+    size = np.minimum(_confidence_from_probs(p_up, p_down), conf_cap) if size_by_conf else 1.0
+    up_side, down_side = p_up > p_down, p_down > p_up
+    for sl in _chunks(len(thr), len(p_up)):
+        t = thr[sl, None]
+        sign = np.where((p_up >= t) & up_side, 1, np.where((p_down >= t) & down_side, -1, 0))
+        out[sl] = _grid_metrics(sign, sign.astype(float) * size, outcome, gate, slippage_bps)
+    return out
+
+
+def top_pct_grid(p_up: np.ndarray, p_down: np.ndarray, outcome: np.ndarray, top_pcts, *, size_by_conf: bool = False,
+                 conf_cap: float = 1.0, slippage_bps: float = 1.0, gate: Optional[np.ndarray] = None) -> np.ndarray:
+    """Score every top_pct at once (one argsort shared by the grid); same positions as `_positions_top_pct`."""
+    pct = np.asarray(top_pcts, dtype=float)
+    n = len(p_up)
+    out = np.empty((len(pct), len(GRID_METRICS)))
+    rank = np.empty(n, dtype=np.int64)
+    rank[np.argsort(-np.maximum(p_up, p_down))] = np.arange(n)
+    k = np.maximum(1, np.floor(pct * n).astype(np.int64))
+    direction = np.where(p_up >= p_down, 1.0, -1.0)
+    size = np.minimum(_confidence_from_probs(p_up, p_down), conf_cap) if size_by_conf else 1.0
+    for sl in _chunks(len(pct), n):
+        sign = np.where(rank < k[sl, None], direction, 0.0)
+        out[sl] = _grid_metrics(sign, sign * size, outcome, gate, slippage_bps)
+    return out
+
+
+# Fold model configuration; part of the OOF cache key so changing it invalidates cached predictions
+_MODEL_PARAMS = dict(n_estimators=300, max_depth=4, learning_rate=0.08, subsample=0.9, colsample_bytree=0.9, eval_metric="mlogloss", tree_method="hist", random_state=2025)
+_OOF_VERSION = 1
+
+
+@dataclass
+class FoldPredictions:
+    fold: int
+    test_idx: np.ndarray
+    y_proba: np.ndarray
+    classes: List[Any]
+    seconds: float = 0.0
+
+
+@dataclass
+class OOFPredictions:
+    """Out-of-fold probabilities for one (matrix, features, target, split, calibration) setup."""
+    key: str
+    y: np.ndarray
+    label_classes: np.ndarray
+    folds: List[FoldPredictions] = field(default_factory=list)
+    workers: int = 1
+    cached: bool = False
+
+
+def _fit_predict(X_train: np.ndarray, y_train: np.ndarray, X_test: np.ndarray, calibration: Optional[str], classes_default, n_jobs: Optional[int] = None) -> Tuple[np.ndarray, List]:
+    model = XGBClassifier(**_MODEL_PARAMS, n_jobs=n_jobs)
+    if calibration in {"sigmoid", "isotonic"}:
+        try:
+            clf = CalibratedClassifierCV(model, method=calibration, cv=3)
+            clf.fit(X_train, y_train)
+            final = clf
+        except Exception:
+            model.fit(X_train, y_train); final = model
+    else:
+        model.fit(X_train, y_train); final = model
+    return final.predict_proba(X_test), list(getattr(final, 'classes_', classes_default))
+
+
+def _fit_fold(fold: int, train_idx: np.ndarray, test_idx: np.ndarray, X: np.ndarray, y: np.ndarray, calibration: Optional[str], label_classes, n_jobs: Optional[int] = None) -> FoldPredictions:
+    t0 = time.perf_counter()
+    y_proba, classes = _fit_predict(X[train_idx], y[train_idx], X[test_idx], calibration, label_classes, n_jobs=n_jobs)
+    return FoldPredictions(fold, test_idx, y_proba, classes, time.perf_counter() - t0)
+
+
+def _label_code(label_classes, label: str) -> int:
+    codes = list(label_classes)
+    if label not in codes:
+        raise ValueError(f"y contains no '{label}' labels")
+    return codes.index(label)
+
+
+def _fold_inputs(fp: FoldPredictions, y: np.ndarray, label_classes, gate_vals: Optional[np.ndarray]):
+    y_test = y[fp.test_idx]
+    up, down = _label_code(label_classes, 'UP'), _label_code(label_classes, 'DOWN')
+    p_up, p_down = _extract_dir_probs(fp.y_proba, fp.classes)
+    outcome = np.where(y_test == up, 1.0, np.where(y_test == down, -1.0, 0.0))
+    gate = gate_vals[fp.test_idx] if gate_vals is not None else None
+    return p_up, p_down, outcome, gate
+
+
+def _evaluate_fold(fp: FoldPredictions, y: np.ndarray, label_classes, gate_vals: Optional[np.ndarray], opts: Dict[str, Any]) -> Dict[str, Any]:
+    """Positions and PnL proxy for one fold's predictions (no model work)."""
+    p_up, p_down, outcome, gate = _fold_inputs(fp, y, label_classes, gate_vals)
+    kw = dict(size_by_conf=opts['size_by_conf'], conf_cap=opts['conf_cap'], slippage_bps=opts['slippage_bps'], gate=gate)
+    top_pct, thresholds = opts['top_pct'], opts['thresholds']
+    thr_used = None
+    if top_pct is not None and top_pct != "":
+        m = top_pct_grid(p_up, p_down, outcome, [float(top_pct)], **kw)[0]
+    elif thresholds:
+        grid = threshold_grid(p_up, p_down, outcome, thresholds, **kw)
+        # Best by direction hit rate; first threshold wins ties
+        best = int(np.argmax(grid[:, 0]))
+        m, thr_used = grid[best], thresholds[best]
+    else:
+        m = np.array([0.0, 0.0, 0.0, 0.0])
+    return {"fold": fp.fold, "thr": thr_used, "cum_ret": float(m[1]), "sharpe_hourly": float(m[2]), "trades": int(m[3])}
+
+
+# Per-process fold inputs, shipped once per worker by the pool initializer
+_WORKER: Dict[str, Any] = {}
+
+
+def _init_fold_worker(X: np.ndarray, y: np.ndarray, calibration: Optional[str], label_classes, n_jobs: int) -> None:
+    _WORKER.update(X=X, y=y, calibration=calibration, label_classes=label_classes, n_jobs=n_jobs)
+
+
+def _fit_fold_worker(fold: int, train_idx: np.ndarray, test_idx: np.ndarray) -> FoldPredictions:
+    w = _WORKER
+    return _fit_fold(fold, train_idx, test_idx, w['X'], w['y'], w['calibration'], w['label_classes'], n_jobs=w['n_jobs'])
+
+
+def resolve_fold_workers(workers: Optional[int], n_folds: int) -> int:
+    """Fold processes to use: explicit value, else SIGMA_BACKTEST_WORKERS (default 1 = serial); <=0 means all cores."""
+    if workers is None:
+        try:
+            workers = int(os.getenv("SIGMA_BACKTEST_WORKERS", "1"))
+        except Exception:
+            workers = 1
+    if int(workers) <= 0:
+        workers = os.cpu_count() or 1
+    return max(1, min(int(workers), int(n_folds)))
+
+
+def oof_cache_key(df: pd.DataFrame, feat_cols: List[str], target_col: str, *, splits: int, embargo: float,
+                  allowed_hours: Optional[List[int]], calibration: Optional[str]) -> str:
+    """Content hash of the (already hour-filtered) matrix plus everything that shapes the fold models."""
+    h = hashlib.sha256()
+    h.update(pd.util.hash_pandas_object(df[feat_cols + [target_col]], index=False).values.tobytes())
+    spec = dict(v=_OOF_VERSION, features=feat_cols, target=target_col, splits=int(splits), embargo=float(embargo),
+                allowed_hours=sorted(int(x) for x in allowed_hours) if allowed_hours else None,
+                calibration=calibration, model=_MODEL_PARAMS)
+    h.update(json.dumps(spec, sort_keys=True, default=str).encode())
+    return h.hexdigest()[:32]
+
+
+def _save_oof(path: Path, oof: OOFPredictions) -> None:
+    arrays = {"y": oof.y, "label_classes": np.asarray(oof.label_classes).astype(str)}
+    for fp in oof.folds:
+        arrays[f"f{fp.fold}_test_idx"] = fp.test_idx
+        arrays[f"f{fp.fold}_proba"] = fp.y_proba
+        arrays[f"f{fp.fold}_classes"] = np.asarray(fp.classes)
+        arrays[f"f{fp.fold}_seconds"] = np.asarray(fp.seconds)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npz")
+    try:
+        np.savez(tmp, **arrays)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def _load_oof(path: Path, key: str) -> Optional[OOFPredictions]:
+    try:
+        with np.load(path, allow_pickle=False) as z:
+            folds = []
+            i = 0
+            while f"f{i}_proba" in z.files:
+                folds.append(FoldPredictions(i, z[f"f{i}_test_idx"], z[f"f{i}_proba"], list(z[f"f{i}_classes"]), float(z[f"f{i}_seconds"])))
+                i += 1
+            return OOFPredictions(key, z["y"], z["label_classes"], folds, cached=True)
+    except Exception as e:
+        logger.warning("ignoring unreadable OOF cache %s: %s", path, e)
+        return None
+
+
+def fit_oof(
+    df: pd.DataFrame,
+    target_col: str,
+    *,
+    splits: int = 5,
+    embargo: float = 0.0,
+    allowed_hours: Optional[List[int]] = None,
+    calibration: Optional[str] = 'sigmoid',
+    workers: Optional[int] = None,
+    cache_dir: Optional[str] = None,
+    n_jobs: Optional[int] = None,
+) -> OOFPredictions:
+    """Fit every walk-forward fold once and return out-of-fold probabilities.
+
+    `df` is expected to be hour-filtered already (allowed_hours only feeds the cache key). With
+    `cache_dir`, predictions are stored as ``<cache_dir>/<key>.npz`` and reused by any later call
+    with the same matrix content, features, target, splits, embargo, hours and calibration.
+    `n_jobs` fixes the XGBoost threads per fold fit (serial or pooled); by default pooled folds get
+    cpu_count // workers and serial fits use XGBoost's own default.
+    """
+    feat_cols = select_features(df)
+    X = df[feat_cols].fillna(0.0).values
+    y_raw = df[target_col].astype(str).values
+    le = LabelEncoder(); y = le.fit_transform(y_raw)
+
+    key = oof_cache_key(df, feat_cols, target_col, splits=splits, embargo=embargo, allowed_hours=allowed_hours, calibration=calibration)
+    path = Path(cache_dir) / f"{key}.npz" if cache_dir else None
+    if path is not None and path.exists():
+        hit = _load_oof(path, key)
+        if hit is not None:
+            return hit
+
+    splitter = PurgedEmbargoedWalkForwardSplit(n_splits=splits, embargo=embargo)
+    folds = list(enumerate(splitter.split(X)))
+    n_workers = resolve_fold_workers(workers, len(folds))
+    preds: List[FoldPredictions] = []
+    if n_workers > 1:
+        pool_jobs = int(n_jobs) if n_jobs else max(1, (os.cpu_count() or 1) // n_workers)
+        try:
+            ctx = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=n_workers, mp_context=ctx, initializer=_init_fold_worker,
+                                     initargs=(X, y, calibration, le.classes_, pool_jobs)) as ex:
+                preds = list(ex.map(_fit_fold_worker, *zip(*[(f, tr, te) for f, (tr, te) in folds])))
+        except Exception as e:
+            logger.warning("parallel folds failed (%s); running serially", e)
+            preds, n_workers = [], 1
+    if n_workers == 1:
+        preds = [_fit_fold(f, tr, te, X, y, calibration, le.classes_, n_jobs=n_jobs) for f, (tr, te) in folds]
+    oof = OOFPredictions(key, y, le.classes_, preds, workers=n_workers)
+    if path is not None:
+        try:
+            _save_oof(path, oof)
+        except Exception as e:
+            logger.warning("OOF cache store failed for %s: %s", path, e)
+    return oof
+
+
+def evaluate_oof(
+    oof: OOFPredictions,
+    thresholds: List[float],
+    *,
+    top_pct: Optional[float] = None,
+    slippage_bps: float = 1.0,
+    size_by_conf: bool = False,
+    conf_cap: float = 1.0,
+    gate_vals: Optional[np.ndarray] = None,
+) -> List[Dict[str, Any]]:
+    """Per-fold threshold/top_pct positions and PnL from cached probabilities."""
+    opts = dict(thresholds=list(thresholds or []), top_pct=top_pct, size_by_conf=size_by_conf, conf_cap=conf_cap, slippage_bps=slippage_bps)
+    return [_evaluate_fold(fp, oof.y, oof.label_classes, gate_vals, opts) for fp in oof.folds]
+
+
+def evaluate_grid(
+    oof: OOFPredictions,
+    *,
+    thresholds: Optional[List[float]] = None,
+    top_pcts: Optional[List[float]] = None,
+    slippage_bps: float = 1.0,
+    size_by_conf: bool = False,
+    conf_cap: float = 1.0,
+    gate_vals: Optional[np.ndarray] = None,
+) -> Dict[str, Any]:
+    """Score whole threshold and top_pct grids against OOF probabilities.
+
+    Returns {'metrics': GRID_METRICS, 'thresholds', 'top_pcts', 'threshold_grid', 'top_pct_grid'}
+    where each grid is a (folds x grid points x metrics) array.
+    """
+    thresholds = list(thresholds or [])
+    top_pcts = list(top_pcts or [])
+    kw = dict(size_by_conf=size_by_conf, conf_cap=conf_cap, slippage_bps=slippage_bps)
+    thr_grid = np.empty((len(oof.folds), len(thresholds), len(GRID_METRICS)))
+    pct_grid = np.empty((len(oof.folds), len(top_pcts), len(GRID_METRICS)))
+    for i, fp in enumerate(oof.folds):
+        p_up, p_down, outcome, gate = _fold_inputs(fp, oof.y, oof.label_classes, gate_vals)
+        if thresholds:
+            thr_grid[i] = threshold_grid(p_up, p_down, outcome, thresholds, gate=gate, **kw)
+        if top_pcts:
+            pct_grid[i] = top_pct_grid(p_up, p_down, outcome, top_pcts, gate=gate, **kw)
+    return {"metrics": GRID_METRICS, "thresholds": thresholds, "top_pcts": top_pcts, "threshold_grid": thr_grid, "top_pct_grid": pct_grid}
+
+
+def results_from_grid(grid: Dict[str, Any], oof: OOFPredictions, *, thresholds: Optional[List[float]] = None,
+                      top_pct: Optional[float] = None) -> List[Dict[str, Any]]:
+    """`evaluate_oof` results for one variant, read off an `evaluate_grid` result that covers its points."""
+    thr_pos = {float(t): j for j, t in enumerate(grid["thresholds"])}
+    pct_pos = {float(p): j for j, p in enumerate(grid["top_pcts"])}
+    thresholds = list(thresholds or [])
+    out = []
+    for i, fp in enumerate(oof.folds):
+        thr_used = None
+        if top_pct is not None and top_pct != "":
+            m = grid["top_pct_grid"][i, pct_pos[float(top_pct)]]
+        elif thresholds:
+            sub = grid["threshold_grid"][i, [thr_pos[float(t)] for t in thresholds]]
+            # Same selection as _evaluate_fold: best hit rate, first threshold wins ties
+            best = int(np.argmax(sub[:, 0]))
+            m, thr_used = sub[best], thresholds[best]
+        else:
+            m = np.zeros(len(GRID_METRICS))
+        out.append({"fold": fp.fold, "thr": thr_used, "cum_ret": float(m[1]), "sharpe_hourly": float(m[2]), "trades": int(m[3])})
+    return out
+
+
+def momentum_gate_values(df: pd.DataFrame, momentum_gate: bool, momentum_min: float, momentum_column: str) -> Optional[np.ndarray]:
+    if not (momentum_gate and momentum_column in df.columns):
+        return None
+    try:
+        return (df[momentum_column].astype(float).fillna(0.0).values >= float(momentum_min)).astype(float)
+    except Exception:
+        return None
+
+
+def best_fold_result(results: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """The fold result with the best hourly Sharpe (first wins ties)."""
+    if not results:
+        return None
+    df_res = pd.DataFrame(results)
+    return df_res.iloc[int(np.argmax(df_res['sharpe_hourly'].values))].to_dict()
+
+
 def run_backtest(
     df: pd.DataFrame,
     target_col: str,
@@ -81,68 +434,25 @@ def run_backtest(
     momentum_gate: bool = False,
     momentum_min: float = 0.0,
     momentum_column: str = 'momentum_score_total',
+    workers: Optional[int] = None,
+    oof_cache_dir: Optional[str] = None,
+    n_jobs: Optional[int] = None,
 ) -> Dict[str, any]:
+    """Walk-forward backtest: `fit_oof` (optionally cached in oof_cache_dir) then `evaluate_oof`.
+
+    With workers > 1 folds run in a process pool; each worker gets cpu_count // workers XGBoost
+    threads so fold processes and tree threads don't oversubscribe. Callers that are themselves
+    parallel (sweeps) pass `n_jobs` to set the per-fit thread count explicitly.
+    """
     if allowed_hours and 'hour_et' in df.columns:
         df = df[df['hour_et'].isin(allowed_hours)].copy()
 
-    feat_cols = select_features(df)
-    X = df[feat_cols].fillna(0.0).values
-    y_raw = df[target_col].astype(str).values
-    le = LabelEncoder(); y = le.fit_transform(y_raw)
-
-    splitter = PurgedEmbargoedWalkForwardSplit(n_splits=splits, embargo=embargo)
-    results = []
-    cum_rets = []
-    for fold, (train_idx, test_idx) in enumerate(splitter.split(X)):
-        X_train, X_test = X[train_idx], X[test_idx]
-        y_train, y_test = y[train_idx], y[test_idx]
-
-        model = XGBClassifier(n_estimators=300, max_depth=4, learning_rate=0.08, subsample=0.9, colsample_bytree=0.9, eval_metric="mlogloss", tree_method="hist", random_state=2025)
-        if calibration in {"sigmoid", "isotonic"}:
-            try:
-                clf = CalibratedClassifierCV(model, method=calibration, cv=3)
-                clf.fit(X_train, y_train)
-                final = clf
-            except Exception:
-                model.fit(X_train, y_train); final = model
-        else:
-            model.fit(X_train, y_train); final = model
-
-        y_proba = final.predict_proba(X_test)
-        classes = list(getattr(final, 'classes_', le.classes_))
-        p_up, p_down = _extract_dir_probs(y_proba, classes)
-        conf = _confidence_from_probs(p_up, p_down)
-
-        if top_pct is not None and top_pct != "":
-            pos = _positions_top_pct(y_proba, classes, float(top_pct), size_by_conf=size_by_conf, conf_cap=conf_cap)
-            thr_used = None
-        else:
-            best = None
-            for thr in thresholds:
-                pos_thr = _positions_threshold(y_proba, classes, thr, size_by_conf=size_by_conf, conf_cap=conf_cap)
-                # Simple return proxy: direction correctness
-                ret = np.mean(np.where(((p_up >= thr) & (p_up > p_down) & (y_test == le.transform(['UP'])[0])) | ((p_down >= thr) & (p_down > p_up) & (y_test == le.transform(['DOWN'])[0])), 1.0, 0.0))
-                if best is None or ret > best[0]:
-                    best = (ret, thr, pos_thr)
-            pos = best[2] if best else np.zeros_like(y_test, dtype=float)
-            thr_used = best[1] if best else None
-
-        # Momentum gate: zero out positions when momentum below threshold
-        if momentum_gate and (momentum_column in df.columns):
-            try:
-                gate_vals = df.iloc[test_idx][momentum_column].astype(float).fillna(0.0).values
-                gate = (gate_vals >= float(momentum_min)).astype(float)
-                pos = pos * gate
-            except Exception:
-                pass
-
-        # Simple PnL proxy with slippage
-        pnl = pos * (np.where(y_test == le.transform(['UP'])[0], 1.0, np.where(y_test == le.transform(['DOWN'])[0], -1.0, 0.0)))
-        pnl -= np.where(pos != 0, slippage_bps/10000.0, 0.0)
-        cum_ret = float(np.sum(pnl))
-        sharpe_hourly = float(np.mean(pnl) / (np.std(pnl) + 1e-9))
-        results.append({"fold": fold, "thr": thr_used, "cum_ret": cum_ret, "sharpe_hourly": sharpe_hourly, "trades": int(np.sum(np.abs(pos)>0))})
-        cum_rets.append(cum_ret)
+    oof = fit_oof(df, target_col, splits=splits, embargo=embargo, allowed_hours=allowed_hours,
+                  calibration=calibration, workers=workers, cache_dir=oof_cache_dir, n_jobs=n_jobs)
+    gate_vals = momentum_gate_values(df, momentum_gate, momentum_min, momentum_column)
+    results = evaluate_oof(oof, thresholds, top_pct=top_pct, slippage_bps=slippage_bps,
+                           size_by_conf=size_by_conf, conf_cap=conf_cap, gate_vals=gate_vals)
+    fold_timings = [{"fold": fp.fold, "seconds": round(fp.seconds, 3)} for fp in oof.folds]
 
     # Plot cumulative returns across folds if requested
     top_result = None
@@ -157,7 +467,6 @@ def run_backtest(
             out_png = Path(plots_dir) / 'cum_returns.png'
             plt.savefig(out_png)
         # Select best by sharpe
-        best_idx = int(np.argmax(df_res['sharpe_hourly'].values))
-        top_result = df_res.iloc[best_idx].to_dict()
+        top_result = best_fold_result(results)
 
-    return {"threshold_results": results, "top_pct_result": top_result}
+    return {"threshold_results": results, "top_pct_result": top_result, "fold_timings": fold_timings, "workers": oof.workers, "oof_cached": oof.cached}
@@ -0,0 +1,140 @@
+"""Previous-close anchors for the 0DTE strike ladders.
+
+`prev_close_anchors` resolves the previous session close for every date in a range with one daily
+bar request (and one hourly request only when daily bars leave gaps, e.g. today intraday), and
+memoizes the result per ticker so repeated builders in the same process do not refetch.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from datetime import date, timedelta
+from typing import Dict, Tuple
+
+import pandas as pd
+import pytz
+
+from .data_loader import get_multi_timeframe_data
+
+ET = pytz.timezone("US/Eastern")
+logger = logging.getLogger(__name__)
+
+_ANCHORS: Dict[str, Dict[date, float]] = {}
+_COVERED: Dict[str, Tuple[date, date]] = {}
+_LOCK = threading.Lock()
+
+
+def _today_et() -> date:
+    return pd.Timestamp.now(tz=ET).date()
+
+
+def _frame_with_date(df: pd.DataFrame) -> pd.DataFrame:
+    if 'date' in df.columns:
+        return df.copy()
+    out = df.reset_index()
+    for alt in ('index', 'timestamp', 'ts', 'time'):
+        if alt in out.columns and 'date' not in out.columns:
+            out = out.rename(columns={alt: 'date'})
+    return out
+
+
+def _prev_from_daily(daily: pd.DataFrame) -> Dict[date, float]:
+    ddf = _frame_with_date(daily)
+    ddf['date'] = pd.to_datetime(ddf['date']).dt.date
+    ddf = ddf.sort_values('date').set_index('date')
+    prev = ddf['close'].astype(float).shift(1).dropna()
+    return {d: float(v) for d, v in prev.items()}
+
+
+def _prev_from_hourly(hourly: pd.DataFrame) -> Dict[date, float]:
+    hdf = _frame_with_date(hourly)
+    hdf['date'] = pd.to_datetime(hdf['date'], utc=True)
+    hdf['session_date'] = hdf['date'].dt.tz_convert(ET).dt.date
+    last_per_day = (
+        hdf.sort_values(['session_date', 'date'])
+           .groupby('session_date')
+           .tail(1)
+           .set_index('session_date')['close']
+           .astype(float)
+    )
+    prev = last_per_day.shift(1).dropna()
+    return {d: float(v) for d, v in prev.items()}
+
+
+def _resolve(ticker: str, start: date, end: date) -> Dict[date, float]:
+    fetch_from = (start - timedelta(days=6)).strftime("%Y-%m-%d")
+    fetch_to = end.strftime("%Y-%m-%d")
+    anchors: Dict[date, float] = {}
+    daily_err = None
+    try:
+        daily = get_multi_timeframe_data(ticker, fetch_from, fetch_to, ["day"]).get("day", pd.DataFrame())
+        if daily is not None and not daily.empty:
+            anchors.update(_prev_from_daily(daily))
+    except Exception as e:
+        daily_err = e
+        logger.warning("daily bars for %s prev_close failed: %s", ticker, e)
+    d = start
+    missing = False
+    while d <= end:
+        if d.weekday() < 5 and d not in anchors:
+            missing = True
+            break
+        d += timedelta(days=1)
+    if missing:
+        # Daily bars lag intraday (and may be unavailable); fill gaps from previous session's last hourly close
+        try:
+            hourly = get_multi_timeframe_data(ticker, fetch_from, fetch_to, ["hour"]).get("hour", pd.DataFrame())
+            if hourly is not None and not hourly.empty:
+                filled = 0
+                for k, v in _prev_from_hourly(hourly).items():
+                    if k not in anchors:
+                        anchors[k] = v
+                        filled += 1
+                if filled:
+                    logger.info("Filled %s prev_close anchors for %s from hourly bars", filled, ticker)
+        except Exception as e:
+            logger.warning("hourly bars for %s prev_close failed: %s", ticker, e)
+    if not anchors and daily_err is not None:
+        raise RuntimeError(f"Failed to fetch {ticker} bars from Polygon for prev_close anchors: {daily_err}")
+    return anchors
+
+
+def prev_close_anchors(ticker: str, start: date, end: date) -> Dict[date, float]:
+    """Map session date -> previous session close for dates in [start, end] (memoized per ticker)."""
+    key = str(ticker).upper()
+    with _LOCK:
+        cov = _COVERED.get(key)
+        if cov and cov[0] <= start and end <= cov[1]:
+            return {d: v for d, v in _ANCHORS[key].items() if start <= d <= end}
+    lo, hi = start, end
+    if cov:
+        # Keep one contiguous memoized span per ticker
+        lo, hi = min(lo, cov[0]), max(hi, cov[1])
+    anchors = _resolve(key, lo, hi)
+    today = _today_et()
+    covered_hi = hi
+    if hi >= today and today not in anchors:
+        # Today's anchor can appear later in the session; do not memoize its absence
+        covered_hi = today - timedelta(days=1)
+    with _LOCK:
+        merged = dict(_ANCHORS.get(key, {}))
+        merged.update(anchors)
+        _ANCHORS[key] = merged
+        if covered_hi >= lo:
+            _COVERED[key] = (lo, covered_hi)
+    return {d: v for d, v in anchors.items() if start <= d <= end}
+
+
+def prev_close_anchor(ticker: str, d: date) -> float | None:
+    """Previous close for a single session date, or None if unavailable."""
+    return prev_close_anchors(ticker, d, d).get(d)
+
+
+def clear_anchor_cache(ticker: str | None = None) -> None:
+    with _LOCK:
+        if ticker is None:
+            _ANCHORS.clear()
+            _COVERED.clear()
+        else:
+            _ANCHORS.pop(str(ticker).upper(), None)
+            _COVERED.pop(str(ticker).upper(), None)
@@ -0,0 +1,218 @@
+"""In-process option chain snapshot store shared by the options-structure indicators.
+
+`chain_snapshot(underlying, expiry)` loads each chain once (through the Polygon snapshot fetcher
+and its disk cache), normalizes it, and exposes lazily computed per-strike aggregates: |gamma| x OI
+by strike, OI by strike and by side, total OI and IV by strike/side, plus ATM and delta lookups.
+Entries live in a bounded LRU (SIGMA_CHAIN_STORE_MAX, default 64 chains). Today's chain is still
+moving, so it is only retained for the duration of a `chain_session()` (e.g. one feature build).
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pytz
+
+from .sources import polygon as _polygon
+
+logger = logging.getLogger(__name__)
+
+ET = pytz.timezone("US/Eastern")
+_NUMERIC = ("strike", "implied_volatility", "delta", "gamma", "theta", "vega", "bid", "ask", "mid", "open_interest")
+
+
+def _today_et() -> date:
+    return datetime.now(ET).date()
+
+
+class ChainSnapshot:
+    """One (underlying, expiry) chain with cached per-strike aggregates."""
+
+    def __init__(self, underlying: str, expiry: date, frame: Optional[pd.DataFrame]):
+        self.underlying = underlying
+        self.expiry = expiry
+        s = frame.copy() if frame is not None else pd.DataFrame()
+        if "delta" not in s.columns and "greeks.delta" in s.columns:
+            s["delta"] = s["greeks.delta"]
+        for c in _NUMERIC:
+            if c in s.columns:
+                s[c] = pd.to_numeric(s[c], errors="coerce")
+        if "contract_type" in s.columns:
+            s["contract_type"] = s["contract_type"].astype(str).str.lower()
+        self.frame = s
+        self._memo: Dict[object, object] = {}
+
+    @property
+    def empty(self) -> bool:
+        return self.frame.empty
+
+    @property
+    def has_gamma(self) -> bool:
+        return "gamma" in self.frame.columns
+
+    def _cached(self, key, fn):
+        if key not in self._memo:
+            self._memo[key] = fn()
+        return self._memo[key]
+
+    def _oi(self) -> pd.Series:
+        return self.frame["open_interest"].fillna(0.0) if "open_interest" in self.frame.columns else pd.Series(0.0, index=self.frame.index)
+
+    @property
+    def gamma_oi_by_strike(self) -> pd.Series:
+        """sum(|gamma| * OI) per strike (strike-sorted)."""
+        def _calc():
+            g = self.frame["gamma"].abs().fillna(0.0)
+            return (g * self._oi()).groupby(self.frame["strike"]).sum()
+        return self._cached("gamma_oi", _calc)
+
+    @property
+    def oi_by_strike(self) -> pd.Series:
+        return self._cached("oi_strike", lambda: self.frame["open_interest"].groupby(self.frame["strike"]).sum())
+
+    @property
+    def oi_by_side(self) -> pd.Series:
+        return self._cached("oi_side", lambda: self.frame["open_interest"].groupby(self.frame["contract_type"]).sum())
+
+    @property
+    def oi_total(self) -> float:
+        return self._cached("oi_total", lambda: float(self._oi().sum()))
+
+    @property
+    def iv_by_strike(self) -> pd.DataFrame:
+        """First non-null IV per strike, one column per side (call/put)."""
+        def _calc():
+            s = self.frame.dropna(subset=["implied_volatility"])
+            return s.groupby(["strike", "contract_type"])["implied_volatility"].first().unstack("contract_type")
+        return self._cached("iv_strike", _calc)
+
+    def _iv_rows(self, side: Optional[str]) -> Tuple[np.ndarray, np.ndarray]:
+        def _calc():
+            s = self.frame
+            if side in ("call", "put"):
+                s = s[s["contract_type"] == side]
+            s = s.dropna(subset=["implied_volatility"])
+            return s["strike"].to_numpy(dtype=float), s["implied_volatility"].to_numpy(dtype=float)
+        return self._cached(("iv_rows", side), _calc)
+
+    def atm_iv(self, anchor: float, side: Optional[str] = None) -> float:
+        """IV of the contract whose strike is nearest to `anchor` (optionally one side only)."""
+        strikes, ivs = self._iv_rows(side)
+        if not len(strikes) or not np.isfinite(anchor):
+            return float("nan")
+        dist = np.abs(strikes - float(anchor))
+        ok = np.flatnonzero(np.isfinite(dist))
+        if not len(ok):
+            return float("nan")
+        # Same pick as sort_values('dist').iloc[0] (call/put ties at one strike resolve identically)
+        return float(ivs[ok[np.argsort(dist[ok])[0]]])
+
+    def iv_at_delta(self, target: float, side: str) -> float:
+        """IV of the `side` contract whose delta is nearest to `target` (e.g. 0.25 / -0.25)."""
+        def _calc():
+            s = self.frame[self.frame["contract_type"] == side] if "contract_type" in self.frame.columns else self.frame.iloc[0:0]
+            if "delta" not in s.columns:
+                return np.array([]), np.array([])
+            s = s.dropna(subset=["implied_volatility", "delta"])
+            return s["delta"].to_numpy(dtype=float), s["implied_volatility"].to_numpy(dtype=float)
+        deltas, ivs = self._cached(("delta_rows", side), _calc)
+        if not len(deltas):
+            return float("nan")
+        return float(ivs[int(np.argsort(np.abs(deltas - float(target)))[0])])
+
+
+class ChainSnapshotStore:
+    """Bounded LRU of ChainSnapshot keyed by (UNDERLYING, expiry).
+
+    Only non-empty historical chains go into the LRU. Live (today or later), empty and failed loads
+    are memoized in a separate per-session dict while a session is open and dropped when it closes.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        if max_entries is None:
+            try:
+                max_entries = int(os.getenv("SIGMA_CHAIN_STORE_MAX", "64"))
+            except Exception:
+                max_entries = 64
+        self.max_entries = max(1, int(max_entries))
+        self._entries: "OrderedDict[Tuple[str, date], ChainSnapshot]" = OrderedDict()
+        self._session_entries: Dict[Tuple[str, date], ChainSnapshot] = {}
+        self._lock = threading.Lock()
+        self._sessions = 0
+        self.hits = 0
+        self.loads = 0
+
+    def get(self, underlying: str, expiry: date) -> ChainSnapshot:
+        key = (str(underlying).upper(), expiry)
+        with self._lock:
+            snap = self._entries.get(key)
+            if snap is not None:
+                self._entries.move_to_end(key)
+            else:
+                snap = self._session_entries.get(key)
+            if snap is not None:
+                self.hits += 1
+                return snap
+        failed = False
+        try:
+            frame = _polygon.get_polygon_option_chain_snapshot(underlying, expiry)
+        except Exception as e:
+            logger.warning("chain snapshot load failed for %s %s: %s", underlying, expiry, e)
+            frame, failed = pd.DataFrame(), True
+        snap = ChainSnapshot(key[0], expiry, frame)
+        with self._lock:
+            self.loads += 1
+            if not failed and not snap.empty and expiry < _today_et():
+                self._entries[key] = snap
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            elif self._sessions > 0:
+                self._session_entries[key] = snap
+        return snap
+
+    @contextmanager
+    def session(self):
+        with self._lock:
+            self._sessions += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._sessions -= 1
+                if self._sessions == 0:
+                    self._session_entries.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._session_entries.clear()
+            self.hits = 0
+            self.loads = 0
+
+    def __len__(self) -> int:
+        return len(self._entries) + len(self._session_entries)
+
+
+_STORE = ChainSnapshotStore()
+
+
+def get_chain_store() -> ChainSnapshotStore:
+    return _STORE
+
+
+def chain_snapshot(underlying: str, expiry: date) -> ChainSnapshot:
+    """Shared, memoized chain snapshot for (underlying, expiry)."""
+    return _STORE.get(underlying, expiry)
+
+
+def chain_session():
+    """Scope (e.g. one feature build) during which today's live chains are loaded only once."""
+    return _STORE.session()
@@ -1,6 +1,5 @@
 import os
-import time
-import random
+import asyncio
 import logging
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import logging
@@ -16,13 +15,25 @@ from dotenv import load_dotenv
 from .sources.polygon import (
     get_polygon_options_aggs,
     get_polygon_option_trades,
-    get_polygon_option_quotes,
+    iter_polygon_option_quotes,
     get_polygon_hourly_bars,
     get_polygon_oi_snapshot_today,
 )
+from .sources.polygon_async import (
+    AsyncPolygonClient,
+    aiohttp,
+    fetch_options_aggs as async_options_aggs,
+    fetch_option_trades as async_option_trades,
+    iter_option_quotes as async_iter_option_quotes,
+    run_async,
+)
+from .trade_classify import PremiumClassifier, default_batch_rows
+from .matrix_io import config_sha1, file_sha1, matrix_exists, read_matrix, write_matrix
 from .data_loader import get_multi_timeframe_data
+from .anchors import prev_close_anchor, prev_close_anchors
 from ..features.builder import FeatureBuilder
 from ..features.loader import load_indicator_set
+from ..features.lookback import latest_window_start, warmup_days
 from ..labels.hourly_direction import label_next_hour_direction
 from ..indicators.builtins.momentum import Momentum
 from ..indicators.builtins.volatility import Volatility
@@ -33,27 +44,13 @@ UTC = pytz.utc
 logger = logging.getLogger(__name__)
 
 
-def _with_retry(fn, *, attempts: int = 3, backoff: float = 0.5, jitter: float = 0.1):
-    """Return a callable that wraps `fn` with simple retry + exponential backoff."""
-    def _wrapped(*args, **kwargs):
-        delay = float(backoff)
-        last_exc = None
-        for i in range(int(max(1, attempts))):
-            try:
-                return fn(*args, **kwargs)
-            except Exception as e:
-                last_exc = e
-                if i == attempts - 1:
-                    break
-                try:
-                    time.sleep(delay + random.random() * float(jitter))
-                except Exception:
-                    pass
-                delay *= 2.0
-        if last_exc is not None:
-            raise last_exc
-        return None
-    return _wrapped
+def _resolve_engine(engine: str | None) -> str:
+    """Pick the per-contract fetch engine; falls back to threads when aiohttp is unavailable."""
+    name = (engine or os.getenv("SIGMA_FETCH_ENGINE") or "threads").strip().lower()
+    if name == "async" and aiohttp is None:
+        logger.warning("engine='async' requested but aiohttp is not installed; using threads")
+        return "threads"
+    return "async" if name == "async" else "threads"
 
 
 def _daterange(start: date, end: date):
@@ -79,150 +76,95 @@ def _ensure_date_column(df: pd.DataFrame) -> pd.DataFrame:
     return df2
 
 
-def fetch_0dte_flow(start_date: date, end_date: date, *, ticker: str = "SPY", distance_max: int = 7, workers: int = 8, retries: int = 3, backoff: float = 0.5) -> pd.DataFrame:
+def fetch_0dte_flow(
+    start_date: date,
+    end_date: date,
+    *,
+    ticker: str = "SPY",
+    distance_max: int = 7,
+    workers: int = 8,
+    retries: int = 3,
+    backoff: float = 0.5,
+    engine: str | None = None,
+    concurrency: int = 64,
+) -> pd.DataFrame:
     """
     Build raw 0DTE flow at per-strike, per-hour granularity:
     Returns columns: date, price_level, spy_prev_close, hour_et, calls_sold, puts_sold
+    Retries (`retries` attempts per request) and rate limiting are owned by the shared Polygon
+    HTTP client; `backoff` is kept for call compatibility and no longer used.
+    engine: "threads" (default; `workers` threads) or "async" (`concurrency` in-flight requests);
+    defaults to SIGMA_FETCH_ENGINE when unset.
     """
-    # Prefer daily bars for prev_close anchor; fallback to previous day's last hourly close
-    daily_dict = get_multi_timeframe_data(
-        ticker,
-        (start_date - timedelta(days=5)).strftime("%Y-%m-%d"),
-        end_date.strftime("%Y-%m-%d"),
-        ["day"],
-    )
-    daily = daily_dict.get("day", pd.DataFrame())
-    prev_close_map: dict[date, float] = {}
-    if not daily.empty:
-        ddf = _ensure_date_column(daily)
-        ddf['date'] = pd.to_datetime(ddf['date']).dt.date
-        ddf = ddf.set_index('date')
-        ddf['prev_close'] = ddf['close'].shift(1)
-        prev_close_map = ddf['prev_close'].dropna().to_dict()
-        logger.info("Daily prev_close map size: %s", len(prev_close_map))
-    else:
-        # Fallback: use last hourly close from prior day
-        logger.warning("No day data found for %s. Falling back to previous day's last hourly close for prev_close anchor…", ticker)
-        hourly_dict = get_multi_timeframe_data(
-            ticker,
-            (start_date - timedelta(days=5)).strftime("%Y-%m-%d"),
-            end_date.strftime("%Y-%m-%d"),
-            ["hour"],
-        )
-        hourly_df = hourly_dict.get("hour", pd.DataFrame())
-        if hourly_df.empty:
-            raise RuntimeError("Failed to fetch SPY hourly bars from Polygon for prev_close fallback")
-        hdf = _ensure_date_column(hourly_df)
-        # Polygon timestamps are UTC in milliseconds; treat parsed datetimes as UTC
-        hdf['date'] = pd.to_datetime(hdf['date'], utc=True)
-        hdf['hour_et'] = hdf['date'].dt.tz_convert(ET).dt.hour
-        hdf['session_date'] = hdf['date'].dt.tz_convert(ET).dt.date
-        # last hourly close per session date
-        last_per_day = (
-            hdf.sort_values(['session_date', 'date'])
-               .groupby('session_date')
-               .tail(1)
-               .set_index('session_date')['close']
-        )
-        # prev_close for date d is last close of d-1
-        dates_sorted = sorted(last_per_day.index)
-        for i in range(1, len(dates_sorted)):
-            prev_day = dates_sorted[i-1]
-            curr_day = dates_sorted[i]
-            prev_close_map[curr_day] = float(last_per_day.loc[prev_day])
-        logger.info("Hourly-based prev_close map size: %s", len(prev_close_map))
-
-    # If some dates in the requested range are missing in prev_close_map (common for 'today' intraday
-    # because daily bars are not yet available), backfill using hourly data for the whole window.
-    missing_dates = [d for d in _daterange(start_date, end_date) if d not in prev_close_map]
-    if missing_dates:
-        try:
-            hourly_dict2 = get_multi_timeframe_data(
-                ticker,
-                (start_date - timedelta(days=6)).strftime("%Y-%m-%d"),
-                end_date.strftime("%Y-%m-%d"),
-                ["hour"],
-            )
-            hourly_df2 = hourly_dict2.get("hour", pd.DataFrame())
-            if not hourly_df2.empty:
-                h2 = _ensure_date_column(hourly_df2)
-                h2['date'] = pd.to_datetime(h2['date'], utc=True)
-                h2['session_date'] = h2['date'].dt.tz_convert(ET).dt.date
-                # last hourly close per session
-                last_per_day2 = (
-                    h2.sort_values(['session_date', 'date'])
-                      .groupby('session_date')
-                      .tail(1)
-                      .set_index('session_date')['close']
-                )
-                dates_sorted2 = sorted(last_per_day2.index)
-                hourly_prev: dict[date, float] = {}
-                for i in range(1, len(dates_sorted2)):
-                    prev_day = dates_sorted2[i-1]
-                    curr_day = dates_sorted2[i]
-                    hourly_prev[curr_day] = float(last_per_day2.loc[prev_day])
-                filled = 0
-                for d in missing_dates:
-                    if d in hourly_prev:
-                        prev_close_map[d] = hourly_prev[d]
-                        filled += 1
-                if filled:
-                    logger.info("Filled %s missing prev_close anchors from hourly data (range %s..%s)", filled, start_date, end_date)
-        except Exception as e:
-            # Non-fatal: keep prev_close_map as-is and proceed
-            logger.warning("Failed to backfill prev_close from hourly for missing dates: %s", e)
+    # Prev-close anchors for the whole range (one daily + at most one hourly request, memoized)
+    prev_close_map = prev_close_anchors(ticker, start_date, end_date)
+    logger.info("prev_close anchors: %s", len(prev_close_map))
 
     records: List[dict] = []
 
-    # Thread-pooled fetch per (date, strike, opt_type)
+    def _hourly_rows(df_min: pd.DataFrame, d: date, lvl: int, opt_type: str, prev_close_val: float):
+        if df_min is None or df_min.empty:
+            return []
+        ts = pd.to_datetime(df_min["timestamp"], utc=True).dt.tz_convert(ET)
+        hours = ts.dt.hour
+        minutes = ts.dt.minute
+        mins_total = hours * 60 + minutes
+        market_open = 9 * 60 + 30
+        market_close = 16 * 60
+        mask = (mins_total >= market_open) & (mins_total < market_close)
+        df_mkt = df_min.loc[mask].copy()
+        if df_mkt.empty:
+            return []
+        df_mkt["hour_et"] = pd.to_datetime(df_mkt["timestamp"], utc=True).dt.tz_convert(ET).dt.hour
+        px = df_mkt.get("vwap")
+        if px is None or px.isna().all():
+            px = df_mkt.get("close")
+        df_mkt["_premium"] = df_mkt["volume"].astype(float) * px.astype(float).fillna(0.0) * 100.0
+        grp = df_mkt.groupby("hour_et").agg(volume=("volume","sum"), premium=("_premium","sum"))
+        out = []
+        for hour_et, row in grp.iterrows():
+            vol = float(row.get("volume", 0.0) or 0.0)
+            prem = float(row.get("premium", 0.0) or 0.0)
+            out.append({
+                "date": d,
+                "price_level": lvl,
+                "spy_prev_close": float(prev_close_val),
+                "hour_et": int(hour_et),
+                "calls_sold": float(vol) if opt_type == "call" else 0.0,
+                "puts_sold": float(vol) if opt_type == "put" else 0.0,
+                "calls_premium": float(prem) if opt_type == "call" else 0.0,
+                "puts_premium": float(prem) if opt_type == "put" else 0.0,
+            })
+        return out
+
+    # Fetch per (date, strike, opt_type): thread pool by default, asyncio when engine="async"
     def _fetch_one(d: date, lvl: int, opt_type: str, prev_close_val: float):
         try:
-            wrapped = _with_retry(get_polygon_options_aggs, attempts=retries, backoff=backoff)
-            df_min = wrapped(
+            df_min = get_polygon_options_aggs(
                 underlying_ticker=ticker,
                 expiration_date=d,
                 strike_price=float(lvl),
                 option_type=opt_type,
                 from_date=d,
                 to_date=d,
+                retries=retries,
             )
-            if df_min is None or df_min.empty:
-                return []
-            ts = pd.to_datetime(df_min["timestamp"], utc=True).dt.tz_convert(ET)
-            hours = ts.dt.hour
-            minutes = ts.dt.minute
-            mins_total = hours * 60 + minutes
-            market_open = 9 * 60 + 30
-            market_close = 16 * 60
-            mask = (mins_total >= market_open) & (mins_total < market_close)
-            df_mkt = df_min.loc[mask].copy()
-            if df_mkt.empty:
-                return []
-            df_mkt["hour_et"] = pd.to_datetime(df_mkt["timestamp"], utc=True).dt.tz_convert(ET).dt.hour
-            px = df_mkt.get("vwap")
-            if px is None or px.isna().all():
-                px = df_mkt.get("close")
-            df_mkt["_premium"] = df_mkt["volume"].astype(float) * px.astype(float).fillna(0.0) * 100.0
-            grp = df_mkt.groupby("hour_et").agg(volume=("volume","sum"), premium=("_premium","sum"))
-            out = []
-            for hour_et, row in grp.iterrows():
-                vol = float(row.get("volume", 0.0) or 0.0)
-                prem = float(row.get("premium", 0.0) or 0.0)
-                out.append({
-                    "date": d,
-                    "price_level": lvl,
-                    "spy_prev_close": float(prev_close_val),
-                    "hour_et": int(hour_et),
-                    "calls_sold": float(vol) if opt_type == "call" else 0.0,
-                    "puts_sold": float(vol) if opt_type == "put" else 0.0,
-                    "calls_premium": float(prem) if opt_type == "call" else 0.0,
-                    "puts_premium": float(prem) if opt_type == "put" else 0.0,
-                })
-            return out
+            return _hourly_rows(df_min, d, lvl, opt_type, prev_close_val)
         except Exception as e:
             logger.warning("options_aggs fetch failed for %s %s %s: %s", d, lvl, opt_type, e)
             return []
 
+    async def _fetch_all_async():
+        async with AsyncPolygonClient(concurrency=concurrency) as client:
+            async def _one(d: date, lvl: int, opt_type: str, prev_close_val: float):
+                try:
+                    df_min = await async_options_aggs(client, ticker, d, float(lvl), opt_type, d, d, retries=retries)
+                    return _hourly_rows(df_min, d, lvl, opt_type, prev_close_val)
+                except Exception as e:
+                    logger.warning("options_aggs fetch failed for %s %s %s: %s", d, lvl, opt_type, e)
+                    return []
+            return await asyncio.gather(*[_one(*t) for t in tasks])
+
     tasks = []
     for d in _daterange(start_date, end_date):
         prev_close = prev_close_map.get(d)
@@ -233,7 +175,10 @@ def fetch_0dte_flow(start_date: date, end_date: date, *, ticker: str = "SPY", di
         for lvl in price_levels:
             for opt_type in ("call", "put"):
                 tasks.append((d, lvl, opt_type, prev_close))
-    if tasks:
+    if tasks and _resolve_engine(engine) == "async":
+        for rows in run_async(_fetch_all_async()):
+            records.extend(rows)
+    elif tasks:
         max_workers = max(1, int(workers))
         with ThreadPoolExecutor(max_workers=max_workers) as ex:
             futs = [ex.submit(_fetch_one, d, lvl, t, pv) for (d, lvl, t, pv) in tasks]
@@ -266,91 +211,69 @@ def fetch_0dte_trades_premium_inferred(
     distance_max: int = 7,
     start_hour_et: int = 9,
     end_hour_et: int = 14,
+    workers: int = 8,
+    retries: int = 3,
+    engine: str | None = None,
+    concurrency: int = 64,
+    max_quote_rows: int | None = None,
 ) -> pd.DataFrame:
     """Compute dealer-sold premium inferred from trades classified via NBBO quotes.
     Returns per-strike, per-hour records with calls_premium_inf_sold, puts_premium_inf_sold.
+    engine/concurrency as in fetch_0dte_flow. Quotes are streamed through a PremiumClassifier
+    `max_quote_rows` at a time (default SIGMA_FLOW_MAX_QUOTE_ROWS), which bounds per-contract memory.
     """
     records: List[dict] = []
-    # Precompute prev_close per date similar to fetch_0dte_flow
-    prev_by_date: dict[date, float] = {}
-    for d in _daterange(start_date, end_date):
-        prev_close = None
-        try:
-            daily_dict = get_multi_timeframe_data(ticker, (d - timedelta(days=5)).strftime("%Y-%m-%d"), d.strftime("%Y-%m-%d"), ["day"])
-            if daily_dict.get('day') is not None and not daily_dict['day'].empty:
-                dd = _ensure_date_column(daily_dict['day']).copy()
-                dd['date'] = pd.to_datetime(dd['date']).dt.date
-                dd = dd.set_index('date')
-                if d in dd.index:
-                    prev_close = float(dd.loc[d]['close'])
-        except Exception:
-            prev_close = None
-        if prev_close is None:
-            try:
-                hourly_dict = get_multi_timeframe_data(ticker, (d - timedelta(days=5)).strftime("%Y-%m-%d"), d.strftime("%Y-%m-%d"), ["hour"])
-                hdf = hourly_dict.get('hour', pd.DataFrame())
-                if not hdf.empty:
-                    hdf2 = _ensure_date_column(hdf)
-                    hdf2['date'] = pd.to_datetime(hdf2['date'], utc=True).dt.tz_convert(ET).dt.date
-                    last_prev = (
-                        hdf2.sort_values(['date'])
-                            .groupby('date')
-                            .tail(1)
-                            .set_index('date')['close']
-                    )
-                    prev_days = sorted(last_prev.index)
-                    for i in range(1, len(prev_days)):
-                        if prev_days[i] == d:
-                            prev_close = float(last_prev.loc[prev_days[i-1]])
-                            break
-            except Exception:
-                prev_close = None
-        if prev_close is not None:
-            prev_by_date[d] = float(prev_close)
+    batch_rows = int(max_quote_rows) if max_quote_rows else default_batch_rows()
+    # Same anchors as fetch_0dte_flow so the strike ladders (and merge keys) line up
+    try:
+        prev_by_date = prev_close_anchors(ticker, start_date, end_date)
+    except Exception as e:
+        logger.warning("prev_close anchors unavailable for %s: %s", ticker, e)
+        prev_by_date = {}
+    try:
+        hours = dict(start_hour=int(start_hour_et), end_hour=int(end_hour_et))
+    except Exception:
+        hours = {}
+
+    def _premium_rows(prem_by_hour: dict, d: date, lvl: int, opt_type: str, prev_close: float):
+        return [{
+            'date': d,
+            'price_level': lvl,
+            'spy_prev_close': float(prev_close),
+            'hour_et': int(hour_et),
+            'calls_premium_inf_sold': float(prem_sold) if opt_type=='call' else 0.0,
+            'puts_premium_inf_sold': float(prem_sold) if opt_type=='put' else 0.0,
+        } for hour_et, prem_sold in prem_by_hour.items()]
 
     def _trades_one(d: date, lvl: int, opt_type: str, prev_close: float):
         try:
-            trades = _with_retry(get_polygon_option_trades, attempts=retries, backoff=backoff)(ticker, d, float(lvl), opt_type, d, d)
+            trades = get_polygon_option_trades(ticker, d, float(lvl), opt_type, d, d, retries=retries)
             if trades is None or trades.empty:
                 return []
-            quotes = _with_retry(get_polygon_option_quotes, attempts=retries, backoff=backoff)(ticker, d, float(lvl), opt_type, d, d)
-            tdf = trades.copy()
-            qdf = quotes.copy() if (quotes is not None and not quotes.empty) else pd.DataFrame(columns=['timestamp','bid','ask'])
-            tdf['ts'] = pd.to_datetime(tdf['timestamp'])
-            qdf['ts'] = pd.to_datetime(qdf.get('timestamp', pd.Series([], dtype='datetime64[ns]')))
-            tdf = tdf.sort_values('ts')
-            qdf = qdf.sort_values('ts')
-            merged = pd.merge_asof(tdf, qdf[['ts','bid','ask']], on='ts', direction='backward', tolerance=pd.Timedelta('5min'))
-            price = merged['price'].astype(float)
-            bid = merged.get('bid', pd.Series(np.nan))
-            ask = merged.get('ask', pd.Series(np.nan))
-            buyer = price >= (ask.astype(float).fillna(np.inf) - 1e-6)
-            mid = (bid.astype(float).fillna(0.0) + ask.astype(float).fillna(0.0)) / 2.0
-            buyer = buyer | (price > (mid + 1e-6))
-            prem = price * merged['size'].astype(float) * 100.0
-            merged['hour_et'] = merged['ts'].dt.tz_convert(ET).dt.hour
-            try:
-                sh = int(start_hour_et); eh = int(end_hour_et)
-                if sh <= eh:
-                    merged = merged[(merged['hour_et'] >= sh) & (merged['hour_et'] <= eh)]
-            except Exception:
-                pass
-            grp = merged.groupby('hour_et').apply(lambda g: float(prem[g.index][buyer[g.index]].sum()))
-            out = []
-            for hour_et, prem_sold in grp.items():
-                out.append({
-                    'date': d,
-                    'price_level': lvl,
-                    'spy_prev_close': float(prev_close),
-                    'hour_et': int(hour_et),
-                    'calls_premium_inf_sold': float(prem_sold) if opt_type=='call' else 0.0,
-                    'puts_premium_inf_sold': float(prem_sold) if opt_type=='put' else 0.0,
-                })
-            return out
+            clf = PremiumClassifier(trades, **hours)
+            for batch in iter_polygon_option_quotes(ticker, d, float(lvl), opt_type, d, d, batch_rows=batch_rows, retries=retries):
+                clf.add_quotes(batch)
+            return _premium_rows(clf.finish(), d, lvl, opt_type, prev_close)
         except Exception as e:
             logger.warning("trades/quotes fetch failed for %s %s %s: %s", d, lvl, opt_type, e)
             return []
 
+    async def _trades_all_async():
+        async with AsyncPolygonClient(concurrency=concurrency) as client:
+            async def _one(d: date, lvl: int, opt_type: str, prev_close: float):
+                try:
+                    trades = await async_option_trades(client, ticker, d, float(lvl), opt_type, d, d, retries=retries)
+                    if trades is None or trades.empty:
+                        return []
+                    clf = PremiumClassifier(trades, **hours)
+                    async for batch in async_iter_option_quotes(client, ticker, d, float(lvl), opt_type, d, d, batch_rows=batch_rows, retries=retries):
+                        clf.add_quotes(batch)
+                    return _premium_rows(clf.finish(), d, lvl, opt_type, prev_close)
+                except Exception as e:
+                    logger.warning("trades/quotes fetch failed for %s %s %s: %s", d, lvl, opt_type, e)
+                    return []
+            return await asyncio.gather(*[_one(*t) for t in tasks2])
+
     tasks2 = []
     for d, prev_close in prev_by_date.items():
         anchor = int(np.round(prev_close))
@@ -358,7 +281,10 @@ def fetch_0dte_trades_premium_inferred(
         for lvl in price_levels:
             for opt_type in ("call","put"):
                 tasks2.append((d, lvl, opt_type, prev_close))
-    if tasks2:
+    if tasks2 and _resolve_engine(engine) == "async":
+        for rows in run_async(_trades_all_async()):
+            records.extend(rows)
+    elif tasks2:
         with ThreadPoolExecutor(max_workers=max(1, int(workers))) as ex:
             futs = [ex.submit(_trades_one, d, lvl, t, pv) for (d, lvl, t, pv) in tasks2]
             for fut in as_completed(futs):
@@ -412,12 +338,136 @@ def build_matrix(
     features_config: dict | None = None,
     indicator_set_path: str | None = None,
     label_config: dict | None = None,
+    fetch_engine: str | None = None,
+    incremental: bool = False,
+    latest_only: bool = False,
 ) -> str:
+    """Build the 0DTE training matrix for [start_date, end_date] and write it to `out_csv`.
+
+    incremental=True keeps the rows already stored in `out_csv` and only builds the sessions
+    missing before/after them (plus an indicator warm-up lookback, and the last stored session,
+    which may be partial), then merges them in. latest_only=True is for scoring the last rows:
+    the start moves up to end_date minus the indicator set's lookback (see features.lookback).
+    """
+    if latest_only:
+        start_date = latest_window_start(_load_set(indicator_set_path), start_date, end_date)
     sd = datetime.strptime(start_date, "%Y-%m-%d").date()
     ed = datetime.strptime(end_date, "%Y-%m-%d").date()
+    build_kwargs = dict(
+        make_real_labels=make_real_labels,
+        k_sigma=k_sigma,
+        fixed_bp=fixed_bp,
+        distance_max=distance_max,
+        dump_raw=dump_raw,
+        raw_out=raw_out,
+        ticker=ticker,
+        features_config=features_config,
+        indicator_set_path=indicator_set_path,
+        label_config=label_config,
+        fetch_engine=fetch_engine,
+        out_csv=out_csv,
+    )
+    if incremental and matrix_exists(out_csv):
+        return _build_matrix_incremental(sd, ed, **build_kwargs)
+
+    m = _build_matrix_frame(sd, ed, **build_kwargs)
+    write_matrix(m, out_csv, lineage=_matrix_lineage(**build_kwargs))
+    logger.info("Saved training matrix to %s (%s rows)", out_csv, len(m))
+    return out_csv
+
+
+def _matrix_lineage(*, ticker: str, indicator_set_path: str | None, features_config: dict | None, label_config: dict | None,
+                    make_real_labels: bool, k_sigma: float, fixed_bp: float | None, distance_max: int, **_) -> dict:
+    """Hashes of the inputs that shape a matrix, stored in its metadata sidecar."""
+    return {
+        "ticker": ticker,
+        "indicator_set_path": indicator_set_path,
+        "indicator_set_sha1": file_sha1(indicator_set_path),
+        "features_config_sha1": config_sha1(features_config),
+        "label_config_sha1": config_sha1(label_config),
+        "labels": {"real": bool(make_real_labels), "k_sigma": k_sigma, "fixed_bp": fixed_bp},
+        "distance_max": distance_max,
+    }
+
+
+def _load_set(indicator_set_path: str | None):
+    if not indicator_set_path:
+        return None
+    try:
+        return load_indicator_set(indicator_set_path)
+    except Exception:
+        return None
+
+
+def _matrix_warmup_days(indicator_set) -> int:
+    """Calendar days of history to rebuild ahead of the first new session so indicators are warm."""
+    return warmup_days(indicator_set)
+
+
+def _build_matrix_incremental(sd: date, ed: date, *, out_csv: str, **kwargs) -> str:
+    existing = read_matrix(out_csv)
+    if existing.empty or not {"date", "hour_et"}.issubset(existing.columns):
+        m = _build_matrix_frame(sd, ed, out_csv=out_csv, **kwargs)
+        write_matrix(m, out_csv, lineage=_matrix_lineage(**kwargs))
+        return out_csv
+    existing["date"] = existing["date"].astype(str)
+    first = date.fromisoformat(existing["date"].min())
+    last = date.fromisoformat(existing["date"].max())
+    # Only gaps before the first / after the last stored session are filled; interior gaps are
+    # market holidays or sessions with no data (a full rebuild refills those).
+    head = [d for d in _daterange(sd, min(ed, first - timedelta(days=1))) if d.weekday() < 5]
+    tail = [d for d in _daterange(max(sd, last + timedelta(days=1)), ed) if d.weekday() < 5]
+    if not head and not tail:
+        logger.info("Incremental build: %s already covers %s..%s; nothing to do", out_csv, sd, ed)
+        return out_csv
+
+    warmup = timedelta(days=_matrix_warmup_days(_load_set(kwargs.get("indicator_set_path"))))
+    # (fetch_from, fetch_to, keep_from, keep_to) as ISO dates. The tail window also rebuilds the
+    # last stored session, which may be partial (intraday build) or carry a stale next-hour label;
+    # the head window runs into the first stored session so its last next-hour label is correct.
+    windows = []
+    if head:
+        windows.append((head[0] - warmup, first if ed >= first else ed, head[0].isoformat(), head[-1].isoformat()))
+    if tail:
+        windows.append((last - warmup, ed, last.isoformat(), ed.isoformat()))
+    parts = []
+    for fetch_from, fetch_to, keep_from, keep_to in windows:
+        logger.info("Incremental build: rebuilding %s..%s (warm-up from %s)", keep_from, keep_to, fetch_from)
+        part = _build_matrix_frame(fetch_from, fetch_to, out_csv=out_csv, **kwargs)
+        part["date"] = part["date"].astype(str)
+        parts.append(part[(part["date"] >= keep_from) & (part["date"] <= keep_to)])
+    new = pd.concat(parts, ignore_index=True, sort=False)
+    keys = set(zip(new["date"], new["hour_et"].astype(int)))
+    keep = existing[[(d, int(h)) not in keys for d, h in zip(existing["date"], existing["hour_et"])]]
+    cols = list(existing.columns) + [c for c in new.columns if c not in existing.columns]
+    m = pd.concat([keep, new], ignore_index=True, sort=False).reindex(columns=cols)
+    m = m.sort_values(["date", "hour_et"]).reset_index(drop=True)
+    write_matrix(m, out_csv, lineage=_matrix_lineage(**kwargs))
+    logger.info("Incremental build: wrote %s new/refreshed rows to %s (%s total)", len(new), out_csv, len(m))
+    return out_csv
 
+
+def _build_matrix_frame(
+    sd: date,
+    ed: date,
+    *,
+    out_csv: str,
+    make_real_labels: bool = False,
+    k_sigma: float = 0.3,
+    fixed_bp: float | None = None,
+    distance_max: int = 7,
+    dump_raw: bool = False,
+    raw_out: str | None = None,
+    ticker: str = "SPY",
+    features_config: dict | None = None,
+    indicator_set_path: str | None = None,
+    label_config: dict | None = None,
+    fetch_engine: str | None = None,
+) -> pd.DataFrame:
+    start_date = sd.strftime("%Y-%m-%d")
+    end_date = ed.strftime("%Y-%m-%d")
     logger.info("Fetching 0DTE flow for %s %s -> %s using Polygon keys from .env", ticker, sd, ed)
-    raw = fetch_0dte_flow(sd, ed, ticker=ticker, distance_max=distance_max)
+    raw = fetch_0dte_flow(sd, ed, ticker=ticker, distance_max=distance_max, engine=fetch_engine)
     if raw.empty:
         raise RuntimeError(f"No 0DTE flow data collected for {ticker} from {sd} to {ed}. Halting matrix build. Check API key and data availability.")
     if dump_raw:
@@ -447,7 +497,7 @@ def build_matrix(
             win = (features_config.get('dealer', {}) or {}).get('sold_premium_inferred_window', {})
             sh = int(win.get('start', 9))
             eh = int(win.get('end', 14))
-            inferred = fetch_0dte_trades_premium_inferred(sd, ed, ticker=ticker, distance_max=distance_max, start_hour_et=sh, end_hour_et=eh)
+            inferred = fetch_0dte_trades_premium_inferred(sd, ed, ticker=ticker, distance_max=distance_max, start_hour_et=sh, end_hour_et=eh, engine=fetch_engine)
             if not inferred.empty:
                 feats = pd.merge(feats, inferred, on=['date','price_level','spy_prev_close','hour_et'], how='left')
         except Exception as e:
@@ -528,7 +578,11 @@ def build_matrix(
                     max_pain_strike = float(oi.sort_values("oi_total", ascending=False).head(1)["strike"].values[0])
                     m["distance_to_max_pain"] = np.abs(np.round(m["spy_prev_close"].astype(float)) - max_pain_strike)
                     # Concentration: Herfindahl over a window around anchor
-                    anchor = int(np.round(float(m.get("spy_prev_close", pd.Series([0])).iloc[0] or 0)))
+                    # Anchor for the snapshot's expiry (sd) from the shared, memoized anchor service
+                    prev_sd = prev_close_anchor(ticker, sd)
+                    if prev_sd is None:
+                        prev_sd = float(m.get("spy_prev_close", pd.Series([0])).iloc[0] or 0)
+                    anchor = int(np.round(float(prev_sd)))
                     window = [s for s in strikes if abs(s - anchor) <= win]
                     sub = oi[oi["strike"].isin(window)].copy()
                     w = sub["oi_total"].astype(float)
@@ -568,8 +622,4 @@ def build_matrix(
                 m = label_next_hour_direction(m, k_sigma=k_sigma, fixed_bp=fixed_bp)
         else:
             m = label_next_hour_direction(m, k_sigma=k_sigma, fixed_bp=fixed_bp)
-
-    Path(out_csv).parent.mkdir(parents=True, exist_ok=True)
-    m.to_csv(out_csv, index=False)
-    logger.info("Saved training matrix to %s (%s rows)", out_csv, len(m))
-    return out_csv
+    return m
@@ -0,0 +1,189 @@
+"""Training matrix storage: a typed columnar file plus a JSON sidecar next to the matrix CSV path.
+
+`write_matrix(df, out_csv)` writes `<stem>.parquet` (SIGMA_MATRIX_FORMAT=parquet, the default;
+`feather` or `csv` also accepted) and `<stem>.meta.json` with the schema, row count, date range and
+lineage hashes, and still writes the CSV unless SIGMA_MATRIX_WRITE_CSV=0. Callers keep passing the
+CSV path around: `read_matrix(path, columns=...)` loads the columnar file when it is at least as new
+as the CSV and reads only the requested columns (memory-mapped); otherwise it falls back to CSV.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except Exception:  # pragma: no cover - optional dependency
+    pa = None
+    feather = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+_COLUMNAR = ("parquet", "feather")
+
+
+def matrix_format() -> str:
+    fmt = os.getenv("SIGMA_MATRIX_FORMAT", "parquet").strip().lower()
+    if fmt not in _COLUMNAR or pa is None:
+        return "csv"
+    return fmt
+
+
+def matrix_paths(path: str | Path) -> Dict[str, Path]:
+    """Sibling files for a matrix path (any of .csv/.parquet/.feather)."""
+    p = Path(path)
+    base = p.with_suffix("") if p.suffix in (".csv", ".parquet", ".feather") else p
+    return {
+        "csv": base.with_suffix(".csv"),
+        "parquet": base.with_suffix(".parquet"),
+        "feather": base.with_suffix(".feather"),
+        "meta": base.with_name(base.name + ".meta.json"),
+    }
+
+
+def file_sha1(path: Optional[str | Path]) -> Optional[str]:
+    try:
+        if not path or not Path(path).exists():
+            return None
+        return hashlib.sha1(Path(path).read_bytes()).hexdigest()
+    except Exception:
+        return None
+
+
+def config_sha1(obj: Any) -> Optional[str]:
+    if obj is None:
+        return None
+    try:
+        return hashlib.sha1(json.dumps(obj, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    except Exception:
+        return None
+
+
+def _write_columnar(df: pd.DataFrame, dest: Path, fmt: str) -> None:
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    tmp = dest.with_name(dest.name + ".tmp")
+    if fmt == "parquet":
+        pq.write_table(table, tmp)
+    else:
+        feather.write_feather(table, tmp, compression="uncompressed")  # uncompressed = zero-copy memory map
+    os.replace(tmp, dest)
+
+
+def _date_range(df: pd.DataFrame) -> Optional[List[str]]:
+    if "date" not in df.columns or df.empty:
+        return None
+    try:
+        d = df["date"].dropna().astype(str)
+        return [str(d.min()), str(d.max())] if len(d) else None
+    except Exception:
+        return None
+
+
+def write_matrix(df: pd.DataFrame, out_csv: str | Path, *, lineage: Optional[Dict[str, Any]] = None, fmt: Optional[str] = None) -> str:
+    """Persist a matrix (columnar file + sidecar, and CSV unless disabled); returns out_csv."""
+    paths = matrix_paths(out_csv)
+    paths["csv"].parent.mkdir(parents=True, exist_ok=True)
+    fmt = fmt or matrix_format()
+    want_csv = os.getenv("SIGMA_MATRIX_WRITE_CSV", "1") not in ("0", "false", "False")
+    # CSV first, columnar file last: readers prefer the columnar file only while it is the newer one
+    if want_csv:
+        df.to_csv(paths["csv"], index=False)
+    written = None
+    if fmt in _COLUMNAR and pa is not None:
+        try:
+            _write_columnar(df, paths[fmt], fmt)
+            written = fmt
+        except Exception as e:
+            # Mixed-type object columns cannot be typed; CSV still works for those
+            logger.warning("columnar matrix write failed (%s); keeping CSV only", e)
+    # A columnar file of the other/unused format would be stale now
+    for other in _COLUMNAR:
+        if other != written and paths[other].exists():
+            paths[other].unlink()
+    write_csv = want_csv or written is None
+    if write_csv and not want_csv:
+        df.to_csv(paths["csv"], index=False)
+    elif not write_csv and paths["csv"].exists():
+        paths["csv"].unlink()
+    meta = {
+        "format": written or "csv",
+        "file": paths[written].name if written else paths["csv"].name,
+        "csv": bool(write_csv),
+        "rows": int(len(df)),
+        "columns": [{"name": str(c), "dtype": str(t)} for c, t in df.dtypes.items()],
+        "date_range": _date_range(df),
+        "lineage": lineage or {},
+        "written_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+    }
+    paths["meta"].write_text(json.dumps(meta, indent=2, default=str), encoding="utf-8")
+    return str(out_csv)
+
+
+def _source(path: str | Path) -> tuple[str, Path]:
+    p = Path(path)
+    if p.suffix in (".parquet", ".feather"):
+        return p.suffix[1:], p
+    paths = matrix_paths(p)
+    csv_mtime = paths["csv"].stat().st_mtime_ns if paths["csv"].exists() else None
+    if pa is not None:
+        for fmt in _COLUMNAR:
+            f = paths[fmt]
+            # A CSV edited/rewritten after the columnar file wins
+            if f.exists() and (csv_mtime is None or f.stat().st_mtime_ns >= csv_mtime):
+                return fmt, f
+    return "csv", paths["csv"]
+
+
+def _to_pandas(table) -> pd.DataFrame:
+    # Calendar dates come back as ISO strings, exactly as readers got them from the CSV
+    for i, field in enumerate(table.schema):
+        if pa.types.is_date(field.type):
+            table = table.set_column(i, field.name, table.column(i).cast(pa.string()))
+    return table.to_pandas()
+
+
+def matrix_exists(path: str | Path) -> bool:
+    return _source(path)[1].exists()
+
+
+def read_matrix_meta(path: str | Path) -> Optional[Dict[str, Any]]:
+    try:
+        return json.loads(matrix_paths(path)["meta"].read_text(encoding="utf-8"))
+    except Exception:
+        return None
+
+
+def matrix_columns(path: str | Path) -> List[str]:
+    """Column names without loading any rows."""
+    fmt, src = _source(path)
+    if fmt == "parquet":
+        return list(pq.read_schema(src).names)
+    if fmt == "feather":
+        with pa.memory_map(str(src)) as f:
+            return list(pa.ipc.open_file(f).schema.names)
+    return list(pd.read_csv(src, nrows=0).columns)
+
+
+def read_matrix(path: str | Path, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """Load a matrix, projecting `columns` (missing names are skipped) when given."""
+    fmt, src = _source(path)
+    want = None
+    if columns is not None:
+        avail = set(matrix_columns(src))
+        want = list(dict.fromkeys(c for c in columns if c in avail))
+    if fmt in _COLUMNAR:
+        reader = pq.read_table if fmt == "parquet" else feather.read_table
+        return _to_pandas(reader(src, columns=want, memory_map=True))
+    if want is None:
+        return pd.read_csv(src)
+    return pd.read_csv(src, usecols=want)[want]
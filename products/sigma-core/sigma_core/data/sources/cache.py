@@ -0,0 +1,423 @@
+"""Pluggable on-disk cache for Polygon fetchers.
+
+Backends:
+- ``json``: legacy row-oriented files (one JSON file per contract/day under ``data_cache/``).
+- ``parquet`` / ``arrow``: typed columnar files (Parquet or Arrow IPC) with timestamps stored as
+  int64 epoch nanoseconds, partitioned as ``<root>/<format>/<underlying>/<dataset>/<date>/<key>.<ext>``.
+
+Select with ``POLYGON_CACHE_BACKEND`` (json|parquet|arrow). Defaults to parquet when pyarrow is
+installed, json otherwise. Columnar backends fall back to a legacy JSON file when the columnar
+file is missing and upgrade it in place, so existing caches keep working without a migration;
+``migrate_json_cache`` converts a whole cache directory in one pass.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import threading
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Iterator, Optional, Tuple, Union
+
+import pandas as pd
+
+try:  # optional dependency for columnar backends
+    import pyarrow as pa  # type: ignore
+    import pyarrow.feather as pa_feather  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+except Exception:  # pragma: no cover
+    pa = None
+    pa_feather = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+DayLike = Union[date, str]
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    legacy_subdir: str = ""
+    ts_col: Optional[str] = None
+    tz: str = "UTC"
+    cache_empty: bool = True
+
+
+DATASETS: Dict[str, DatasetSpec] = {
+    "aggs": DatasetSpec(legacy_subdir="", ts_col="timestamp", tz="US/Eastern", cache_empty=False),
+    "trades": DatasetSpec(legacy_subdir="trades", ts_col="timestamp", tz="US/Eastern"),
+    "quotes": DatasetSpec(legacy_subdir="quotes", ts_col="timestamp", tz="US/Eastern"),
+    "snapshot": DatasetSpec(legacy_subdir="snapshot"),
+    "hour": DatasetSpec(legacy_subdir="", ts_col="date", tz="UTC", cache_empty=False),
+}
+
+
+def _day_str(day: DayLike) -> str:
+    return day.isoformat() if isinstance(day, date) else str(day)
+
+
+def _spec(dataset: str) -> DatasetSpec:
+    try:
+        return DATASETS[dataset]
+    except KeyError:
+        raise ValueError(f"Unknown cache dataset: {dataset}")
+
+
+def _atomic_write(path: str, write_fn) -> None:
+    """Write via a temp file + rename so concurrent readers never see partial files."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        write_fn(tmp)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            try:
+                os.remove(tmp)
+            except Exception:
+                pass
+
+
+class CacheBackend:
+    """Interface: load/store a DataFrame for (dataset, underlying, day, key)."""
+
+    name = "base"
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def path_for(self, dataset: str, *, underlying: str, day: DayLike, key: str) -> str:
+        raise NotImplementedError
+
+    def load(self, dataset: str, *, underlying: str, day: DayLike, key: str) -> Optional[pd.DataFrame]:
+        raise NotImplementedError
+
+    def store(self, dataset: str, df: pd.DataFrame, *, underlying: str, day: DayLike, key: str) -> None:
+        raise NotImplementedError
+
+    def load_batches(self, dataset: str, *, batch_rows: int, underlying: str, day: DayLike, key: str) -> Optional[Iterator[pd.DataFrame]]:
+        """Cached frame as an iterator of row batches (None on miss). Default: load, then slice."""
+        df = self.load(dataset, underlying=underlying, day=day, key=key)
+        if df is None:
+            return None
+        n = max(1, int(batch_rows))
+        return (df.iloc[i:i + n] for i in range(0, max(len(df), 1), n))
+
+    def writer(self, dataset: str, *, underlying: str, day: DayLike, key: str) -> "CacheWriter":
+        """Incremental writer for a frame produced in batches; nothing is visible until commit()."""
+        return CacheWriter(self, dataset, dict(underlying=underlying, day=day, key=key))
+
+
+class CacheWriter:
+    """Buffers batches and stores them on commit (backends may stream to disk instead)."""
+
+    def __init__(self, backend: CacheBackend, dataset: str, ref: dict):
+        self.backend = backend
+        self.dataset = dataset
+        self.ref = ref
+        self._frames: list = []
+
+    def write(self, df: pd.DataFrame) -> None:
+        self._frames.append(df)
+
+    def commit(self) -> None:
+        df = pd.concat(self._frames, ignore_index=True) if self._frames else pd.DataFrame()
+        self._frames = []
+        self.backend.store(self.dataset, df, **self.ref)
+
+    def abort(self) -> None:
+        self._frames = []
+
+
+class JsonCacheBackend(CacheBackend):
+    """Legacy layout: ``<root>/[<subdir>/]<key>.json`` with row-oriented records."""
+
+    name = "json"
+
+    def path_for(self, dataset: str, *, underlying: str = "", day: DayLike = "", key: str) -> str:
+        sub = _spec(dataset).legacy_subdir
+        return os.path.join(self.root, sub, f"{key}.json") if sub else os.path.join(self.root, f"{key}.json")
+
+    def load(self, dataset: str, *, underlying: str = "", day: DayLike = "", key: str) -> Optional[pd.DataFrame]:
+        spec = _spec(dataset)
+        path = self.path_for(dataset, key=key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r") as f:
+                df = pd.DataFrame(json.load(f))
+        except Exception:
+            # Corrupt/partial file: drop it so the next call refetches
+            try:
+                os.remove(path)
+            except Exception:
+                pass
+            return None
+        if df.empty and not spec.cache_empty:
+            try:
+                os.remove(path)
+            except Exception:
+                pass
+            return None
+        if spec.ts_col and spec.ts_col in df.columns:
+            df[spec.ts_col] = pd.to_datetime(df[spec.ts_col], utc=True).dt.tz_convert(spec.tz)
+        return df
+
+    def store(self, dataset: str, df: pd.DataFrame, *, underlying: str = "", day: DayLike = "", key: str) -> None:
+        path = self.path_for(dataset, key=key)
+
+        def _write(tmp: str) -> None:
+            with open(tmp, "w") as f:
+                json.dump(df.to_dict(orient="records"), f, default=str)
+
+        try:
+            _atomic_write(path, _write)
+        except Exception:
+            pass
+
+
+class ColumnarCacheBackend(CacheBackend):
+    """Parquet / Arrow IPC layout partitioned by underlying, dataset and date."""
+
+    def __init__(self, root: str, fmt: str = "parquet"):
+        if pa is None:
+            raise RuntimeError("pyarrow is not installed; install it or set POLYGON_CACHE_BACKEND=json")
+        if fmt not in ("parquet", "arrow"):
+            raise ValueError(f"Unsupported columnar format: {fmt}")
+        super().__init__(root)
+        self.fmt = fmt
+        self.name = fmt
+        self.ext = "parquet" if fmt == "parquet" else "arrow"
+        self.legacy = JsonCacheBackend(root)
+
+    def path_for(self, dataset: str, *, underlying: str, day: DayLike, key: str) -> str:
+        _spec(dataset)
+        return os.path.join(self.root, self.fmt, str(underlying).upper(), dataset, _day_str(day), f"{key}.{self.ext}")
+
+    def _read(self, path: str) -> pd.DataFrame:
+        if self.fmt == "parquet":
+            table = pq.read_table(path)
+        else:
+            table = pa_feather.read_table(path, memory_map=True)
+        return table.to_pandas()
+
+    def load(self, dataset: str, *, underlying: str, day: DayLike, key: str) -> Optional[pd.DataFrame]:
+        spec = _spec(dataset)
+        path = self.path_for(dataset, underlying=underlying, day=day, key=key)
+        if os.path.exists(path):
+            try:
+                df = self._read(path)
+            except Exception:
+                try:
+                    os.remove(path)
+                except Exception:
+                    pass
+                return None
+            if df.empty and not spec.cache_empty:
+                return None
+            if spec.ts_col and spec.ts_col in df.columns:
+                df[spec.ts_col] = pd.to_datetime(df[spec.ts_col].astype("int64"), unit="ns", utc=True).dt.tz_convert(spec.tz)
+            return df
+        # Legacy JSON fallback; upgrade in place so the next hit is columnar
+        df = self.legacy.load(dataset, key=key)
+        if df is not None:
+            self.store(dataset, df, underlying=underlying, day=day, key=key)
+        return df
+
+    def store(self, dataset: str, df: pd.DataFrame, *, underlying: str, day: DayLike, key: str) -> None:
+        spec = _spec(dataset)
+        path = self.path_for(dataset, underlying=underlying, day=day, key=key)
+        try:
+            out = df.reset_index(drop=True)
+            if spec.ts_col and spec.ts_col in out.columns:
+                out = out.copy()
+                out[spec.ts_col] = pd.to_datetime(out[spec.ts_col], utc=True).astype("int64")
+            table = pa.Table.from_pandas(out, preserve_index=False)
+            if self.fmt == "parquet":
+                _atomic_write(path, lambda tmp: pq.write_table(table, tmp))
+            else:
+                _atomic_write(path, lambda tmp: pa_feather.write_feather(table, tmp))
+        except Exception as e:
+            logger.warning("cache store failed for %s: %s", path, e)
+
+    def load_batches(self, dataset: str, *, batch_rows: int, underlying: str, day: DayLike, key: str) -> Optional[Iterator[pd.DataFrame]]:
+        path = self.path_for(dataset, underlying=underlying, day=day, key=key)
+        if self.fmt != "parquet" or not os.path.exists(path):
+            return super().load_batches(dataset, batch_rows=batch_rows, underlying=underlying, day=day, key=key)
+        spec = _spec(dataset)
+        try:
+            pf = pq.ParquetFile(path)
+        except Exception:
+            return super().load_batches(dataset, batch_rows=batch_rows, underlying=underlying, day=day, key=key)
+
+        def _iter():
+            for rb in pf.iter_batches(batch_size=max(1, int(batch_rows))):
+                df = rb.to_pandas()
+                if spec.ts_col and spec.ts_col in df.columns:
+                    df[spec.ts_col] = pd.to_datetime(df[spec.ts_col].astype("int64"), unit="ns", utc=True).dt.tz_convert(spec.tz)
+                yield df
+        return _iter()
+
+    def writer(self, dataset: str, *, underlying: str, day: DayLike, key: str) -> "CacheWriter":
+        return ColumnarCacheWriter(self, dataset, dict(underlying=underlying, day=day, key=key))
+
+
+class ColumnarCacheWriter(CacheWriter):
+    """Streams batches into a temp Parquet/Arrow file that is renamed into place on commit."""
+
+    def __init__(self, backend: ColumnarCacheBackend, dataset: str, ref: dict):
+        super().__init__(backend, dataset, ref)
+        self.path = backend.path_for(dataset, **ref)
+        self.tmp = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        self._sink = None
+        self._schema = None
+
+    def write(self, df: pd.DataFrame) -> None:
+        spec = _spec(self.dataset)
+        out = df.reset_index(drop=True)
+        if spec.ts_col and spec.ts_col in out.columns:
+            out = out.copy()
+            out[spec.ts_col] = pd.to_datetime(out[spec.ts_col], utc=True).astype("int64")
+        table = pa.Table.from_pandas(out, preserve_index=False)
+        if self._sink is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._schema = table.schema
+            if self.backend.fmt == "parquet":
+                self._sink = pq.ParquetWriter(self.tmp, self._schema)
+            else:
+                self._sink = pa.ipc.new_file(self.tmp, self._schema)
+        else:
+            table = table.cast(self._schema)
+        self._sink.write_table(table)
+
+    def commit(self) -> None:
+        if self._sink is None:
+            self.backend.store(self.dataset, pd.DataFrame(), **self.ref)
+            return
+        try:
+            self._sink.close()
+            self._sink = None
+            os.replace(self.tmp, self.path)
+        except Exception as e:
+            logger.warning("cache store failed for %s: %s", self.path, e)
+            self.abort()
+
+    def abort(self) -> None:
+        try:
+            if self._sink is not None:
+                self._sink.close()
+        except Exception:
+            pass
+        self._sink = None
+        if os.path.exists(self.tmp):
+            try:
+                os.remove(self.tmp)
+            except Exception:
+                pass
+
+
+_BACKENDS: Dict[Tuple[str, str], CacheBackend] = {}
+_BACKENDS_LOCK = threading.Lock()
+
+
+def default_backend_name() -> str:
+    name = (os.getenv("POLYGON_CACHE_BACKEND") or "").strip().lower()
+    if name in ("json", "parquet", "arrow"):
+        if name != "json" and pa is None:
+            logger.warning("POLYGON_CACHE_BACKEND=%s requested but pyarrow is missing; using json", name)
+            return "json"
+        return name
+    return "parquet" if pa is not None else "json"
+
+
+def make_backend(name: str, root: str) -> CacheBackend:
+    if name == "json":
+        return JsonCacheBackend(root)
+    return ColumnarCacheBackend(root, fmt=name)
+
+
+def get_cache_backend(root: str = "data_cache", name: Optional[str] = None) -> CacheBackend:
+    """Return a shared backend instance for (name, root)."""
+    name = name or default_backend_name()
+    key = (name, os.path.abspath(root))
+    with _BACKENDS_LOCK:
+        be = _BACKENDS.get(key)
+        if be is None:
+            be = make_backend(name, root)
+            _BACKENDS[key] = be
+        return be
+
+
+# ---------------------------------------------------------------------------
+# One-shot migration of legacy JSON caches
+# ---------------------------------------------------------------------------
+
+_RE_OCC = r"O_(?P<u>[A-Z.]+)\d{6}[CP]\d{8}"
+_LEGACY_PATTERNS = [
+    ("aggs", "", re.compile(rf"^{_RE_OCC}_(?P<d>\d{{4}}-\d{{2}}-\d{{2}})$")),
+    ("trades", "trades", re.compile(rf"^{_RE_OCC}_(?P<d>\d{{4}}-\d{{2}}-\d{{2}})_\d{{4}}-\d{{2}}-\d{{2}}$")),
+    ("quotes", "quotes", re.compile(rf"^{_RE_OCC}_(?P<d>\d{{4}}-\d{{2}}-\d{{2}})_\d{{4}}-\d{{2}}-\d{{2}}$")),
+    ("snapshot", "snapshot", re.compile(r"^(?P<u>[A-Z.:]+)_(?P<d>\d{4}-\d{2}-\d{2})$")),
+    ("hour", "", re.compile(r"^(?P<u>[A-Z.:]+)_hour_(?P<d>\d{4}-\d{2}-\d{2})_\d{4}-\d{2}-\d{2}$")),
+]
+
+
+def iter_legacy_files(root: str) -> Iterator[Tuple[str, str, str, str, str]]:
+    """Yield (dataset, underlying, day, key, path) for recognised legacy JSON cache files."""
+    for dataset, sub, rx in _LEGACY_PATTERNS:
+        d = os.path.join(root, sub) if sub else root
+        if not os.path.isdir(d):
+            continue
+        for fn in sorted(os.listdir(d)):
+            if not fn.endswith(".json"):
+                continue
+            key = fn[:-5]
+            m = rx.match(key)
+            if m:
+                yield dataset, m.group("u"), m.group("d"), key, os.path.join(d, fn)
+
+
+def migrate_json_cache(root: str = "data_cache", *, backend: str = "parquet", remove: bool = False, dry_run: bool = False) -> dict:
+    """Convert every legacy JSON cache file under ``root`` into the columnar layout.
+
+    Returns counters: files, migrated, skipped (already present/empty), failed, bytes_in, bytes_out.
+    """
+    if backend == "json":
+        raise ValueError("migration target must be a columnar backend (parquet|arrow)")
+    dst = make_backend(backend, root)
+    src = JsonCacheBackend(root)
+    stats = {"files": 0, "migrated": 0, "skipped": 0, "failed": 0, "bytes_in": 0, "bytes_out": 0}
+    for dataset, underlying, day, key, path in iter_legacy_files(root):
+        stats["files"] += 1
+        out_path = dst.path_for(dataset, underlying=underlying, day=day, key=key)
+        if os.path.exists(out_path):
+            stats["skipped"] += 1
+            continue
+        try:
+            size_in = os.path.getsize(path)
+        except Exception:
+            size_in = 0
+        if dry_run:
+            stats["migrated"] += 1
+            stats["bytes_in"] += size_in
+            continue
+        try:
+            df = src.load(dataset, key=key)
+            if df is None:
+                stats["skipped"] += 1
+                continue
+            dst.store(dataset, df, underlying=underlying, day=day, key=key)
+            if not os.path.exists(out_path):
+                stats["failed"] += 1
+                continue
+            stats["migrated"] += 1
+            stats["bytes_in"] += size_in
+            stats["bytes_out"] += os.path.getsize(out_path)
+            if remove:
+                os.remove(path)
+        except Exception as e:
+            logger.warning("migration failed for %s: %s", path, e)
+            stats["failed"] += 1
+    return stats
@@ -0,0 +1,200 @@
+"""Shared HTTP client for Polygon requests.
+
+One process-wide ``requests.Session`` with keep-alive connection pooling, a token-bucket rate
+limiter sized to the API plan, and a single retry policy that honours 429/503 ``Retry-After``.
+Callers should not add their own retry loops on top of this client.
+
+Environment:
+- ``POLYGON_PLAN``: basic|starter|developer|advanced|business (default: starter)
+- ``POLYGON_RATE_LIMIT``: requests per second; overrides the plan default (0 disables limiting)
+- ``POLYGON_POOL_SIZE``: max pooled connections per host (default: 32)
+- ``POLYGON_MAX_RETRIES``: default attempts per request (default: 4)
+"""
+from __future__ import annotations
+
+import email.utils
+import logging
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# (requests per second, burst capacity). Basic is 5 calls/minute; paid plans are unmetered but
+# Polygon asks clients to stay under ~100 req/s.
+PLAN_RATE_LIMITS = {
+    "basic": (5.0 / 60.0, 5),
+    "free": (5.0 / 60.0, 5),
+    "starter": (100.0, 100),
+    "developer": (100.0, 100),
+    "advanced": (100.0, 100),
+    "business": (100.0, 100),
+}
+
+
+class TokenBucket:
+    """Thread-safe token bucket. ``rate`` tokens/sec, up to ``capacity`` banked."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = float(rate)
+        self.capacity = max(1.0, float(capacity))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token and return how long the caller must wait before using it."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1.0
+            wait = 0.0 if self._tokens >= 0 else (-self._tokens / self.rate)
+            return max(wait, self._paused_until - now)
+
+    def acquire(self) -> None:
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back all callers for ``seconds`` (e.g. after a 429)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + float(seconds))
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 4
+    backoff: float = 0.5
+    max_backoff: float = 30.0
+    retry_statuses: Tuple[int, ...] = (429, 500, 502, 503, 504)
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Seconds to wait before ``attempt + 1``; Retry-After wins over exponential backoff."""
+        ra = parse_retry_after(retry_after)
+        if ra is not None:
+            return min(ra, self.max_backoff)
+        base = min(self.max_backoff, self.backoff * (2 ** (attempt - 1)))
+        return base * (0.5 + random.random() * 0.5)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP-date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        dt = email.utils.parsedate_to_datetime(value)
+        return max(0.0, dt.timestamp() - time.time())
+    except Exception:
+        return None
+
+
+def _env_float(name: str) -> Optional[float]:
+    v = os.getenv(name)
+    if v is None or str(v).strip() == "":
+        return None
+    try:
+        return float(v)
+    except ValueError:
+        return None
+
+
+class PolygonHTTPClient:
+    """Pooled, rate-limited GET client shared by all Polygon fetchers."""
+
+    def __init__(
+        self,
+        *,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        pool_size: int = 32,
+        retry: Optional[RetryPolicy] = None,
+    ):
+        plan = (os.getenv("POLYGON_PLAN") or "starter").strip().lower()
+        plan_rate, plan_burst = PLAN_RATE_LIMITS.get(plan, PLAN_RATE_LIMITS["starter"])
+        if rate is None:
+            rate = _env_float("POLYGON_RATE_LIMIT")
+            if rate is None:
+                rate = plan_rate
+            elif burst is None:
+                burst = max(1.0, rate)
+        self.bucket = TokenBucket(rate, burst if burst is not None else plan_burst)
+        self.retry = retry or RetryPolicy()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=int(pool_size), max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get(self, url: str, *, params: Optional[dict] = None, timeout: float = 20, retries: Optional[int] = None) -> requests.Response:
+        """GET with rate limiting and retries; raises the last error once attempts are exhausted."""
+        attempts = max(1, int(retries if retries is not None else self.retry.max_attempts))
+        last_err: Optional[Exception] = None
+        for attempt in range(1, attempts + 1):
+            self.bucket.acquire()
+            retry_after = None
+            status = None
+            try:
+                r = self.session.get(url, params=params, timeout=timeout)
+                status = r.status_code
+                if status not in self.retry.retry_statuses:
+                    r.raise_for_status()
+                    return r
+                retry_after = r.headers.get("Retry-After")
+                last_err = requests.exceptions.HTTPError(f"{r.status_code} for {url}", response=r)
+            except requests.exceptions.HTTPError:
+                raise
+            except requests.exceptions.RequestException as e:
+                last_err = e
+            if attempt == attempts:
+                break
+            wait = self.retry.delay(attempt, retry_after)
+            if status == 429 or retry_after is not None:
+                # Quota exhausted: back off every worker, not just this one
+                self.bucket.pause(wait)
+            logger.debug("retrying %s in %.2fs (attempt %s/%s): %s", url, wait, attempt, attempts, last_err)
+            time.sleep(wait)
+        raise last_err  # type: ignore[misc]
+
+    def get_json(self, url: str, *, params: Optional[dict] = None, timeout: float = 20, retries: Optional[int] = None) -> dict:
+        return self.get(url, params=params, timeout=timeout, retries=retries).json() or {}
+
+
+_CLIENT: Optional[PolygonHTTPClient] = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def get_http_client() -> PolygonHTTPClient:
+    """Process-wide client (created lazily from environment)."""
+    global _CLIENT
+    with _CLIENT_LOCK:
+        if _CLIENT is None:
+            pool = int(_env_float("POLYGON_POOL_SIZE") or 32)
+            attempts = int(_env_float("POLYGON_MAX_RETRIES") or 4)
+            _CLIENT = PolygonHTTPClient(pool_size=pool, retry=RetryPolicy(max_attempts=attempts))
+        return _CLIENT
+
+
+def reset_http_client() -> None:
+    """Drop the shared client (e.g. after changing POLYGON_* env vars)."""
+    global _CLIENT
+    with _CLIENT_LOCK:
+        if _CLIENT is not None:
+            try:
+                _CLIENT.session.close()
+            except Exception:
+                pass
+        _CLIENT = None
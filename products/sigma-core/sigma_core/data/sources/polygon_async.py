@@ -0,0 +1,278 @@
+"""Asyncio fetch path for the per-contract Polygon fan-out.
+
+Opt-in alternative to the thread pool used by ``fetch_0dte_flow`` and
+``fetch_0dte_trades_premium_inferred`` (``engine="async"``). It shares the on-disk cache backend
+with the sync fetchers (warm entries never hit the network) and the token bucket / retry policy
+of the shared HTTP client, so both paths stay within the same plan quota.
+
+Requires ``aiohttp``.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+from datetime import date
+from typing import Optional
+
+import pandas as pd
+
+try:  # optional dependency
+    import aiohttp  # type: ignore
+except Exception:  # pragma: no cover
+    aiohttp = None
+
+from . import polygon as _pg
+from .http_client import get_http_client
+
+logger = logging.getLogger(__name__)
+
+
+def _api_key() -> Optional[str]:
+    return os.getenv("POLYGON_API_KEY") or os.getenv("ZE_POLYGON_API_KEY")
+
+
+class AsyncPolygonClient:
+    """aiohttp session with bounded in-flight requests; use as ``async with``."""
+
+    def __init__(self, *, concurrency: int = 64, timeout: float = 20):
+        if aiohttp is None:
+            raise RuntimeError("aiohttp is not installed; install it or use engine='threads'")
+        http = get_http_client()
+        self.bucket = http.bucket
+        self.retry = http.retry
+        self.concurrency = max(1, int(concurrency))
+        self.timeout = float(timeout)
+        self._sem: Optional[asyncio.Semaphore] = None
+        self._session = None
+
+    async def __aenter__(self) -> "AsyncPolygonClient":
+        self._sem = asyncio.Semaphore(self.concurrency)
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.concurrency),
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def get_json(self, url: str, params: Optional[dict] = None, *, retries: Optional[int] = None) -> dict:
+        """GET with the shared rate limiter and retry policy; raises once attempts are exhausted."""
+        attempts = max(1, int(retries if retries is not None else self.retry.max_attempts))
+        last_err: Optional[BaseException] = None
+        for attempt in range(1, attempts + 1):
+            wait = self.bucket.reserve()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            retry_after = None
+            status = None
+            try:
+                async with self._sem:
+                    async with self._session.get(url, params=params) as r:
+                        status = r.status
+                        if status not in self.retry.retry_statuses:
+                            r.raise_for_status()
+                            return (await r.json(content_type=None)) or {}
+                        retry_after = r.headers.get("Retry-After")
+                        last_err = RuntimeError(f"{status} for {url}")
+            except aiohttp.ClientResponseError:
+                raise
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                last_err = e
+            if attempt == attempts:
+                break
+            delay = self.retry.delay(attempt, retry_after)
+            if status == 429 or retry_after is not None:
+                self.bucket.pause(delay)
+            await asyncio.sleep(delay)
+        raise last_err  # type: ignore[misc]
+
+    async def iter_results(self, url: str, params: dict, *, retries: Optional[int] = None, max_pages: Optional[int] = None) -> list:
+        """Collect `results` across cursor pages (follows next_url / next_page_token)."""
+        out: list = []
+        async for res in self.iter_pages(url, params, retries=retries, max_pages=max_pages):
+            out.extend(res)
+        return out
+
+    async def iter_pages(self, url: str, params: dict, *, retries: Optional[int] = None, max_pages: Optional[int] = None):
+        """Async generator over each cursor page's `results` list."""
+        q = dict(params)
+        pages = 0
+        while True:
+            data = await self.get_json(url, q, retries=retries)
+            yield data.get("results") or []
+            pages += 1
+            if max_pages is not None and pages >= max_pages:
+                break
+            if data.get("next_url"):
+                url = data["next_url"]
+                q = {"apiKey": params.get("apiKey")}
+            elif data.get("next_page_token"):
+                q = dict(params)
+                q["cursor"] = data["next_page_token"]
+            else:
+                break
+
+
+async def _cache_load(dataset: str, ref: dict) -> Optional[pd.DataFrame]:
+    return await asyncio.to_thread(_pg._cache().load, dataset, **ref)
+
+
+async def _cache_store(dataset: str, df: pd.DataFrame, ref: dict) -> None:
+    await asyncio.to_thread(_pg._cache().store, dataset, df, **ref)
+
+
+async def fetch_options_aggs(
+    client: AsyncPolygonClient,
+    underlying_ticker: str,
+    expiration_date: date,
+    strike_price: float,
+    option_type: str,
+    from_date: date,
+    to_date: date,
+    *,
+    retries: int = 3,
+) -> pd.DataFrame:
+    """Async counterpart of ``get_polygon_options_aggs`` (same cache entries and frame shape)."""
+    occ = _pg._build_occ_symbol(underlying_ticker, expiration_date, strike_price, option_type)
+    is_today = (from_date == _pg._today_et()) or (to_date == _pg._today_et())
+    ref = _pg._aggs_cache_ref(underlying_ticker, occ, from_date)
+    if not is_today:
+        cached = await _cache_load("aggs", ref)
+        if cached is not None:
+            return cached
+    key = _api_key()
+    if not key:
+        raise ValueError("POLYGON_API_KEY (or ZE_POLYGON_API_KEY) environment variable not set.")
+    url, params = _pg._options_aggs_request(occ, from_date, to_date, key)
+    try:
+        data = await client.get_json(url, params, retries=retries)
+    except Exception as e:
+        logger.warning("options aggs fetch failed for %s: %s", occ, e)
+        return pd.DataFrame()
+    if not data.get("results"):
+        return pd.DataFrame()
+    df = _pg._options_aggs_frame(data["results"])
+    if (not is_today) and not df.empty:
+        await _cache_store("aggs", df, ref)
+    return df
+
+
+async def _fetch_ticks(
+    client: AsyncPolygonClient,
+    kind: str,
+    underlying_ticker: str,
+    expiration_date: date,
+    strike_price: float,
+    option_type: str,
+    from_date: date,
+    to_date: date,
+    *,
+    retries: int = 3,
+) -> pd.DataFrame:
+    occ = _pg._build_occ_symbol(underlying_ticker, expiration_date, strike_price, option_type)
+    is_today = (from_date == _pg._today_et()) or (to_date == _pg._today_et())
+    ref = _pg._ticks_cache_ref(underlying_ticker, occ, from_date, to_date)
+    if not is_today:
+        cached = await _cache_load(kind, ref)
+        if cached is not None:
+            return cached
+    key = _api_key()
+    if not key:
+        return pd.DataFrame()
+    url = f"https://api.polygon.io/v3/{kind}/options/{occ}"
+    try:
+        res = await client.iter_results(url, _pg._ticks_params(from_date, to_date, key), retries=retries)
+    except Exception as e:
+        logger.warning("%s fetch failed for %s: %s", kind, occ, e)
+        return pd.DataFrame()
+    df = pd.DataFrame(_pg._trade_rows(res) if kind == "trades" else _pg._quote_rows(res))
+    if not is_today:
+        await _cache_store(kind, df, ref)
+    return df
+
+
+async def fetch_option_trades(client: AsyncPolygonClient, *args, retries: int = 3) -> pd.DataFrame:
+    """Async counterpart of ``get_polygon_option_trades``."""
+    return await _fetch_ticks(client, "trades", *args, retries=retries)
+
+
+async def fetch_option_quotes(client: AsyncPolygonClient, *args, retries: int = 3) -> pd.DataFrame:
+    """Async counterpart of ``get_polygon_option_quotes``."""
+    return await _fetch_ticks(client, "quotes", *args, retries=retries)
+
+
+async def iter_option_quotes(
+    client: AsyncPolygonClient,
+    underlying_ticker: str,
+    expiration_date: date,
+    strike_price: float,
+    option_type: str,
+    from_date: date,
+    to_date: date,
+    *,
+    batch_rows: int = 50000,
+    retries: int = 3,
+):
+    """Async counterpart of ``iter_polygon_option_quotes`` (same cache entries and batch shape)."""
+    occ = _pg._build_occ_symbol(underlying_ticker, expiration_date, strike_price, option_type)
+    is_today = (from_date == _pg._today_et()) or (to_date == _pg._today_et())
+    ref = _pg._ticks_cache_ref(underlying_ticker, occ, from_date, to_date)
+    batch_rows = max(1, int(batch_rows))
+    if not is_today:
+        batches = await asyncio.to_thread(_pg._cache().load_batches, "quotes", batch_rows=batch_rows, **ref)
+        if batches is not None:
+            while True:
+                batch = await asyncio.to_thread(next, batches, None)
+                if batch is None:
+                    return
+                yield batch
+    key = _api_key()
+    if not key:
+        return
+    params = _pg._ticks_params(from_date, to_date, key)
+    params["limit"] = min(batch_rows, 50000)
+    writer = None if is_today else _pg._cache().writer("quotes", **ref)
+    try:
+        async for res in client.iter_pages(f"https://api.polygon.io/v3/quotes/options/{occ}", params, retries=retries):
+            page = _pg._quote_frame(res)
+            if writer is not None:
+                await asyncio.to_thread(writer.write, page)
+            yield page
+    except Exception as e:
+        logger.warning("quotes fetch failed for %s: %s", occ, e)
+        if writer is not None:
+            writer.abort()
+        return
+    except BaseException:
+        if writer is not None:
+            writer.abort()
+        raise
+    if writer is not None:
+        await asyncio.to_thread(writer.commit)
+
+
+def run_async(coro):
+    """Run ``coro`` to completion from sync code, even if this thread already runs an event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    out: dict = {}
+
+    def _runner():
+        try:
+            out["value"] = asyncio.run(coro)
+        except BaseException as e:  # surfaced to the caller below
+            out["error"] = e
+
+    t = threading.Thread(target=_runner, name="polygon-async")
+    t.start()
+    t.join()
+    if "error" in out:
+        raise out["error"]
+    return out.get("value")
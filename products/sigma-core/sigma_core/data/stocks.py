@@ -1,12 +1,29 @@
 from __future__ import annotations
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, Tuple
+
 import pandas as pd
 from .datasets import fetch_hourly_ticker
+from .matrix_io import file_sha1, write_matrix
 from ..features.loader import load_indicator_set
 from ..features.builder import FeatureBuilder
+from ..features.lookback import latest_window_start
 from ..labels.hourly_direction import label_next_hour_direction
 from ..labels.overnight import label_close_to_open_direction
 from ..labels.forward import label_forward_return_days
 
+logger = logging.getLogger(__name__)
+
+
+def _indicator_set(indicator_set_path: str | None):
+    if not indicator_set_path:
+        return None
+    try:
+        return load_indicator_set(indicator_set_path)
+    except Exception as e:
+        print(f"WARN: failed to load indicator set from {indicator_set_path}: {e}")
+        return None
 
 def build_stock_matrix(
     start_date: str,
@@ -16,23 +33,21 @@ def build_stock_matrix(
     ticker: str = "AAPL",
     indicator_set_path: str | None = None,
     label_kind: str | None = None,
+    latest_only: bool = False,
 ) -> str:
     """
     Minimal stocks-only pipeline: hourly OHLCV + indicator set + next-hour direction label.
+    latest_only=True fetches only the indicator set's lookback before end_date.
     """
+    indicator_set = _indicator_set(indicator_set_path)
+    if latest_only:
+        start_date = latest_window_start(indicator_set, start_date, end_date)
     hourly = fetch_hourly_ticker(ticker, start_date, end_date)
     if hourly.empty:
         raise RuntimeError(f"No hourly bars for {ticker} from {start_date} to {end_date}")
     df = hourly.copy()
     # Add indicator features via FeatureBuilder (no 0DTE flow)
-    indicator_set = None
-    if indicator_set_path:
-        try:
-            indicator_set = load_indicator_set(indicator_set_path)
-        except Exception as e:
-            print(f"WARN: failed to load indicator set from {indicator_set_path}: {e}")
-    fb = FeatureBuilder(distance_max=0, indicator_set=indicator_set)
-    df = fb.add_indicator_features(df)
+    df = FeatureBuilder(distance_max=0, indicator_set=indicator_set).add_indicator_features(df)
     # Labels
     try:
         kind = (label_kind or '').lower()
@@ -49,5 +64,74 @@ def build_stock_matrix(
     except Exception:
         if 'close' in df.columns:
             df['y'] = (df['close'].shift(-1) > df['close']).astype(int)
-    df.to_csv(out_csv, index=False)
+    write_matrix(df, out_csv, lineage={
+        "ticker": ticker,
+        "indicator_set_path": indicator_set_path,
+        "indicator_set_sha1": file_sha1(indicator_set_path),
+        "label_kind": label_kind,
+    })
     return out_csv
+
+
+def fetch_hourly_universe(
+    tickers: Iterable[str],
+    start_date: str,
+    end_date: str,
+    *,
+    workers: int = 8,
+) -> Tuple[pd.DataFrame, Dict[str, str]]:
+    """Hourly bars for many tickers fetched concurrently, as one long frame sorted by (ticker, time).
+
+    Returns (frame with a leading `ticker` column, {ticker: error} for tickers without bars).
+    """
+    tickers = list(dict.fromkeys(tickers))
+    frames: Dict[str, pd.DataFrame] = {}
+    errors: Dict[str, str] = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(int(workers), len(tickers) or 1))) as ex:
+        futs = {ex.submit(fetch_hourly_ticker, t, start_date, end_date): t for t in tickers}
+        for fut in as_completed(futs):
+            t = futs[fut]
+            try:
+                df = fut.result()
+                if df.empty:
+                    errors[t] = "no hourly bars"
+                else:
+                    frames[t] = df
+            except Exception as e:
+                logger.warning("hourly fetch failed for %s: %s", t, e)
+                errors[t] = str(e)
+    # Input order, each ticker's rows contiguous (required by the grouped indicator pass)
+    parts = [frames[t].assign(ticker=t) for t in tickers if t in frames]
+    if not parts:
+        return pd.DataFrame(columns=["ticker", "date", "hour_et", "open", "high", "low", "close", "volume"]), errors
+    long = pd.concat(parts, ignore_index=True)
+    return long[["ticker"] + [c for c in long.columns if c != "ticker"]], errors
+
+
+def build_stock_universe_latest(
+    tickers: Iterable[str],
+    start_date: str,
+    end_date: str,
+    *,
+    indicator_set_path: str | None = None,
+    workers: int = 8,
+    latest_only: bool = True,
+) -> Tuple[pd.DataFrame, Dict[str, str]]:
+    """Latest bar per ticker with the indicator set computed, in memory (no per-ticker matrices).
+
+    Indicators run once over the long (ticker, time) frame with per-ticker grouping, so every row
+    matches what `build_stock_matrix` computes for that ticker alone; no labels are attached.
+    latest_only (default) fetches just the set's lookback before end_date instead of the range.
+    Returns (one row per ticker in input order, {ticker: error}).
+    """
+    indicator_set = _indicator_set(indicator_set_path)
+    if latest_only:
+        start_date = latest_window_start(indicator_set, start_date, end_date)
+    long, errors = fetch_hourly_universe(tickers, start_date, end_date, workers=workers)
+    if long.empty:
+        return long, errors
+    feats = FeatureBuilder(distance_max=0, indicator_set=indicator_set).add_indicator_features(long, group_col="ticker")
+    latest = feats.groupby("ticker", sort=False).tail(1).reset_index(drop=True)
+    # Same date representation callers got from the per-ticker CSV round trip
+    latest["date"] = latest["date"].astype(str)
+    return latest, errors
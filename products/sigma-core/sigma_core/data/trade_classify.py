@@ -0,0 +1,128 @@
+"""Streaming NBBO classification of option trades into buyer-initiated premium per ET hour.
+
+`PremiumClassifier` holds one contract-day's trades (small) and consumes the quote stream batch by
+batch in timestamp order, so the quote side (millions of rows on busy 0DTE strikes) is never held
+in full. Each trade takes the last quote at or before it within `tolerance`, exactly like
+``pd.merge_asof(direction='backward')``; only the quote tail still needed by pending trades is
+kept between batches, so memory is bounded by the batch size.
+"""
+from __future__ import annotations
+
+import os
+from collections import defaultdict
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+ET = "US/Eastern"
+_EMPTY = np.empty(0, dtype=np.int64)
+
+
+def default_batch_rows() -> int:
+    """Quote rows per batch/page (SIGMA_FLOW_MAX_QUOTE_ROWS, default 50000)."""
+    try:
+        return max(1000, int(os.getenv("SIGMA_FLOW_MAX_QUOTE_ROWS", "50000")))
+    except Exception:
+        return 50000
+
+
+def _ns(ts) -> np.ndarray:
+    """Epoch nanoseconds from a timestamp column (tz-aware, naive UTC or already int)."""
+    s = pd.Series(ts)
+    if s.dtype.kind in "iu":
+        return s.to_numpy(dtype=np.int64)
+    if s.dtype.kind != "M":
+        s = pd.to_datetime(s, utc=True)
+    idx = pd.DatetimeIndex(s)
+    return (idx.tz_localize("UTC") if idx.tz is None else idx).as_unit("ns").asi8
+
+
+class PremiumClassifier:
+    """Accumulate buyer-initiated premium per ET hour for one contract-day."""
+
+    def __init__(self, trades: pd.DataFrame, *, start_hour: Optional[int] = None, end_hour: Optional[int] = None,
+                 tolerance: pd.Timedelta = pd.Timedelta("5min")):
+        ts = _ns(trades["timestamp"])
+        order = np.argsort(ts, kind="stable")
+        self.ts = ts[order]
+        self.price = pd.to_numeric(trades["price"], errors="coerce").to_numpy(dtype=float)[order]
+        self.size = pd.to_numeric(trades["size"], errors="coerce").to_numpy(dtype=float)[order]
+        self.hour = pd.DatetimeIndex(pd.to_datetime(self.ts, utc=True)).tz_convert(ET).hour.to_numpy()
+        self.start_hour = start_hour
+        self.end_hour = end_hour
+        self.tol = int(pd.Timedelta(tolerance).value)
+        self._next = 0  # first trade not yet classified
+        self._q_ts = _EMPTY
+        self._q_bid = np.empty(0)
+        self._q_ask = np.empty(0)
+        self._prem: Dict[int, float] = defaultdict(float)
+        self.quote_rows = 0
+        self.peak_buffer = 0
+
+    @property
+    def done(self) -> bool:
+        return self._next >= len(self.ts)
+
+    def add_quotes(self, quotes: pd.DataFrame) -> None:
+        """Feed the next batch of quotes (ascending time; batches must not overlap)."""
+        if quotes is None or quotes.empty:
+            return
+        ts = _ns(quotes["timestamp"])
+        order = np.argsort(ts, kind="stable")
+        self._q_ts = np.concatenate([self._q_ts, ts[order]])
+        self._q_bid = np.concatenate([self._q_bid, pd.to_numeric(quotes["bid"], errors="coerce").to_numpy(dtype=float)[order]])
+        self._q_ask = np.concatenate([self._q_ask, pd.to_numeric(quotes["ask"], errors="coerce").to_numpy(dtype=float)[order]])
+        self.quote_rows += len(ts)
+        self.peak_buffer = max(self.peak_buffer, len(self._q_ts))
+        # Trades strictly before the newest quote can no longer gain a later quote
+        self._classify(int(np.searchsorted(self.ts, self._q_ts[-1], side="left")))
+
+    def finish(self) -> Dict[int, float]:
+        """Classify remaining trades against the buffered quotes; returns {hour_et: premium_sold}."""
+        self._classify(len(self.ts))
+        return dict(sorted(self._prem.items()))
+
+    def _classify(self, stop: int) -> None:
+        lo = self._next
+        if stop > lo:
+            t = self.ts[lo:stop]
+            bid = ask = np.full(len(t), np.nan)
+            if len(self._q_ts):
+                j = np.searchsorted(self._q_ts, t, side="right") - 1
+                jj = np.maximum(j, 0)
+                hit = (j >= 0) & ((t - self._q_ts[jj]) <= self.tol)
+                bid = np.where(hit, self._q_bid[jj], np.nan)
+                ask = np.where(hit, self._q_ask[jj], np.nan)
+            price = self.price[lo:stop]
+            buyer = price >= (np.nan_to_num(ask, nan=np.inf) - 1e-6)
+            mid = (np.nan_to_num(bid, nan=0.0) + np.nan_to_num(ask, nan=0.0)) / 2.0
+            buyer |= price > (mid + 1e-6)
+            prem = np.where(buyer, price * self.size[lo:stop] * 100.0, 0.0)
+            hours = self.hour[lo:stop]
+            keep = np.ones(len(hours), dtype=bool)
+            if self.start_hour is not None and self.end_hour is not None and self.start_hour <= self.end_hour:
+                keep = (hours >= self.start_hour) & (hours <= self.end_hour)
+            for h in np.unique(hours[keep]):
+                self._prem[int(h)] += float(prem[keep & (hours == h)].sum())
+            self._next = stop
+        self._trim()
+
+    def _trim(self) -> None:
+        # Keep only the latest quote at/before the next pending trade, plus everything after it
+        if not len(self._q_ts):
+            return
+        anchor = self.ts[self._next] if not self.done else self._q_ts[-1]
+        keep_from = max(int(np.searchsorted(self._q_ts, anchor, side="right")) - 1, 0)
+        if keep_from:
+            self._q_ts = self._q_ts[keep_from:]
+            self._q_bid = self._q_bid[keep_from:]
+            self._q_ask = self._q_ask[keep_from:]
+
+
+def classify_premium(trades: pd.DataFrame, quote_batches, **kwargs) -> Tuple[Dict[int, float], PremiumClassifier]:
+    """Run a PremiumClassifier over an iterable of quote batches."""
+    clf = PremiumClassifier(trades, **kwargs)
+    for batch in quote_batches:
+        clf.add_quotes(batch)
+    return clf.finish(), clf
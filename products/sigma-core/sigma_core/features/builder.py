@@ -4,6 +4,8 @@ import logging
 from typing import List, Optional
 from ..indicators.base import Indicator
 from ..indicators.registry import get_indicator
+from ..indicators.intermediates import Intermediates
+from ..data.chains import chain_session
 from .sets import IndicatorSet
 
 
@@ -42,54 +44,137 @@ def select_features(df: pd.DataFrame) -> List[str]:
     return cols
 
 
+def _group_bounds(keys: pd.Series):
+    """(group code per row, [(start, stop)] per group) for contiguous runs of equal keys."""
+    k = keys.to_numpy()
+    change = np.ones(len(k), dtype=bool)
+    change[1:] = k[1:] != k[:-1]
+    starts = np.flatnonzero(change)
+    stops = np.append(starts[1:], len(k))
+    return np.cumsum(change) - 1, list(zip(starts.tolist(), stops.tolist()))
+
+
 class FeatureBuilder:
     def __init__(self, distance_max: int = 5, indicator_set: Optional[IndicatorSet] = None):
         self.distance_max = int(distance_max)
         self.indicator_set = indicator_set
 
     def add_base_features(self, df: pd.DataFrame) -> pd.DataFrame:
-        df = df.copy()
-        # Per-distance features for calls/puts sold
-        for d in range(-self.distance_max, self.distance_max + 1):
-            df[f"calls_sold_d{d}"] = np.where(np.round(df["price_level"] - df["spy_prev_close"]) == d, df["calls_sold"], 0.0)
-            df[f"puts_sold_d{d}"] = np.where(np.round(df["price_level"] - df["spy_prev_close"]) == d, df["puts_sold"], 0.0)
-            if "calls_premium" in df.columns:
-                df[f"calls_premium_d{d}"] = np.where(np.round(df["price_level"] - df["spy_prev_close"]) == d, df["calls_premium"], 0.0)
-            if "puts_premium" in df.columns:
-                df[f"puts_premium_d{d}"] = np.where(np.round(df["price_level"] - df["spy_prev_close"]) == d, df["puts_premium"], 0.0)
-        # Totals and ratios
-        df["calls_sold_total"] = df[[f"calls_sold_d{d}" for d in range(-self.distance_max, self.distance_max + 1)]].sum(axis=1)
-        df["puts_sold_total"] = df[[f"puts_sold_d{d}" for d in range(-self.distance_max, self.distance_max + 1)]].sum(axis=1)
-        df["pc_ratio"] = (df["puts_sold_total"] + 1e-6) / (df["calls_sold_total"] + 1e-6)
-        df["imbalance"] = df["calls_sold_total"] - df["puts_sold_total"]
+        """Per-distance call/put volume, premium and inferred-premium columns plus totals/ratios.
+
+        The distance bucket round(price_level - spy_prev_close) is computed once and every source
+        column is scattered into a single preallocated float block whose (n, n_dist, n_src) views
+        give the per-distance columns directly; no intermediate frames are concatenated.
+        """
+        dists = list(range(-self.distance_max, self.distance_max + 1))
+        n, nd = len(df), len(dists)
+        bucket = np.round(df["price_level"].to_numpy(dtype=float) - df["spy_prev_close"].to_numpy(dtype=float))
+        valid = np.isfinite(bucket) & (np.abs(bucket) <= self.distance_max)
+        rows = np.flatnonzero(valid)
+        cols_idx = (bucket[valid] + self.distance_max).astype(np.int64)
+
+        sources = ["calls_sold", "puts_sold"] + [c for c in ("calls_premium", "puts_premium") if c in df.columns]
+        inferred = ["calls_premium_inf_sold", "puts_premium_inf_sold"]
+        has_inferred = any(c in df.columns for c in inferred)
+        # Column layout (matches the historical order): per-distance block, totals/ratios, inferred block
+        columns = [f"{p}_d{d}" for d in dists for p in sources]
+        columns += ["calls_sold_total", "puts_sold_total", "pc_ratio", "imbalance"]
+        columns += [f"{p}_total" for p in sources[2:]]
+        tot0 = nd * len(sources)
+        inf0 = len(columns)
+        if has_inferred:
+            columns += [f"{p}_d{d}" for d in dists for p in inferred]
+        out = np.zeros((n, len(columns)), dtype=float)
+
+        def _scatter(start: int, srcs) -> None:
+            block = out[:, start:start + nd * len(srcs)].reshape(n, nd, len(srcs))
+            for k, src in enumerate(srcs):
+                if src in df.columns:
+                    block[rows, cols_idx, k] = df[src].to_numpy(dtype=float)[rows]
+
+        def _total(src) -> np.ndarray:
+            # Each row lands in at most one bucket, so the row total is the (NaN-safe) in-range value
+            tot = np.zeros(n, dtype=float)
+            tot[rows] = np.nan_to_num(df[src].to_numpy(dtype=float)[rows], nan=0.0)
+            return tot
+
+        _scatter(0, sources)
+        calls_total, puts_total = _total("calls_sold"), _total("puts_sold")
+        out[:, tot0] = calls_total
+        out[:, tot0 + 1] = puts_total
+        out[:, tot0 + 2] = (puts_total + 1e-6) / (calls_total + 1e-6)
+        out[:, tot0 + 3] = calls_total - puts_total
         # Premium totals if present
-        prem_calls = [c for c in df.columns if c.startswith("calls_premium_d")]
-        prem_puts = [c for c in df.columns if c.startswith("puts_premium_d")]
-        if prem_calls:
-            df["calls_premium_total"] = df[prem_calls].sum(axis=1)
-        if prem_puts:
-            df["puts_premium_total"] = df[prem_puts].sum(axis=1)
-        # Inferred (trade-level) premium per-distance if present
-        if "calls_premium_inf_sold" in df.columns or "puts_premium_inf_sold" in df.columns:
-            for d in range(-self.distance_max, self.distance_max + 1):
-                df[f"calls_premium_inf_sold_d{d}"] = np.where(df["price_level"] - df["spy_prev_close"] == d, df.get("calls_premium_inf_sold", 0.0), 0.0)
-                df[f"puts_premium_inf_sold_d{d}"] = np.where(df["price_level"] - df["spy_prev_close"] == d, df.get("puts_premium_inf_sold", 0.0), 0.0)
-        df["day_of_week"] = pd.to_datetime(df["date"]).dt.dayofweek
-        return df
+        for k, src in enumerate(sources[2:]):
+            out[:, tot0 + 4 + k] = _total(src)
+        # Inferred (trade-level) premium per-distance if present (same bucket as volume/premium)
+        if has_inferred:
+            _scatter(inf0, inferred)
 
-    def add_indicator_features(self, df: pd.DataFrame) -> pd.DataFrame:
-        df = df.copy()
-        if self.indicator_set:
-            for spec in self.indicator_set.indicators:
+        res = pd.DataFrame(out, index=df.index, columns=columns, copy=False)
+        res["day_of_week"] = pd.to_datetime(df["date"]).dt.dayofweek.to_numpy()
+        # Original columns go in front one at a time so the float block above is never copied
+        keep = [c for c in df.columns if c not in res.columns]
+        for i, c in enumerate(keep):
+            res.insert(i, c, df[c])
+        return res
+
+    def add_indicator_features(self, df: pd.DataFrame, group_col: Optional[str] = None) -> pd.DataFrame:
+        """Compute the indicator set against shared intermediates and attach outputs in one concat.
+
+        Every indicator is instantiated first so the intermediates of the whole set (true range,
+        EMAs, Wilder smoothing, ...) are planned as one DAG and each node is computed once. Outputs
+        are collected and concatenated at the end; an indicator whose declared inputs() include a
+        column produced earlier in the set triggers an early attach so it still sees that column.
+
+        `group_col` marks a long multi-ticker frame (rows of a ticker contiguous, in time order):
+        intermediates restart at every group, GROUP_SAFE indicators run once over the whole frame
+        and the rest run per group, so each row matches a single-ticker build.
+        """
+        if not self.indicator_set:
+            return df.copy()
+        log = logging.getLogger(__name__)
+        instances = []
+        for spec in self.indicator_set.indicators:
+            try:
+                indicator_class = get_indicator(spec.name)
+                params = dict(spec.params or {})
+                instances.append((spec, indicator_class(**params)))
+            except Exception:
+                log.warning("indicator compute failed: %s", getattr(spec, 'name', 'unknown'))
+        bounds = _group_bounds(df[group_col]) if group_col else None
+        shared = Intermediates(df, groups=None if bounds is None else bounds[0])
+        keys = []
+        for _, indicator in instances:
+            try:
+                keys.extend(indicator.intermediates())
+            except Exception:
+                pass
+        shared.prefetch(keys)
+
+        frame = df
+        pending: List[pd.DataFrame] = []
+        pending_cols: set = set()
+        # Options indicators share one chain snapshot per (underlying, expiry) for the whole build
+        with chain_session():
+            for spec, indicator in instances:
                 try:
-                    indicator_class = get_indicator(spec.name)
-                    params = dict(spec.params or {})
-                    indicator = indicator_class(**params)
-                    df = pd.concat([df, indicator.calculate(df)], axis=1)
+                    if pending_cols and (indicator.inputs() & pending_cols):
+                        frame = pd.concat([frame] + pending, axis=1)
+                        shared.rebind(frame)
+                        pending, pending_cols = [], set()
+                    if bounds is not None and not indicator.GROUP_SAFE:
+                        out = pd.concat([indicator.calculate(frame.iloc[a:b]) for a, b in bounds[1]])
+                    elif indicator.intermediates() or indicator.GROUP_SAFE:
+                        out = indicator.calculate(frame, shared=shared)
+                    else:
+                        out = indicator.calculate(frame)
+                    pending.append(out)
+                    pending_cols.update(out.columns)
                 except Exception:
                     # If indicator cannot be computed, skip gracefully but log
-                    logging.getLogger(__name__).warning("indicator compute failed: %s", getattr(spec, 'name', 'unknown'))
-        return df
+                    log.warning("indicator compute failed: %s", getattr(spec, 'name', 'unknown'))
+        return pd.concat([frame] + pending, axis=1)
 
     def add_dealer_orientation(self, df: pd.DataFrame) -> pd.DataFrame:
         df = df.copy()
@@ -0,0 +1,77 @@
+"""History an indicator set needs before its latest row is warm.
+
+Every Indicator reports `lookback()` (bars; None for running totals such as OBV) and
+`lookback_sessions()` (daily-bar indicators, `*_days` params). `set_lookback` takes the maximum
+over a set; `warmup_days` turns it into calendar days and `latest_window_start` into the first
+date a latest-only build has to fetch, so rescoring the last bar is bounded by the longest
+lookback instead of the requested history.
+"""
+from __future__ import annotations
+
+import logging
+import math
+from datetime import date, timedelta
+from typing import Any, Dict, Optional
+
+from ..indicators.base import LOOKBACK_ATTRS
+from ..indicators.registry import get_indicator
+
+logger = logging.getLogger(__name__)
+
+RTH_HOURS = 7  # hourly bars per regular session (09:00-15:00 ET)
+_FALLBACK_FACTOR = 3  # specs that cannot be instantiated: treat bar params as EMA spans
+
+
+def _spec_fallback(params: Dict[str, Any]) -> tuple[int, int]:
+    bars, sessions = 1, 0
+    for k, v in (params or {}).items():
+        if isinstance(v, bool) or not isinstance(v, (int, float)):
+            continue
+        if str(k).endswith("_days"):
+            sessions = max(sessions, int(v))
+        elif k in LOOKBACK_ATTRS:
+            bars = max(bars, int(v) * _FALLBACK_FACTOR + 1)
+    return bars, sessions
+
+
+def set_lookback(indicator_set) -> Dict[str, Any]:
+    """{'bars': max bar lookback, 'sessions': max session lookback, 'unbounded': [indicator names]}."""
+    bars, sessions, unbounded = 1, 0, []
+    for spec in (getattr(indicator_set, "indicators", None) or []):
+        params = dict(spec.params or {})
+        try:
+            ind = get_indicator(spec.name)(**params)
+            b, s = ind.lookback(), ind.lookback_sessions()
+        except Exception:
+            b, s = _spec_fallback(params)
+        if b is None:
+            unbounded.append(spec.name)
+        else:
+            bars = max(bars, int(b))
+        sessions = max(sessions, int(s))
+    return {"bars": bars, "sessions": sessions, "unbounded": unbounded}
+
+
+def warmup_sessions(indicator_set, bars_per_session: int = RTH_HOURS, *, lb: Optional[Dict[str, Any]] = None) -> int:
+    """Sessions of history (plus the current one) that cover every indicator's lookback."""
+    lb = lb or set_lookback(indicator_set)
+    return max(lb["sessions"], int(math.ceil(lb["bars"] / max(1, bars_per_session)))) + 1
+
+
+def warmup_days(indicator_set, bars_per_session: int = RTH_HOURS, *, lb: Optional[Dict[str, Any]] = None) -> int:
+    """Calendar days spanning `warmup_sessions` (weekends plus a small holiday allowance)."""
+    return int(math.ceil(warmup_sessions(indicator_set, bars_per_session, lb=lb) * 7 / 5)) + 3
+
+
+def latest_window_start(indicator_set, start_date: str, end_date: str, *, bars_per_session: int = RTH_HOURS) -> str:
+    """First date a latest-only build fetches: end_date minus the warm-up, never before start_date.
+
+    Running totals (unbounded lookback) are computed over that window, so their level is relative
+    to its start; everything else matches a build over the full range at the last row.
+    """
+    lb = set_lookback(indicator_set)
+    first = date.fromisoformat(str(start_date)[:10])
+    start = max(first, date.fromisoformat(str(end_date)[:10]) - timedelta(days=warmup_days(indicator_set, bars_per_session, lb=lb)))
+    if lb["unbounded"] and start > first:
+        logger.info("latest-only window from %s: %s level is relative to the window start", start, ", ".join(lb["unbounded"]))
+    return start.isoformat()
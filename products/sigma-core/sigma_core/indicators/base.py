@@ -1,14 +1,82 @@
+import math
 from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Mapping, Optional, Set
 import pandas as pd
 
+# Attributes that express a lookback in bars (or sessions for LOOKBACK_UNIT='session')
+LOOKBACK_ATTRS = (
+    "window", "period", "slow", "fast", "signal", "span", "er_period", "atr_period", "lookback",
+    "rsi_period", "stoch_period", "smooth_k", "smooth_d", "period_k", "period_d", "long", "senkou", "r", "s",
+)
+
 class Indicator(ABC):
     """
     Base class for all technical indicators.
+
+    Indicators that read shared primitives (see `indicators.intermediates`) list their keys in
+    `intermediates()` and accept `calculate(df, shared=None)`; FeatureBuilder then plans the whole
+    set once and passes the shared cache in.
+
+    Recursive indicators may also implement `init_state()` / `update(state, bar)` for bar-by-bar
+    live updates (see `indicators.incremental`).
     """
 
+    # Columns produced by other indicators that this one reads when present
+    INPUTS: tuple = ()
+    # True when calculate() only combines shared intermediates (and row-wise math), so it is
+    # exact on a multi-ticker frame whose intermediates are grouped (see FeatureBuilder)
+    GROUP_SAFE: bool = False
+    # Multiple of the longest lookback attribute the latest value needs: 1 for plain windows, more
+    # for recursive smoothing whose start-up error decays geometrically (EMA ~3x span, Wilder ~7x)
+    WARMUP_FACTOR: float = 3.0
+    # 'bar' when lookback attributes count the frame's bars, 'session' when the indicator pulls
+    # its own daily bars for the frame's date range
+    LOOKBACK_UNIT: str = "bar"
+
     @abstractmethod
     def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Calculates the indicator and returns a DataFrame with the results.
         """
         pass
+
+    def intermediates(self) -> List[tuple]:
+        """Shared intermediate keys read by `calculate` (empty for self-contained indicators)."""
+        return []
+
+    def inputs(self) -> Set[str]:
+        """Frame columns read by `calculate` that an earlier indicator in the set may produce."""
+        cols = set(self.INPUTS)
+        # Source-column params: `column` and any `*_col` (spot_col, price_col, ...)
+        for k, v in vars(self).items():
+            if (k == 'column' or k.endswith('_col')) and isinstance(v, str):
+                cols.add(v)
+        return cols
+
+    def _lookback_attr(self) -> int:
+        vals = [int(v) for k, v in vars(self).items()
+                if k in LOOKBACK_ATTRS and isinstance(v, (int, float)) and not isinstance(v, bool)]
+        return max(vals, default=0)
+
+    def lookback(self) -> Optional[int]:
+        """Bars of history the latest output needs to be warm; None when it depends on all history."""
+        if self.LOOKBACK_UNIT != "bar":
+            return 1
+        return int(math.ceil(self._lookback_attr() * self.WARMUP_FACTOR)) + 1
+
+    def lookback_sessions(self) -> int:
+        """Whole sessions of history needed (daily-bar indicators and `*_days` parameters)."""
+        days = [int(v) for k, v in vars(self).items()
+                if k.endswith("_days") and isinstance(v, (int, float)) and not isinstance(v, bool)]
+        sessions = max(days, default=0)
+        if self.LOOKBACK_UNIT == "session":
+            sessions = max(sessions, int(math.ceil(self._lookback_attr() * self.WARMUP_FACTOR)))
+        return sessions
+
+    def init_state(self) -> Dict[str, Any]:
+        """Fresh streaming state: a JSON-checkpointable dict of floats and lists."""
+        raise NotImplementedError(f"{type(self).__name__} does not support streaming updates")
+
+    def update(self, state: Dict[str, Any], bar: Mapping[str, Any]) -> Dict[str, float]:
+        """Advance `state` by one bar and return that bar's outputs (same names as `calculate`)."""
+        raise NotImplementedError(f"{type(self).__name__} does not support streaming updates")
@@ -1,15 +1,23 @@
+from typing import Optional
 from ..base import Indicator
+from .. import incremental as inc
+from .. import intermediates as im
 import pandas as pd
 import numpy as np
 
 class ADX(Indicator):
     CATEGORY = "trend_strength"
     SUBCATEGORY = "dmi_adx"
+    WARMUP_FACTOR = 10  # two chained Wilder smoothings (DI, then DX)
+    GROUP_SAFE = True
 
     def __init__(self, period: int = 14):
         self.period = int(period)
 
-    def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
+    def intermediates(self):
+        return [im.col("high"), im.col("low"), im.wilder(im.true_range(), self.period)]
+
+    def calculate(self, df: pd.DataFrame, shared: Optional[im.Intermediates] = None) -> pd.DataFrame:
         out = pd.DataFrame(index=df.index)
         required = {"high", "low", "close"}
         if not required.issubset(df.columns):
@@ -17,33 +25,51 @@ class ADX(Indicator):
             out[f"minus_di_{self.period}"] = 0.0
             out[f"adx_{self.period}"] = 0.0
             return out
-        high = pd.to_numeric(df["high"], errors='coerce').astype(float)
-        low = pd.to_numeric(df["low"], errors='coerce').astype(float)
-        close = pd.to_numeric(df["close"], errors='coerce').astype(float)
+        shared = shared if shared is not None else im.Intermediates(df)
+        high = shared.get(im.col("high"))
+        low = shared.get(im.col("low"))
 
-        up_move = high.diff()
-        down_move = -low.diff()
+        up_move = shared.diff(high)
+        down_move = -shared.diff(low)
         plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
         minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
 
-        prev_close = close.shift(1)
-        tr1 = (high - low).abs()
-        tr2 = (high - prev_close).abs()
-        tr3 = (low - prev_close).abs()
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-
         alpha = 1.0 / float(self.period)
-        tr_s = tr.ewm(alpha=alpha, adjust=False).mean()
-        plus_dm_s = pd.Series(plus_dm, index=df.index).ewm(alpha=alpha, adjust=False).mean()
-        minus_dm_s = pd.Series(minus_dm, index=df.index).ewm(alpha=alpha, adjust=False).mean()
+        tr_s = shared.get(im.wilder(im.true_range(), self.period))
+        plus_dm_s = shared.ewm_mean(pd.Series(plus_dm, index=df.index), alpha=alpha, adjust=False)
+        minus_dm_s = shared.ewm_mean(pd.Series(minus_dm, index=df.index), alpha=alpha, adjust=False)
 
         plus_di = 100.0 * (plus_dm_s / (tr_s + 1e-12))
         minus_di = 100.0 * (minus_dm_s / (tr_s + 1e-12))
         dx = 100.0 * (plus_di - minus_di).abs() / ((plus_di + minus_di) + 1e-12)
-        adx = dx.ewm(alpha=alpha, adjust=False).mean()
+        adx = shared.ewm_mean(dx, alpha=alpha, adjust=False)
 
         out[f"plus_di_{self.period}"] = plus_di.fillna(0.0)
         out[f"minus_di_{self.period}"] = minus_di.fillna(0.0)
         out[f"adx_{self.period}"] = adx.fillna(0.0)
         return out
 
+    def init_state(self):
+        return {"prev_high": inc.NAN, "prev_low": inc.NAN, "prev_close": inc.NAN,
+                "tr": inc.ewm_state(), "plus_dm": inc.ewm_state(), "minus_dm": inc.ewm_state(), "adx": inc.ewm_state()}
+
+    def update(self, state, bar):
+        high, low = inc.num(bar, "high"), inc.num(bar, "low")
+        up_move = high - state["prev_high"]
+        down_move = -(low - state["prev_low"])
+        plus_dm = up_move if (up_move > down_move and up_move > 0) else 0.0
+        minus_dm = down_move if (down_move > up_move and down_move > 0) else 0.0
+        tr = inc.true_range(high, low, state["prev_close"])
+        state.update(prev_high=high, prev_low=low, prev_close=inc.num(bar, "close"))
+
+        a = inc.alpha(alpha=1.0 / float(self.period))
+        tr_s = inc.ewm_update(state["tr"], tr, a)
+        plus_di = 100.0 * (inc.ewm_update(state["plus_dm"], plus_dm, a) / (tr_s + 1e-12))
+        minus_di = 100.0 * (inc.ewm_update(state["minus_dm"], minus_dm, a) / (tr_s + 1e-12))
+        dx = 100.0 * abs(plus_di - minus_di) / ((plus_di + minus_di) + 1e-12)
+        adx = inc.ewm_update(state["adx"], dx, a)
+        return {
+            f"plus_di_{self.period}": inc.fill(plus_di),
+            f"minus_di_{self.period}": inc.fill(minus_di),
+            f"adx_{self.period}": inc.fill(adx),
+        }
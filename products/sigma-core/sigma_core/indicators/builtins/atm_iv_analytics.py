@@ -4,7 +4,7 @@ import numpy as np
 from datetime import date, datetime
 from pathlib import Path
 import pytz, os
-from ...data.sources.polygon import get_polygon_option_chain_snapshot
+from ...data.chains import chain_snapshot
 
 
 def _today_et() -> date:
@@ -39,17 +39,11 @@ def _atm_iv_series(df: pd.DataFrame, underlying: str) -> pd.Series:
         if d in iv_map and np.isfinite(iv_map[d]):
             continue
         try:
-            snap = get_polygon_option_chain_snapshot(underlying, d)
-            if snap is None or snap.empty:
+            snap = chain_snapshot(underlying, d)
+            if snap.empty:
                 iv_map[d] = np.nan; continue
             anchor_val = float(np.nanmean(anchors_rounded[dts == d]))
-            s2 = snap.dropna(subset=['implied_volatility']).copy()
-            s2['dist'] = (pd.to_numeric(s2['strike'], errors='coerce') - anchor_val).abs()
-            s2 = s2.sort_values('dist')
-            if s2.empty:
-                iv_map[d] = np.nan
-            else:
-                iv_map[d] = float(pd.to_numeric(s2.iloc[0]['implied_volatility'], errors='coerce'))
+            iv_map[d] = snap.atm_iv(anchor_val)
         except Exception:
             iv_map[d] = np.nan
     # write cache for historical days (never today)
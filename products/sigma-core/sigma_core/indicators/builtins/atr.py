@@ -1,30 +1,37 @@
+from typing import Optional
 from ..base import Indicator
+from .. import incremental as inc
+from .. import intermediates as im
 import pandas as pd
 
 class ATR(Indicator):
     CATEGORY = "volatility"
     SUBCATEGORY = "atr"
+    WARMUP_FACTOR = 7  # Wilder smoothing
+    GROUP_SAFE = True
 
     def __init__(self, period: int = 14):
         self.period = int(period)
 
-    def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
+    def intermediates(self):
+        return [im.wilder(im.true_range(), self.period)]
+
+    def calculate(self, df: pd.DataFrame, shared: Optional[im.Intermediates] = None) -> pd.DataFrame:
         out = pd.DataFrame(index=df.index)
         required = {"high", "low", "close"}
         if not required.issubset(df.columns):
             out[f"atr_{self.period}"] = 0.0
             return out
-        high = pd.to_numeric(df["high"], errors='coerce').astype(float)
-        low = pd.to_numeric(df["low"], errors='coerce').astype(float)
-        close = pd.to_numeric(df["close"], errors='coerce').astype(float)
-        prev_close = close.shift(1)
-        tr = pd.concat([
-            (high - low).abs(),
-            (high - prev_close).abs(),
-            (low - prev_close).abs(),
-        ], axis=1).max(axis=1)
-        alpha = 1.0 / float(self.period)
-        atr = tr.ewm(alpha=alpha, adjust=False).mean()
+        shared = shared if shared is not None else im.Intermediates(df)
+        atr = shared.get(im.wilder(im.true_range(), self.period))
         out[f"atr_{self.period}"] = atr.fillna(0.0)
         return out
 
+    def init_state(self):
+        return {"prev_close": inc.NAN, "tr": inc.ewm_state()}
+
+    def update(self, state, bar):
+        tr = inc.true_range(inc.num(bar, "high"), inc.num(bar, "low"), state["prev_close"])
+        state["prev_close"] = inc.num(bar, "close")
+        atr = inc.ewm_update(state["tr"], tr, inc.alpha(alpha=1.0 / float(self.period)))
+        return {f"atr_{self.period}": inc.fill(atr)}
@@ -1,3 +1,4 @@
+from typing import Optional
 from ..base import Indicator
 import pandas as pd
 import numpy as np
@@ -7,12 +8,15 @@ class CloseVsVWAP(Indicator):
     NAME = "close_vs_vwap"
     CATEGORY = "intraday"
     SUBCATEGORY = "vwap"
+    GROUP_SAFE = True
+    INPUTS = ("vwap_d", "vwap_intraday")
 
     def __init__(self, kind: str = 'intraday'):
         # kind: 'intraday' uses intraday_vwap column if present; 'daily' uses daily_vwap
         self.kind = kind
 
-    def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
+    def calculate(self, df: pd.DataFrame, shared: Optional[object] = None) -> pd.DataFrame:
+        # Row-wise only; `shared` is accepted because GROUP_SAFE indicators are called with it
         out = pd.DataFrame(index=df.index)
         if 'close' not in df.columns:
             out['close_vs_vwap'] = float('nan')
@@ -1,4 +1,6 @@
+from typing import Optional
 from ..base import Indicator
+from .. import intermediates as im
 import pandas as pd
 import numpy as np
 
@@ -7,11 +9,13 @@ class CMF(Indicator):
     NAME = "cmf"
     CATEGORY = "volume"
     SUBCATEGORY = "money_flow"
+    WARMUP_FACTOR = 1
+    GROUP_SAFE = True
 
     def __init__(self, period: int = 20):
         self.period = int(period)
 
-    def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
+    def calculate(self, df: pd.DataFrame, shared: Optional[im.Intermediates] = None) -> pd.DataFrame:
         out = pd.DataFrame(index=df.index)
         req = {'high','low','close','volume'}
         if not req.issubset(df.columns):
@@ -24,8 +28,9 @@ class CMF(Indicator):
         denom = (h - l).replace(0.0, np.nan)
         mfm = ((c - l) - (h - c)) / denom
         mfv = mfm.fillna(0.0) * v
-        mfv_sum = mfv.rolling(self.period, min_periods=max(1, self.period//2)).sum()
-        vol_sum = v.rolling(self.period, min_periods=max(1, self.period//2)).sum().replace(0.0, np.nan)
+        shared = shared if shared is not None else im.Intermediates(df)
+        mfv_sum = shared.rolling(mfv, self.period, 'sum', min_periods=max(1, self.period//2))
+        vol_sum = shared.rolling(v, self.period, 'sum', min_periods=max(1, self.period//2)).replace(0.0, np.nan)
         cmf = (mfv_sum / vol_sum).fillna(0.0)
         out[f"cmf_{self.period}"] = cmf
         return out
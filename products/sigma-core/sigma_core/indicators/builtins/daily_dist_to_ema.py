@@ -6,6 +6,7 @@ from ...data.sources.polygon import get_polygon_daily_bars
 class DailyDistToEma(Indicator):
     CATEGORY = "daily_moving_average"
     SUBCATEGORY = "distance"
+    LOOKBACK_UNIT = "session"
     """Normalized distance of daily price to daily EMA, shifted 1 day.
 
     Params: underlying: str='SPY', window: int=20, normalize: str='price'|'ema'
@@ -5,6 +5,7 @@ from ...data.sources.polygon import get_polygon_daily_bars
 class DailyEMA(Indicator):
     CATEGORY = "daily_moving_average"
     SUBCATEGORY = "ema"
+    LOOKBACK_UNIT = "session"
     """Daily EMA shifted 1 day to avoid leakage.
 
     Params: underlying: str='SPY', window: int=20
@@ -5,6 +5,8 @@ from ...data.sources.polygon import get_polygon_daily_bars
 class DailyRet(Indicator):
     CATEGORY = "daily_momentum"
     SUBCATEGORY = "returns"
+    LOOKBACK_UNIT = "session"
+    WARMUP_FACTOR = 1
     """Daily returns over N days, shifted 1 day to avoid leakage.
 
     Params: underlying: str='SPY', window: int=1
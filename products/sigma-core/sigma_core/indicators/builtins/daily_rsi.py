@@ -7,6 +7,8 @@ from ...data.sources.polygon import get_polygon_daily_bars
 class DailyRSI(Indicator):
     CATEGORY = "daily_momentum"
     SUBCATEGORY = "rsi"
+    LOOKBACK_UNIT = "session"
+    WARMUP_FACTOR = 7  # Wilder smoothing
     """Daily RSI shifted 1 day to avoid leakage.
 
     Params: underlying: str='SPY', period: int=14, column: str='close'
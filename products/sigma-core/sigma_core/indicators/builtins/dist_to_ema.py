@@ -1,9 +1,12 @@
+from typing import Optional
 from ..base import Indicator
+from .. import intermediates as im
 import pandas as pd
 
 class DistToEma(Indicator):
     CATEGORY = "moving_average"
     SUBCATEGORY = "distance"
+    GROUP_SAFE = True
     """Normalized distance of price to EMA.
     Params: column: str='close', window: int=10, normalize: str='price' (price|ema)
     Output: dist_ema{window}_norm
@@ -13,13 +16,17 @@ class DistToEma(Indicator):
         self.window = int(window)
         self.normalize = normalize
 
-    def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
+    def intermediates(self):
+        return [im.ema(self.column, self.window)]
+
+    def calculate(self, df: pd.DataFrame, shared: Optional[im.Intermediates] = None) -> pd.DataFrame:
         out = pd.DataFrame(index=df.index)
         if self.column not in df.columns:
             out[f"dist_ema{self.window}_norm"] = 0.0
             return out
-        price = df[self.column].astype(float)
-        ema = price.ewm(span=self.window, adjust=False).mean()
+        shared = shared if shared is not None else im.Intermediates(df)
+        price = shared.get(im.col(self.column))
+        ema = shared.get(im.ema(self.column, self.window))
         denom = price.abs() if self.normalize == "price" else ema.abs()
         dist = (price - ema) / (denom + 1e-12)
         out[f"dist_ema{self.window}_norm"] = dist.fillna(0.0)
@@ -1,4 +1,6 @@
+from typing import Optional
 from ..base import Indicator
+from .. import intermediates as im
 import pandas as pd
 import numpy as np
 
@@ -7,11 +9,13 @@ class DonchianChannels(Indicator):
     NAME = "donchian"
     CATEGORY = "price"
     SUBCATEGORY = "channels"
+    WARMUP_FACTOR = 1
+    GROUP_SAFE = True
 
     def __init__(self, window: int = 20):
         self.window = int(window)
 
-    def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
+    def calculate(self, df: pd.DataFrame, shared: Optional[im.Intermediates] = None) -> pd.DataFrame:
         out = pd.DataFrame(index=df.index)
         req = {'high','low'}
         if not req.issubset(df.columns):
@@ -19,10 +23,11 @@ class DonchianChannels(Indicator):
             out[f"donchian_lower_{self.window}"] = float('nan')
             out[f"donchian_mid_{self.window}"] = float('nan')
             return out
-        h = pd.to_numeric(df['high'], errors='coerce').astype(float)
-        l = pd.to_numeric(df['low'], errors='coerce').astype(float)
-        upper = h.rolling(self.window, min_periods=max(1, self.window//2)).max()
-        lower = l.rolling(self.window, min_periods=max(1, self.window//2)).min()
+        shared = shared if shared is not None else im.Intermediates(df)
+        h = shared.get(im.col('high'))
+        l = shared.get(im.col('low'))
+        upper = shared.rolling(h, self.window, 'max', min_periods=max(1, self.window//2))
+        lower = shared.rolling(l, self.window, 'min', min_periods=max(1, self.window//2))
         mid = (upper + lower) / 2.0
         out[f"donchian_upper_{self.window}"] = upper
         out[f"donchian_lower_{self.window}"] = lower
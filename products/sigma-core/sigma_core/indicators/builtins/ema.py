@@ -1,9 +1,13 @@
+from typing import Optional
 from ..base import Indicator
+from .. import incremental as inc
+from .. import intermediates as im
 import pandas as pd
 
 class EMA(Indicator):
     CATEGORY = "moving_average"
     SUBCATEGORY = "ema"
+    GROUP_SAFE = True
     """Exponential moving average.
     Params: column: str = 'close', window: int = 10
     Output: ema_{window}
@@ -12,11 +16,22 @@ class EMA(Indicator):
         self.column = column
         self.window = int(window)
 
-    def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
+    def intermediates(self):
+        return [im.ema(self.column, self.window)]
+
+    def calculate(self, df: pd.DataFrame, shared: Optional[im.Intermediates] = None) -> pd.DataFrame:
         out = pd.DataFrame(index=df.index)
         if self.column not in df.columns:
             out[f"ema_{self.window}"] = 0.0
             return out
-        ema = df[self.column].astype(float).ewm(span=self.window, adjust=False).mean()
+        shared = shared if shared is not None else im.Intermediates(df)
+        ema = shared.get(im.ema(self.column, self.window))
         out[f"ema_{self.window}"] = ema.fillna(0.0)
         return out
+
+    def init_state(self):
+        return {"ema": inc.ewm_state()}
+
+    def update(self, state, bar):
+        ema = inc.ewm_update(state["ema"], inc.num(bar, self.column), inc.alpha(span=self.window))
+        return {f"ema_{self.window}": inc.fill(ema)}
@@ -1,9 +1,12 @@
+from typing import Optional
 from ..base import Indicator
+from .. import intermediates as im
 import pandas as pd
 
 class EmaSlope(Indicator):
     CATEGORY = "moving_average"
     SUBCATEGORY = "slope"
+    GROUP_SAFE = True
     """Slope (first difference over period) of EMA.
     Params: column: str='close', window: int=10, period: int=1
     Output: ema{window}_slope{period}h
@@ -13,16 +16,23 @@ class EmaSlope(Indicator):
         self.window = int(window)
         self.period = int(period)
 
-    def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
+    def intermediates(self):
+        return [im.ema(self.column, self.window)]
+
+    def inputs(self):
+        return super().inputs() | {f"ema_{self.window}"}
+
+    def calculate(self, df: pd.DataFrame, shared: Optional[im.Intermediates] = None) -> pd.DataFrame:
         out = pd.DataFrame(index=df.index)
         colname = f"ema_{self.window}"
+        shared = shared if shared is not None else im.Intermediates(df)
         if colname in df.columns:
             ema = df[colname].astype(float)
         elif self.column in df.columns:
-            ema = df[self.column].astype(float).ewm(span=self.window, adjust=False).mean()
+            ema = shared.get(im.ema(self.column, self.window))
         else:
             out[f"ema{self.window}_slope{self.period}h"] = 0.0
             return out
-        slope = ema.diff(self.period)
+        slope = shared.diff(ema, self.period)
         out[f"ema{self.window}_slope{self.period}h"] = slope.fillna(0.0)
         return out
@@ -1,7 +1,7 @@
 from ..base import Indicator
 import pandas as pd
 import numpy as np
-from ...data.sources.polygon import get_polygon_option_chain_snapshot
+from ...data.chains import chain_snapshot
 
 
 class GammaConcentration(Indicator):
@@ -23,15 +23,11 @@ class GammaConcentration(Indicator):
         vals = {}
         for d in uniq:
             try:
-                snap = get_polygon_option_chain_snapshot(self.underlying, d)
-                if snap is None or snap.empty or 'gamma' not in snap.columns:
+                snap = chain_snapshot(self.underlying, d)
+                if snap.empty or not snap.has_gamma:
                     vals[d] = np.nan
                     continue
-                s = snap.copy()
-                g = pd.to_numeric(s['gamma'], errors='coerce').abs().fillna(0.0)
-                oi = pd.to_numeric(s.get('open_interest', 0.0), errors='coerce').fillna(0.0)
-                s['_g_oi'] = g * oi
-                grp = s.groupby('strike')['_g_oi'].sum().sort_values(ascending=False)
+                grp = snap.gamma_oi_by_strike.sort_values(ascending=False)
                 top = grp.head(self.top_n)
                 tot = float(grp.sum())
                 if tot <= 0:
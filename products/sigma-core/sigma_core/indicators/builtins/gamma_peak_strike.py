@@ -1,7 +1,7 @@
 from ..base import Indicator
 import pandas as pd
 import numpy as np
-from ...data.sources.polygon import get_polygon_option_chain_snapshot
+from ...data.chains import chain_snapshot
 
 
 class GammaPeakStrike(Indicator):
@@ -22,19 +22,12 @@ class GammaPeakStrike(Indicator):
         peak = {}
         for d in uniq:
             try:
-                snap = get_polygon_option_chain_snapshot(self.underlying, d)
-                if snap is None or snap.empty or 'gamma' not in snap.columns:
+                snap = chain_snapshot(self.underlying, d)
+                if snap.empty or not snap.has_gamma:
                     peak[d] = np.nan
                     continue
-                s = snap.copy()
                 # proxy: sum |gamma| * OI by strike
-                try:
-                    g = pd.to_numeric(s['gamma'], errors='coerce').abs()
-                except Exception:
-                    peak[d] = np.nan; continue
-                oi = pd.to_numeric(s.get('open_interest', 0.0), errors='coerce').fillna(0.0)
-                s['_g_oi'] = g * oi
-                grp = s.groupby('strike')['_g_oi'].sum()
+                grp = snap.gamma_oi_by_strike
                 if grp.empty:
                     peak[d] = np.nan
                 else:
@@ -1,3 +1,4 @@
+from typing import Optional
 from ..base import Indicator
 import pandas as pd
 
@@ -6,8 +7,10 @@ class HourOfDay(Indicator):
     NAME = "hour_of_day"
     CATEGORY = "time"
     SUBCATEGORY = "intraday"
+    GROUP_SAFE = True
 
-    def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
+    def calculate(self, df: pd.DataFrame, shared: Optional[object] = None) -> pd.DataFrame:
+        # Row-wise only; `shared` is accepted because GROUP_SAFE indicators are called with it
         out = pd.DataFrame(index=df.index)
         if 'hour_et' in df.columns:
             out['hour_of_day'] = pd.to_numeric(df['hour_et'], errors='coerce').astype(float)
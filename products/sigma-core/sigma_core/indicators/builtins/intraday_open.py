@@ -10,6 +10,7 @@ class OpenGapZ(Indicator):
     NAME = "open_gap_z"
     CATEGORY = "intraday"
     SUBCATEGORY = "open"
+    LOOKBACK_UNIT = "session"
 
     def __init__(self, ticker: str = 'SPY', atr_period: int = 14, norm: str = 'atr'):
         self.ticker = ticker
@@ -1,4 +1,5 @@
 from ..base import Indicator
+from .. import incremental as inc
 import pandas as pd
 
 class IntradayVWAP(Indicator):
@@ -29,3 +30,25 @@ class IntradayVWAP(Indicator):
         out['vwap_intraday'] = vwap.fillna(0.0)
         return out
 
+    def init_state(self):
+        return {"session": "", "pv": 0.0, "volume": 0.0}
+
+    def update(self, state, bar):
+        try:
+            ts = pd.Timestamp(bar.get("date"))
+            session = "" if pd.isna(ts) else ts.date().isoformat()
+        except Exception:
+            session = ""
+        if not session:
+            # Batch: rows without a session date are dropped by the groupby
+            return {"vwap_intraday": 0.0}
+        if session != state["session"]:
+            state.update(session=session, pv=0.0, volume=0.0)
+        price = inc.num(bar, self.price_col if self.price_col in bar else "close")
+        vol = inc.fill(inc.num(bar, self.volume_col))
+        pv = price * vol
+        if pv == pv:
+            state["pv"] += pv
+        state["volume"] += vol
+        vwap = (state["pv"] if pv == pv else inc.NAN) / (state["volume"] + 1e-12)
+        return {"vwap_intraday": inc.fill(vwap)}
@@ -2,8 +2,9 @@ from ..base import Indicator
 import pandas as pd
 import numpy as np
 from datetime import date, datetime, time as dtime, timedelta
-from ...data.sources.polygon import get_polygon_option_chain_snapshot, get_polygon_option_quotes
-from .iv_skew import implied_vol_newton
+from ...data.sources.polygon import get_polygon_option_quotes
+from ...data.chains import chain_snapshot
+from .iv_skew import _nearest_iv_by_group
 import pytz
 
 class IVRealizedSpread(Indicator):
@@ -55,19 +56,15 @@ class IVRealizedSpread(Indicator):
         iv_map: dict[date, float] = {}
         for dt in sorted(set(dts)):
             try:
-                snap = get_polygon_option_chain_snapshot(self.underlying, dt)
+                snap = chain_snapshot(self.underlying, dt)
                 if snap.empty:
                     continue
                 # nearest strike to anchor of that date (use first row’s anchor for the date)
                 anchor_val = float(np.nanmean(anchors_rounded[dts == dt]))
-                snap2 = snap.copy()
-                if self.contract_type in ('call','put'):
-                    snap2 = snap2[snap2['contract_type'] == self.contract_type]
-                snap2['dist'] = np.abs(snap2['strike'] - anchor_val)
-                snap2 = snap2.sort_values(['dist']).dropna(subset=['implied_volatility'])
-                if len(snap2) == 0:
+                side = self.contract_type if self.contract_type in ('call', 'put') else None
+                iv = snap.atm_iv(anchor_val, side)
+                if not np.isfinite(iv):
                     continue
-                iv = float(snap2.iloc[0]['implied_volatility'])
                 iv_map[dt] = iv
             except Exception:
                 continue
@@ -97,7 +94,7 @@ class IVRealizedSpread(Indicator):
 
         start_t, end_t = self._parse_window(self.quote_window)
         ET = pytz.timezone('US/Eastern')
-        iv_map: dict[date, float] = {}
+        rows = []
 
         for dt in sorted(set(dts)):
             try:
@@ -121,8 +118,6 @@ class IVRealizedSpread(Indicator):
                 if T <= 0:
                     continue
 
-                best_iv = float('nan')
-                best_dist = float('inf')
                 for side in ([self.contract_type] if self.contract_type in ('call','put') else ['call','put']):
                     for K in strikes:
                         q = get_polygon_option_quotes(self.underlying, dt, float(K), side, dt, dt)
@@ -145,19 +140,12 @@ class IVRealizedSpread(Indicator):
                             price = float(mid.median())
                         except Exception:
                             continue
-                        # Invert Black-Scholes
-                        iv = implied_vol_newton(S=anchor_val, K=float(K), T=T, price=price, option_type=side)
-                        if not np.isfinite(iv) or iv <= 0:
-                            continue
-                        dist = abs(float(K) - anchor_val)
-                        if dist < best_dist:
-                            best_dist = dist
-                            best_iv = float(iv)
-                if np.isfinite(best_iv):
-                    iv_map[dt] = best_iv
+                        rows.append((dt, anchor_val, float(K), T, price, side, anchor_val))
             except Exception:
                 continue
 
+        # Invert Black-Scholes for every day/strike at once; keep the nearest-strike IV per day
+        iv_map: dict[date, float] = _nearest_iv_by_group(rows)
         iv_series = dts.map(lambda x: iv_map.get(x, float('nan'))).astype(float)
         return pd.Series(iv_series, index=df.index)
 
@@ -2,44 +2,39 @@ from ..base import Indicator
 import pandas as pd
 import numpy as np
 from datetime import date, timedelta, datetime
-from ...data.sources.polygon import get_polygon_option_chain_snapshot
+from ...data.chains import chain_snapshot
 from ...data.sources.polygon import get_polygon_option_quotes
+from ...pricing.black_scholes import bs_price, implied_vol
 
-import math
-
-def _norm_cdf(x):
-    return 0.5 * (1.0 + math.erf(x / math.sqrt(2.0)))
 
 def _bs_price(S, K, T, sigma, r=0.0, q=0.0, option_type='call'):
-    if T <= 0 or sigma <= 0:
-        return max(0.0, (S - K) if option_type == 'call' else (K - S))
-    d1 = (math.log((S+1e-12)/(K+1e-12)) + (r - q + 0.5*sigma*sigma)*T) / (sigma*math.sqrt(T))
-    d2 = d1 - sigma*math.sqrt(T)
-    Nd1 = _norm_cdf(d1)
-    Nd2 = _norm_cdf(d2)
-    if option_type == 'call':
-        return S*math.exp(-q*T)*Nd1 - K*math.exp(-r*T)*Nd2
-    else:
-        return K*math.exp(-r*T)*(1.0-Nd2) - S*math.exp(-q*T)*(1.0-Nd1)
+    return float(bs_price(S, K, T, sigma, r, q, option_type))
+
 
 def implied_vol_newton(S, K, T, price, r=0.0, q=0.0, option_type='call', tol=1e-4, max_iter=50):
-    if price <= 0 or S <= 0 or K <= 0 or T <= 0:
-        return float('nan')
-    sigma = 0.3
-    for _ in range(max_iter):
-        if sigma <= 1e-8:
-            sigma = 1e-4
-        # Vega
-        d1 = (math.log((S+1e-12)/(K+1e-12)) + (r - q + 0.5*sigma*sigma)*T) / (sigma*math.sqrt(T))
-        vega = (S*math.exp(-q*T) * (1.0/math.sqrt(2*math.pi)) * math.exp(-0.5*d1*d1) * math.sqrt(T))
-        if vega < 1e-8:
-            break
-        diff = _bs_price(S, K, T, sigma, r, q, option_type) - price
-        sigma_new = sigma - diff/vega
-        if abs(sigma_new - sigma) < tol:
-            return max(sigma_new, 0.0)
-        sigma = sigma_new
-    return float('nan')
+    """Scalar IV (kept for existing callers); see sigma_core.pricing.black_scholes.implied_vol."""
+    return float(implied_vol(price, S, K, T, r, q, option_type, tol=tol, max_iter=max(int(max_iter), 50))[()])
+
+
+def _nearest_iv_by_group(rows) -> dict:
+    """Solve IV for all rows in one batch; per group, IV of the row whose strike is nearest its target.
+
+    rows: iterable of (group, S, K, T, price, side, target). Rows keep their iteration order, so
+    ties resolve to the first row like the previous per-strike loops.
+    """
+    rows = list(rows)
+    if not rows:
+        return {}
+    groups, S, K, T, price, side, target = zip(*rows)
+    iv = implied_vol(np.asarray(price, float), np.asarray(S, float), np.asarray(K, float), np.asarray(T, float), option_type=np.asarray(side))
+    dist = np.abs(np.asarray(K, float) - np.asarray(target, float))
+    best = {}
+    for i, g in enumerate(groups):
+        if not np.isfinite(iv[i]) or iv[i] <= 0:
+            continue
+        if g not in best or dist[i] < best[g][0]:
+            best[g] = (dist[i], float(iv[i]))
+    return {g: v for g, (_, v) in best.items()}
 
 
 class IVSkew25Delta(Indicator):
@@ -61,41 +56,41 @@ class IVSkew25Delta(Indicator):
         except Exception:
             return (10,0), (11,0)
 
-    def _atm_iv_from_quotes(self, dt, anchor_price: float, side: str) -> float:
-        from ...data.sources.polygon import get_polygon_option_quotes
+    def _quote_rows(self, dt, anchor_price: float, sides, expiry=None, group=None) -> list:
+        """(group, S, K, T, mid, side, anchor) rows for strikes in the band, sampled in quote_window on dt."""
         import pytz
         ET = pytz.timezone('US/Eastern')
+        expiry = expiry or dt
         (sh, sm), (eh, em) = self._parse_window(self.quote_window)
         lo = int(np.floor(anchor_price - self.strike_band))
         hi = int(np.ceil(anchor_price + self.strike_band))
-        strikes = list(range(lo, hi+1))
         sample_dt = ET.localize(datetime(dt.year, dt.month, dt.day, (sh+eh)//2, (sm+em)//2))
-        expiry_dt = ET.localize(datetime(dt.year, dt.month, dt.day, 16, 0))
+        expiry_dt = ET.localize(datetime(expiry.year, expiry.month, expiry.day, 16, 0))
         T = max((expiry_dt - sample_dt).total_seconds(), 0.0) / (365.0*24*3600.0)
-        best_iv, best_dist = float('nan'), float('inf')
-        for K in strikes:
-            try:
-                q = get_polygon_option_quotes(self.underlying, dt, float(K), side, dt, dt)
-                if q is None or q.empty:
-                    continue
-                q['ts'] = pd.to_datetime(q.get('timestamp'))
-                q['ts_et'] = q['ts'].dt.tz_convert(ET)
-                qq = q[(q['ts_et'].dt.hour*60 + q['ts_et'].dt.minute >= sh*60+sm) & (q['ts_et'].dt.hour*60 + q['ts_et'].dt.minute <= eh*60+em)].copy()
-                if qq.empty:
-                    qq = q.copy()
-                mid = ((qq['bid'].astype(float) + qq['ask'].astype(float)) / 2.0).replace([np.inf,-np.inf], np.nan).dropna()
-                if mid.empty or T <= 0:
-                    continue
-                price = float(mid.median())
-                iv = implied_vol_newton(S=float(anchor_price), K=float(K), T=T, price=price, option_type=side)
-                if not np.isfinite(iv) or iv <= 0:
+        rows = []
+        if T <= 0:
+            return rows
+        for K in range(lo, hi+1):
+            for side in sides:
+                try:
+                    q = get_polygon_option_quotes(self.underlying, expiry, float(K), side, dt, dt)
+                    if q is None or q.empty:
+                        continue
+                    q['ts'] = pd.to_datetime(q.get('timestamp'))
+                    q['ts_et'] = q['ts'].dt.tz_convert(ET)
+                    qq = q[(q['ts_et'].dt.hour*60 + q['ts_et'].dt.minute >= sh*60+sm) & (q['ts_et'].dt.hour*60 + q['ts_et'].dt.minute <= eh*60+em)].copy()
+                    if qq.empty:
+                        qq = q.copy()
+                    mid = ((qq['bid'].astype(float) + qq['ask'].astype(float)) / 2.0).replace([np.inf,-np.inf], np.nan).dropna()
+                    if mid.empty:
+                        continue
+                    rows.append((group, float(anchor_price), float(K), T, float(mid.median()), side, float(anchor_price)))
+                except Exception:
                     continue
-                dist = abs(float(K) - float(anchor_price))
-                if dist < best_dist:
-                    best_dist, best_iv = dist, float(iv)
-            except Exception:
-                continue
-        return best_iv
+        return rows
+
+    def _atm_iv_from_quotes(self, dt, anchor_price: float, side: str) -> float:
+        return _nearest_iv_by_group(self._quote_rows(dt, anchor_price, [side])).get(None, float('nan'))
 
     def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
         out = pd.DataFrame(index=df.index)
@@ -108,46 +103,31 @@ class IVSkew25Delta(Indicator):
         else:
             anchor_series = pd.to_numeric(df.get('close', pd.Series(0.0, index=df.index)), errors='coerce')
         values = []
+        memo = {}
+        if str(self.iv_source).lower() == 'quotes':
+            # Gather quotes for every (day, anchor) first and solve all IVs in one batch
+            rows = []
+            for key in dict.fromkeys(zip(dts, anchor_series.astype(float))):
+                if np.isfinite(key[1]):
+                    for side in ('call', 'put'):
+                        rows += self._quote_rows(key[0], key[1], [side], group=(key, side))
+            ivs = _nearest_iv_by_group(rows)
+            for key in {g[0] for g in ivs}:
+                ivc, ivp = ivs.get((key, 'call'), np.nan), ivs.get((key, 'put'), np.nan)
+                memo[key] = float(ivc - ivp) if (np.isfinite(ivc) and np.isfinite(ivp)) else float('nan')
         for i, dt in enumerate(dts):
             try:
                 if str(self.iv_source).lower() == 'quotes':
                     anchor = float(anchor_series.iloc[i]) if i < len(anchor_series) else float('nan')
-                    if not np.isfinite(anchor):
-                        values.append(float('nan'))
-                        continue
-                    ivc = self._atm_iv_from_quotes(dt, anchor, 'call')
-                    ivp = self._atm_iv_from_quotes(dt, anchor, 'put')
-                    if np.isfinite(ivc) and np.isfinite(ivp):
-                        values.append(float(ivc - ivp))
-                    else:
-                        values.append(float('nan'))
+                    values.append(memo.get((dt, anchor), float('nan')))
                 else:
-                    snap = get_polygon_option_chain_snapshot(self.underlying, dt)
-                    if snap is None or snap.empty:
-                        values.append(float('nan'))
-                        continue
-                    # nearest to +0.25 for calls and -0.25 for puts
-                    calls = snap[snap['contract_type'] == 'call'].copy()
-                    puts = snap[snap['contract_type'] == 'put'].copy()
-                    for sub in (calls, puts):
-                        if 'delta' not in sub.columns and 'greeks.delta' in sub.columns:
-                            sub['delta'] = sub['greeks.delta']
-                    ivc = np.nan
-                    ivp = np.nan
-                    if 'delta' in calls.columns and not calls.empty:
-                        calls['d2'] = (calls['delta'].astype(float) - 0.25).abs()
-                        csel = calls.dropna(subset=['implied_volatility','d2']).sort_values('d2').head(1)
-                        if not csel.empty:
-                            ivc = float(csel.iloc[0]['implied_volatility'])
-                    if 'delta' in puts.columns and not puts.empty:
-                        puts['d2'] = (puts['delta'].astype(float) + 0.25).abs()
-                        psel = puts.dropna(subset=['implied_volatility','d2']).sort_values('d2').head(1)
-                        if not psel.empty:
-                            ivp = float(psel.iloc[0]['implied_volatility'])
-                    if np.isnan(ivc) or np.isnan(ivp):
-                        values.append(float('nan'))
-                    else:
-                        values.append(ivc - ivp)
+                    if dt not in memo:
+                        snap = chain_snapshot(self.underlying, dt)
+                        # nearest to +0.25 for calls and -0.25 for puts
+                        ivc = snap.iv_at_delta(0.25, 'call') if not snap.empty else float('nan')
+                        ivp = snap.iv_at_delta(-0.25, 'put') if not snap.empty else float('nan')
+                        memo[dt] = float('nan') if (np.isnan(ivc) or np.isnan(ivp)) else ivc - ivp
+                    values.append(memo[dt])
             except Exception:
                 values.append(float('nan'))
         out['iv_skew_25d'] = pd.Series(values, index=df.index).astype(float)
@@ -167,16 +147,9 @@ class IVTermSlope(Indicator):
 
     def _atm_iv(self, snap, anchor_price: float) -> float:
         try:
-            s = snap.copy()
-            s = s.dropna(subset=['implied_volatility'])
-            s['dist'] = (s['strike'].astype(float) - float(anchor_price))
-            s['dist_abs'] = s['dist'].abs()
-            sel = s.sort_values('dist_abs').head(1)
-            if not sel.empty:
-                return float(sel.iloc[0]['implied_volatility'])
+            return snap.atm_iv(float(anchor_price))
         except Exception:
-            pass
-        return float('nan')
+            return float('nan')
 
     def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
         out = pd.DataFrame(index=df.index)
@@ -191,6 +164,17 @@ class IVTermSlope(Indicator):
             anchor_series = pd.to_numeric(df['spy_prev_close'], errors='coerce')
         else:
             anchor_series = pd.to_numeric(df.get('close', pd.Series(0.0, index=df.index)), errors='coerce')
+        quote_ivs = {}
+        if str(self.iv_source).lower() == 'quotes':
+            # ATM IV from quotes on dt for the near (call) and far (either side) expiry, solved in one batch
+            ivc = IVSkew25Delta(self.underlying, iv_source='quotes', quote_window=self.quote_window, strike_band=self.strike_band)
+            rows = []
+            for key in dict.fromkeys(zip(dts, anchor_series.astype(float))):
+                if np.isfinite(key[1]):
+                    rows += ivc._quote_rows(key[0], key[1], ['call'], group=(key, 'near'))
+                    far_dt = key[0] + timedelta(days=self.days_fwd)
+                    rows += ivc._quote_rows(key[0], key[1], ['call', 'put'], expiry=far_dt, group=(key, 'far'))
+            quote_ivs = _nearest_iv_by_group(rows)
         values = []
         for idx, dt in enumerate(dts):
             try:
@@ -199,51 +183,14 @@ class IVTermSlope(Indicator):
                     values.append(float('nan'))
                     continue
                 if str(self.iv_source).lower() == 'quotes':
-                    # Use quotes on dt for both expiries
-                    # Reuse IVSkew25Delta helper to estimate ATM IV via quotes
-                    ivc = IVSkew25Delta(self.underlying, iv_source='quotes', quote_window=self.quote_window, strike_band=self.strike_band)
-                    iv_near = ivc._atm_iv_from_quotes(dt, anchor, 'call')  # call or put; ATM should be similar
-                    far_dt = dt + timedelta(days=self.days_fwd)
-                    # For far expiry, reuse quotes fetch with far_dt expiry but sample on dt window
-                    # We need a small helper here using the same logic but passing expiry far_dt
-                    # Quick inline: loop strikes with get_polygon_option_quotes for far_dt
-                    import pytz
-                    ET = pytz.timezone('US/Eastern')
-                    (sh, sm), (eh, em) = ivc._parse_window(self.quote_window)
-                    sample_dt = ET.localize(datetime(dt.year, dt.month, dt.day, (sh+eh)//2, (sm+em)//2))
-                    expiry_dt = ET.localize(datetime(far_dt.year, far_dt.month, far_dt.day, 16, 0))
-                    T_far = max((expiry_dt - sample_dt).total_seconds(), 0.0) / (365.0*24*3600.0)
-                    best_far, best_dist = float('nan'), float('inf')
-                    lo = int(np.floor(anchor - self.strike_band)); hi = int(np.ceil(anchor + self.strike_band))
-                    for K in range(lo, hi+1):
-                        for side in ['call','put']:
-                            try:
-                                q = get_polygon_option_quotes(self.underlying, far_dt, float(K), side, dt, dt)
-                                if q is None or q.empty:
-                                    continue
-                                q['ts'] = pd.to_datetime(q.get('timestamp'))
-                                q['ts_et'] = q['ts'].dt.tz_convert(ET)
-                                qq = q[(q['ts_et'].dt.hour*60 + q['ts_et'].dt.minute >= sh*60+sm) & (q['ts_et'].dt.hour*60 + q['ts_et'].dt.minute <= eh*60+em)].copy()
-                                if qq.empty:
-                                    qq = q.copy()
-                                mid = ((qq['bid'].astype(float) + qq['ask'].astype(float))/2.0).replace([np.inf,-np.inf], np.nan).dropna()
-                                if mid.empty or T_far <= 0:
-                                    continue
-                                price = float(mid.median())
-                                ivf = implied_vol_newton(S=float(anchor), K=float(K), T=T_far, price=price, option_type=side)
-                                if not np.isfinite(ivf) or ivf <= 0:
-                                    continue
-                                dist = abs(float(K) - float(anchor))
-                                if dist < best_dist:
-                                    best_dist, best_far = dist, float(ivf)
-                            except Exception:
-                                continue
-                    iv_far = best_far
+                    key = (dt, anchor)
+                    iv_near = quote_ivs.get((key, 'near'), float('nan'))
+                    iv_far = quote_ivs.get((key, 'far'), float('nan'))
                 else:
-                    near = get_polygon_option_chain_snapshot(self.underlying, dt)
+                    near = chain_snapshot(self.underlying, dt)
                     far_dt = dt + timedelta(days=self.days_fwd)
-                    far = get_polygon_option_chain_snapshot(self.underlying, far_dt)
-                    if (near is None or near.empty) or (far is None or far.empty):
+                    far = chain_snapshot(self.underlying, far_dt)
+                    if near.empty or far.empty:
                         values.append(float('nan'))
                         continue
                     iv_near = self._atm_iv(near, anchor)
@@ -1,4 +1,5 @@
 from ..base import Indicator
+from .. import incremental as inc
 import pandas as pd
 import numpy as np
 
@@ -41,3 +42,25 @@ class KAMA(Indicator):
         out[f"kama_{self.er_period}_{self.fast}_{self.slow}"] = kama
         return out
 
+    def init_state(self):
+        return {"prices": [], "kama": inc.NAN, "started": False}
+
+    def update(self, state, bar):
+        """Matches `calculate` from the first valid price on (the batch back-fills earlier rows)."""
+        p = inc.num(bar, self.column)
+        prices = inc.push(state["prices"], p, self.er_period + 1)
+        er = 0.0
+        if len(prices) == self.er_period + 1:
+            change = abs(prices[-1] - prices[0])
+            volatility = inc.window_stat([abs(b - a) for a, b in zip(prices, prices[1:])], self.er_period, "sum")
+            if volatility == volatility and volatility != 0.0 and change == change:
+                er = change / volatility
+        sc_fast = 2.0 / (self.fast + 1.0)
+        sc_slow = 2.0 / (self.slow + 1.0)
+        sc = (er * (sc_fast - sc_slow) + sc_slow) ** 2
+        if not state["started"]:
+            if p == p:
+                state.update(kama=p, started=True)
+        else:
+            state["kama"] = state["kama"] + sc * (p - state["kama"])
+        return {f"kama_{self.er_period}_{self.fast}_{self.slow}": state["kama"]}
@@ -1,4 +1,6 @@
+from typing import Optional
 from ..base import Indicator
+from .. import intermediates as im
 import pandas as pd
 import numpy as np
 
@@ -7,23 +9,19 @@ class KeltnerChannels(Indicator):
     NAME = "keltner"
     CATEGORY = "price"
     SUBCATEGORY = "channels"
+    GROUP_SAFE = True
 
     def __init__(self, window: int = 20, multiplier: float = 2.0):
         self.window = int(window)
         self.multiplier = float(multiplier)
 
-    def _ema(self, s: pd.Series, span: int) -> pd.Series:
-        return s.ewm(span=span, adjust=False).mean()
+    def _range_key(self):
+        return im.sma(im.true_range(), self.window, max(1, self.window // 2))
 
-    def _atr(self, h: pd.Series, l: pd.Series, c: pd.Series, period: int) -> pd.Series:
-        prev_c = c.shift(1)
-        tr1 = h - l
-        tr2 = (h - prev_c).abs()
-        tr3 = (l - prev_c).abs()
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        return tr.rolling(period, min_periods=max(1, period//2)).mean()
+    def intermediates(self):
+        return [im.ema("close", self.window), self._range_key()]
 
-    def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
+    def calculate(self, df: pd.DataFrame, shared: Optional[im.Intermediates] = None) -> pd.DataFrame:
         out = pd.DataFrame(index=df.index)
         req = {'high','low','close'}
         if not req.issubset(df.columns):
@@ -31,11 +29,9 @@ class KeltnerChannels(Indicator):
             out[f"keltner_upper_{self.window}"] = float('nan')
             out[f"keltner_lower_{self.window}"] = float('nan')
             return out
-        h = pd.to_numeric(df['high'], errors='coerce').astype(float)
-        l = pd.to_numeric(df['low'], errors='coerce').astype(float)
-        c = pd.to_numeric(df['close'], errors='coerce').astype(float)
-        mid = self._ema(c, self.window)
-        rng = self._atr(h, l, c, self.window)
+        shared = shared if shared is not None else im.Intermediates(df)
+        mid = shared.get(im.ema("close", self.window))
+        rng = shared.get(self._range_key())
         up = mid + self.multiplier * rng
         lo = mid - self.multiplier * rng
         out[f"keltner_mid_{self.window}"] = mid
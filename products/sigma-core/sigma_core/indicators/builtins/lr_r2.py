@@ -7,6 +7,7 @@ class LRR2(Indicator):
     NAME = "lr_r2"
     CATEGORY = "trend"
     SUBCATEGORY = "quality"
+    WARMUP_FACTOR = 1
 
     def __init__(self, column: str = 'close', window: int = 126):
         self.column = column
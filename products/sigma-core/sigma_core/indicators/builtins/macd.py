@@ -1,10 +1,14 @@
+from typing import Optional
 from ..base import Indicator
+from .. import incremental as inc
+from .. import intermediates as im
 import pandas as pd
 
 class MACD(Indicator):
     NAME = "macd"
     CATEGORY = "oscillator"
     SUBCATEGORY = "macd"
+    GROUP_SAFE = True
 
     def __init__(self, column: str = "close", fast: int = 12, slow: int = 26, signal: int = 9):
         self.column = column
@@ -12,21 +16,37 @@ class MACD(Indicator):
         self.slow = int(slow)
         self.signal = int(signal)
 
-    def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
+    def intermediates(self):
+        return [im.ema(self.column, self.fast), im.ema(self.column, self.slow)]
+
+    def calculate(self, df: pd.DataFrame, shared: Optional[im.Intermediates] = None) -> pd.DataFrame:
         out = pd.DataFrame(index=df.index)
         if self.column not in df.columns:
             out["macd_line"] = 0.0
             out["macd_signal"] = 0.0
             out["macd_hist"] = 0.0
             return out
-        x = pd.to_numeric(df[self.column], errors='coerce').astype(float)
-        ema_fast = x.ewm(span=self.fast, adjust=False).mean()
-        ema_slow = x.ewm(span=self.slow, adjust=False).mean()
+        shared = shared if shared is not None else im.Intermediates(df)
+        ema_fast = shared.get(im.ema(self.column, self.fast))
+        ema_slow = shared.get(im.ema(self.column, self.slow))
         macd_line = ema_fast - ema_slow
-        macd_signal = macd_line.ewm(span=self.signal, adjust=False).mean()
+        macd_signal = shared.ewm_mean(macd_line, span=self.signal, adjust=False)
         macd_hist = macd_line - macd_signal
         out["macd_line"] = macd_line.fillna(0.0)
         out["macd_signal"] = macd_signal.fillna(0.0)
         out["macd_hist"] = macd_hist.fillna(0.0)
         return out
 
+    def init_state(self):
+        return {"fast": inc.ewm_state(), "slow": inc.ewm_state(), "signal": inc.ewm_state()}
+
+    def update(self, state, bar):
+        x = inc.num(bar, self.column)
+        macd_line = (inc.ewm_update(state["fast"], x, inc.alpha(span=self.fast))
+                     - inc.ewm_update(state["slow"], x, inc.alpha(span=self.slow)))
+        macd_signal = inc.ewm_update(state["signal"], macd_line, inc.alpha(span=self.signal))
+        return {
+            "macd_line": inc.fill(macd_line),
+            "macd_signal": inc.fill(macd_signal),
+            "macd_hist": inc.fill(macd_line - macd_signal),
+        }
@@ -1,17 +1,22 @@
+from typing import Optional
 from ..base import Indicator
+from .. import intermediates as im
 import pandas as pd
 
 class Momentum(Indicator):
     CATEGORY = "price_trend"
     SUBCATEGORY = "momentum"
+    WARMUP_FACTOR = 1
+    GROUP_SAFE = True
     def __init__(self, column: str = "close", window: int = 1):
         self.column = column
         self.window = int(window)
 
-    def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
+    def calculate(self, df: pd.DataFrame, shared: Optional[im.Intermediates] = None) -> pd.DataFrame:
         out = pd.DataFrame()
         if self.column in df.columns:
-            out[f"close_mom_{self.window}"] = df[self.column].astype(float).pct_change(self.window).fillna(0.0)
+            shared = shared if shared is not None else im.Intermediates(df)
+            out[f"close_mom_{self.window}"] = shared.pct_change(df[self.column].astype(float), self.window).fillna(0.0)
         else:
             out[f"close_mom_{self.window}"] = 0.0
         return out
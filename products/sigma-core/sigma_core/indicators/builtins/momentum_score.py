@@ -5,6 +5,7 @@ import numpy as np
 class MomentumScoreTotal(Indicator):
     CATEGORY = "composite"
     SUBCATEGORY = "momentum_score"
+    INPUTS = ("rsi_14_d", "close_mom_1", "close_mom_3")
     """Composite momentum score combining hourly and daily signals.
 
     This implementation is intentionally simple and robust:
@@ -1,23 +1,42 @@
+from typing import Optional
 from ..base import Indicator
+from .. import incremental as inc
+from .. import intermediates as im
 import pandas as pd
+import numpy as np
 
 class OBV(Indicator):
     CATEGORY = "volume"
     SUBCATEGORY = "obv"
+    GROUP_SAFE = True
 
     def __init__(self, price_col: str = 'close', volume_col: str = 'volume'):
         self.price_col = price_col
         self.volume_col = volume_col
 
-    def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
+    def lookback(self) -> Optional[int]:
+        # A running sum: its level depends on where the history starts
+        return None
+
+    def calculate(self, df: pd.DataFrame, shared: Optional[im.Intermediates] = None) -> pd.DataFrame:
         out = pd.DataFrame(index=df.index)
         if self.price_col not in df.columns or self.volume_col not in df.columns:
             out['obv'] = 0.0
             return out
         price = pd.to_numeric(df[self.price_col], errors='coerce').astype(float)
         vol = pd.to_numeric(df[self.volume_col], errors='coerce').astype(float).fillna(0.0)
-        sign = (price.diff().fillna(0.0)).apply(lambda x: 1.0 if x > 0 else (-1.0 if x < 0 else 0.0))
-        obv = (vol * sign).cumsum()
+        shared = shared if shared is not None else im.Intermediates(df)
+        sign = np.sign(shared.diff(price).fillna(0.0))
+        obv = shared.cumsum(vol * sign)
         out['obv'] = obv.fillna(0.0)
         return out
 
+    def init_state(self):
+        return {"prev": inc.NAN, "obv": 0.0}
+
+    def update(self, state, bar):
+        price = inc.num(bar, self.price_col)
+        d = inc.fill(price - state["prev"])
+        state["prev"] = price
+        state["obv"] += inc.fill(inc.num(bar, self.volume_col)) * (1.0 if d > 0 else -1.0 if d < 0 else 0.0)
+        return {"obv": state["obv"]}
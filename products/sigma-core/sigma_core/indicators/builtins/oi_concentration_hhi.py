@@ -1,7 +1,7 @@
 from ..base import Indicator
 import pandas as pd
 import numpy as np
-from ...data.sources.polygon import get_polygon_option_chain_snapshot
+from ...data.chains import chain_snapshot
 
 
 class OIConcentrationHHI(Indicator):
@@ -23,12 +23,11 @@ class OIConcentrationHHI(Indicator):
         vals = {}
         for d in uniq:
             try:
-                snap = get_polygon_option_chain_snapshot(self.underlying, d)
-                if snap is None or snap.empty:
+                snap = chain_snapshot(self.underlying, d)
+                if snap.empty:
                     vals[d] = np.nan
                     continue
-                s = snap.copy()
-                by_strike = s.groupby('strike')['open_interest'].sum().sort_values(ascending=False)
+                by_strike = snap.oi_by_strike.sort_values(ascending=False)
                 top = by_strike.head(self.top_n)
                 tot = float(by_strike.sum())
                 if tot <= 0:
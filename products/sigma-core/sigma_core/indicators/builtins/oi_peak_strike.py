@@ -1,7 +1,7 @@
 from ..base import Indicator
 import pandas as pd
 import numpy as np
-from ...data.sources.polygon import get_polygon_option_chain_snapshot
+from ...data.chains import chain_snapshot
 
 
 class OIPeakStrike(Indicator):
@@ -22,12 +22,11 @@ class OIPeakStrike(Indicator):
         peak = {}
         for d in uniq:
             try:
-                snap = get_polygon_option_chain_snapshot(self.underlying, d)
-                if snap is None or snap.empty:
+                snap = chain_snapshot(self.underlying, d)
+                if snap.empty:
                     peak[d] = np.nan
                     continue
-                s = snap.copy()
-                grp = s.groupby('strike')['open_interest'].sum()
+                grp = snap.oi_by_strike
                 if grp.empty:
                     peak[d] = np.nan
                 else:
@@ -1,7 +1,7 @@
 from ..base import Indicator
 import pandas as pd
 import numpy as np
-from ...data.sources.polygon import get_polygon_option_chain_snapshot
+from ...data.chains import chain_snapshot
 
 
 class OITrend(Indicator):
@@ -23,12 +23,11 @@ class OITrend(Indicator):
         totals = {}
         for d in uniq:
             try:
-                snap = get_polygon_option_chain_snapshot(self.underlying, d)
-                if snap is None or snap.empty:
+                snap = chain_snapshot(self.underlying, d)
+                if snap.empty:
                     totals[d] = np.nan
                     continue
-                tot = float(pd.to_numeric(snap.get('open_interest', pd.Series(0.0)), errors='coerce').sum())
-                totals[d] = tot
+                totals[d] = snap.oi_total
             except Exception:
                 totals[d] = np.nan
         # build series and compute rolling ema trend (slope-like): current - ema(window)
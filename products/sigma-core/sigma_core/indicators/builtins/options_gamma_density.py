@@ -1,7 +1,7 @@
 from ..base import Indicator
 import pandas as pd
 import numpy as np
-from ...data.sources.polygon import get_polygon_option_chain_snapshot
+from ...data.chains import chain_snapshot
 
 
 class GammaDensityPeakStrike(Indicator):
@@ -22,15 +22,11 @@ class GammaDensityPeakStrike(Indicator):
         peak = {}
         for d in uniq:
             try:
-                snap = get_polygon_option_chain_snapshot(self.underlying, d)
-                if snap is None or snap.empty or 'gamma' not in snap.columns:
+                snap = chain_snapshot(self.underlying, d)
+                if snap.empty or not snap.has_gamma:
                     peak[d] = np.nan
                     continue
-                s = snap.copy()
-                g = pd.to_numeric(s['gamma'], errors='coerce').abs().fillna(0.0)
-                oi = pd.to_numeric(s.get('open_interest', 0.0), errors='coerce').fillna(0.0)
-                s['_g_oi'] = g * oi
-                grp = s.groupby('strike')['_g_oi'].sum()
+                grp = snap.gamma_oi_by_strike
                 peak[d] = (float(grp.idxmax()) if not grp.empty else np.nan)
             except Exception:
                 peak[d] = np.nan
@@ -58,16 +54,11 @@ class GammaSkewLeftRight(Indicator):
         density = {}
         for d in uniq:
             try:
-                snap = get_polygon_option_chain_snapshot(self.underlying, d)
-                if snap is None or snap.empty or 'gamma' not in snap.columns:
+                snap = chain_snapshot(self.underlying, d)
+                if snap.empty or not snap.has_gamma:
                     density[d] = None
                     continue
-                s = snap.copy()
-                g = pd.to_numeric(s['gamma'], errors='coerce').abs().fillna(0.0)
-                oi = pd.to_numeric(s.get('open_interest', 0.0), errors='coerce').fillna(0.0)
-                s['_g_oi'] = g * oi
-                grp = s.groupby('strike')['_g_oi'].sum()
-                density[d] = grp
+                density[d] = snap.gamma_oi_by_strike
             except Exception:
                 density[d] = None
         spot = pd.to_numeric(df[self.spot_col], errors='coerce').astype(float)
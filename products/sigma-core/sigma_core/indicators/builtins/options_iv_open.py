@@ -4,7 +4,7 @@ import numpy as np
 from datetime import datetime, time as dtime
 import pytz
 from ...data.sources.polygon import get_polygon_option_quotes
-from .iv_skew import implied_vol_newton
+from .iv_skew import _nearest_iv_by_group
 from ...data.sources.polygon import get_polygon_daily_bars
 
 
@@ -52,20 +52,21 @@ class ATMIVOpenDelta(Indicator):
         row = daily[daily['dd']==prev_day].tail(1)
         return float(pd.to_numeric(row['close'], errors='coerce').iloc[-1])
 
-    def _atm_iv_quotes(self, day: pd.Timestamp, expiry_date: pd.Timestamp, win: str, anchor: float) -> float:
+    def _quote_rows(self, day: pd.Timestamp, expiry_date: pd.Timestamp, win: str, anchor: float, group=None) -> list:
+        """(group, S, K, T, mid, side, anchor) rows for strikes in the band, sampled in `win` on day."""
         ET = pytz.timezone('US/Eastern')
         start_t, end_t = self._parse_win(win)
         lo = int(np.floor(anchor - self.strike_band))
         hi = int(np.ceil(anchor + self.strike_band))
-        best_iv, best_dist = float('nan'), float('inf')
         # Mid time for T
         mid_h = (start_t.hour + end_t.hour)//2
         mid_m = (start_t.minute + end_t.minute)//2
         sample_dt = ET.localize(datetime(day.year, day.month, day.day, mid_h, mid_m))
         expiry_dt = ET.localize(datetime(expiry_date.year, expiry_date.month, expiry_date.day, 16, 0))
         T = max((expiry_dt - sample_dt).total_seconds(), 0.0) / (365.0*24*3600.0)
+        rows = []
         if T <= 0:
-            return float('nan')
+            return rows
         for K in range(lo, hi+1):
             for side in ['call','put']:
                 try:
@@ -81,16 +82,13 @@ class ATMIVOpenDelta(Indicator):
                     mid = ((pd.to_numeric(qq['bid'], errors='coerce') + pd.to_numeric(qq['ask'], errors='coerce'))/2.0).replace([np.inf,-np.inf], np.nan).dropna()
                     if mid.empty:
                         continue
-                    price = float(mid.median())
-                    iv = implied_vol_newton(S=float(anchor), K=float(K), T=T, price=price, option_type=side)
-                    if not np.isfinite(iv) or iv <= 0:
-                        continue
-                    dist = abs(float(K) - float(anchor))
-                    if dist < best_dist:
-                        best_dist, best_iv = dist, float(iv)
+                    rows.append((group, float(anchor), float(K), T, float(mid.median()), side, float(anchor)))
                 except Exception:
                     continue
-        return best_iv
+        return rows
+
+    def _atm_iv_quotes(self, day: pd.Timestamp, expiry_date: pd.Timestamp, win: str, anchor: float) -> float:
+        return _nearest_iv_by_group(self._quote_rows(day, expiry_date, win, anchor)).get(None, float('nan'))
 
     def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
         out = pd.DataFrame(index=df.index)
@@ -100,18 +98,23 @@ class ATMIVOpenDelta(Indicator):
         ET = pytz.timezone('US/Eastern')
         dts = pd.to_datetime(df['date']).dt.tz_convert(ET)
         unique_days = sorted(set(dts.dt.date))
-        ivdelta = {}
+        # Collect prev-close and open quotes for every day, then solve all IVs in one batch
+        rows = []
         for d in unique_days:
             day_ts = ET.localize(datetime(d.year, d.month, d.day))
             # same-day expiry assumed for 0DTE
             expiry = day_ts
             anchor_prev = self._prev_close_anchor(day_ts)
             if not np.isfinite(anchor_prev):
-                ivdelta[d] = np.nan
                 continue
-            iv_prev = self._atm_iv_quotes(day_ts - pd.Timedelta(days=1), expiry, self.close_sampling_prev, anchor_prev)
+            rows += self._quote_rows(day_ts - pd.Timedelta(days=1), expiry, self.close_sampling_prev, anchor_prev, group=(d, 'prev'))
             anchor_open = anchor_prev  # approximate using prev close; could update using first prints if available
-            iv_open = self._atm_iv_quotes(day_ts, expiry, self.open_sampling, anchor_open)
+            rows += self._quote_rows(day_ts, expiry, self.open_sampling, anchor_open, group=(d, 'open'))
+        ivs = _nearest_iv_by_group(rows)
+        ivdelta = {}
+        for d in unique_days:
+            iv_prev = ivs.get((d, 'prev'), np.nan)
+            iv_open = ivs.get((d, 'open'), np.nan)
             if not np.isfinite(iv_prev) or not np.isfinite(iv_open):
                 ivdelta[d] = np.nan
             else:
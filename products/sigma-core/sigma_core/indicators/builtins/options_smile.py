@@ -4,7 +4,7 @@ import numpy as np
 from datetime import datetime, time as dtime
 import pytz
 from ...data.sources.polygon import get_polygon_option_quotes
-from .iv_skew import implied_vol_newton
+from .iv_skew import _nearest_iv_by_group
 
 
 class IVSmileWings(Indicator):
@@ -26,15 +26,21 @@ class IVSmileWings(Indicator):
         return self._wing_iv(day, anchor, 0, start_t, end_t)
 
     def _wing_iv(self, day: pd.Timestamp, anchor: float, offset: int, start_t, end_t) -> float:
+        rows = self._quote_rows(day, anchor, start_t, end_t)
+        return _nearest_iv_by_group((None,) + r[1:6] + (float(anchor + offset),) for r in rows).get(None, float('nan'))
+
+    def _quote_rows(self, day: pd.Timestamp, anchor: float, start_t, end_t) -> list:
+        """(None, S, K, T, mid, side, anchor) rows for strikes in the band, sampled in the window on day."""
         ET = pytz.timezone('US/Eastern')
         lo = int(np.floor(anchor - self.strike_band)); hi = int(np.ceil(anchor + self.strike_band))
-        K_target = float(anchor + offset)
-        best_iv, best_dist = float('nan'), float('inf')
         # approx T to 16:00 from mid-window
         mid_h=(start_t.hour+end_t.hour)//2; mid_m=(start_t.minute+end_t.minute)//2
         sample_dt = ET.localize(datetime(day.year, day.month, day.day, mid_h, mid_m))
         expiry_dt = ET.localize(datetime(day.year, day.month, day.day, 16, 0))
         T = max((expiry_dt - sample_dt).total_seconds(), 0.0)/(365.0*24*3600.0)
+        rows = []
+        if T <= 0:
+            return rows
         for K in range(lo, hi+1):
             for side in ['call','put']:
                 try:
@@ -45,16 +51,11 @@ class IVSmileWings(Indicator):
                     qq = q[m]
                     if qq.empty: continue
                     mid = ((pd.to_numeric(qq['bid'], errors='coerce') + pd.to_numeric(qq['ask'], errors='coerce'))/2.0).replace([np.inf,-np.inf], np.nan).dropna()
-                    if mid.empty or T<=0: continue
-                    price = float(mid.median())
-                    iv = implied_vol_newton(S=float(anchor), K=float(K), T=T, price=price, option_type=side)
-                    if not np.isfinite(iv) or iv<=0: continue
-                    dist = abs(float(K) - K_target)
-                    if dist < best_dist:
-                        best_dist, best_iv = dist, float(iv)
+                    if mid.empty: continue
+                    rows.append((None, float(anchor), float(K), T, float(mid.median()), side, float(anchor)))
                 except Exception:
                     continue
-        return best_iv
+        return rows
 
     def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
         out = pd.DataFrame(index=df.index)
@@ -70,18 +71,23 @@ class IVSmileWings(Indicator):
             anchors = pd.to_numeric(df.get('close', pd.Series(0.0, index=df.index)), errors='coerce')
         anchors_rounded = np.round(anchors).astype(float)
         start_t, end_t = self._parse_win(self.sampling)
-        smile_map = {}
+        # Fetch each day's quotes once; ATM and both wings pick from the same batch of IV solves
+        rows = []
         for d in days:
             try:
                 anchor_val = float(np.nanmean(anchors_rounded[dts.dt.date == d]))
-                iv_atm = self._atm_iv(ET.localize(datetime(d.year, d.month, d.day)), anchor_val, start_t, end_t)
-                iv_left = self._wing_iv(ET.localize(datetime(d.year, d.month, d.day)), anchor_val, -self.wing_points, start_t, end_t)
-                iv_right = self._wing_iv(ET.localize(datetime(d.year, d.month, d.day)), anchor_val, self.wing_points, start_t, end_t)
-                if np.isfinite(iv_atm) and np.isfinite(iv_left) and np.isfinite(iv_right):
-                    smile_map[d] = float(((iv_left + iv_right)/2.0) - iv_atm)
-                else:
-                    smile_map[d] = np.nan
+                day_rows = self._quote_rows(ET.localize(datetime(d.year, d.month, d.day)), anchor_val, start_t, end_t)
+                for leg, offset in (('atm', 0), ('left', -self.wing_points), ('right', self.wing_points)):
+                    rows += [((d, leg),) + r[1:6] + (float(anchor_val + offset),) for r in day_rows]
             except Exception:
+                continue
+        ivs = _nearest_iv_by_group(rows)
+        smile_map = {}
+        for d in days:
+            iv_atm, iv_left, iv_right = (ivs.get((d, leg), np.nan) for leg in ('atm', 'left', 'right'))
+            if np.isfinite(iv_atm) and np.isfinite(iv_left) and np.isfinite(iv_right):
+                smile_map[d] = float(((iv_left + iv_right)/2.0) - iv_atm)
+            else:
                 smile_map[d] = np.nan
         out['iv_smile_wings'] = dts.dt.date.map(lambda x: smile_map.get(x, np.nan)).astype(float)
         return out
@@ -2,7 +2,7 @@ from ..base import Indicator
 import pandas as pd
 import numpy as np
 from datetime import date
-from ...data.sources.polygon import get_polygon_option_chain_snapshot
+from ...data.chains import chain_snapshot
 
 
 class PCROI(Indicator):
@@ -22,17 +22,12 @@ class PCROI(Indicator):
         unique_days = sorted(set(dts))
         ratios = {}
         for d in unique_days:
-            try:
-                snap = get_polygon_option_chain_snapshot(self.underlying, d)
-            except Exception:
-                snap = pd.DataFrame()
-            if snap is None or snap.empty:
+            snap = chain_snapshot(self.underlying, d)
+            if snap.empty:
                 ratios[d] = np.nan
                 continue
             try:
-                s = snap.copy()
-                s['side'] = s['contract_type'].astype(str).str.lower()
-                agg = s.groupby('side')['open_interest'].sum()
+                agg = snap.oi_by_side
                 p = float(agg.get('put', 0.0))
                 c = float(agg.get('call', 0.0))
                 ratios[d] = (p + 1e-9) / (c + 1e-9)
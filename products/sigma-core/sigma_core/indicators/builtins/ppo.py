@@ -1,9 +1,12 @@
+from typing import Optional
 from ..base import Indicator
+from .. import intermediates as im
 import pandas as pd
 
 class PPO(Indicator):
     CATEGORY = "oscillator"
     SUBCATEGORY = "ppo"
+    GROUP_SAFE = True
 
     def __init__(self, column: str = 'close', fast: int = 12, slow: int = 26, signal: int = 9):
         self.column = column
@@ -11,18 +14,21 @@ class PPO(Indicator):
         self.slow = int(slow)
         self.signal = int(signal)
 
-    def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
+    def intermediates(self):
+        return [im.ema(self.column, self.fast), im.ema(self.column, self.slow)]
+
+    def calculate(self, df: pd.DataFrame, shared: Optional[im.Intermediates] = None) -> pd.DataFrame:
         out = pd.DataFrame(index=df.index)
         if self.column not in df.columns:
             out['ppo_line'] = 0.0
             out['ppo_signal'] = 0.0
             out['ppo_hist'] = 0.0
             return out
-        x = pd.to_numeric(df[self.column], errors='coerce').astype(float)
-        ema_fast = x.ewm(span=self.fast, adjust=False).mean()
-        ema_slow = x.ewm(span=self.slow, adjust=False).mean()
+        shared = shared if shared is not None else im.Intermediates(df)
+        ema_fast = shared.get(im.ema(self.column, self.fast))
+        ema_slow = shared.get(im.ema(self.column, self.slow))
         ppo_line = (ema_fast - ema_slow) / (ema_slow + 1e-12) * 100.0
-        ppo_signal = ppo_line.ewm(span=self.signal, adjust=False).mean()
+        ppo_signal = shared.ewm_mean(ppo_line, span=self.signal, adjust=False)
         ppo_hist = ppo_line - ppo_signal
         out['ppo_line'] = ppo_line.fillna(0.0)
         out['ppo_signal'] = ppo_signal.fillna(0.0)
@@ -1,4 +1,5 @@
 from ..base import Indicator
+from .. import incremental as inc
 import pandas as pd
 import numpy as np
 
@@ -63,3 +64,35 @@ class PSAR(Indicator):
         out['psar'] = pd.Series(psar, index=df.index)
         return out
 
+    def init_state(self):
+        return {"n": 0, "bull": True, "af": self.step, "ep": inc.NAN, "psar": inc.NAN,
+                "high_1": inc.NAN, "high_2": inc.NAN, "low_1": inc.NAN, "low_2": inc.NAN}
+
+    def update(self, state, bar):
+        high, low = inc.num(bar, "high"), inc.num(bar, "low")
+        if state["n"] == 0:
+            state.update(ep=high, psar=low)
+        else:
+            bull, af, ep = state["bull"], state["af"], state["ep"]
+            psar = state["psar"] + af * (ep - state["psar"])
+            if bull:
+                psar = min(psar, state["low_1"])
+                if state["n"] >= 2:
+                    psar = min(psar, state["low_2"])
+                if high > ep:
+                    ep = high
+                    af = min(af + self.step, self.max_step)
+                if low < psar:
+                    bull, psar, ep, af = False, ep, low, self.step
+            else:
+                psar = max(psar, state["high_1"])
+                if state["n"] >= 2:
+                    psar = max(psar, state["high_2"])
+                if low < ep:
+                    ep = low
+                    af = min(af + self.step, self.max_step)
+                if high > psar:
+                    bull, psar, ep, af = True, ep, high, self.step
+            state.update(bull=bull, af=af, ep=ep, psar=psar)
+        state.update(n=state["n"] + 1, high_2=state["high_1"], high_1=high, low_2=state["low_1"], low_1=low)
+        return {"psar": state["psar"]}
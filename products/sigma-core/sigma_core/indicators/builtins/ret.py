@@ -4,6 +4,7 @@ import pandas as pd
 class Ret(Indicator):
     CATEGORY = "price_trend"
     SUBCATEGORY = "returns"
+    WARMUP_FACTOR = 1
     """Return over N periods (pct change).
     Params: column: str='close', window: int=1
     Output: ret_{window}h
@@ -7,6 +7,7 @@ class ROC(Indicator):
     NAME = "roc"
     CATEGORY = "price"
     SUBCATEGORY = "momentum"
+    WARMUP_FACTOR = 1
 
     def __init__(self, column: str = "close", window: int = 10):
         self.column = column
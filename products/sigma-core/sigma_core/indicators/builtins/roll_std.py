@@ -4,6 +4,7 @@ import pandas as pd
 class RollingStd(Indicator):
     CATEGORY = "volatility"
     SUBCATEGORY = "rolling_std"
+    WARMUP_FACTOR = 1
     """Rolling standard deviation of returns.
     Params: column: str='close', window: int=20
     Output: roll_std_{window}
@@ -1,9 +1,14 @@
+from typing import Optional
 from ..base import Indicator
+from .. import incremental as inc
+from .. import intermediates as im
 import pandas as pd
 
 class RSI(Indicator):
     CATEGORY = "oscillator"
     SUBCATEGORY = "rsi"
+    WARMUP_FACTOR = 7  # Wilder smoothing
+    GROUP_SAFE = True
     """Wilder RSI over a column (default: close).
     Params: column: str = 'close', period: int = 14
     Output: rsi_{period}
@@ -12,19 +17,29 @@ class RSI(Indicator):
         self.column = column
         self.period = int(period)
 
-    def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
+    def intermediates(self):
+        return [im.rsi(self.column, self.period)]
+
+    def calculate(self, df: pd.DataFrame, shared: Optional[im.Intermediates] = None) -> pd.DataFrame:
         out = pd.DataFrame(index=df.index)
         if self.column not in df.columns:
             out[f"rsi_{self.period}"] = 0.0
             return out
-        series = df[self.column].astype(float)
-        delta = series.diff()
-        gain = delta.clip(lower=0.0)
-        loss = -delta.clip(upper=0.0)
-        # Wilder's smoothing via EMA with alpha = 1/period
-        avg_gain = gain.ewm(alpha=1.0/self.period, adjust=False).mean()
-        avg_loss = loss.ewm(alpha=1.0/self.period, adjust=False).mean()
-        rs = avg_gain / (avg_loss + 1e-12)
-        rsi = 100.0 - (100.0 / (1.0 + rs))
+        # Wilder's smoothing of gains/losses (shared with StochRSI and other RSI consumers)
+        shared = shared if shared is not None else im.Intermediates(df)
+        rsi = shared.get(im.rsi(self.column, self.period))
         out[f"rsi_{self.period}"] = rsi.fillna(0.0)
         return out
+
+    def init_state(self):
+        return {"prev": inc.NAN, "gain": inc.ewm_state(), "loss": inc.ewm_state()}
+
+    def update(self, state, bar):
+        x = inc.num(bar, self.column)
+        d = x - state["prev"]
+        state["prev"] = x
+        a = inc.alpha(alpha=1.0 / float(self.period))
+        avg_gain = inc.ewm_update(state["gain"], max(d, 0.0) if d == d else inc.NAN, a)
+        avg_loss = inc.ewm_update(state["loss"], -min(d, 0.0) if d == d else inc.NAN, a)
+        rsi = 100.0 - (100.0 / (1.0 + avg_gain / (avg_loss + 1e-12)))
+        return {f"rsi_{self.period}": inc.fill(rsi)}
@@ -1,4 +1,6 @@
+from typing import Optional
 from ..base import Indicator
+from .. import intermediates as im
 import pandas as pd
 import numpy as np
 
@@ -7,17 +9,22 @@ class SMA(Indicator):
     NAME = "sma"
     CATEGORY = "price"
     SUBCATEGORY = "moving_average"
+    WARMUP_FACTOR = 1
+    GROUP_SAFE = True
 
     def __init__(self, column: str = "close", window: int = 20):
         self.column = column
         self.window = int(window)
 
-    def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
+    def intermediates(self):
+        return [im.sma(self.column, self.window, max(1, self.window//2))]
+
+    def calculate(self, df: pd.DataFrame, shared: Optional[im.Intermediates] = None) -> pd.DataFrame:
         out = pd.DataFrame(index=df.index)
         if self.column not in df.columns:
             out[f"sma_{self.window}"] = float('nan')
             return out
-        s = pd.to_numeric(df[self.column], errors='coerce').astype(float)
-        out[f"sma_{self.window}"] = s.rolling(self.window, min_periods=max(1, self.window//2)).mean()
+        shared = shared if shared is not None else im.Intermediates(df)
+        out[f"sma_{self.window}"] = shared.get(im.sma(self.column, self.window, max(1, self.window//2)))
         return out
 
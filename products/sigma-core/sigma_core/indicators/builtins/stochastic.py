@@ -1,4 +1,5 @@
 from ..base import Indicator
+from .. import incremental as inc
 import pandas as pd
 
 class Stochastic(Indicator):
@@ -27,3 +28,14 @@ class Stochastic(Indicator):
         out['stoch_d'] = d.fillna(0.0)
         return out
 
+    def init_state(self):
+        return {"high": [], "low": [], "k": []}
+
+    def update(self, state, bar):
+        inc.push(state["high"], inc.num(bar, "high"), self.period_k)
+        inc.push(state["low"], inc.num(bar, "low"), self.period_k)
+        ll = inc.window_stat(state["low"], self.period_k, "min")
+        hh = inc.window_stat(state["high"], self.period_k, "max")
+        k = 100.0 * (inc.num(bar, "close") - ll) / (hh - ll + 1e-12)
+        d = inc.window_stat(inc.push(state["k"], k, self.period_d), self.period_d, "mean")
+        return {"stoch_k": inc.fill(k), "stoch_d": inc.fill(d)}
@@ -1,4 +1,7 @@
+from typing import Optional
 from ..base import Indicator
+from .. import incremental as inc
+from .. import intermediates as im
 import pandas as pd
 import numpy as np
 
@@ -12,25 +15,24 @@ class SuperTrend(Indicator):
         self.period = int(period)
         self.multiplier = float(multiplier)
 
-    def _atr(self, h: pd.Series, l: pd.Series, c: pd.Series, period: int) -> pd.Series:
-        prev_c = c.shift(1)
-        tr1 = h - l
-        tr2 = (h - prev_c).abs()
-        tr3 = (l - prev_c).abs()
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        return tr.rolling(period, min_periods=max(1, period//2)).mean()
+    def _range_key(self):
+        return im.sma(im.true_range(), self.period, max(1, self.period // 2))
 
-    def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
+    def intermediates(self):
+        return [im.col("high"), im.col("low"), im.col("close"), self._range_key()]
+
+    def calculate(self, df: pd.DataFrame, shared: Optional[im.Intermediates] = None) -> pd.DataFrame:
         out = pd.DataFrame(index=df.index)
         req = {'high','low','close'}
         if not req.issubset(df.columns):
             out['supertrend'] = float('nan')
             out['supertrend_dir'] = float('nan')
             return out
-        h = pd.to_numeric(df['high'], errors='coerce').astype(float)
-        l = pd.to_numeric(df['low'], errors='coerce').astype(float)
-        c = pd.to_numeric(df['close'], errors='coerce').astype(float)
-        atr = self._atr(h, l, c, self.period)
+        shared = shared if shared is not None else im.Intermediates(df)
+        h = shared.get(im.col("high"))
+        l = shared.get(im.col("low"))
+        c = shared.get(im.col("close"))
+        atr = shared.get(self._range_key())
         hl2 = (h + l) / 2.0
         upper_basic = hl2 + self.multiplier * atr
         lower_basic = hl2 - self.multiplier * atr
@@ -58,3 +60,26 @@ class SuperTrend(Indicator):
         out['supertrend_dir'] = direction
         return out
 
+    def init_state(self):
+        return {"n": 0, "tr": [], "prev_close": inc.NAN, "upper": inc.NAN, "lower": inc.NAN, "st": inc.NAN}
+
+    def update(self, state, bar):
+        h, l, c = inc.num(bar, "high"), inc.num(bar, "low"), inc.num(bar, "close")
+        prev_close = state["prev_close"]
+        inc.push(state["tr"], inc.true_range(h, l, prev_close), self.period)
+        atr = inc.window_stat(state["tr"], self.period, "mean", max(1, self.period // 2))
+        hl2 = (h + l) / 2.0
+        upper_basic = hl2 + self.multiplier * atr
+        lower_basic = hl2 - self.multiplier * atr
+        if state["n"] == 0:
+            upper, lower, st, direction = upper_basic, lower_basic, upper_basic, 1.0
+        else:
+            upper = min(upper_basic, state["upper"]) if prev_close > state["upper"] else upper_basic
+            lower = max(lower_basic, state["lower"]) if prev_close < state["lower"] else lower_basic
+            if state["st"] == state["upper"]:
+                st = lower if c > upper else upper
+            else:
+                st = upper if c < lower else lower
+            direction = 1.0 if c >= st else -1.0
+        state.update(n=state["n"] + 1, prev_close=c, upper=upper, lower=lower, st=st)
+        return {"supertrend": st, "supertrend_dir": direction}
@@ -1,4 +1,6 @@
+from typing import Optional
 from ..base import Indicator
+from .. import intermediates as im
 import pandas as pd
 import numpy as np
 
@@ -7,21 +9,26 @@ class TRIX(Indicator):
     NAME = "trix"
     CATEGORY = "price"
     SUBCATEGORY = "momentum"
+    GROUP_SAFE = True
 
     def __init__(self, column: str = "close", period: int = 15):
         self.column = column
         self.period = int(period)
 
-    def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _triple_key(self):
+        return im.ema(im.ema(im.ema(self.column, self.period), self.period), self.period)
+
+    def intermediates(self):
+        return [self._triple_key()]
+
+    def calculate(self, df: pd.DataFrame, shared: Optional[im.Intermediates] = None) -> pd.DataFrame:
         out = pd.DataFrame(index=df.index)
         if self.column not in df.columns:
             out[f"trix_{self.period}"] = float('nan')
             return out
-        s = pd.to_numeric(df[self.column], errors='coerce').astype(float)
-        e1 = s.ewm(span=self.period, adjust=False).mean()
-        e2 = e1.ewm(span=self.period, adjust=False).mean()
-        e3 = e2.ewm(span=self.period, adjust=False).mean()
-        trix = (e3.diff() / e3.shift(1)) * 100.0
+        shared = shared if shared is not None else im.Intermediates(df)
+        e3 = shared.get(self._triple_key())
+        trix = (shared.diff(e3) / shared.shift(e3, 1)) * 100.0
         out[f"trix_{self.period}"] = trix
         return out
 
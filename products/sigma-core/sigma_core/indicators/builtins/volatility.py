@@ -4,6 +4,7 @@ import pandas as pd
 class Volatility(Indicator):
     CATEGORY = "volatility"
     SUBCATEGORY = "realized"
+    WARMUP_FACTOR = 1
     def __init__(self, column: str = "close", window: int = 3):
         self.column = column
         self.window = int(window)
@@ -0,0 +1,192 @@
+"""Shared intermediate series for indicator sets.
+
+Indicators declare the primitives they read (true range, EMAs, Wilder smoothing, RSI, ...) as
+hashable keys built with the helpers below. `plan` expands the keys for a whole IndicatorSet into
+a dependency-ordered DAG and `Intermediates` evaluates each node once per frame, so e.g. ADX, ATR,
+Keltner and SuperTrend share one true range and MACD/PPO/EMA share the same EMA(close, span).
+
+With `groups` (one code per row, rows of a group contiguous and in time order) every window,
+shift and smoothing restarts at each group boundary, so a long (ticker, ts) frame for a whole
+universe evaluates each node once instead of once per ticker.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+Key = Tuple
+Source = Union[str, Key]
+
+logger = logging.getLogger(__name__)
+
+
+def _src(source: Source) -> Key:
+    return source if isinstance(source, tuple) else ("col", str(source))
+
+
+def col(name: str) -> Key:
+    """Numeric (coerced) float view of a frame column."""
+    return ("col", str(name))
+
+
+def true_range() -> Key:
+    return ("true_range",)
+
+
+def ema(source: Source, span: int) -> Key:
+    return ("ema", _src(source), int(span))
+
+
+def wilder(source: Source, period: int) -> Key:
+    """Wilder smoothing (EMA with alpha = 1/period)."""
+    return ("wilder", _src(source), int(period))
+
+
+def sma(source: Source, window: int, min_periods: Optional[int] = None) -> Key:
+    return ("sma", _src(source), int(window), None if min_periods is None else int(min_periods))
+
+
+def gain(source: Source) -> Key:
+    return ("gain", _src(source))
+
+
+def loss(source: Source) -> Key:
+    return ("loss", _src(source))
+
+
+def rsi(source: Source, period: int) -> Key:
+    """Wilder RSI (unfilled; callers apply their own fill)."""
+    return ("rsi", _src(source), int(period))
+
+
+def deps(key: Key) -> Tuple[Key, ...]:
+    kind = key[0]
+    if kind == "col":
+        return ()
+    if kind == "true_range":
+        return (col("high"), col("low"), col("close"))
+    if kind in ("ema", "wilder", "sma", "gain", "loss"):
+        return (key[1],)
+    if kind == "rsi":
+        return (wilder(gain(key[1]), key[2]), wilder(loss(key[1]), key[2]))
+    raise KeyError(f"unknown intermediate: {key!r}")
+
+
+def plan(keys: Iterable[Key]) -> List[Key]:
+    """Dependency-ordered, de-duplicated list of every node needed for `keys`."""
+    order: List[Key] = []
+    seen = set()
+
+    def _visit(k: Key) -> None:
+        if k in seen:
+            return
+        seen.add(k)
+        for d in deps(k):
+            _visit(d)
+        order.append(k)
+
+    for k in keys:
+        _visit(k)
+    return order
+
+
+def _by(s: pd.Series, groups: Optional[np.ndarray]):
+    return s if groups is None else s.groupby(groups, sort=False)
+
+
+def _ungroup(s: pd.Series, groups: Optional[np.ndarray]) -> pd.Series:
+    # Grouped window results are indexed (group, row); contiguous groups keep the row order
+    return s if groups is None else s.droplevel(0)
+
+
+def _true_range(v: Callable[[Key], pd.Series], groups: Optional[np.ndarray] = None) -> pd.Series:
+    high, low, close = v(col("high")), v(col("low")), v(col("close"))
+    prev_close = _by(close, groups).shift(1)
+    tr = np.fmax(np.fmax((high - low).abs(), (high - prev_close).abs()), (low - prev_close).abs())
+    return pd.Series(tr, index=close.index)
+
+
+def _evaluate(key: Key, df: pd.DataFrame, v: Callable[[Key], pd.Series], groups: Optional[np.ndarray] = None) -> pd.Series:
+    kind = key[0]
+    if kind == "col":
+        return pd.to_numeric(df[key[1]], errors="coerce").astype(float)
+    if kind == "true_range":
+        return _true_range(v, groups)
+    if kind == "ema":
+        return _ungroup(_by(v(key[1]), groups).ewm(span=key[2], adjust=False).mean(), groups)
+    if kind == "wilder":
+        return _ungroup(_by(v(key[1]), groups).ewm(alpha=1.0 / float(key[2]), adjust=False).mean(), groups)
+    if kind == "sma":
+        return _ungroup(_by(v(key[1]), groups).rolling(key[2], min_periods=key[3]).mean(), groups)
+    if kind == "gain":
+        return _by(v(key[1]), groups).diff().clip(lower=0.0)
+    if kind == "loss":
+        return -_by(v(key[1]), groups).diff().clip(upper=0.0)
+    if kind == "rsi":
+        avg_gain = v(wilder(gain(key[1]), key[2]))
+        avg_loss = v(wilder(loss(key[1]), key[2]))
+        rs = avg_gain / (avg_loss + 1e-12)
+        return 100.0 - (100.0 / (1.0 + rs))
+    raise KeyError(f"unknown intermediate: {key!r}")
+
+
+class Intermediates:
+    """Per-frame memo of intermediate series; `get` computes missing nodes (and their deps) once."""
+
+    def __init__(self, df: pd.DataFrame, groups: Optional[np.ndarray] = None):
+        self.df = df
+        self.groups = None if groups is None else np.asarray(groups)
+        self._values: Dict[Key, pd.Series] = {}
+        self.computed = 0
+
+    def rebind(self, df: pd.DataFrame) -> None:
+        """Point at a wider frame with the same rows (e.g. after earlier outputs were attached)."""
+        self.df = df
+
+    def __contains__(self, key: Key) -> bool:
+        return key in self._values
+
+    def get(self, key: Key) -> pd.Series:
+        val = self._values.get(key)
+        if val is None:
+            val = _evaluate(key, self.df, self.get, self.groups)
+            self._values[key] = val
+            self.computed += 1
+        return val
+
+    # Window ops on derived series, restarted per group like the cached nodes
+    def shift(self, s: pd.Series, periods: int = 1) -> pd.Series:
+        return _by(s, self.groups).shift(periods)
+
+    def diff(self, s: pd.Series, periods: int = 1) -> pd.Series:
+        return _by(s, self.groups).diff(periods)
+
+    def pct_change(self, s: pd.Series, periods: int = 1) -> pd.Series:
+        return _by(s, self.groups).pct_change(periods)
+
+    def cumsum(self, s: pd.Series) -> pd.Series:
+        return _by(s, self.groups).cumsum()
+
+    def ewm_mean(self, s: pd.Series, **kwargs) -> pd.Series:
+        return _ungroup(_by(s, self.groups).ewm(**kwargs).mean(), self.groups)
+
+    def rolling(self, s: pd.Series, window: int, stat: str = "mean", min_periods: Optional[int] = None) -> pd.Series:
+        return _ungroup(getattr(_by(s, self.groups).rolling(window, min_periods=min_periods), stat)(), self.groups)
+
+    def prefetch(self, keys: Iterable[Key]) -> int:
+        """Evaluate the planned DAG for `keys`; nodes whose inputs are missing are skipped."""
+        failed = set()
+        for k in plan(keys):
+            if k in self._values or any(d in failed for d in deps(k)):
+                if k not in self._values:
+                    failed.add(k)
+                continue
+            try:
+                self.get(k)
+            except Exception as e:
+                failed.add(k)
+                logger.debug("intermediate %r unavailable: %s", k, e)
+        return len(self._values)
@@ -1,5 +1,20 @@
-"""Live runtime controller (skeleton stub)."""
+"""Live runtime controller.
 
-def run_once():
-    pass
+`run_once` advances a `StreamingIndicators` (see `indicators.incremental`) by the newest bar of
+each ticker; the caller owns the stream and checkpoints it between runs.
+"""
+import logging
+from typing import Any, Dict, Mapping
 
+logger = logging.getLogger(__name__)
+
+
+def run_once(stream, bars: Mapping[str, Mapping[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """Feed `{ticker: bar}` to the stream; returns `{ticker: features}` for the bars that updated."""
+    out: Dict[str, Dict[str, float]] = {}
+    for ticker, bar in (bars or {}).items():
+        try:
+            out[ticker] = stream.update(bar, key=ticker)
+        except Exception as e:
+            logger.warning("live update failed for %s: %s", ticker, e)
+    return out
@@ -0,0 +1,218 @@
+"""Single-pass XGBoost training: early stopping on a time-ordered tail, held-out calibration, warm start.
+
+The full path (`XGBClassifier` + `CalibratedClassifierCV(cv=3)`) fits 300 trees four times. Here the
+training and validation `QuantileDMatrix` are built once, boosting stops when the validation tail
+(the most recent sessions) stops improving, and the probabilities are calibrated on that same tail.
+With `warm_from` (a previous bundle) the earlier booster is continued for at most `warm_rounds`
+extra trees when the matrix only gained newer rows; anything else falls back to a fresh fit.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import xgboost as xgb
+except Exception:  # pragma: no cover - optional dependency
+    xgb = None
+try:
+    from sklearn.isotonic import IsotonicRegression
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.preprocessing import LabelEncoder
+except Exception:  # pragma: no cover - optional dependency
+    IsotonicRegression = LogisticRegression = LabelEncoder = None
+
+# Same tree settings as the XGBClassifier used by the full training path
+DEFAULT_PARAMS: Dict[str, Any] = {
+    'max_depth': 4,
+    'eta': 0.08,
+    'subsample': 0.9,
+    'colsample_bytree': 0.9,
+    'tree_method': 'hist',
+    'seed': 2025,
+}
+MIN_CALIBRATION_ROWS = 30
+
+
+class BoosterClassifier:
+    """Picklable predict_proba wrapper around a Booster plus optional per-class calibrators."""
+
+    def __init__(self, booster, n_classes: int, calibrators: Optional[List[Any]] = None, calibration: Optional[str] = None):
+        self.booster = booster
+        self.n_classes = int(n_classes)
+        self.classes_ = np.arange(self.n_classes)
+        self.n_features_in_ = int(booster.num_features())
+        self.calibrators = calibrators
+        self.calibration = calibration if calibrators else None
+
+    def raw_proba(self, X) -> np.ndarray:
+        dm = X if isinstance(X, xgb.DMatrix) else xgb.DMatrix(np.asarray(X, dtype=np.float32))
+        return _as_proba(self.booster.predict(dm), self.n_classes)
+
+    def predict_proba(self, X) -> np.ndarray:
+        return _calibrate(self.raw_proba(X), self.calibrators, self.n_classes)
+
+    def predict(self, X) -> np.ndarray:
+        return np.argmax(self.predict_proba(X), axis=1)
+
+
+def _as_proba(pred: np.ndarray, k: int) -> np.ndarray:
+    if k == 2 and pred.ndim == 1:
+        return np.column_stack([1.0 - pred, pred])
+    return pred
+
+
+def _logit(p: np.ndarray) -> np.ndarray:
+    p = np.clip(p, 1e-6, 1 - 1e-6)
+    return np.log(p / (1 - p)).reshape(-1, 1)
+
+
+def _fit_calibrators(proba: np.ndarray, y: np.ndarray, k: int, method: str) -> Optional[List[Any]]:
+    """One-vs-rest calibrators (Platt on log-odds or isotonic); binary calibrates the positive class only."""
+    if method not in ('sigmoid', 'isotonic') or len(y) < MIN_CALIBRATION_ROWS:
+        return None
+    out: List[Any] = []
+    for c in ([1] if k == 2 else range(k)):
+        target = (y == c).astype(int)
+        if target.min() == target.max():
+            out.append(None)  # class absent (or alone) in the tail: keep raw probabilities
+            continue
+        if method == 'sigmoid':
+            cal = LogisticRegression(C=1e6).fit(_logit(proba[:, c]), target)
+        else:
+            cal = IsotonicRegression(y_min=0.0, y_max=1.0, out_of_bounds='clip').fit(proba[:, c], target)
+        out.append(cal)
+    return out if any(c is not None for c in out) else None
+
+
+def _calibrate(proba: np.ndarray, calibrators: Optional[List[Any]], k: int) -> np.ndarray:
+    if not calibrators:
+        return proba
+    cols = [1] if k == 2 else range(k)
+    out = proba.copy()
+    for c, cal in zip(cols, calibrators):
+        if cal is None:
+            continue
+        if isinstance(cal, LogisticRegression):
+            out[:, c] = cal.predict_proba(_logit(proba[:, c]))[:, 1]
+        else:
+            out[:, c] = cal.predict(proba[:, c])
+    if k == 2:
+        out[:, 0] = 1.0 - out[:, 1]
+        return out
+    s = out.sum(axis=1, keepdims=True)
+    return np.where(s > 0, out / np.where(s > 0, s, 1.0), 1.0 / k)
+
+
+def time_order(df: pd.DataFrame) -> pd.Series:
+    """Row timestamps (date + hour_et when present, else the row position as nanoseconds)."""
+    if {'date', 'hour_et'}.issubset(df.columns):
+        return pd.to_datetime(df['date']) + pd.to_timedelta(pd.to_numeric(df['hour_et'], errors='coerce').fillna(0), unit='h')
+    if 'date' in df.columns:
+        return pd.to_datetime(df['date'])
+    return pd.Series(pd.to_datetime(np.arange(len(df)), unit='ns'), index=df.index)
+
+
+def _tail_start(ts: np.ndarray, valid_frac: float) -> int:
+    """First row of the validation tail, moved back so no timestamp straddles the cut."""
+    n = len(ts)
+    cut = int(round(n * (1.0 - valid_frac)))
+    if cut <= 0 or cut >= n:
+        return n
+    return int(np.searchsorted(ts, ts[cut], side='left'))
+
+
+def _warm_check(prev: Any, meta: Dict[str, Any]) -> Tuple[Optional[Any], str]:
+    """Previous booster if the new matrix only appended rows to the one it was trained on."""
+    if not isinstance(prev, dict):
+        return None, 'no previous bundle'
+    model = prev.get('model')
+    pm = prev.get('train_meta') or {}
+    if not isinstance(model, BoosterClassifier):
+        return None, 'previous model was not trained with early stopping'
+    for key in ('features', 'classes', 'target', 'allowed_hours'):
+        if pm.get(key) != meta.get(key):
+            return None, f'{key} changed'
+    if not pm.get('last_ts') or meta['last_ts'] <= pm['last_ts'] or meta['rows'] <= int(pm.get('rows') or 0):
+        return None, 'no new sessions'
+    return model, 'ok'
+
+
+def train_booster(
+    df: pd.DataFrame,
+    features: Sequence[str],
+    y_col: str,
+    *,
+    calibration: Optional[str] = 'sigmoid',
+    allowed_hours: Optional[Sequence[int]] = None,
+    num_boost_round: int = 300,
+    early_stopping_rounds: int = 30,
+    valid_frac: float = 0.2,
+    warm_from: Optional[Dict[str, Any]] = None,
+    warm_rounds: int = 50,
+    params: Optional[Dict[str, Any]] = None,
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Fit on the head of a time-ordered frame; returns (bundle for gbm.pkl, training info)."""
+    if xgb is None or LabelEncoder is None:
+        raise RuntimeError('Training dependencies missing')
+    df = df[df[y_col].notna()]
+    ts = time_order(df)
+    order = np.argsort(ts.to_numpy(), kind='stable')
+    df, ts = df.iloc[order], ts.iloc[order].to_numpy()
+    X = df[list(features)].fillna(0.0).to_numpy(dtype=np.float32)
+    le = LabelEncoder()
+    y = le.fit_transform(df[y_col].astype(str).to_numpy())
+    k = len(le.classes_)
+    if k < 2:
+        raise ValueError(f"target '{y_col}' has a single class")
+    meta = {
+        'features': list(features),
+        'classes': [str(c) for c in le.classes_],
+        'target': y_col,
+        'allowed_hours': sorted(int(h) for h in allowed_hours) if allowed_hours else None,
+        'rows': int(len(df)),
+        'last_ts': str(pd.Timestamp(ts[-1])) if len(ts) else None,
+    }
+    prev, warm_reason = _warm_check(warm_from, meta) if warm_from is not None else (None, 'not requested')
+
+    cut = _tail_start(ts, valid_frac)
+    dtrain = xgb.QuantileDMatrix(X[:cut], label=y[:cut])
+    dvalid = xgb.QuantileDMatrix(X[cut:], label=y[cut:], ref=dtrain) if cut < len(y) else None
+    p = dict(DEFAULT_PARAMS)
+    p.update(params or {})
+    if k == 2:
+        p.update(objective='binary:logistic', eval_metric='logloss')
+    else:
+        p.update(objective='multi:softprob', num_class=k, eval_metric='mlogloss')
+    prior = prev.booster.num_boosted_rounds() if prev is not None else 0
+    booster = xgb.train(
+        p, dtrain,
+        num_boost_round=int(warm_rounds if prev is not None else num_boost_round),
+        evals=[(dvalid, 'valid')] if dvalid is not None else (),
+        early_stopping_rounds=int(early_stopping_rounds) if dvalid is not None else None,
+        xgb_model=prev.booster if prev is not None else None,
+        verbose_eval=False,
+    )
+    best = getattr(booster, 'best_iteration', None) if dvalid is not None else None
+    if best is not None and best + 1 < booster.num_boosted_rounds():
+        booster = booster[: best + 1]
+
+    calibrators = None
+    if dvalid is not None and calibration in ('sigmoid', 'isotonic'):
+        calibrators = _fit_calibrators(_as_proba(booster.predict(dvalid), k), y[cut:], k, calibration)
+    model = BoosterClassifier(booster, k, calibrators, calibration)
+    meta['params'] = {key: v for key, v in p.items() if key != 'num_class'}
+    info = {
+        'mode': 'warm' if prev is not None else 'fresh',
+        'warm_start': warm_reason,
+        'train_rows': int(cut),
+        'valid_rows': int(len(y) - cut),
+        'trees_added': int(booster.num_boosted_rounds() - prior),
+        'rounds': int(booster.num_boosted_rounds()),
+        'best_iteration': None if best is None else int(best),
+        'calibration': model.calibration,
+    }
+    bundle = {'model': model, 'features': list(features), 'label_encoder': le, 'train_meta': meta}
+    return bundle, info
@@ -11,6 +11,7 @@ from sklearn.metrics import classification_report, confusion_matrix
 
 from ..cv.splits import PurgedEmbargoedWalkForwardSplit
 from ..features.builder import select_features
+from .booster import train_booster
 
 
 def main():
@@ -20,6 +21,9 @@ def main():
     parser.add_argument("--model_out", type=str, default="models/gbm_0dte.pkl", help="Output path for model")
     parser.add_argument("--splits", type=int, default=3, help="Number of walk-forward splits")
     parser.add_argument("--allowed_hours", type=str, default=None, help="Comma-separated ET hours to include (e.g., 13,14,15)")
+    parser.add_argument("--early_stopping", action="store_true", help="Single pass: early stopping and calibration on the latest sessions")
+    parser.add_argument("--warm_start", action="store_true", help="Continue the booster in --model_out when only new sessions were appended")
+    parser.add_argument("--calibration", type=str, default="sigmoid", help="Held-out calibration for --early_stopping: sigmoid, isotonic or none")
     args = parser.parse_args()
 
     df = pd.read_csv(args.csv)
@@ -45,6 +49,15 @@ def main():
     # Drop rows with missing target
     df = df[df[y_col].notna()].reset_index(drop=True)
 
+    if args.early_stopping or args.warm_start:
+        prev = joblib.load(args.model_out) if args.warm_start and Path(args.model_out).exists() else None
+        allowed_hours = [int(x) for x in args.allowed_hours.split(',') if x.strip()] if args.allowed_hours else None
+        bundle, info = train_booster(df, select_features(df), y_col, calibration=args.calibration, allowed_hours=allowed_hours, warm_from=prev)
+        Path(args.model_out).parent.mkdir(parents=True, exist_ok=True)
+        joblib.dump(bundle, args.model_out)
+        print(f"Saved model to {args.model_out} ({info['mode']}, {info['rounds']} rounds, warm start: {info['warm_start']})")
+        return
+
     # Derive timestamp for ordering (after filtering)
     if {"date", "hour_et"}.issubset(df.columns):
         ts = pd.to_datetime(df["date"]) + pd.to_timedelta(df["hour_et"], unit="h")
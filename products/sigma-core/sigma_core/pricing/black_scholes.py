@@ -0,0 +1,138 @@
+"""Vectorized Black-Scholes pricing, greeks and implied volatility.
+
+Every function broadcasts over NumPy arrays (or scalars) of S, K, T, sigma/price and option type,
+so a whole chain or a year of sampled quotes is priced or inverted in one call. Conventions follow
+the scalar helpers previously in `indicators/builtins/iv_skew.py`: T in years, continuous r and q,
+intrinsic (undiscounted) value when T <= 0 or sigma <= 0.
+"""
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+try:
+    from scipy.special import ndtr as _ndtr
+except Exception:  # scipy is optional; fall back to math.erf element-wise
+    _ndtr = None
+
+_SQRT2 = math.sqrt(2.0)
+_INV_SQRT_2PI = 1.0 / math.sqrt(2.0 * math.pi)
+_erf = np.frompyfunc(math.erf, 1, 1)
+
+
+def norm_cdf(x):
+    x = np.asarray(x, dtype=float)
+    if _ndtr is not None:
+        return _ndtr(x)
+    return 0.5 * (1.0 + _erf(x / _SQRT2).astype(float))
+
+
+def norm_pdf(x):
+    x = np.asarray(x, dtype=float)
+    return _INV_SQRT_2PI * np.exp(-0.5 * x * x)
+
+
+def is_call(option_type) -> np.ndarray:
+    """Boolean array from 'call'/'put' strings (or booleans)."""
+    arr = np.asarray(option_type)
+    if arr.dtype == bool:
+        return arr
+    return np.char.lower(arr.astype(str)) == 'call'
+
+
+def _d1_d2(S, K, T, sigma, r, q):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        vol_t = sigma * np.sqrt(T)
+        d1 = (np.log((S + 1e-12) / (K + 1e-12)) + (r - q + 0.5 * sigma * sigma) * T) / vol_t
+    return d1, d1 - vol_t
+
+
+def bs_price(S, K, T, sigma, r=0.0, q=0.0, option_type='call') -> np.ndarray:
+    S, K, T, sigma, r, q = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (S, K, T, sigma, r, q)))
+    call = np.broadcast_to(is_call(option_type), S.shape)
+    d1, d2 = _d1_d2(S, K, T, sigma, r, q)
+    disc_q = np.exp(-q * T)
+    disc_r = np.exp(-r * T)
+    c = S * disc_q * norm_cdf(d1) - K * disc_r * norm_cdf(d2)
+    p = K * disc_r * norm_cdf(-d2) - S * disc_q * norm_cdf(-d1)
+    price = np.where(call, c, p)
+    expired = (T <= 0) | (sigma <= 0)
+    intrinsic = np.where(call, np.maximum(S - K, 0.0), np.maximum(K - S, 0.0))
+    return np.where(expired, intrinsic, price)
+
+
+def bs_greeks(S, K, T, sigma, r=0.0, q=0.0, option_type='call') -> dict:
+    """delta, gamma, vega (per 1.00 vol), theta (per year) and rho as arrays; NaN where T/sigma <= 0."""
+    S, K, T, sigma, r, q = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (S, K, T, sigma, r, q)))
+    call = np.broadcast_to(is_call(option_type), S.shape)
+    d1, d2 = _d1_d2(S, K, T, sigma, r, q)
+    disc_q = np.exp(-q * T)
+    disc_r = np.exp(-r * T)
+    pdf = norm_pdf(d1)
+    sqrt_t = np.sqrt(np.where(T > 0, T, np.nan))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        gamma = disc_q * pdf / (S * sigma * sqrt_t)
+        theta_common = -S * disc_q * pdf * sigma / (2.0 * sqrt_t)
+    delta = np.where(call, disc_q * norm_cdf(d1), -disc_q * norm_cdf(-d1))
+    vega = S * disc_q * pdf * sqrt_t
+    theta = np.where(
+        call,
+        theta_common - r * K * disc_r * norm_cdf(d2) + q * S * disc_q * norm_cdf(d1),
+        theta_common + r * K * disc_r * norm_cdf(-d2) - q * S * disc_q * norm_cdf(-d1),
+    )
+    rho = np.where(call, K * T * disc_r * norm_cdf(d2), -K * T * disc_r * norm_cdf(-d2))
+    bad = (T <= 0) | (sigma <= 0)
+    return {k: np.where(bad, np.nan, v) for k, v in
+            {'delta': delta, 'gamma': gamma, 'vega': vega, 'theta': theta, 'rho': rho}.items()}
+
+
+def implied_vol(price, S, K, T, r=0.0, q=0.0, option_type='call', *, tol: float = 1e-6,
+                max_iter: int = 100, lo: float = 1e-4, hi: float = 5.0) -> np.ndarray:
+    """Implied volatility for arrays of option prices (NaN where no solution in [lo, hi]).
+
+    Safeguarded Newton: each element keeps a bracket [a, b] with price(a) <= target <= price(b)
+    (BS price is increasing in sigma); a Newton step that leaves the bracket or has ~zero vega
+    falls back to bisection, so deep OTM / near-expiry contracts still converge.
+    """
+    price, S, K, T, r, q = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (price, S, K, T, r, q)))
+    call = np.broadcast_to(is_call(option_type), S.shape)
+    out = np.full(S.shape, np.nan)
+    ok = np.isfinite(price) & np.isfinite(S) & np.isfinite(K) & np.isfinite(T) & (price > 0) & (S > 0) & (K > 0) & (T > 0)
+    if not ok.any():
+        return out
+    p, s, k, t, rr, qq, c = (a[ok] for a in (price, S, K, T, r, q, call))
+    a = np.full(p.shape, float(lo))
+    b = np.full(p.shape, float(hi))
+    f_lo = bs_price(s, k, t, a, rr, qq, c) - p
+    f_hi = bs_price(s, k, t, b, rr, qq, c) - p
+    # Outside the bracket's price range (incl. no resolvable time value) -> no solution
+    live = (f_lo < -1e-10 * np.maximum(p, 1.0)) & (f_hi >= 0)
+    sigma = np.clip(np.full(p.shape, 0.3), a, b)
+    res = np.full(p.shape, np.nan)
+    for _ in range(int(max_iter)):
+        idx = np.flatnonzero(live & np.isnan(res))
+        if not len(idx):
+            break
+        sg = sigma[idx]
+        diff = bs_price(s[idx], k[idx], t[idx], sg, rr[idx], qq[idx], c[idx]) - p[idx]
+        # Tighten the bracket around the root
+        above = diff > 0
+        b[idx] = np.where(above, sg, b[idx])
+        a[idx] = np.where(above, a[idx], sg)
+        d1, _ = _d1_d2(s[idx], k[idx], t[idx], sg, rr[idx], qq[idx])
+        vega = s[idx] * np.exp(-qq[idx] * t[idx]) * norm_pdf(d1) * np.sqrt(t[idx])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            step = sg - diff / vega
+        bisect = ~np.isfinite(step) | (vega < 1e-10) | (step < a[idx]) | (step > b[idx])
+        new = np.where(diff == 0, sg, np.where(bisect, 0.5 * (a[idx] + b[idx]), step))
+        done = (np.abs(new - sg) < tol) | ((b[idx] - a[idx]) < tol)
+        res[idx[done]] = new[done]
+        sigma[idx] = new
+    out[ok] = res
+    return out
+
+
+def implied_vol_scalar(S, K, T, price, r=0.0, q=0.0, option_type='call') -> float:
+    """Convenience scalar wrapper (float in, float out)."""
+    return float(implied_vol(price, S, K, T, r, q, option_type)[()])
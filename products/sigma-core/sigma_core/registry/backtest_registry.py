@@ -4,6 +4,7 @@ from psycopg2.extras import RealDictCursor
 from datetime import datetime
 
 from sigma_core.storage.relational import get_db
+from sigma_core.registry.bulk import copy_insert
 
 
 def create_backtest_run(
@@ -87,23 +88,21 @@ def leaderboard(
 
 
 def create_backtest_folds(run_id: int, folds: List[Dict[str, Any]]) -> None:
+    """Bulk-insert per-fold rows for a run (COPY, see `registry.bulk`)."""
     if not folds:
         return
+    rows = [
+        (
+            run_id,
+            int(r.get("fold", 0)),
+            (float(r.get("thr")) if r.get("thr") is not None else None),
+            float(r.get("cum_ret", 0.0)),
+            float(r.get("sharpe_hourly", 0.0)),
+            int(r.get("trades", 0)),
+        )
+        for r in folds
+    ]
     with get_db() as conn:
         with conn.cursor() as cur:
-            for r in folds:
-                cur.execute(
-                    """
-                    INSERT INTO backtest_folds (run_id, fold, thr_used, cum_ret, sharpe_hourly, trades)
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                    """,
-                    (
-                        run_id,
-                        int(r.get("fold", 0)),
-                        (float(r.get("thr")) if r.get("thr") is not None else None),
-                        float(r.get("cum_ret", 0.0)),
-                        float(r.get("sharpe_hourly", 0.0)),
-                        int(r.get("trades", 0)),
-                    ),
-                )
+            copy_insert(cur, "backtest_folds", ["run_id", "fold", "thr_used", "cum_ret", "sharpe_hourly", "trades"], rows)
             conn.commit()
@@ -0,0 +1,124 @@
+"""Bulk writes through COPY.
+
+Rows (a DataFrame, dicts or tuples) are streamed as CSV in chunks into a temp staging table shaped
+like the target (`CREATE TEMP TABLE ... AS SELECT cols FROM target WITH NO DATA`, plus a row number)
+and merged with a single INSERT ... SELECT per chunk, optionally `ON CONFLICT`. Memory stays bounded
+by the chunk size and there is no per-row parameter binding on the client.
+"""
+from __future__ import annotations
+
+import csv
+import io
+import json
+import math
+from datetime import date, datetime
+from typing import Any, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+COPY_CHUNK_ROWS = 50_000
+_NULL = "\\N"
+_SEQ = "_bulk_seq"
+
+
+def _csv_value(v: Any) -> str:
+    if v is None or v is pd.NaT:
+        return _NULL
+    if isinstance(v, np.generic):
+        v = v.item()
+    if isinstance(v, bool):
+        return "t" if v else "f"
+    if isinstance(v, float):
+        if math.isnan(v) or math.isinf(v):
+            return _NULL
+        # Integral floats (pandas upcasts int columns with gaps) must also load into INTEGER columns
+        return str(int(v)) if v.is_integer() and abs(v) < 1e15 else repr(v)
+    if isinstance(v, (datetime, date)):
+        return v.isoformat()
+    if isinstance(v, (dict, list)):
+        return json.dumps(v, default=str)
+    return str(v)
+
+
+def iter_rows(rows: Any, columns: Sequence[str]) -> Iterator[tuple]:
+    """Tuples in `columns` order from a DataFrame (missing columns are NULL), dicts or tuples."""
+    if isinstance(rows, pd.DataFrame):
+        frame = rows.reindex(columns=list(columns))
+        yield from frame.astype(object).where(frame.notna(), None).itertuples(index=False, name=None)
+        return
+    for r in rows:
+        yield tuple(r.get(c) for c in columns) if isinstance(r, dict) else tuple(r)
+
+
+def write_csv(rows: Iterable[tuple], buf: io.StringIO) -> int:
+    w = csv.writer(buf, lineterminator="\n")
+    n = 0
+    for r in rows:
+        w.writerow([_csv_value(v) for v in r])
+        n += 1
+    return n
+
+
+def _chunks(it: Iterator[tuple], size: int) -> Iterator[List[tuple]]:
+    chunk: List[tuple] = []
+    for r in it:
+        chunk.append(r)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def copy_merge(
+    cur,
+    table: str,
+    columns: Sequence[str],
+    rows: Any,
+    *,
+    conflict: Optional[Sequence[str]] = None,
+    update: Optional[Sequence[str]] = None,
+    chunk_rows: int = COPY_CHUNK_ROWS,
+) -> int:
+    """COPY `rows` into `table` on the caller's cursor (the caller commits); returns rows staged.
+
+    With `conflict` the merge is `ON CONFLICT (conflict) DO UPDATE SET update...` (or DO NOTHING
+    when `update` is empty); duplicate keys within a chunk keep the last row, by the row number
+    staged with each row (physical order in the staging table is not relied on).
+    """
+    cols = ", ".join(columns)
+    stage = f"_bulk_{table}"
+    select = f"SELECT {cols} FROM {stage}"
+    if conflict:
+        keys = ", ".join(conflict)
+        select = f"SELECT DISTINCT ON ({keys}) {cols} FROM {stage} ORDER BY {keys}, {_SEQ} DESC"
+    merge = f"INSERT INTO {table} ({cols}) {select}"
+    if conflict:
+        sets = ", ".join(f"{c} = EXCLUDED.{c}" for c in (update or []))
+        merge += f" ON CONFLICT ({', '.join(conflict)}) " + (f"DO UPDATE SET {sets}" if sets else "DO NOTHING")
+
+    cur.execute(f"DROP TABLE IF EXISTS {stage}")
+    cur.execute(f"CREATE TEMP TABLE {stage} AS SELECT {cols}, 0::bigint AS {_SEQ} FROM {table} WITH NO DATA")
+    total = 0
+    for chunk in _chunks(iter_rows(rows, columns), max(1, int(chunk_rows))):
+        buf = io.StringIO()
+        total += write_csv((r + (i,) for i, r in enumerate(chunk)), buf)
+        buf.seek(0)
+        cur.copy_expert(f"COPY {stage} ({cols}, {_SEQ}) FROM STDIN WITH (FORMAT csv, NULL '{_NULL}')", buf)
+        cur.execute(merge)
+        cur.execute(f"TRUNCATE {stage}")
+    cur.execute(f"DROP TABLE IF EXISTS {stage}")
+    return total
+
+
+def copy_insert(cur, table: str, columns: Sequence[str], rows: Any, *, chunk_rows: int = COPY_CHUNK_ROWS) -> int:
+    """Plain bulk INSERT through COPY (no staging: straight into the table)."""
+    cols = ", ".join(columns)
+    total = 0
+    for chunk in _chunks(iter_rows(rows, columns), max(1, int(chunk_rows))):
+        buf = io.StringIO()
+        total += write_csv(chunk, buf)
+        buf.seek(0)
+        cur.copy_expert(f"COPY {table} ({cols}) FROM STDIN WITH (FORMAT csv, NULL '{_NULL}')", buf)
+    return total
@@ -1,49 +1,149 @@
 from __future__ import annotations
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Union
 from psycopg2.extras import RealDictCursor
 from datetime import date
 
+import pandas as pd
+
 from sigma_core.storage.relational import get_db
+from sigma_core.registry.bulk import copy_insert, copy_merge
+
+
+SIGNAL_COLUMNS = [
+    'date', 'model_id', 'ticker',
+    'side', 'entry_mode', 'entry_ref_px', 'stop_px', 'target_px', 'time_stop_minutes', 'rr',
+    'score_total', 'rank', 'score_breakout', 'score_momentum', 'score_trend_quality', 'score_alignment',
+    'pack_id', 'policy_version', 'pack_sha', 'indicator_set_sha', 'model_config_sha', 'policy_sha',
+    'pnl', 'status', 'slippage',
+]
+OPTION_SIGNAL_COLUMNS = [
+    'signal_id', 'occ_symbol', 'expiry', 'strike', 'type', 'delta', 'iv_used',
+    'entry_premium_est', 'stop_premium_est', 'target_premium_est', 'pricing_estimate', 'legs_json', 'net_debit_credit', 'stop_value', 'target_value',
+]
+_SIGNAL_KEY = ('date', 'model_id', 'ticker')
 
 
-def upsert_signals(rows: Iterable[Dict[str, Any]]) -> int:
+def upsert_signals(rows: Union[pd.DataFrame, Iterable[Dict[str, Any]]]) -> int:
     """
     Upsert stock signals into the `signals` table.
-    Each row should include at minimum: date, model_id, ticker.
+    `rows` is a DataFrame or dicts; each row should include at minimum: date, model_id, ticker.
     Optional fields are persisted when present.
-    On conflict (date, model_id, ticker), updates core/scoring/exec fields.
+    On conflict (date, model_id, ticker), updates core/scoring/exec fields (rows are COPY-staged,
+    see `registry.bulk`).
+    The `signals_daily` rollups of the touched (model_id, date) keys are refreshed in the same
+    transaction.
     Returns number of rows written.
     """
-    rows = list(rows)
-    if not rows:
+    if not isinstance(rows, pd.DataFrame):
+        rows = list(rows)
+    if len(rows) == 0:
         return 0
-    cols = [
-        'date', 'model_id', 'ticker',
-        'side', 'entry_mode', 'entry_ref_px', 'stop_px', 'target_px', 'time_stop_minutes', 'rr',
-        'score_total', 'rank', 'score_breakout', 'score_momentum', 'score_trend_quality', 'score_alignment',
-        'pack_id', 'policy_version', 'pack_sha', 'indicator_set_sha', 'model_config_sha', 'policy_sha',
-    ]
-    # Prepare value tuples with None for missing keys
-    values: List[tuple] = []
-    for r in rows:
-        values.append(tuple(r.get(c) for c in cols))
-    placeholders = ",".join(["(" + ",".join(["%s"] * len(cols)) + ")"] * len(values))
-    update_set = ", ".join([f"{c} = EXCLUDED.{c}" for c in cols if c not in {'date','model_id','ticker'}])
+    if isinstance(rows, pd.DataFrame):
+        keys = set(zip(rows['model_id'].astype(str), rows['date'].astype(str).str[:10]))
+    else:
+        keys = {(str(r.get('model_id')), str(r.get('date'))[:10]) for r in rows}
+    with get_db() as conn:
+        with conn.cursor() as cur:
+            n = copy_merge(cur, 'signals', SIGNAL_COLUMNS, rows, conflict=_SIGNAL_KEY,
+                           update=[c for c in SIGNAL_COLUMNS if c not in _SIGNAL_KEY])
+            refresh_daily_rollups(cur, sorted(keys))
+            conn.commit()
+            return n
 
-    sql = f"""
-        INSERT INTO signals ({', '.join(cols)})
-        VALUES {placeholders}
-        ON CONFLICT (date, model_id, ticker) DO UPDATE SET
-          {update_set}
+
+_DAILY_AGG_COLS = [
+    'trades', 'status_n', 'filled', 'canceled', 'pending', 'pnl', 'pnl_n', 'pnl_sq',
+    'neg_n', 'neg_sum', 'neg_sq', 'slippage_sum', 'slippage_n', 'last_ts',
+]
+
+
+def refresh_daily_rollups(cur, keys: Iterable[tuple]) -> int:
+    """Recompute `signals_daily` for (model_id, date) keys, then equity/peak from each model's earliest touched day.
+
+    Runs on the caller's cursor/transaction. Per-signal returns are `pnl`, else `rr`.
     """
-    flat_params: List[Any] = []
-    for t in values:
-        flat_params.extend(t)
+    keys = list(keys)
+    if not keys:
+        return 0
+    model_ids = [k[0] for k in keys]
+    dates = [k[1] for k in keys]
+    update_set = ", ".join(f"{c} = EXCLUDED.{c}" for c in _DAILY_AGG_COLS)
+    cur.execute(
+        f"""
+        INSERT INTO signals_daily (model_id, date, {', '.join(_DAILY_AGG_COLS)}, updated_at)
+        SELECT s.model_id, s.date, COUNT(*), COUNT(s.status),
+               COUNT(*) FILTER (WHERE lower(s.status) = 'filled'),
+               COUNT(*) FILTER (WHERE lower(s.status) = 'canceled'),
+               COUNT(*) FILTER (WHERE lower(s.status) = 'pending'),
+               COALESCE(SUM(p.v), 0), COUNT(p.v), COALESCE(SUM(p.v * p.v), 0),
+               COUNT(*) FILTER (WHERE p.v < 0),
+               COALESCE(SUM(p.v) FILTER (WHERE p.v < 0), 0),
+               COALESCE(SUM(p.v * p.v) FILTER (WHERE p.v < 0), 0),
+               COALESCE(SUM(s.slippage), 0), COUNT(s.slippage), MAX(s.created_at), now()
+        FROM signals s
+        CROSS JOIN LATERAL (SELECT COALESCE(s.pnl, s.rr) AS v) p
+        WHERE (s.model_id, s.date) IN (SELECT k.model_id, k.date FROM unnest(%s::text[], %s::date[]) AS k(model_id, date))
+        GROUP BY s.model_id, s.date
+        ON CONFLICT (model_id, date) DO UPDATE SET {update_set}, updated_at = EXCLUDED.updated_at
+        """,
+        (model_ids, dates),
+    )
+    # Cumulative equity and running peak only change from the earliest touched day onwards;
+    # seed them with the last row before it
+    cur.execute(
+        """
+        WITH k AS (
+          SELECT model_id, MIN(date) AS d0
+          FROM unnest(%s::text[], %s::date[]) AS t(model_id, date)
+          GROUP BY model_id
+        ), seed AS (
+          SELECT k.model_id, k.d0, p.equity AS eq0, p.peak AS pk0
+          FROM k
+          LEFT JOIN LATERAL (
+            SELECT equity, peak FROM signals_daily x
+            WHERE x.model_id = k.model_id AND x.date < k.d0
+            ORDER BY x.date DESC LIMIT 1
+          ) p ON TRUE
+        ), e AS (
+          SELECT d.model_id, d.date, s.pk0,
+                 COALESCE(s.eq0, 0) + SUM(d.pnl) OVER (PARTITION BY d.model_id ORDER BY d.date) AS equity
+          FROM signals_daily d JOIN seed s ON s.model_id = d.model_id AND d.date >= s.d0
+        ), r AS (
+          SELECT model_id, date, equity,
+                 GREATEST(pk0, MAX(equity) OVER (PARTITION BY model_id ORDER BY date)) AS peak
+          FROM e
+        )
+        UPDATE signals_daily d
+        SET equity = r.equity, peak = r.peak
+        FROM r
+        WHERE d.model_id = r.model_id AND d.date = r.date
+        """,
+        (model_ids, dates),
+    )
+    return len(keys)
+
+
+def fetch_daily_rollups(
+    *,
+    model_id: str,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """`signals_daily` rows for a model (date ASC), optionally within [start, end]."""
+    where = ["model_id = %s"]
+    params: List[Any] = [model_id]
+    if start:
+        where.append("date >= %s"); params.append(start)
+    if end:
+        where.append("date <= %s"); params.append(end)
+    sql = (
+        f"SELECT model_id, date, {', '.join(_DAILY_AGG_COLS)}, equity, peak FROM signals_daily "
+        "WHERE " + " AND ".join(where) + " ORDER BY date ASC"
+    )
     with get_db() as conn:
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(sql, flat_params)
-            conn.commit()
-            return len(values)
+            cur.execute(sql, params)
+            return [dict(r) for r in cur.fetchall()]
 
 
 def fetch_signals(
@@ -97,25 +197,100 @@ def fetch_signals(
             return [dict(r) for r in rows]
 
 
-def upsert_option_signals(rows: List[Dict[str, Any]]) -> int:
+_LEADERBOARD_ORDER = {
+    'sharpe': "sharpe DESC NULLS LAST",
+    'sortino': "sortino DESC NULLS LAST",
+    'cum_return': "cum_return DESC NULLS LAST",
+    'trades': "trades DESC",
+    'freshness': "freshness_sec ASC NULLS LAST",
+}
+
+
+def leaderboard_metrics(
+    *,
+    model_ids: Optional[List[str]] = None,
+    pack_id: Optional[str] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    order_by: str = 'sharpe',
+    limit: int = 50,
+    offset: int = 0,
+) -> Dict[str, Any]:
+    """Per-model live metrics over `signals`, aggregated and paginated in one query.
+
+    Mirrors `compute_live_metrics` on signal rows (returns are `rr`): trades, cum_return, Sharpe and
+    Sortino (population std, scaled by sqrt(n)), max drawdown of the cumulative `rr` equity in
+    signal order (date, rank). Coverage is distinct signal days over the covered calendar span;
+    freshness is the age of the newest row. Returns {'rows': [...], 'total': models matched}.
+    """
+    where = []
+    params: List[Any] = []
+    if model_ids is not None:
+        where.append("model_id = ANY(%s)"); params.append(list(model_ids))
+    if pack_id:
+        where.append("pack_id = %s"); params.append(pack_id)
+    if start:
+        where.append("date >= %s"); params.append(start)
+    if end:
+        where.append("date <= %s"); params.append(end)
+    order_expr = _LEADERBOARD_ORDER.get(order_by, _LEADERBOARD_ORDER['sharpe'])
+    sql = f"""
+        WITH s AS (
+          SELECT id, model_id, date, rank, rr, created_at,
+                 SUM(rr) OVER w AS equity
+          FROM signals
+          {"WHERE " + " AND ".join(where) if where else ""}
+          WINDOW w AS (PARTITION BY model_id ORDER BY date, COALESCE(rank, 999999), id ROWS UNBOUNDED PRECEDING)
+        ), d AS (
+          SELECT s.*, MAX(equity) OVER (PARTITION BY model_id ORDER BY date, COALESCE(rank, 999999), id ROWS UNBOUNDED PRECEDING) AS peak
+          FROM s
+        ), agg AS (
+          SELECT model_id,
+                 COUNT(*) AS trades,
+                 COALESCE(SUM(rr), 0) AS cum_return,
+                 AVG(rr) / NULLIF(STDDEV_POP(rr), 0) * SQRT(COUNT(rr)) AS sharpe,
+                 AVG(rr) / NULLIF(STDDEV_POP(rr) FILTER (WHERE rr < 0), 0) * SQRT(COUNT(rr)) AS sortino,
+                 MIN(equity / NULLIF(peak, 0) - 1.0) AS max_dd,
+                 COUNT(DISTINCT date) * 100.0 / (MAX(date) - MIN(date) + 1) AS coverage_pct,
+                 EXTRACT(EPOCH FROM now() - MAX(created_at))::bigint AS freshness_sec,
+                 MIN(date) AS first_date,
+                 MAX(date) AS last_date
+          FROM d
+          GROUP BY model_id
+        )
+        SELECT t.total, p.*
+        FROM (SELECT COUNT(*) AS total FROM agg) t
+        LEFT JOIN LATERAL (
+          SELECT * FROM agg ORDER BY {order_expr}, model_id LIMIT %s OFFSET %s
+        ) p ON TRUE
+    """
+    params.append(int(limit))
+    params.append(int(max(0, offset)))
+    with get_db() as conn:
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(sql, params)
+            fetched = [dict(r) for r in cur.fetchall()]
+    total = int(fetched[0]['total']) if fetched else 0
+    rows = []
+    for r in fetched:
+        if r.get('model_id') is None:
+            continue  # empty page: only the total came back
+        r.pop('total', None)
+        for k in ('cum_return', 'sharpe', 'sortino', 'max_dd', 'coverage_pct'):
+            r[k] = float(r[k]) if r.get(k) is not None else None
+        rows.append(r)
+    return {'rows': rows, 'total': total}
+
+
+def upsert_option_signals(rows: Union[pd.DataFrame, List[Dict[str, Any]]]) -> int:
     """Insert option overlay rows for signals. Does not update; callers should delete/replace as needed."""
-    if not rows:
+    if len(rows) == 0:
         return 0
-    cols = [
-        'signal_id','occ_symbol','expiry','strike','type','delta','iv_used',
-        'entry_premium_est','stop_premium_est','target_premium_est','pricing_estimate','legs_json','net_debit_credit','stop_value','target_value'
-    ]
-    values = [tuple(r.get(c) for c in cols) for r in rows]
-    placeholders = ",".join(["(" + ",".join(["%s"] * len(cols)) + ")"] * len(values))
-    sql = f"INSERT INTO option_signals ({', '.join(cols)}) VALUES {placeholders}"
-    flat: List[Any] = []
-    for v in values:
-        flat.extend(v)
     with get_db() as conn:
         with conn.cursor() as cur:
-            cur.execute(sql, flat)
+            n = copy_insert(cur, 'option_signals', OPTION_SIGNAL_COLUMNS, rows)
             conn.commit()
-            return len(values)
+            return n
 
 
 def fetch_option_signals(
@@ -173,29 +348,20 @@ def fetch_option_signals(
             return [dict(r) for r in rows]
 
 
-def replace_option_signals(rows: List[Dict[str, Any]]) -> int:
+def replace_option_signals(rows: Union[pd.DataFrame, List[Dict[str, Any]]]) -> int:
     """Replace option overlay rows for their signal_ids.
 
     Deletes existing rows for all signal_ids present in `rows`, then inserts the provided rows.
     Returns number of rows written.
     """
-    if not rows:
+    if len(rows) == 0:
         return 0
-    sig_ids = sorted({int(r.get('signal_id')) for r in rows if r.get('signal_id') is not None})
-    cols = [
-        'signal_id','occ_symbol','expiry','strike','type','delta','iv_used',
-        'entry_premium_est','stop_premium_est','target_premium_est','pricing_estimate','legs_json','net_debit_credit','stop_value','target_value'
-    ]
-    values = [tuple(r.get(c) for c in cols) for r in rows]
-    placeholders = ",".join(["(" + ",".join(["%s"] * len(cols)) + ")"] * len(values))
-    sql_ins = f"INSERT INTO option_signals ({', '.join(cols)}) VALUES {placeholders}"
-    flat: List[Any] = []
-    for v in values:
-        flat.extend(v)
+    ids = rows['signal_id'].dropna() if isinstance(rows, pd.DataFrame) else [r.get('signal_id') for r in rows if r.get('signal_id') is not None]
+    sig_ids = sorted({int(i) for i in ids})
     with get_db() as conn:
         with conn.cursor() as cur:
             if sig_ids:
                 cur.execute("DELETE FROM option_signals WHERE signal_id = ANY(%s)", (sig_ids,))
-            cur.execute(sql_ins, flat)
+            n = copy_insert(cur, 'option_signals', OPTION_SIGNAL_COLUMNS, rows)
             conn.commit()
-            return len(values)
+            return n
@@ -0,0 +1,99 @@
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Set
+from psycopg2.extras import Json, RealDictCursor
+from datetime import datetime
+
+from sigma_core.storage.relational import get_db
+
+_SWEEP_COLS = "id, pack_id, model_id, tag, status, spec, total_variants, error, started_at, finished_at, created_at"
+
+
+def create_sweep(*, pack_id: str, model_id: str, spec: Dict[str, Any], tag: Optional[str], total_variants: int, status: str = 'queued') -> int:
+    with get_db() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                INSERT INTO backtest_sweeps (pack_id, model_id, spec, tag, status, total_variants)
+                VALUES (%s, %s, %s, %s, %s, %s)
+                RETURNING id
+                """,
+                (pack_id, model_id, Json(spec), tag, status, int(total_variants)),
+            )
+            row = cur.fetchone()
+            conn.commit()
+            return int(row[0])
+
+
+def get_sweep(sweep_id: int) -> Optional[Dict[str, Any]]:
+    with get_db() as conn:
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(f"SELECT {_SWEEP_COLS} FROM backtest_sweeps WHERE id = %s", (int(sweep_id),))
+            row = cur.fetchone()
+            return dict(row) if row else None
+
+
+def set_sweep_status(sweep_id: int, status: str, *, started_at: Optional[datetime] = None,
+                     finished_at: Optional[datetime] = None, error: Optional[str] = None) -> None:
+    with get_db() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                UPDATE backtest_sweeps
+                   SET status = %s,
+                       started_at = COALESCE(%s, started_at),
+                       finished_at = %s,
+                       error = %s
+                 WHERE id = %s
+                """,
+                (status, started_at, finished_at, error, int(sweep_id)),
+            )
+            conn.commit()
+
+
+def completed_variant_keys(sweep_id: int) -> Set[str]:
+    with get_db() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT variant_key FROM sweep_results WHERE sweep_id = %s AND variant_key IS NOT NULL", (int(sweep_id),))
+            return {r[0] for r in cur.fetchall()}
+
+
+def record_sweep_result(sweep_id: int, *, variant_key: str, kind: str, params: Dict[str, Any], metrics: Dict[str, Any],
+                        csv_uri: Optional[str], backtest_run_id: Optional[int] = None) -> bool:
+    """Insert one completed variant; returns False if it was already recorded."""
+    with get_db() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                INSERT INTO sweep_results (sweep_id, variant_key, kind, params, metrics, csv_uri, backtest_run_id)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+                ON CONFLICT (sweep_id, variant_key) DO NOTHING
+                """,
+                (int(sweep_id), variant_key, kind, Json(params), Json(metrics), csv_uri, backtest_run_id),
+            )
+            inserted = cur.rowcount > 0
+            conn.commit()
+            return inserted
+
+
+def sweep_results(sweep_id: int) -> List[Dict[str, Any]]:
+    with get_db() as conn:
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(
+                "SELECT id, variant_key, kind, params, metrics, csv_uri, backtest_run_id, created_at FROM sweep_results WHERE sweep_id = %s ORDER BY created_at",
+                (int(sweep_id),),
+            )
+            return [dict(r) for r in cur.fetchall()]
+
+
+def list_sweeps(*, statuses: Optional[List[str]] = None, limit: int = 50) -> List[Dict[str, Any]]:
+    sql = f"SELECT {_SWEEP_COLS} FROM backtest_sweeps"
+    params: List[Any] = []
+    if statuses:
+        sql += " WHERE status = ANY(%s)"
+        params.append(list(statuses))
+    sql += " ORDER BY created_at LIMIT %s"
+    params.append(int(limit))
+    with get_db() as conn:
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(sql, params)
+            return [dict(r) for r in cur.fetchall()]
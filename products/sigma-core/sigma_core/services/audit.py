@@ -1,11 +1,23 @@
 from __future__ import annotations
-from typing import Any, Dict, List, Optional
+import asyncio
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
 
 try:
     from sigma_core.storage.relational import get_db
 except Exception:
     get_db = None  # type: ignore
 
+logger = logging.getLogger(__name__)
+
+AUDIT_COLUMNS = ['at', 'path', 'method', 'status', 'user_id', 'client', 'pack_id', 'model_id', 'lineage', 'payload']
+
 
 def log_audit(
     *,
@@ -89,3 +101,207 @@ def fetch_audit(
             rows = cur.fetchall()
             return [dict(r) for r in rows]
 
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def prepare_event(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Row for `audit_logs` from a queued event: parses a raw JSON `body` and picks model/pack ids."""
+    row = dict(event)
+    body = row.pop('body', None)
+    if body and row.get('payload') is None:
+        try:
+            row['payload'] = json.loads(body.decode('utf-8') if isinstance(body, (bytes, bytearray)) else body)
+        except Exception:
+            row['payload'] = None
+    payload = row.get('payload')
+    if isinstance(payload, dict):
+        row.setdefault('model_id', payload.get('model_id'))
+        row.setdefault('pack_id', payload.get('pack_id'))
+    return row
+
+
+def write_audit_batch(rows: List[Dict[str, Any]]) -> int:
+    """Insert prepared audit rows in one COPY."""
+    if get_db is None:
+        raise RuntimeError('DB-backed audit log is unavailable')
+    from sigma_core.registry.bulk import copy_insert
+    with get_db() as conn:  # type: ignore
+        with conn.cursor() as cur:
+            n = copy_insert(cur, 'audit_logs', AUDIT_COLUMNS, rows)
+            conn.commit()
+            return n
+
+
+class AuditQueue:
+    """Bounded in-process queue of audit events drained in batches by one background thread.
+
+    `put` never waits on the database: when the queue is full the event is dropped (after waiting
+    up to `block_ms` for room, counted as `blocked`). Parsing, `enrich` (e.g. lineage) and the
+    insert all run on the writer thread. `stats()` reports the counters.
+    """
+
+    def __init__(
+        self,
+        *,
+        maxsize: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        flush_ms: Optional[int] = None,
+        block_ms: Optional[int] = None,
+        writer: Optional[Callable[[List[Dict[str, Any]]], Any]] = None,
+        enrich: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+    ):
+        self.maxsize = max(1, int(maxsize if maxsize is not None else _env_int('SIGMA_AUDIT_QUEUE_SIZE', 10000)))
+        self.batch_size = max(1, int(batch_size if batch_size is not None else _env_int('SIGMA_AUDIT_BATCH', 200)))
+        self.flush_ms = max(1, int(flush_ms if flush_ms is not None else _env_int('SIGMA_AUDIT_FLUSH_MS', 500)))
+        self.block_ms = max(0, int(block_ms if block_ms is not None else _env_int('SIGMA_AUDIT_BLOCK_MS', 0)))
+        self.writer = writer or write_audit_batch
+        self.enrich = enrich
+        self._q: queue.Queue = queue.Queue(maxsize=self.maxsize)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._at_exit = False
+        self._counts = {'enqueued': 0, 'dropped': 0, 'blocked': 0, 'written': 0, 'failed': 0, 'batches': 0}
+        self._last_error: Optional[str] = None
+
+    def _bump(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self._counts[key] += n
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name='audit-writer', daemon=True)
+                self._thread.start()
+                if not self._at_exit:
+                    atexit.register(self.close)
+                    self._at_exit = True
+
+    def put(self, event: Dict[str, Any]) -> bool:
+        """Enqueue an event; False when it was dropped because the queue stayed full.
+
+        With block_ms > 0 a full queue blocks the calling thread up to block_ms; on an event loop
+        use `aput` instead.
+        """
+        self._ensure_started()
+        try:
+            self._q.put_nowait(event)
+        except queue.Full:
+            if self.block_ms <= 0:
+                self._bump('dropped')
+                return False
+            return self._put_blocking(event)
+        self._bump('enqueued')
+        return True
+
+    async def aput(self, event: Dict[str, Any]) -> bool:
+        """`put` for async callers: the block_ms wait runs in an executor thread, never on the loop."""
+        self._ensure_started()
+        try:
+            self._q.put_nowait(event)
+        except queue.Full:
+            if self.block_ms <= 0:
+                self._bump('dropped')
+                return False
+            return await asyncio.get_running_loop().run_in_executor(None, self._put_blocking, event)
+        self._bump('enqueued')
+        return True
+
+    def _put_blocking(self, event: Dict[str, Any]) -> bool:
+        self._bump('blocked')
+        try:
+            self._q.put(event, timeout=self.block_ms / 1000.0)
+        except queue.Full:
+            self._bump('dropped')
+            return False
+        self._bump('enqueued')
+        return True
+
+    def _drain(self) -> List[Dict[str, Any]]:
+        wait = self.flush_ms / 1000.0
+        try:
+            batch = [self._q.get(timeout=wait)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._q.get(timeout=remaining) if remaining > 0 and not self._stop.is_set() else self._q.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _flush(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            rows = []
+            for event in batch:
+                row = prepare_event(event)
+                if self.enrich is not None:
+                    try:
+                        row = self.enrich(row) or row
+                    except Exception as e:
+                        logger.debug("audit enrich failed: %s", e)
+                rows.append(row)
+            self.writer(rows)
+            self._bump('written', len(batch))
+        except Exception as e:
+            self._bump('failed', len(batch))
+            self._last_error = str(e)
+            logger.debug("audit batch of %d not written: %s", len(batch), e)
+        finally:
+            self._bump('batches')
+
+    def _run(self) -> None:
+        while not (self._stop.is_set() and self._q.empty()):
+            batch = self._drain()
+            if batch:
+                self._flush(batch)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until everything queued so far has been handed to the writer."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._lock:
+                done = self._counts['written'] + self._counts['failed']
+                pending = self._counts['enqueued'] - done
+            if pending <= 0:
+                return True
+            time.sleep(0.01)
+        return False
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stop the writer after draining the queue (called at interpreter exit)."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = dict(self._counts)
+        out.update(depth=self._q.qsize(), capacity=self.maxsize, batch_size=self.batch_size,
+                   flush_ms=self.flush_ms, block_ms=self.block_ms, last_error=self._last_error,
+                   running=bool(self._thread is not None and self._thread.is_alive()))
+        return out
+
+
+_QUEUE: Optional[AuditQueue] = None
+_QUEUE_LOCK = threading.Lock()
+
+
+def audit_queue(**kwargs: Any) -> AuditQueue:
+    """Process-wide AuditQueue; keyword arguments only apply when it is first created."""
+    global _QUEUE
+    with _QUEUE_LOCK:
+        if _QUEUE is None:
+            _QUEUE = AuditQueue(**kwargs)
+        return _QUEUE
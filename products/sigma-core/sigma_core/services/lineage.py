@@ -1,15 +1,83 @@
+"""Lineage fingerprints (SHA-1) of the pack, model config, policy and indicator set.
+
+File hashes are cached per path and reused while (mtime_ns, size) is unchanged, so repeated stamping
+costs one stat per file. With a watcher running (`start_lineage_watch`, or SIGMA_LINEAGE_WATCH=poll|inotify)
+entries under the watched roots are trusted without the stat and evicted when the watcher sees a change.
+`compute_lineage_db` hashes the DB-stored configs (model_configs / policies / indicator_sets), cached
+by each row's version stamp.
+"""
 from __future__ import annotations
 from pathlib import Path
 import hashlib
-from typing import Dict, Optional
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+try:
+    from watchdog.observers import Observer  # type: ignore
+    from watchdog.events import FileSystemEventHandler  # type: ignore
+except Exception:
+    Observer = None  # type: ignore
+    FileSystemEventHandler = object  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+_Sig = Optional[Tuple[int, int]]
+
+_LOCK = threading.Lock()
+_FILE_CACHE: Dict[str, Tuple[_Sig, Optional[str]]] = {}
+_DB_CACHE: Dict[Tuple[str, str, str], Tuple[str, Optional[str]]] = {}
+_WATCH: Optional["_Watcher"] = None
+
+
+def _stat_sig(key: str) -> _Sig:
+    try:
+        st = os.stat(key)
+        return (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
 
 
 def _sha1_path(p: Path) -> Optional[str]:
+    key = str(p)
+    cached = _FILE_CACHE.get(key)
+    watch = _WATCH
+    if cached is not None and watch is not None and watch.covers(key):
+        return cached[1]
+    sig = _stat_sig(key)
+    if cached is not None and cached[0] == sig:
+        return cached[1]
     try:
-        data = p.read_bytes()
-        return hashlib.sha1(data).hexdigest()
+        sha = hashlib.sha1(p.read_bytes()).hexdigest() if sig is not None else None
     except Exception:
-        return None
+        sha = None
+    with _LOCK:
+        _FILE_CACHE[key] = (sig, sha)
+    return sha
+
+
+def invalidate_lineage(path: Optional[Path] = None) -> None:
+    """Drop cached hashes for `path` (a file or a directory prefix), or everything when None."""
+    with _LOCK:
+        if path is None:
+            _FILE_CACHE.clear()
+            _DB_CACHE.clear()
+            return
+        key = os.path.abspath(str(path)).rstrip(os.sep)
+        for k in [k for k in _FILE_CACHE if os.path.abspath(k) == key or os.path.abspath(k).startswith(key + os.sep)]:
+            _FILE_CACHE.pop(k, None)
+
+
+def lineage_cache_info() -> Dict[str, Any]:
+    watch = _WATCH
+    return {
+        'files': len(_FILE_CACHE),
+        'db': len(_DB_CACHE),
+        'watch': watch.mode if watch is not None else None,
+        'roots': list(watch.roots) if watch is not None else [],
+    }
 
 
 def compute_lineage(*, pack_dir: Path, model_id: str, indicator_set_path: Optional[Path] = None) -> Dict[str, Optional[str]]:
@@ -25,3 +93,195 @@ def compute_lineage(*, pack_dir: Path, model_id: str, indicator_set_path: Option
         'model_config_sha': cfg,
         'policy_sha': pol,
     }
+
+
+# --- DB-stored configs ---
+
+# Row version stamps: xmin changes on every UPDATE, so in-place edits (same version) are seen too
+_DB_STAMPS_SQL = """
+SELECT
+  (SELECT xmin::text FROM model_configs WHERE pack_id=%(p)s AND model_id=%(m)s) AS model_config,
+  (SELECT version::text || ':' || xmin::text FROM policies
+    WHERE pack_id=%(p)s AND model_id=%(m)s ORDER BY version DESC LIMIT 1) AS policy,
+  (SELECT id::text || ':' || xmin::text FROM indicator_sets
+    WHERE pack_id=%(p)s AND scope='model' AND model_id=%(m)s ORDER BY id DESC LIMIT 1) AS indicator_set
+"""
+
+_DB_DOC_SQL = {
+    'model_config': "SELECT config FROM model_configs WHERE pack_id=%(p)s AND model_id=%(m)s",
+    'policy': "SELECT policy FROM policies WHERE pack_id=%(p)s AND model_id=%(m)s ORDER BY version DESC LIMIT 1",
+    'indicator_set': "SELECT data FROM indicator_sets WHERE pack_id=%(p)s AND scope='model' AND model_id=%(m)s ORDER BY id DESC LIMIT 1",
+}
+
+
+def _sha1_doc(doc: Any) -> Optional[str]:
+    if doc is None:
+        return None
+    if isinstance(doc, (bytes, str)):
+        data = doc.encode() if isinstance(doc, str) else doc
+    else:
+        data = json.dumps(doc, sort_keys=True, separators=(',', ':'), default=str).encode()
+    return hashlib.sha1(data).hexdigest()
+
+
+def db_lineage(cur, pack_id: str, model_id: str) -> Dict[str, Optional[str]]:
+    """SHA-1 of the DB-stored model config, latest policy and model indicator set (None when absent).
+
+    One query reads the row version stamps; documents are only fetched and hashed when a stamp changed.
+    """
+    args = {'p': pack_id, 'm': model_id}
+    cur.execute(_DB_STAMPS_SQL, args)
+    row = cur.fetchone()
+    if row is not None and not isinstance(row, dict):
+        row = dict(zip(('model_config', 'policy', 'indicator_set'), row))
+    out: Dict[str, Optional[str]] = {}
+    for kind, sql in _DB_DOC_SQL.items():
+        stamp = (row or {}).get(kind)
+        key = (pack_id, model_id, kind)
+        if stamp is None:
+            _DB_CACHE.pop(key, None)
+            out[kind] = None
+            continue
+        cached = _DB_CACHE.get(key)
+        if cached is not None and cached[0] == stamp:
+            out[kind] = cached[1]
+            continue
+        cur.execute(sql, args)
+        doc = cur.fetchone()
+        if doc is not None:
+            doc = next(iter(doc.values())) if isinstance(doc, dict) else doc[0]
+        sha = _sha1_doc(doc)
+        with _LOCK:
+            _DB_CACHE[key] = (stamp, sha)
+        out[kind] = sha
+    return out
+
+
+def compute_lineage_db(
+    *, pack_dir: Path, pack_id: str, model_id: str, indicator_set_path: Optional[Path] = None
+) -> Dict[str, Optional[str]]:
+    """`compute_lineage` with the model config/policy/indicator set hashed from the DB where stored there.
+
+    Falls back to the file hashes for anything missing from the DB or when the DB is unavailable.
+    """
+    out = compute_lineage(pack_dir=pack_dir, model_id=model_id, indicator_set_path=indicator_set_path)
+    try:
+        from sigma_core.storage.relational import get_db
+        with get_db() as conn:
+            with conn.cursor() as cur:
+                db = db_lineage(cur, pack_id, model_id)
+    except Exception:
+        return out
+    for kind, field in (('model_config', 'model_config_sha'), ('policy', 'policy_sha'), ('indicator_set', 'indicator_set_sha')):
+        if db.get(kind) is not None:
+            out[field] = db[kind]
+    return out
+
+
+# --- Invalidation watchers ---
+
+class _Watcher:
+    mode = 'poll'
+
+    def __init__(self, roots: Iterable[Path], interval: float):
+        self.roots = tuple(os.path.abspath(str(r)).rstrip(os.sep) for r in roots)
+        self.interval = max(0.05, float(interval))
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def covers(self, key: str) -> bool:
+        # String prefix only (no syscalls): this runs on every cache hit
+        key = os.path.abspath(key)
+        return any(key == r or key.startswith(r + os.sep) for r in self.roots)
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name='lineage-watch', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval * 2 + 1)
+
+    def poll(self) -> int:
+        """Evict cached files under the roots whose (mtime_ns, size) changed; returns evictions."""
+        evicted = 0
+        for key, (sig, _) in list(_FILE_CACHE.items()):
+            if self.covers(key) and _stat_sig(key) != sig:
+                with _LOCK:
+                    _FILE_CACHE.pop(key, None)
+                evicted += 1
+        return evicted
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:
+                logger.warning("lineage poll failed: %s", e)
+
+
+class _EvictHandler(FileSystemEventHandler):  # type: ignore[misc]
+    def on_any_event(self, event):
+        for p in (getattr(event, 'src_path', None), getattr(event, 'dest_path', None)):
+            if p:
+                invalidate_lineage(Path(p))
+
+
+class _InotifyWatcher(_Watcher):
+    mode = 'inotify'
+
+    def start(self) -> None:
+        self._observer = Observer()
+        handler = _EvictHandler()
+        for r in self.roots:
+            if os.path.isdir(r):
+                self._observer.schedule(handler, r, recursive=True)
+        self._observer.daemon = True
+        self._observer.start()
+
+    def stop(self) -> None:
+        self._observer.stop()
+        self._observer.join(timeout=2)
+
+
+def start_lineage_watch(roots: Iterable[Path], *, mode: Optional[str] = None, interval: Optional[float] = None) -> Optional[str]:
+    """Watch `roots` (e.g. PACKS_DIR) so cached hashes under them skip the per-call stat.
+
+    `mode` is 'poll', 'inotify' (needs watchdog; falls back to polling) or 'off'; defaults to
+    SIGMA_LINEAGE_WATCH (off). Polling re-stats cached files every `interval` seconds
+    (SIGMA_LINEAGE_POLL_S, default 2), which bounds how long a changed file can go unnoticed.
+    Returns the mode started, or None.
+    """
+    global _WATCH
+    mode = (mode or os.getenv('SIGMA_LINEAGE_WATCH') or 'off').strip().lower()
+    if mode in ('', 'off', '0', 'false', 'none'):
+        return None
+    if interval is None:
+        try:
+            interval = float(os.getenv('SIGMA_LINEAGE_POLL_S', 2))
+        except (TypeError, ValueError):
+            interval = 2.0
+    stop_lineage_watch()
+    watcher: _Watcher
+    if mode == 'inotify' and Observer is not None:
+        watcher = _InotifyWatcher(roots, interval)
+    else:
+        watcher = _Watcher(roots, interval)
+    try:
+        watcher.start()
+    except Exception as e:
+        logger.warning("lineage watch unavailable: %s", e)
+        return None
+    # Entries cached before the watcher started may already be stale
+    for r in watcher.roots:
+        invalidate_lineage(Path(r))
+    _WATCH = watcher
+    return watcher.mode
+
+
+def stop_lineage_watch() -> None:
+    global _WATCH
+    watch, _WATCH = _WATCH, None
+    if watch is not None:
+        watch.stop()
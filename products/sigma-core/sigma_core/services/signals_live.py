@@ -117,6 +117,132 @@ def compute_live_metrics(df: pd.DataFrame, *, now_ts: Optional[pd.Timestamp] = N
     return m
 
 
+ROLLUP_COLUMNS = [
+    "date", "trades", "status_n", "filled", "canceled", "pending", "pnl", "pnl_n", "pnl_sq",
+    "neg_n", "neg_sum", "neg_sq", "slippage_sum", "slippage_n", "last_ts", "equity", "peak",
+]
+
+
+def daily_rollup(df: pd.DataFrame) -> pd.DataFrame:
+    """Per-day aggregates of signal rows, shaped like the `signals_daily` table.
+
+    Days come from `ts` (UTC) when present, else `date`; returns are `pnl`, else `rr`.
+    """
+    if df is None or df.empty:
+        return pd.DataFrame(columns=ROLLUP_COLUMNS)
+    if "ts" in df.columns and pd.api.types.is_datetime64_any_dtype(df["ts"]):
+        ts = df["ts"]
+        day = ts.dt.date
+    elif "date" in df.columns:
+        ts = pd.Series(pd.NaT, index=df.index)
+        day = pd.to_datetime(df["date"], errors="coerce").dt.date
+    else:
+        return pd.DataFrame(columns=ROLLUP_COLUMNS)
+    perf = pd.to_numeric(df["pnl"] if "pnl" in df.columns else df.get("rr", pd.Series(float("nan"), index=df.index)), errors="coerce")
+    neg = perf.where(perf < 0)
+    st = df["status"].astype(str).str.lower().where(df["status"].notna()) if "status" in df.columns else pd.Series(None, index=df.index, dtype=object)
+    slip = pd.to_numeric(df["slippage"], errors="coerce") if "slippage" in df.columns else pd.Series(float("nan"), index=df.index)
+    parts = pd.DataFrame({
+        "date": day,
+        "trades": 1,
+        "status_n": st.notna().astype(int),
+        "filled": (st == "filled").astype(int),
+        "canceled": (st == "canceled").astype(int),
+        "pending": (st == "pending").astype(int),
+        "pnl": perf.fillna(0.0),
+        "pnl_n": perf.notna().astype(int),
+        "pnl_sq": (perf ** 2).fillna(0.0),
+        "neg_n": neg.notna().astype(int),
+        "neg_sum": neg.fillna(0.0),
+        "neg_sq": (neg ** 2).fillna(0.0),
+        "slippage_sum": slip.fillna(0.0),
+        "slippage_n": slip.notna().astype(int),
+        "last_ts": ts,
+    }).dropna(subset=["date"])
+    daily = parts.groupby("date", sort=True).agg({c: ("max" if c == "last_ts" else "sum") for c in parts.columns if c != "date"}).reset_index()
+    daily["equity"] = daily["pnl"].cumsum()
+    daily["peak"] = daily["equity"].cummax()
+    return daily[ROLLUP_COLUMNS]
+
+
+def _moment_std(n: float, s: float, q: float) -> Optional[float]:
+    if n <= 0:
+        return None
+    mean = s / n
+    var = q / n - mean * mean
+    # Moment sums leave rounding noise where the batch std is exactly zero
+    if var <= 1e-12 * max(1.0, q / n):
+        return None
+    return math.sqrt(var)
+
+
+def metrics_from_rollup(daily: pd.DataFrame, *, now_ts: Optional[pd.Timestamp] = None) -> LiveMetrics:
+    """LiveMetrics from `daily_rollup`/`signals_daily` rows (O(days)); max drawdown is at daily resolution."""
+    m = LiveMetrics()
+    if daily is None or daily.empty:
+        return m
+    d = daily.sort_values("date")
+
+    def num(c: str) -> pd.Series:
+        return pd.to_numeric(d[c], errors="coerce").fillna(0.0)
+
+    n, total, sq = float(num("pnl_n").sum()), float(num("pnl").sum()), float(num("pnl_sq").sum())
+    status_n, filled = int(num("status_n").sum()), int(num("filled").sum())
+    m.trades = filled if status_n > 0 else int(num("trades").sum())
+    if n > 0:
+        m.cum_return = total
+        std = _moment_std(n, total, sq)
+        m.sharpe = (total / n) / std * math.sqrt(n) if std else None
+        dstd = _moment_std(float(num("neg_n").sum()), float(num("neg_sum").sum()), float(num("neg_sq").sum()))
+        m.sortino = (total / n) / dstd * math.sqrt(n) if dstd else None
+        m.max_dd = _max_drawdown(num("pnl").cumsum())
+    considered = filled + int(num("canceled").sum()) + int(num("pending").sum())
+    m.fill_rate = (filled / considered) if considered > 0 else None
+    slip_n = float(num("slippage_n").sum())
+    m.avg_slippage = float(num("slippage_sum").sum()) / slip_n if slip_n > 0 else None
+    days = pd.to_datetime(d["date"], errors="coerce").dropna()
+    if not days.empty:
+        m.coverage_pct = float(days.dt.normalize().nunique()) * 100.0 / float(max(1, (days.max() - days.min()).days + 1))
+    last = pd.to_datetime(d["last_ts"], errors="coerce", utc=True).dropna() if "last_ts" in d.columns else pd.Series(dtype="datetime64[ns, UTC]")
+    if not last.empty:
+        now_ts = now_ts or pd.Timestamp.now(tz="UTC")
+        m.freshness_sec = int((now_ts - last.max()).total_seconds())
+    return m
+
+
+_ROLLUP_CACHE: Dict[str, Any] = {}
+
+
+def load_daily_rollup_csv(root: Path, model_id: str) -> Optional[pd.DataFrame]:
+    """`daily_rollup` of a model's signals.csv, cached until the file's mtime/size change."""
+    csv_path = root / "live_data" / model_id / "signals.csv"
+    try:
+        st = csv_path.stat()
+    except OSError:
+        return None
+    key = (st.st_mtime_ns, st.st_size)
+    hit = _ROLLUP_CACHE.get(str(csv_path))
+    if hit is not None and hit[0] == key:
+        return hit[1]
+    df = load_signals_csv(root, model_id)
+    daily = daily_rollup(df) if df is not None else None
+    _ROLLUP_CACHE[str(csv_path)] = (key, daily)
+    return daily
+
+
+def rollup_window(daily: pd.DataFrame, start: Optional[str] = None, end: Optional[str] = None) -> pd.DataFrame:
+    """Rollup rows with start <= date <= end (YYYY-MM-DD, inclusive)."""
+    if daily is None or daily.empty or not (start or end):
+        return daily
+    days = pd.to_datetime(daily["date"], errors="coerce")
+    keep = pd.Series(True, index=daily.index)
+    if start:
+        keep &= days >= pd.Timestamp(start)
+    if end:
+        keep &= days <= pd.Timestamp(end)
+    return daily[keep]
+
+
 def leaderboard_from_csv(root: Path, *, pack_filter: Optional[str], risk_profile: Optional[str], start: Optional[str], end: Optional[str], limit: int, offset: int) -> Dict[str, Any]:
     live_dir = root / "live_data"
     rows: List[Dict[str, Any]] = []
@@ -143,19 +269,10 @@ def leaderboard_from_csv(root: Path, *, pack_filter: Optional[str], risk_profile
             resolved_pack = _resolve_pack_for_model(model_id)
             if resolved_pack != pack_filter:
                 continue
-        df = load_signals_csv(root, model_id)
-        if df is None or df.empty:
+        daily = rollup_window(load_daily_rollup_csv(root, model_id), start, end)
+        if daily is None or daily.empty:
             continue
-        if start or end:
-            if "ts" in df.columns:
-                ts = pd.to_datetime(df["ts"], errors="coerce", utc=True)
-                if start:
-                    ts_start = pd.Timestamp(start).tz_localize("UTC")
-                    df = df[ts >= ts_start]
-                if end:
-                    ts_end = pd.Timestamp(end).tz_localize("UTC")
-                    df = df[ts <= ts_end]
-        metrics = compute_live_metrics(df)
+        metrics = metrics_from_rollup(daily)
         rows.append({
             "model_id": model_id,
             "risk_profile": risk_profile or "balanced",
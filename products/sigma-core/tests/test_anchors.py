@@ -0,0 +1,31 @@
+from datetime import date
+
+import pandas as pd
+
+from sigma_core.data import anchors
+
+
+def test_prev_close_anchors_single_fetch_and_hourly_fill(monkeypatch):
+    calls = []
+
+    def fake(ticker, start, end, intervals):
+        calls.append(tuple(intervals))
+        if intervals == ["day"]:
+            days = pd.to_datetime(["2024-07-01", "2024-07-02", "2024-07-03"]).tz_localize("UTC") + pd.Timedelta(hours=4)
+            return {"day": pd.DataFrame({"date": days, "close": [545.0, 546.0, 547.0]})}
+        # 2024-07-05 has no daily bar yet: hourly bars for 07-03 / 07-05 fill the gap
+        hrs = pd.to_datetime(["2024-07-03 18:00", "2024-07-03 19:00", "2024-07-05 14:00"]).tz_localize("UTC")
+        return {"hour": pd.DataFrame({"date": hrs, "close": [547.5, 548.0, 549.0]})}
+
+    monkeypatch.setattr(anchors, "get_multi_timeframe_data", fake)
+    anchors.clear_anchor_cache()
+    out = anchors.prev_close_anchors("spy", date(2024, 7, 2), date(2024, 7, 5))
+    assert out[date(2024, 7, 2)] == 545.0
+    assert out[date(2024, 7, 3)] == 546.0
+    assert out[date(2024, 7, 5)] == 548.0
+    assert calls == [("day",), ("hour",)]
+
+    # Memoized: sub-ranges and single dates do not refetch
+    assert anchors.prev_close_anchor("SPY", date(2024, 7, 3)) == 546.0
+    assert len(calls) == 2
+    anchors.clear_anchor_cache()
@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+
+from sigma_core.backtest.engine import (
+    _positions_threshold, _positions_top_pct, fit_oof, oof_cache_key, resolve_fold_workers, run_backtest,
+    select_features, threshold_grid, top_pct_grid,
+)
+
+
+def _matrix(n=150):
+    rng = np.random.default_rng(7)
+    x = rng.normal(size=(n, 4))
+    y = np.where(x[:, 0] + 0.5 * rng.normal(size=n) > 0, 'UP', 'DOWN')
+    df = pd.DataFrame(x, columns=['f1', 'f2', 'f3', 'momentum_score_total'])
+    df['y'] = y
+    return df
+
+
+def _assert_same_oof(a, b):
+    assert list(a.label_classes) == list(b.label_classes) and len(a.folds) == len(b.folds)
+    np.testing.assert_array_equal(a.y, b.y)
+    for fa, fb in zip(a.folds, b.folds):
+        assert fa.fold == fb.fold and list(fa.classes) == list(fb.classes)
+        np.testing.assert_array_equal(fa.test_idx, fb.test_idx)
+        np.testing.assert_allclose(fa.y_proba, fb.y_proba, rtol=1e-6, atol=1e-7)
+
+
+def test_parallel_folds_match_serial():
+    df = _matrix()
+    serial = fit_oof(df, 'y', splits=3, calibration=None, workers=1)
+    parallel = fit_oof(df, 'y', splits=3, calibration=None, workers=2)
+    assert (serial.workers, parallel.workers) == (1, 2)
+    _assert_same_oof(parallel, serial)
+    # Real predictions, not a degenerate constant
+    assert all(fp.y_proba.shape[1] == 2 and fp.y_proba[:, 0].std() > 0 for fp in serial.folds)
+    res = run_backtest(df, 'y', [0.55, 0.6], splits=3, calibration=None, workers=2)
+    assert res['workers'] == 2 and [t['fold'] for t in res['fold_timings']] == [0, 1, 2]
+    assert all(t['seconds'] > 0 for t in res['fold_timings'])
+
+
+def test_resolve_fold_workers(monkeypatch):
+    monkeypatch.delenv('SIGMA_BACKTEST_WORKERS', raising=False)
+    assert resolve_fold_workers(None, 5) == 1
+    monkeypatch.setenv('SIGMA_BACKTEST_WORKERS', '8')
+    assert resolve_fold_workers(None, 5) == 5
+    assert resolve_fold_workers(2, 5) == 2
+
+
+def test_oof_cache_reused_across_threshold_variants(tmp_path):
+    df = _matrix()
+    first = run_backtest(df, 'y', [0.55], splits=3, calibration=None, oof_cache_dir=str(tmp_path))
+    again = run_backtest(df, 'y', [0.55], splits=3, calibration=None, oof_cache_dir=str(tmp_path))
+    other = run_backtest(df, 'y', [0.5, 0.7], top_pct=0.3, splits=3, calibration=None, oof_cache_dir=str(tmp_path))
+    assert not first['oof_cached'] and again['oof_cached'] and other['oof_cached']
+    assert len(list(tmp_path.glob('*.npz'))) == 1
+    # The stored arrays are exactly what a fresh fit produces
+    cached = fit_oof(df, 'y', splits=3, calibration=None, cache_dir=str(tmp_path))
+    assert cached.cached
+    _assert_same_oof(cached, fit_oof(df, 'y', splits=3, calibration=None))
+    # A different split layout is a different cache entry
+    assert not run_backtest(df, 'y', [0.55], splits=2, calibration=None, oof_cache_dir=str(tmp_path))['oof_cached']
+    # ... and so are a changed matrix or hour filter
+    feats = select_features(df)
+    key = lambda d, hours=None: oof_cache_key(d, feats, 'y', splits=3, embargo=0.0, allowed_hours=hours, calibration=None)
+    changed = df.copy()
+    changed.loc[5, feats[0]] += 1.0
+    assert len({key(df), key(changed), key(df, [13, 14]), key(df, [13])}) == 4
+    assert key(df, [14, 13]) == key(df, [13, 14])
+
+
+def _loop_metrics(pos, sign, outcome, gate, slippage_bps):
+    hit = np.mean(np.where(sign * outcome > 0, 1.0, 0.0))
+    pos = pos * gate
+    pnl = pos * outcome - np.where(pos != 0, slippage_bps / 10000.0, 0.0)
+    return [hit, pnl.sum(), pnl.mean() / (pnl.std() + 1e-9), np.sum(np.abs(pos) > 0)]
+
+
+def test_grids_match_per_point_positions():
+    rng = np.random.default_rng(3)
+    p_up = rng.uniform(0, 1, 500)
+    p_down = 1 - p_up - rng.uniform(0, 0.2, 500).clip(max=1 - p_up)
+    outcome = rng.choice([-1.0, 0.0, 1.0], 500)
+    gate = (rng.uniform(size=500) > 0.2).astype(float)
+    kw = dict(size_by_conf=True, conf_cap=0.6, slippage_bps=2.0, gate=gate)
+    thresholds = np.linspace(0.3, 0.9, 301)
+    grid = threshold_grid(p_up, p_down, outcome, thresholds, **kw)
+    proba = np.column_stack([p_up, p_down])
+    for i in (0, 77, 150, 300):
+        pos = _positions_threshold(proba, ['UP', 'DOWN'], thresholds[i], size_by_conf=True, conf_cap=0.6)
+        sign = _positions_threshold(proba, ['UP', 'DOWN'], thresholds[i])
+        np.testing.assert_allclose(grid[i], _loop_metrics(pos, sign, outcome, gate, 2.0))
+    pcts = [0.001, 0.05, 0.3, 1.0]
+    grid = top_pct_grid(p_up, p_down, outcome, pcts, **kw)
+    for i, pct in enumerate(pcts):
+        pos = _positions_top_pct(proba, ['UP', 'DOWN'], pct, size_by_conf=True, conf_cap=0.6)
+        sign = _positions_top_pct(proba, ['UP', 'DOWN'], pct)
+        np.testing.assert_allclose(grid[i], _loop_metrics(pos, sign, outcome, gate, 2.0))
@@ -0,0 +1,72 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from sigma_core.pricing.black_scholes import bs_greeks, bs_price, implied_vol
+from sigma_core.indicators.builtins import iv_skew
+
+
+def _grid():
+    S = np.full(40, 100.0)
+    K = np.linspace(80, 120, 40)
+    T = np.linspace(0.05, 1.0, 40)
+    sigma = np.linspace(0.08, 0.9, 40)
+    side = np.where(np.arange(40) % 2 == 0, 'call', 'put')
+    return S, K, T, sigma, side
+
+
+def test_implied_vol_round_trip_on_arrays():
+    S, K, T, sigma, side = _grid()
+    price = bs_price(S, K, T, sigma, 0.01, 0.0, side)
+    iv = implied_vol(price, S, K, T, 0.01, 0.0, side)
+    # Contracts priced at their lower bound (no resolvable time value) come back NaN; everything else must solve
+    floor = bs_price(S, K, T, 1e-4, 0.01, 0.0, side)
+    assert np.isfinite(iv[price - floor > 1e-3]).all()
+    ok = np.isfinite(iv)
+    np.testing.assert_allclose(iv[ok], sigma[ok], atol=1e-5)
+
+
+def test_greeks_match_finite_differences():
+    S, K, T, sigma, side = _grid()
+    g = bs_greeks(S, K, T, sigma, 0.01, 0.0, side)
+    h = 1e-4
+    delta = (bs_price(S + h, K, T, sigma, 0.01, 0.0, side) - bs_price(S - h, K, T, sigma, 0.01, 0.0, side)) / (2 * h)
+    vega = (bs_price(S, K, T, sigma + h, 0.01, 0.0, side) - bs_price(S, K, T, sigma - h, 0.01, 0.0, side)) / (2 * h)
+    np.testing.assert_allclose(g['delta'], delta, atol=1e-6)
+    np.testing.assert_allclose(g['vega'], vega, rtol=1e-5, atol=1e-6)
+
+
+def test_implied_vol_nan_outside_no_arbitrage_range():
+    iv = implied_vol([0.0, 150.0, 10.0, 5.0], 100.0, 90.0, [0.5, 0.5, 0.5, 0.0], option_type='call')
+    # zero price, above spot, below intrinsic, expired
+    assert np.isnan(iv).all()
+
+
+def test_nearest_iv_by_group_prefers_first_row_on_ties():
+    p = float(bs_price(100.0, 99.0, 0.1, 0.2, option_type='call'))
+    q = float(bs_price(100.0, 101.0, 0.1, 0.3, option_type='call'))
+    rows = [('a', 100.0, 99.0, 0.1, p, 'call', 100.0), ('a', 100.0, 101.0, 0.1, q, 'call', 100.0),
+            ('b', 100.0, 101.0, 0.1, q, 'call', 100.0), ('c', 100.0, 90.0, 0.1, 0.0, 'call', 100.0)]
+    out = iv_skew._nearest_iv_by_group(rows)
+    assert abs(out['a'] - 0.2) < 1e-5 and abs(out['b'] - 0.3) < 1e-5
+    assert 'c' not in out
+
+
+def test_smile_fetches_quotes_once_per_day(monkeypatch):
+    from sigma_core.indicators.builtins import options_smile
+    calls = []
+
+    def _quotes(underlying, expiry, strike, side, start, end):
+        calls.append((strike, side))
+        T = 5.5 / (365.0 * 24)
+        vol = 0.2 + 0.02 * abs(strike - 100.0)
+        mid = float(bs_price(100.0, strike, T, vol, option_type=side))
+        ts = pd.Timestamp(f'{expiry} 10:30', tz='US/Eastern').tz_convert('UTC')
+        return pd.DataFrame({'timestamp': [ts], 'bid': [mid], 'ask': [mid]})
+
+    monkeypatch.setattr(options_smile, 'get_polygon_option_quotes', _quotes)
+    df = pd.DataFrame({'date': pd.date_range('2024-03-01 10:00', periods=3, freq='h', tz='US/Eastern'), 'close': 100.0})
+    out = options_smile.IVSmileWings(wing_points=1, strike_band=3.0).calculate(df)
+    assert len(calls) == 2 * 7
+    assert abs(out['iv_smile_wings'].iloc[0] - 0.02) < 1e-3
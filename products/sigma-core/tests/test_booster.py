@@ -0,0 +1,45 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from sigma_core.models.booster import BoosterClassifier, train_booster
+
+
+def _matrix(days=400):
+    rng = np.random.default_rng(5)
+    n = days * 4
+    df = pd.DataFrame(rng.normal(size=(n, 5)), columns=[f'f{i}' for i in range(5)])
+    df['date'] = np.repeat(pd.date_range('2022-01-03', periods=days).strftime('%Y-%m-%d'), 4)
+    df['hour_et'] = np.tile([12, 13, 14, 15], days)
+    z = df['f0'] + 0.7 * rng.normal(size=n)
+    df['y'] = np.where(z > 0.4, 'UP', np.where(z < -0.4, 'DOWN', 'FLAT'))
+    return df
+
+
+FEATS = [f'f{i}' for i in range(5)]
+
+
+def test_early_stopping_with_heldout_calibration():
+    df = _matrix()
+    bundle, info = train_booster(df, FEATS, 'y', calibration='sigmoid')
+    model = bundle['model']
+    assert isinstance(model, BoosterClassifier) and info['mode'] == 'fresh'
+    assert info['rounds'] < 300 and info['calibration'] == 'sigmoid'
+    # The validation tail starts on a session boundary
+    assert info['valid_rows'] % 4 == 0 and info['train_rows'] + info['valid_rows'] == len(df)
+    proba = pickle.loads(pickle.dumps(model)).predict_proba(df[FEATS].to_numpy())
+    np.testing.assert_allclose(proba.sum(axis=1), 1.0, rtol=1e-5)
+    acc = (model.predict(df[FEATS].to_numpy()) == bundle['label_encoder'].transform(df['y'])).mean()
+    assert acc > 0.6
+
+
+def test_warm_start_only_on_appended_sessions():
+    df = _matrix()
+    first, _ = train_booster(df.iloc[:1200], FEATS, 'y')
+    warm, info = train_booster(df, FEATS, 'y', warm_from=first, warm_rounds=10)
+    assert info['mode'] == 'warm' and 0 < info['trees_added'] <= 10
+    assert warm['model'].booster.num_boosted_rounds() == first['model'].booster.num_boosted_rounds() + info['trees_added']
+    # Same rows again, or a different feature list: fresh fit
+    assert train_booster(df.iloc[:1200], FEATS, 'y', warm_from=first)[1]['warm_start'] == 'no new sessions'
+    assert train_booster(df, FEATS[:4], 'y', warm_from=first)[1]['mode'] == 'fresh'
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+from sigma_core.backtest.brackets import bracket_parity, simulate_brackets
+
+
+def _bars():
+    # Three sessions of three bars; ATR 1 everywhere
+    sess = np.repeat([0, 1, 2], 3)
+    o = np.array([100, 100, 100, 100, 100, 100, 50, 50, 50], dtype=float)
+    h = np.array([101, 101, 101, 100.5, 103.5, 101, 50.5, 50.5, 50.5])
+    l = np.array([99, 99, 99, 99.5, 99.5, 99, 49.8, 49.8, 48.0])
+    c = np.array([100, 100, 100, 100, 101, 100, 50, 50.2, 49])
+    return o, h, l, c, sess, np.ones(9)
+
+
+def test_next_session_open_target_and_time_stop():
+    o, h, l, c, sess, atr = _bars()
+    t = simulate_brackets(o, h, l, c, sess, atr, atr_mult_stop=1.0, atr_mult_target=3.0, max_bars=2)
+    assert t['entry_idx'].tolist() == [3, 6]
+    # Session 1 hits the target on its second bar; session 2 times out after two bars
+    assert t['outcome'].tolist() == ['target', 'time']
+    assert t['exit_idx'].tolist() == [4, 8] and t['bars'].tolist() == [1, 2]
+    assert t['exit_px'].tolist() == [103.0, 49.0]
+    np.testing.assert_allclose(t['rr'], [3.0, -1.0])
+
+
+def test_short_same_bar_entries():
+    o, h, l, c, sess, atr = _bars()
+    t = simulate_brackets(o, h, l, c, sess, atr, signal_idx=[3, 6], sides=[-1, -1], entry_mode='same_bar',
+                          atr_mult_stop=2.0, atr_mult_target=1.0, max_bars=5)
+    # Enter at the signal close; short stop is above entry, target below
+    assert t['entry'].tolist() == [100.0, 50.0] and t['stop'].tolist() == [102.0, 52.0]
+    assert t['outcome'].tolist() == ['stop', 'target']
+    assert t['exit_idx'].tolist() == [4, 8]
+    np.testing.assert_allclose(t['ret'], [-0.02, 0.02])
+
+
+def test_parity_summary_from_frame():
+    o, h, l, c, sess, atr = _bars()
+    df = pd.DataFrame({'date': pd.to_datetime(['2024-01-02'] * 3 + ['2024-01-03'] * 3 + ['2024-01-04'] * 3),
+                       'hour_et': [10, 11, 12] * 3, 'open': o, 'high': h, 'low': l, 'close': c, 'atr_14': atr})
+    out, trades = bracket_parity(df, {'atr_mult_stop': 1.0, 'atr_mult_target': 3.0, 'time_stop_minutes': 120}, return_trades=True)
+    assert out['ok'] and out['trades'] == 2 and out['hit_rate'] == 0.5
+    assert out['entry_mode'] == 'next_session_open' and len(trades) == 2
+    assert bracket_parity(df.iloc[:3], {}) == {'ok': False, 'trades': 0}
+
+
+def test_parity_same_bar_stays_in_session_and_unknown_mode_falls_back():
+    o, h, l, c, sess, atr = _bars()
+    df = pd.DataFrame({'date': pd.to_datetime(['2024-01-02'] * 3 + ['2024-01-03'] * 3 + ['2024-01-04'] * 3),
+                       'hour_et': [10, 11, 12] * 3, 'open': o, 'high': h, 'low': l, 'close': c, 'atr_14': atr})
+    br = {'atr_mult_stop': 1.0, 'atr_mult_target': 3.0, 'time_stop_minutes': 120, 'entry_mode': 'same_bar'}
+    out, trades = bracket_parity(df, br, return_trades=True)
+    # One trade per session from its first bar; exits never leave the entry session
+    assert out['ok'] and out['entry_mode'] == 'same_bar' and out['trades'] == 3
+    assert trades['entry_idx'].tolist() == [0, 3, 6]
+    assert (sess[trades['exit_idx']] == sess[trades['entry_idx']]).all()
+    assert trades['outcome'].tolist() == ['stop', 'target', 'stop']
+    # A same_bar signal on a session's last bar has nothing to watch
+    assert simulate_brackets(o, h, l, c, sess, atr, signal_idx=[2, 5], entry_mode='same_bar').empty
+    legacy = bracket_parity(df, {**br, 'entry_mode': 'next_session_open'})
+    assert bracket_parity(df, {**br, 'entry_mode': 'next_bar_open'}) == legacy
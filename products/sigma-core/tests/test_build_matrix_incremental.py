@@ -0,0 +1,49 @@
+from datetime import date, timedelta
+
+import pandas as pd
+
+from sigma_core.data import datasets
+from sigma_core.features.sets import IndicatorSet, IndicatorSpec
+
+
+def _fake_frame(calls):
+    def _frame(sd, ed, *, out_csv, **kwargs):
+        calls.append((sd, ed))
+        rows = []
+        d = sd
+        while d <= ed:
+            if d.weekday() < 5:
+                for h in range(9, 16):
+                    rows.append({"date": d, "hour_et": h, "close": float(d.day * 100 + h)})
+            d += timedelta(days=1)
+        return pd.DataFrame(rows)
+    return _frame
+
+
+def test_incremental_appends_only_tail_sessions(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(datasets, "_build_matrix_frame", _fake_frame(calls))
+    out = str(tmp_path / "m.csv")
+    datasets.build_matrix("2024-07-01", "2024-07-10", out)
+    full = pd.read_csv(out)
+    calls.clear()
+
+    datasets.build_matrix("2024-07-01", "2024-07-12", out, incremental=True)
+    assert len(calls) == 1
+    fetch_from, fetch_to = calls[0]
+    assert fetch_to == date(2024, 7, 12)
+    assert fetch_from < date(2024, 7, 10)  # warm-up ahead of the last stored session
+    m = pd.read_csv(out)
+    assert not m.duplicated(["date", "hour_et"]).any()
+    assert sorted(m["date"].unique())[-2:] == ["2024-07-11", "2024-07-12"]
+    assert len(m) == len(full) + 2 * 7
+
+    calls.clear()
+    datasets.build_matrix("2024-07-01", "2024-07-12", out, incremental=True)
+    assert calls == []
+
+
+def test_matrix_warmup_days_scales_with_lookback():
+    small = IndicatorSet(name="s", version=1, description="", indicators=[IndicatorSpec(name="rsi", version=1, params={"period": 14})])
+    big = IndicatorSet(name="b", version=1, description="", indicators=[IndicatorSpec(name="ema", version=1, params={"window": 200})])
+    assert datasets._matrix_warmup_days(None) < datasets._matrix_warmup_days(small) < datasets._matrix_warmup_days(big)
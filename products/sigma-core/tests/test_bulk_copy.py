@@ -0,0 +1,53 @@
+import csv
+import io
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from sigma_core.registry import bulk
+
+
+class RecordingCursor:
+    def __init__(self):
+        self.sql = []
+        self.copied = []
+
+    def execute(self, sql, params=None):
+        self.sql.append(sql)
+
+    def copy_expert(self, sql, buf):
+        self.sql.append(sql)
+        self.copied.append(list(csv.reader(io.StringIO(buf.read()))))
+
+
+def test_copy_merge_chunks_and_encodes_frame():
+    df = pd.DataFrame({
+        'date': [date(2024, 1, 2)] * 3,
+        'model_id': 'm',
+        'ticker': ['A', 'B, Inc', 'C'],
+        'rank': [1.0, np.nan, 3.0],
+        'rr': [1.5, np.inf, 0.25],
+    })
+    cur = RecordingCursor()
+    n = bulk.copy_merge(cur, 'signals', ['date', 'model_id', 'ticker', 'rank', 'rr', 'side'], df,
+                        conflict=('date', 'model_id', 'ticker'), update=['rank', 'rr', 'side'], chunk_rows=2)
+    assert n == 3
+    assert len(cur.copied) == 2
+    rows = cur.copied[0] + cur.copied[1]
+    # Each row carries its position in the chunk, which decides which duplicate key wins
+    assert rows[0] == ['2024-01-02', 'm', 'A', '1', '1.5', '\\N', '0']
+    assert rows[1] == ['2024-01-02', 'm', 'B, Inc', '\\N', '\\N', '\\N', '1']
+    assert rows[2][-1] == '0'
+    assert '0::bigint AS _bulk_seq' in cur.sql[1] and '(date, model_id, ticker, rank, rr, side, _bulk_seq) FROM STDIN' in cur.sql[2]
+    merges = [s for s in cur.sql if s.startswith('INSERT INTO signals')]
+    assert len(merges) == 2 and 'ON CONFLICT (date, model_id, ticker) DO UPDATE SET rank = EXCLUDED.rank' in merges[0]
+    assert 'ORDER BY date, model_id, ticker, _bulk_seq DESC' in merges[0] and 'ctid' not in merges[0]
+    assert cur.sql[-1].startswith('DROP TABLE')
+
+
+def test_csv_value_types():
+    assert bulk._csv_value({'a': 1}) == '{"a": 1}'
+    assert bulk._csv_value(np.bool_(True)) == 't'
+    assert bulk._csv_value(pd.NaT) == '\\N'
+    assert bulk._csv_value(np.int64(7)) == '7'
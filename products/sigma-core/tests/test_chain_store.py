@@ -0,0 +1,91 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from sigma_core.data import chains
+from sigma_core.data.sources import polygon
+from sigma_core.features.builder import FeatureBuilder
+from sigma_core.features.sets import IndicatorSet, IndicatorSpec
+
+
+def _fake_chain(calls):
+    def _fetch(underlying, expiry, **kwargs):
+        calls.append((underlying, expiry))
+        strikes = np.repeat([99.0, 100.0, 101.0], 2)
+        return pd.DataFrame({
+            'strike': strikes,
+            'contract_type': ['call', 'put'] * 3,
+            'implied_volatility': [0.20, 0.22, 0.18, 0.19, 0.16, 0.17],
+            'delta': [0.7, -0.3, 0.5, -0.5, 0.26, -0.74],
+            'gamma': [0.01, 0.01, 0.05, 0.05, 0.02, None],
+            'open_interest': [100.0, 300.0, 500.0, 700.0, 50.0, 10.0],
+        })
+    return _fetch
+
+
+def test_snapshot_aggregates():
+    snap = chains.ChainSnapshot('SPY', date(2024, 3, 1), _fake_chain([])('SPY', date(2024, 3, 1)))
+    assert snap.oi_by_strike.idxmax() == 100.0
+    assert snap.oi_by_side['put'] == 1010.0 and snap.oi_total == 1660.0
+    assert snap.gamma_oi_by_strike[101.0] == 0.02 * 50.0
+    assert snap.iv_by_strike.loc[99.0, 'put'] == 0.22
+    assert snap.atm_iv(100.9, 'put') == 0.17
+    assert snap.iv_at_delta(0.25, 'call') == 0.16
+
+
+def test_options_indicators_share_one_load_per_day(monkeypatch):
+    calls = []
+    monkeypatch.setattr(polygon, 'get_polygon_option_chain_snapshot', _fake_chain(calls))
+    chains.get_chain_store().clear()
+    days = pd.bdate_range('2024-03-01', periods=3)
+    df = pd.DataFrame({'date': np.repeat(days, 7), 'close': 100.4})
+    names = ['gamma_peak_strike', 'oi_peak_strike', 'pcr_oi', 'oi_concentration_hhi', 'gamma_concentration', 'dist_to_gamma_peak']
+    iset = IndicatorSet(name='o', version=1, description='', indicators=[IndicatorSpec(name=n, version=1, params={}) for n in names])
+    out = FeatureBuilder(indicator_set=iset).add_indicator_features(df)
+    assert len(calls) == len(days)
+    assert (out['oi_peak_strike'] == 100.0).all()
+    assert np.allclose(out['pcr_oi'], 1010.0 / 650.0)
+    assert np.allclose(out['dist_to_gamma_peak'], 0.4)
+
+
+def test_store_lru_bound_and_live_chain_scope(monkeypatch):
+    calls = []
+    monkeypatch.setattr(polygon, 'get_polygon_option_chain_snapshot', _fake_chain(calls))
+    store = chains.ChainSnapshotStore(max_entries=2)
+    for d in (date(2024, 3, 1), date(2024, 3, 4), date(2024, 3, 5)):
+        store.get('SPY', d)
+    assert len(store) == 2
+    store.get('SPY', date(2024, 3, 1))  # evicted -> reloaded
+    assert len(calls) == 4
+
+    today = chains._today_et()
+    store.get('SPY', today)
+    store.get('SPY', today)
+    assert len(calls) == 6  # live chain is not retained outside a session
+    with store.session():
+        store.get('SPY', today + timedelta(days=1))
+        store.get('SPY', today + timedelta(days=1))
+        assert len(calls) == 7
+    assert ('SPY', today + timedelta(days=1)) not in store._entries
+
+
+def test_session_memoizes_empty_and_failed_loads_then_drops_them(monkeypatch):
+    calls = []
+
+    def _fetch(underlying, expiry, **kwargs):
+        calls.append(expiry)
+        if expiry == date(2024, 3, 4):
+            raise RuntimeError('boom')
+        return pd.DataFrame()
+
+    monkeypatch.setattr(polygon, 'get_polygon_option_chain_snapshot', _fetch)
+    store = chains.ChainSnapshotStore(max_entries=4)
+    with store.session():
+        for _ in range(3):
+            assert store.get('SPY', date(2024, 3, 1)).empty
+            assert store.get('SPY', date(2024, 3, 4)).empty
+        assert len(calls) == 2 and len(store) == 2
+    assert len(store) == 0
+    store.get('SPY', date(2024, 3, 1))
+    assert len(calls) == 3 and len(store) == 0
@@ -0,0 +1,65 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from sigma_core.data.sources.cache import JsonCacheBackend, make_backend, migrate_json_cache, pa
+
+
+def _aggs_frame():
+    ts = pd.date_range("2024-07-01 13:30", periods=5, freq="min", tz="UTC").tz_convert("US/Eastern")
+    return pd.DataFrame({
+        "timestamp": ts,
+        "open": [1.0, 1.1, 1.2, 1.3, 1.4],
+        "high": [1.1, 1.2, 1.3, 1.4, 1.5],
+        "low": [0.9, 1.0, 1.1, 1.2, 1.3],
+        "close": [1.05, 1.15, 1.25, 1.35, 1.45],
+        "volume": [10, 20, 30, 40, 50],
+        "vwap": [1.0, None, 1.2, 1.3, 1.4],
+    })
+
+
+def test_json_backend_roundtrip_parses_timestamps(tmp_path):
+    be = JsonCacheBackend(str(tmp_path))
+    df = _aggs_frame()
+    ref = dict(underlying="SPY", day="2024-07-01", key="O_SPY240701C00545000_2024-07-01")
+    be.store("aggs", df, **ref)
+    assert (tmp_path / "O_SPY240701C00545000_2024-07-01.json").exists()
+    out = be.load("aggs", **ref)
+    assert str(out["timestamp"].dt.tz) == "US/Eastern"
+    assert (out["timestamp"] == df["timestamp"]).all()
+
+
+@pytest.mark.skipif(pa is None, reason="pyarrow not installed")
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_columnar_backend_roundtrip_and_partitioning(tmp_path, fmt):
+    be = make_backend(fmt, str(tmp_path))
+    df = _aggs_frame()
+    ref = dict(underlying="SPY", day="2024-07-01", key="O_SPY240701C00545000_2024-07-01")
+    be.store("aggs", df, **ref)
+    path = be.path_for("aggs", **ref)
+    assert os.path.relpath(path, tmp_path).split(os.sep)[:4] == [fmt, "SPY", "aggs", "2024-07-01"]
+    out = be.load("aggs", **ref)
+    pd.testing.assert_series_equal(out["timestamp"], df["timestamp"], check_freq=False)
+    pd.testing.assert_frame_equal(out.drop(columns=["timestamp"]), df.drop(columns=["timestamp"]))
+
+
+@pytest.mark.skipif(pa is None, reason="pyarrow not installed")
+def test_migrate_json_cache(tmp_path):
+    rec = _aggs_frame()
+    (tmp_path / "O_SPY240701C00545000_2024-07-01.json").write_text(json.dumps(rec.to_dict(orient="records"), default=str))
+    (tmp_path / "snapshot").mkdir()
+    (tmp_path / "snapshot" / "SPY_2024-07-01.json").write_text(json.dumps([{"strike": 545.0, "contract_type": "call", "delta": None}]))
+    (tmp_path / "SPY_hour_2024-07-01_2024-07-02.json").write_text(json.dumps([{"date": "2024-07-01 13:00:00+00:00", "close": 545.0}]))
+    (tmp_path / "unrelated.json").write_text("{}")
+
+    stats = migrate_json_cache(str(tmp_path), backend="parquet")
+    assert stats["files"] == 3 and stats["migrated"] == 3 and stats["failed"] == 0
+    assert migrate_json_cache(str(tmp_path), backend="parquet")["skipped"] == 3
+
+    be = make_backend("parquet", str(tmp_path))
+    hour = be.load("hour", underlying="SPY", day="2024-07-01", key="SPY_hour_2024-07-01_2024-07-02")
+    assert hour["date"].iloc[0] == pd.Timestamp("2024-07-01 13:00", tz="UTC")
+    snap = be.load("snapshot", underlying="SPY", day="2024-07-01", key="SPY_2024-07-01")
+    assert snap["strike"].tolist() == [545.0]
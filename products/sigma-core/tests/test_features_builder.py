@@ -35,3 +35,23 @@ def test_select_features_filters_by_prefixes():
     # Should include at least one per-distance feature
     assert any(c.startswith('calls_sold_d') for c in feats)
 
+
+
+def test_base_features_match_per_distance_loop():
+    df = make_flow_df(21)
+    df['calls_premium'] = np.random.rand(21) * 100
+    df['puts_premium'] = np.random.rand(21) * 100
+    df['calls_premium_inf_sold'] = np.random.rand(21) * 100
+    df.loc[3, 'calls_sold'] = np.nan
+    out = FeatureBuilder(distance_max=2).add_base_features(df)
+    bucket = np.round(df['price_level'] - df['spy_prev_close'])
+    for d in range(-2, 3):
+        for src in ['calls_sold', 'puts_sold', 'calls_premium', 'puts_premium', 'calls_premium_inf_sold']:
+            expected = np.where(bucket == d, df[src], 0.0)
+            np.testing.assert_allclose(out[f'{src}_d{d}'], expected)
+        assert (out[f'puts_premium_inf_sold_d{d}'] == 0.0).all()
+    per_d_calls = out[[f'calls_sold_d{d}' for d in range(-2, 3)]].sum(axis=1)
+    np.testing.assert_allclose(out['calls_sold_total'], per_d_calls)
+    np.testing.assert_allclose(out['calls_premium_total'], out[[f'calls_premium_d{d}' for d in range(-2, 3)]].sum(axis=1))
+    assert list(out.columns[:len(df.columns)]) == list(df.columns)
+    assert out.columns[-1] == 'day_of_week'
@@ -0,0 +1,59 @@
+import requests
+
+from sigma_core.data.sources import http_client
+from sigma_core.data.sources.http_client import PolygonHTTPClient, RetryPolicy, TokenBucket, parse_retry_after
+
+
+class _Resp:
+    def __init__(self, status, headers=None, payload=None):
+        self.status_code = status
+        self.headers = headers or {}
+        self._payload = payload or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(str(self.status_code), response=self)
+
+    def json(self):
+        return self._payload
+
+
+def test_token_bucket_waits_after_burst():
+    b = TokenBucket(rate=10.0, capacity=2)
+    assert b.reserve() == 0.0
+    assert b.reserve() == 0.0
+    assert 0.05 < b.reserve() <= 0.1
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("garbage") is None
+
+
+def test_client_honours_retry_after_and_returns(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(http_client.time, "sleep", lambda s: sleeps.append(s))
+    c = PolygonHTTPClient(rate=0, retry=RetryPolicy(max_attempts=3))
+    seq = iter([_Resp(429, {"Retry-After": "2"}), _Resp(503), _Resp(200, payload={"results": [1]})])
+    monkeypatch.setattr(c.session, "get", lambda *a, **k: next(seq))
+    assert c.get_json("https://example.test") == {"results": [1]}
+    assert sleeps[0] == 2.0
+    assert len(sleeps) == 2
+
+
+def test_client_does_not_retry_client_errors(monkeypatch):
+    calls = []
+    c = PolygonHTTPClient(rate=0, retry=RetryPolicy(max_attempts=3))
+
+    def _get(*a, **k):
+        calls.append(1)
+        return _Resp(403)
+
+    monkeypatch.setattr(c.session, "get", _get)
+    try:
+        c.get("https://example.test")
+        assert False, "expected HTTPError"
+    except requests.exceptions.HTTPError:
+        pass
+    assert len(calls) == 1
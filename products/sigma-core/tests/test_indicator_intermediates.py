@@ -0,0 +1,126 @@
+import inspect
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from sigma_core.features.builder import FeatureBuilder
+from sigma_core.features.loader import load_indicator_set
+from sigma_core.features.sets import IndicatorSet, IndicatorSpec
+from sigma_core.indicators import intermediates as im
+from sigma_core.indicators.registry import get_indicator, registry
+
+
+def make_ohlc(n=300):
+    rng = np.random.default_rng(1)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    return pd.DataFrame({
+        'date': pd.date_range('2024-01-02', periods=n, freq='h'),
+        'open': close,
+        'high': close + rng.random(n),
+        'low': close - rng.random(n),
+        'close': close,
+    })
+
+
+def _set(*specs):
+    return IndicatorSet(name='t', version=1, description='', indicators=[IndicatorSpec(name=n, version=1, params=p) for n, p in specs])
+
+
+def test_plan_dedupes_shared_nodes():
+    keys = [im.wilder(im.true_range(), 14), im.sma(im.true_range(), 20, 10), im.rsi('close', 14), im.rsi('close', 14)]
+    order = im.plan(keys)
+    assert order.count(im.true_range()) == 1
+    assert order.count(im.col('close')) == 1
+    # Dependencies precede their consumers
+    assert order.index(im.true_range()) < order.index(im.wilder(im.true_range(), 14))
+    assert order.index(im.gain('close')) < order.index(im.rsi('close', 14))
+
+
+def test_indicator_set_matches_independent_calculation():
+    df = make_ohlc()
+    specs = [('atr', {}), ('adx', {}), ('keltner', {'window': 14}), ('rsi', {}), ('stoch_rsi', {}),
+             ('ema', {'window': 12}), ('macd', {}), ('ppo', {}), ('trix', {'period': 12})]
+    out = FeatureBuilder(indicator_set=_set(*specs)).add_indicator_features(df)
+    for name, params in specs:
+        solo = get_indicator(name)(**params).calculate(df)
+        pd.testing.assert_frame_equal(out[solo.columns], solo, check_dtype=False)
+
+
+def test_shared_intermediates_computed_once():
+    df = make_ohlc()
+    shared = im.Intermediates(df)
+    atr = get_indicator('atr')(period=14)
+    adx = get_indicator('adx')(period=14)
+    shared.prefetch(atr.intermediates() + adx.intermediates())
+    before = shared.computed
+    atr.calculate(df, shared=shared)
+    adx.calculate(df, shared=shared)
+    assert shared.computed == before
+    assert im.true_range() in shared
+
+
+def test_later_indicator_sees_declared_earlier_output():
+    df = make_ohlc()
+    df['open'] = df['close'] * 2.0
+    # ema_slope prefers an existing ema_{window} column (here an EMA of 'open')
+    iset = _set(('ema', {'column': 'open', 'window': 10}), ('ema_slope', {'window': 10}))
+    out = FeatureBuilder(indicator_set=iset).add_indicator_features(df)
+    np.testing.assert_allclose(out['ema10_slope1h'], out['ema_10'].diff().fillna(0.0))
+
+
+
+def test_composite_sees_pending_momentum_outputs():
+    df = make_ohlc()
+    iset = _set(('momentum', {'window': 1}), ('momentum', {'window': 3}), ('momentum_score_total', {}))
+    out = FeatureBuilder(indicator_set=iset).add_indicator_features(df)
+    expected = get_indicator('momentum_score_total')().calculate(out[['close_mom_1', 'close_mom_3']])
+    assert out['momentum_score_total'].abs().sum() > 0
+    np.testing.assert_allclose(out['momentum_score_total'], expected['momentum_score_total'])
+
+def test_grouped_long_frame_matches_per_ticker():
+    parts = []
+    for i, n in enumerate((120, 80, 150)):
+        d = make_ohlc(n)
+        d['close'] = d['close'] * (1 + i)
+        d['volume'] = 1000.0 + i
+        d.loc[[7, 40], 'close'] = np.nan
+        parts.append(d.assign(ticker=f'T{i}'))
+    long = pd.concat(parts, ignore_index=True)
+    specs = [('ema', {'window': 20}), ('rsi', {}), ('atr', {}), ('keltner', {'window': 14}), ('dist_to_ema', {'window': 20}),
+             ('adx', {}), ('macd', {}), ('ppo', {}), ('stoch_rsi', {}), ('trix', {'period': 12}), ('ema_slope', {'window': 20, 'period': 3}),
+             ('bollinger_bands', {'window': 20}), ('donchian', {'window': 20}), ('momentum', {'window': 5}), ('sma', {'window': 10}),
+             ('obv', {}), ('cmf', {'period': 20}), ('supertrend', {})]
+    fb = FeatureBuilder(indicator_set=_set(*specs))
+    grouped = fb.add_indicator_features(long, group_col='ticker')
+    for t, part in long.groupby('ticker', sort=False):
+        single = fb.add_indicator_features(part.drop(columns='ticker').reset_index(drop=True))
+        got = grouped[grouped['ticker'] == t].drop(columns='ticker').reset_index(drop=True)
+        pd.testing.assert_frame_equal(got[single.columns], single)
+
+
+PACKS = Path(__file__).resolve().parents[2] / 'sigma-lab' / 'packs'
+# Pack-set indicators that need no market-data fetches
+OFFLINE = {'rsi', 'ema', 'macd', 'atr', 'rolling_std', 'hour_of_day', 'close_vs_vwap', 'rsi_last_hour',
+           'returns_last_30m', 'day_range_pos', 'ret', 'vol_zscore', 'intraday_vwap'}
+
+
+def test_group_safe_indicators_accept_shared():
+    for name, cls in registry.indicators.items():
+        if getattr(cls, 'GROUP_SAFE', False):
+            assert 'shared' in inspect.signature(cls.calculate).parameters, name
+
+
+def test_pack_sets_keep_time_and_vwap_features():
+    df = make_ohlc(60)
+    df['hour_et'] = df['date'].dt.hour
+    df['volume'] = 1000.0
+    df['vwap'] = df['close'] - 0.5
+    df['ticker'] = np.repeat(['SPY', 'QQQ'], 30)
+    for rel, col in (('zerosigma/indicator_sets/zerosigma_opening_drive.yaml', 'hour_of_day'),
+                     ('overnightsigma/indicator_sets/overnight_eq_gap.yaml', 'close_vs_vwap')):
+        iset = load_indicator_set(PACKS / rel)
+        iset.indicators = [s for s in iset.indicators if s.name in OFFLINE]
+        for group_col in (None, 'ticker'):
+            out = FeatureBuilder(indicator_set=iset).add_indicator_features(df, group_col=group_col)
+            assert col in out.columns and out[col].notna().any(), (rel, group_col)
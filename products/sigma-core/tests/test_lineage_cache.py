@@ -0,0 +1,75 @@
+import hashlib
+import os
+
+from sigma_core.services import lineage
+
+
+def _pack(tmp_path):
+    pack = tmp_path / 'pk'
+    (pack / 'model_configs').mkdir(parents=True)
+    (pack / 'pack.yaml').write_text('id: pk\n')
+    (pack / 'model_configs' / 'm1.yaml').write_text('a: 1\n')
+    return pack
+
+
+def test_file_cache_rehashes_only_on_change(tmp_path, monkeypatch):
+    lineage.invalidate_lineage()
+    pack = _pack(tmp_path)
+    reads = []
+    real = lineage.Path.read_bytes
+    monkeypatch.setattr(lineage.Path, 'read_bytes', lambda self: reads.append(self.name) or real(self))
+    first = lineage.compute_lineage(pack_dir=pack, model_id='m1')
+    assert first['pack_sha'] == hashlib.sha1(b'id: pk\n').hexdigest()
+    assert first['policy_sha'] is None
+    assert lineage.compute_lineage(pack_dir=pack, model_id='m1') == first
+    assert sorted(reads) == ['m1.yaml', 'pack.yaml']
+
+    cfg = pack / 'model_configs' / 'm1.yaml'
+    cfg.write_text('a: 22\n')
+    os.utime(cfg, ns=(1, 1))
+    second = lineage.compute_lineage(pack_dir=pack, model_id='m1')
+    assert second['model_config_sha'] == hashlib.sha1(b'a: 22\n').hexdigest()
+    assert second['pack_sha'] == first['pack_sha']
+
+    # Under a watcher hits skip the stat; a poll evicts the changed entry
+    assert lineage.start_lineage_watch([pack], mode='poll', interval=3600) == 'poll'
+    try:
+        lineage.compute_lineage(pack_dir=pack, model_id='m1')
+        cfg.write_text('a: 333\n')
+        assert lineage.compute_lineage(pack_dir=pack, model_id='m1')['model_config_sha'] == second['model_config_sha']
+        assert lineage._WATCH.poll() == 1
+        assert lineage.compute_lineage(pack_dir=pack, model_id='m1')['model_config_sha'] == hashlib.sha1(b'a: 333\n').hexdigest()
+    finally:
+        lineage.stop_lineage_watch()
+
+
+class FakeCursor:
+    def __init__(self, stamps, docs):
+        self.stamps, self.docs, self.sql = stamps, docs, []
+
+    def execute(self, sql, args=None):
+        self.sql.append(sql)
+        self._last = sql
+
+    def fetchone(self):
+        if 'xmin' in self._last:
+            return dict(self.stamps)
+        kind = 'policy' if 'FROM policies' in self._last else ('model_config' if 'FROM model_configs' in self._last else 'indicator_set')
+        return {'doc': self.docs[kind]} if kind in self.docs else None
+
+
+def test_db_lineage_cached_by_row_stamp():
+    lineage.invalidate_lineage()
+    cur = FakeCursor({'model_config': '10', 'policy': '2:11', 'indicator_set': None}, {'model_config': {'b': 1, 'a': 2}, 'policy': {'v': 1}})
+    out = lineage.db_lineage(cur, 'pk', 'm1')
+    assert out['model_config'] == hashlib.sha1(b'{"a":2,"b":1}').hexdigest()
+    assert out['indicator_set'] is None
+    assert len(cur.sql) == 3
+    cur.sql.clear()
+    assert lineage.db_lineage(cur, 'pk', 'm1') == out
+    assert len(cur.sql) == 1
+    cur.stamps['policy'] = '2:12'
+    cur.docs['policy'] = {'v': 2}
+    cur.sql.clear()
+    assert lineage.db_lineage(cur, 'pk', 'm1')['policy'] == hashlib.sha1(b'{"v":2}').hexdigest()
+    assert len(cur.sql) == 2
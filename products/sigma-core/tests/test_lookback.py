@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+from sigma_core.features.builder import FeatureBuilder
+from sigma_core.features.lookback import latest_window_start, set_lookback, warmup_days
+from sigma_core.features.sets import IndicatorSet, IndicatorSpec
+from sigma_core.indicators.registry import get_indicator
+
+
+def _set(*specs):
+    return IndicatorSet(name='t', version=1, description='', indicators=[IndicatorSpec(name=n, version=1, params=p) for n, p in specs])
+
+
+def test_indicator_lookbacks():
+    assert get_indicator('sma')(window=20).lookback() == 21
+    assert get_indicator('ema')(window=20).lookback() == 61
+    assert get_indicator('rsi')(period=14).lookback() == 99
+    assert get_indicator('obv')().lookback() is None
+    daily = get_indicator('daily_ema')(window=20)
+    assert daily.lookback() == 1 and daily.lookback_sessions() == 60
+    lb = set_lookback(_set(('sma', {'window': 50}), ('rsi', {}), ('obv', {}), ('not_registered', {'window': 10, 'lag_days': 4})))
+    assert lb == {'bars': 99, 'sessions': 4, 'unbounded': ['obv']}
+
+
+def test_latest_row_matches_full_history():
+    specs = [('sma', {'window': 20}), ('bollinger_bands', {'window': 20}), ('ema', {'window': 12}),
+             ('rsi', {}), ('macd', {}), ('atr', {}), ('adx', {})]
+    rng = np.random.default_rng(4)
+    n = 2000
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    df = pd.DataFrame({'open': close, 'high': close + rng.random(n), 'low': close - rng.random(n), 'close': close})
+    fb = FeatureBuilder(indicator_set=_set(*specs))
+    full = fb.add_indicator_features(df).iloc[-1]
+    tail = fb.add_indicator_features(df.tail(set_lookback(fb.indicator_set)['bars']).reset_index(drop=True)).iloc[-1]
+    pd.testing.assert_series_equal(tail[['sma_20', 'bb_upper_20']], full[['sma_20', 'bb_upper_20']], check_names=False)
+    np.testing.assert_allclose(tail.to_numpy(dtype=float), full.to_numpy(dtype=float), rtol=5e-3)
+
+
+def test_latest_window_start_is_clamped():
+    s = _set(('ema', {'window': 20}))
+    assert warmup_days(s) == 17
+    assert latest_window_start(s, '2020-01-01', '2024-06-28') == '2024-06-11'
+    assert latest_window_start(s, '2024-06-20', '2024-06-28') == '2024-06-20'
@@ -0,0 +1,47 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from sigma_core.data.matrix_io import _source, matrix_columns, read_matrix, read_matrix_meta, write_matrix
+
+
+def _frame(n=50):
+    rng = np.random.default_rng(1)
+    return pd.DataFrame({
+        'date': pd.date_range('2024-01-02', periods=n, freq='D').strftime('%Y-%m-%d'),
+        'hour_et': rng.integers(9, 16, n),
+        'close': rng.normal(100, 1, n),
+        'rsi_14': np.where(rng.uniform(size=n) < 0.1, np.nan, rng.uniform(0, 100, n)),
+        'y': rng.choice(['UP', 'DOWN', 'FLAT'], n),
+    })
+
+
+def test_round_trip_matches_csv(tmp_path, monkeypatch):
+    monkeypatch.setenv('SIGMA_MATRIX_FORMAT', 'parquet')
+    df = _frame()
+    out = tmp_path / 'matrix.csv'
+    write_matrix(df, out, lineage={'pack_sha': 'abc'})
+    assert (tmp_path / 'matrix.parquet').exists()
+    assert _source(out)[0] == 'parquet'
+    got = read_matrix(out)
+    pd.testing.assert_frame_equal(got, pd.read_csv(out))
+    meta = read_matrix_meta(out)
+    assert meta['format'] == 'parquet' and meta['rows'] == len(df)
+    assert meta['date_range'] == ['2024-01-02', df['date'].iloc[-1]]
+    assert meta['lineage'] == {'pack_sha': 'abc'}
+    assert matrix_columns(out) == list(df.columns)
+
+
+def test_projection_and_stale_columnar_fallback(tmp_path, monkeypatch):
+    monkeypatch.setenv('SIGMA_MATRIX_FORMAT', 'parquet')
+    df = _frame()
+    out = tmp_path / 'matrix.csv'
+    write_matrix(df, out)
+    got = read_matrix(out, columns=['y', 'close', 'missing'])
+    assert list(got.columns) == ['y', 'close']
+    # A CSV rewritten after the parquet file is the source of truth
+    df.head(5).to_csv(out, index=False)
+    pq_mtime = os.stat(tmp_path / 'matrix.parquet').st_mtime_ns
+    os.utime(out, ns=(pq_mtime + 10**9, pq_mtime + 10**9))
+    assert len(read_matrix(out)) == 5
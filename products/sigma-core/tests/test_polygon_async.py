@@ -0,0 +1,41 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from sigma_core.data.sources import polygon
+from sigma_core.data.sources import polygon_async
+from sigma_core.data.sources.cache import JsonCacheBackend
+
+
+@pytest.mark.skipif(polygon_async.aiohttp is None, reason="aiohttp not installed")
+def test_async_aggs_reads_shared_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(polygon, "CACHE_DIR", str(tmp_path))
+    monkeypatch.delenv("POLYGON_API_KEY", raising=False)
+    monkeypatch.delenv("ZE_POLYGON_API_KEY", raising=False)
+    d = date(2024, 7, 1)
+    occ = polygon._build_occ_symbol("SPY", d, 545.0, "call")
+    ts = pd.date_range("2024-07-01 13:30", periods=3, freq="min", tz="UTC").tz_convert("US/Eastern")
+    frame = pd.DataFrame({"timestamp": ts, "open": 1.0, "high": 1.0, "low": 1.0, "close": 1.0, "volume": [1, 2, 3], "vwap": 1.0})
+    polygon._cache().store("aggs", frame, **polygon._aggs_cache_ref("SPY", occ, d))
+
+    async def _go():
+        async with polygon_async.AsyncPolygonClient(concurrency=4) as client:
+            return await polygon_async.fetch_options_aggs(client, "SPY", d, 545.0, "call", d, d)
+
+    got = polygon_async.run_async(_go())
+    sync = polygon.get_polygon_options_aggs("SPY", d, 545.0, "call", d, d)
+    pd.testing.assert_frame_equal(got, sync)
+    assert got["volume"].tolist() == [1, 2, 3]
+
+
+def test_json_backend_entries_visible_to_async_path(tmp_path, monkeypatch):
+    monkeypatch.setenv("POLYGON_CACHE_BACKEND", "json")
+    monkeypatch.setattr(polygon, "CACHE_DIR", str(tmp_path))
+    d = date(2024, 7, 1)
+    occ = polygon._build_occ_symbol("SPY", d, 545.0, "put")
+    ref = polygon._ticks_cache_ref("SPY", occ, d, d)
+    assert isinstance(polygon._cache(), JsonCacheBackend)
+    polygon._cache().store("trades", pd.DataFrame(), **ref)
+    # Empty trade results are a valid cached answer (no refetch)
+    assert polygon_async.run_async(polygon_async._cache_load("trades", ref)).empty
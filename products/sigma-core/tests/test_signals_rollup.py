@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sigma_core.services import signals_live as sl
+
+
+def make_signals(n=200):
+    rng = np.random.default_rng(0)
+    minutes = np.sort(rng.integers(0, 60 * 24 * 40, n))
+    df = pd.DataFrame({
+        'ts': pd.Timestamp('2024-01-02', tz='UTC') + pd.to_timedelta(minutes, unit='min'),
+        'pnl': rng.normal(0.01, 0.1, n),
+        'status': rng.choice(['filled', 'canceled', 'pending'], n),
+        'slippage': rng.random(n),
+    })
+    df.loc[5, 'pnl'] = np.nan
+    return df
+
+
+def test_rollup_metrics_match_row_metrics():
+    df = make_signals()
+    now = pd.Timestamp('2024-03-01', tz='UTC')
+    rows = sl.compute_live_metrics(df, now_ts=now)
+    daily = sl.daily_rollup(df)
+    got = sl.metrics_from_rollup(daily, now_ts=now)
+    for k in ('sharpe', 'sortino', 'cum_return', 'fill_rate', 'avg_slippage', 'coverage_pct'):
+        assert getattr(got, k) == pytest.approx(getattr(rows, k), rel=1e-9), k
+    assert got.trades == rows.trades
+    assert got.freshness_sec == rows.freshness_sec
+    # Equity/peak columns mirror the signals_daily table
+    assert daily['equity'].iloc[-1] == pytest.approx(rows.cum_return)
+    assert (daily['peak'] >= daily['equity']).all()
+
+
+def test_csv_leaderboard_uses_cached_rollup(tmp_path, monkeypatch):
+    d = tmp_path / 'live_data' / 'm1'
+    d.mkdir(parents=True)
+    make_signals().to_csv(d / 'signals.csv', index=False)
+    calls = []
+    real = sl.load_signals_csv
+    monkeypatch.setattr(sl, 'load_signals_csv', lambda root, mid: calls.append(mid) or real(root, mid))
+    a = sl.leaderboard_from_csv(tmp_path, pack_filter=None, risk_profile=None, start='2024-01-10', end='2024-01-20', limit=10, offset=0)
+    b = sl.leaderboard_from_csv(tmp_path, pack_filter=None, risk_profile=None, start=None, end=None, limit=10, offset=0)
+    assert calls == ['m1']
+    assert a['total'] == b['total'] == 1
+    assert a['rows'][0]['metrics']['trades'] < b['rows'][0]['metrics']['trades']
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sigma_core.data import stocks
+
+
+def _bars(ticker, start, end):
+    if ticker == 'BAD':
+        raise RuntimeError(f"Failed to fetch {ticker} hourly bars from Polygon")
+    rng = np.random.default_rng(len(ticker))
+    n = 70
+    close = 50 + np.cumsum(rng.normal(0, 1, n))
+    return pd.DataFrame({
+        'date': np.repeat(pd.date_range('2024-03-01', periods=10).date, 7),
+        'hour_et': np.tile(range(9, 16), 10),
+        'open': close, 'high': close + 1, 'low': close - 1, 'close': close, 'volume': 1e5,
+    })
+
+
+@pytest.fixture
+def indicator_set(tmp_path):
+    p = tmp_path / 'set.yaml'
+    p.write_text("name: t\nversion: 1\nindicators:\n  - {name: ema, window: 20}\n  - {name: rsi, period: 14}\n  - {name: adx, period: 14}\n")
+    return str(p)
+
+
+def test_universe_latest_matches_per_ticker_matrix(monkeypatch, tmp_path, indicator_set):
+    monkeypatch.setattr(stocks, 'fetch_hourly_ticker', _bars)
+    latest, errors = stocks.build_stock_universe_latest(['AAPL', 'BAD', 'MSFT', 'AAPL'], '2024-03-01', '2024-03-10',
+                                                        indicator_set_path=indicator_set, workers=4)
+    assert list(latest['ticker']) == ['AAPL', 'MSFT'] and list(errors) == ['BAD']
+    for t in ('AAPL', 'MSFT'):
+        out = tmp_path / f'{t}.csv'
+        stocks.build_stock_matrix('2024-03-01', '2024-03-10', str(out), ticker=t, indicator_set_path=indicator_set, label_kind='none')
+        last = pd.read_csv(out).iloc[-1]
+        row = latest[latest['ticker'] == t].iloc[0]
+        assert row['date'] == last['date']
+        for c in ('close', 'ema_20', 'rsi_14', 'adx_14'):
+            assert row[c] == pytest.approx(last[c], rel=1e-9)
+
+
+def test_latest_only_fetches_lookback_window(monkeypatch, indicator_set):
+    seen = []
+    monkeypatch.setattr(stocks, 'fetch_hourly_ticker', lambda t, s, e: seen.append((s, e)) or _bars(t, s, e))
+    stocks.build_stock_universe_latest(['AAPL'], '2020-01-01', '2024-06-28', indicator_set_path=indicator_set)
+    stocks.build_stock_universe_latest(['AAPL'], '2020-01-01', '2024-06-28', indicator_set_path=indicator_set, latest_only=False)
+    # ADX(14) needs 141 hourly bars -> 22 sessions -> 34 calendar days
+    assert seen == [('2024-05-25', '2024-06-28'), ('2020-01-01', '2024-06-28')]
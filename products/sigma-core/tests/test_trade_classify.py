@@ -0,0 +1,82 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sigma_core.data.sources import cache, polygon
+from sigma_core.data.trade_classify import PremiumClassifier, classify_premium
+
+
+def _ticks(n_trades=400, n_quotes=20000, seed=0):
+    rng = np.random.default_rng(seed)
+    day = pd.Timestamp("2024-07-01 09:30", tz="US/Eastern").value
+    span = int(6.5 * 3600e9)
+    q_ts = np.sort(day + rng.integers(0, span, n_quotes))
+    bid = np.round(rng.uniform(1.0, 2.0, n_quotes), 2)
+    quotes = pd.DataFrame({"timestamp": pd.to_datetime(q_ts, utc=True).tz_convert("US/Eastern"), "bid": bid, "ask": bid + 0.05})
+    quotes.loc[rng.integers(0, n_quotes, 50), "bid"] = np.nan
+    t_ts = day - int(600e9) + rng.integers(0, span + int(600e9), n_trades)
+    trades = pd.DataFrame({
+        "timestamp": pd.to_datetime(t_ts, utc=True).tz_convert("US/Eastern"),
+        "price": np.round(rng.uniform(0.9, 2.2, n_trades), 2),
+        "size": rng.integers(1, 20, n_trades),
+    })
+    return trades, quotes
+
+
+def _reference(trades, quotes, sh, eh):
+    # Previous in-memory implementation (merge_asof + per-hour groupby)
+    tdf = trades.assign(ts=pd.to_datetime(trades["timestamp"])).sort_values("ts")
+    qdf = quotes.assign(ts=pd.to_datetime(quotes["timestamp"])).sort_values("ts", kind="stable")
+    m = pd.merge_asof(tdf, qdf[["ts", "bid", "ask"]], on="ts", direction="backward", tolerance=pd.Timedelta("5min"))
+    price = m["price"].astype(float)
+    buyer = (price >= m["ask"].fillna(np.inf) - 1e-6) | (price > (m["bid"].fillna(0.0) + m["ask"].fillna(0.0)) / 2.0 + 1e-6)
+    m["prem"] = np.where(buyer, price * m["size"].astype(float) * 100.0, 0.0)
+    m["hour_et"] = m["ts"].dt.tz_convert("US/Eastern").dt.hour
+    m = m[(m["hour_et"] >= sh) & (m["hour_et"] <= eh)]
+    return m.groupby("hour_et")["prem"].sum().to_dict()
+
+
+@pytest.mark.parametrize("batch", [777, 5000, 10**6])
+def test_streaming_matches_merge_asof(batch):
+    trades, quotes = _ticks()
+    expected = _reference(trades, quotes, 9, 14)
+    batches = (quotes.iloc[i:i + batch] for i in range(0, len(quotes), batch))
+    got, clf = classify_premium(trades, batches, start_hour=9, end_hour=14)
+    assert got.keys() == expected.keys()
+    np.testing.assert_allclose(list(got.values()), list(expected.values()))
+    # Only the current batch plus the carried quote tail is ever buffered
+    assert clf.peak_buffer <= min(batch, len(quotes)) + 1
+
+
+def test_trades_without_quotes():
+    trades, _ = _ticks(n_trades=20)
+    clf = PremiumClassifier(trades)
+    assert clf.finish() == _reference(trades, pd.DataFrame({"timestamp": pd.to_datetime([], utc=True).tz_convert("US/Eastern"), "bid": [], "ask": []}), 0, 23)
+
+
+def test_quote_stream_pages_spill_to_cache(tmp_path, monkeypatch):
+    if cache.pa is None:
+        pytest.skip("pyarrow not installed")
+    monkeypatch.setenv("POLYGON_CACHE_BACKEND", "parquet")
+    monkeypatch.setenv("POLYGON_API_KEY", "test")
+    monkeypatch.setattr(polygon, "CACHE_DIR", str(tmp_path))
+    t0 = pd.Timestamp("2024-07-01 14:00", tz="UTC").value
+    pages = [[{"t": t0 + i * 1000 + k, "bp": 1.0, "ap": 1.1} for k in range(3)] for i in range(4)]
+    seen = []
+
+    def _pages(url, params, **kw):
+        seen.append(params["limit"])
+        yield from pages
+
+    monkeypatch.setattr(polygon, "_iter_pages", _pages)
+    d = date(2024, 7, 1)
+    stream = polygon.iter_polygon_option_quotes("SPY", d, 545.0, "call", d, d, batch_rows=3)
+    next(stream)
+    stream.close()  # abandoned mid-day: nothing cached
+    got = list(polygon.iter_polygon_option_quotes("SPY", d, 545.0, "call", d, d, batch_rows=3))
+    assert seen == [3, 3] and [len(b) for b in got] == [3] * 4
+    cached = list(polygon.iter_polygon_option_quotes("SPY", d, 545.0, "call", d, d, batch_rows=5))
+    assert len(seen) == 2 and [len(b) for b in cached] == [5, 5, 2]
+    pd.testing.assert_frame_equal(pd.concat(cached, ignore_index=True), pd.concat(got, ignore_index=True))
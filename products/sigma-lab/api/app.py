@@ -13,6 +13,9 @@ if _os.getenv("SIGMA_USE_PATH_HACKS", "1") in ("1","true","True"):
         _SIGMA_CORE_DIR = _PARENT / 'sigma-core'
         if _SIGMA_CORE_DIR.exists() and str(_SIGMA_CORE_DIR) not in _sys.path:
             _sys.path.insert(0, str(_SIGMA_CORE_DIR))
+        _SIGMA_WORKERS_DIR = _PARENT / 'sigma-workers'
+        if _SIGMA_WORKERS_DIR.exists() and str(_SIGMA_WORKERS_DIR) not in _sys.path:
+            _sys.path.insert(0, str(_SIGMA_WORKERS_DIR))
     except Exception:
         pass
     if str(_PARENT) not in _sys.path:
@@ -28,7 +31,7 @@ except Exception:
     pass
 import threading
 import time
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 import shutil
@@ -42,7 +45,8 @@ from pydantic import BaseModel
 import time as _time
 
 from sigma_core.data.datasets import build_matrix as build_matrix_range
-from sigma_core.data.stocks import build_stock_matrix as build_stock_matrix_range
+from sigma_core.data.stocks import build_stock_matrix as build_stock_matrix_range, build_stock_universe_latest
+from sigma_core.data.matrix_io import read_matrix
 from sigma_core.backtest.engine import run_backtest
 from sigma_core.features.builder import select_features as select_features_train
 from sigma_core.cv.splits import PurgedEmbargoedWalkForwardSplit
@@ -61,6 +65,10 @@ from sigma_core.storage.relational import get_db
 from sklearn.calibration import CalibratedClassifierCV
 from sklearn.preprocessing import LabelEncoder
 from xgboost import XGBClassifier
+try:
+    from sigma_core.models.booster import train_booster
+except Exception:
+    train_booster = None
 import numpy as np
 import requests as _requests
 import csv as _csv
@@ -71,9 +79,10 @@ try:
 except Exception:
     apply_stock_brackets = None
 try:
-    from sigma_core.services.lineage import compute_lineage as _compute_lineage
+    from sigma_core.services.lineage import compute_lineage as _compute_lineage, start_lineage_watch as _start_lineage_watch
 except Exception:
     _compute_lineage = None
+    _start_lineage_watch = None
 try:
     from sigma_core.services.policy import validate_policy_file as _validate_policy_file
 except Exception:
@@ -125,11 +134,35 @@ _include_router('api.routers.runs')
 _include_router('api.routers.admin')
 _include_router('api.routers.packs')
 
+# Lineage hashes are cached per file; with SIGMA_LINEAGE_WATCH set, pack files are watched instead of stat'ed
+if _start_lineage_watch is not None:
+    try:
+        from sigma_core.services.io import PACKS_DIR as _LINEAGE_PACKS_DIR
+        _start_lineage_watch({WS_DIR / 'packs', _LINEAGE_PACKS_DIR})
+    except Exception:
+        _logging.getLogger(__name__).warning("lineage watch not started")
+
 # Lightweight audit middleware (DB optional). Logs POST requests to key endpoints.
+# Events are queued and written in batches off the request path (see sigma_core.services.audit).
+_AUDIT_PATHS = {"/scan", "/options_overlay", "/build_matrix", "/train", "/backtest"}
+
+
+def _audit_lineage(row: dict) -> dict:
+    """Writer-thread enrichment: lineage of the pack/model named in the payload (best-effort)."""
+    model_id, pack_id = row.get('model_id'), row.get('pack_id')
+    if _compute_lineage is not None and model_id and pack_id and row.get('lineage') is None:
+        pack_dir = WS_DIR / 'packs' / str(pack_id)
+        ind_cand = pack_dir / 'indicator_sets' / f"{model_id}.yaml"
+        ind_path = ind_cand if ind_cand.exists() else (pack_dir / 'indicator_set.yaml')
+        row['lineage'] = _compute_lineage(pack_dir=pack_dir, model_id=str(model_id), indicator_set_path=ind_path)
+    return row
+
+
 try:
-    from sigma_core.services.audit import log_audit as _log_audit
+    from sigma_core.services.audit import audit_queue as _audit_queue_factory
+    _audit_queue = _audit_queue_factory(enrich=_audit_lineage)
 except Exception:
-    _log_audit = None
+    _audit_queue = None
 
 @app.middleware("http")
 async def audit_mw(request, call_next):
@@ -142,52 +175,24 @@ async def audit_mw(request, call_next):
     except Exception:
         pass
     try:
-        if _log_audit is not None and request.method in {"POST"}:
+        if _audit_queue is not None and request.method in {"POST"}:
             path = str(request.url.path)
             # Only log key mutating routes
-            if path in {"/scan","/options_overlay","/build_matrix","/train","/backtest"}:
+            if path in _AUDIT_PATHS:
                 try:
                     body = await request.body()
-                    payload = None
-                    if body:
-                        import json as _json
-                        try:
-                            payload = _json.loads(body.decode('utf-8'))
-                        except Exception:
-                            payload = None
-                except Exception:
-                    payload = None
-                # best-effort model/pack extraction
-                model_id = None; pack_id = None
-                if isinstance(payload, dict):
-                    model_id = payload.get('model_id')
-                    pack_id = payload.get('pack_id')
-                # lineage (best-effort)
-                lineage_vals = None
-                try:
-                    if _compute_lineage is not None and model_id and pack_id:
-                        pack_dir = WS_DIR / 'packs' / str(pack_id)
-                        # Try to resolve indicator set file if present
-                        ind_path = None
-                        try:
-                            ind_cand = pack_dir / 'indicator_sets' / f"{model_id}.yaml"
-                            ind_path = ind_cand if ind_cand.exists() else (pack_dir / 'indicator_set.yaml')
-                        except Exception:
-                            ind_path = None
-                        lineage_vals = _compute_lineage(pack_dir=pack_dir, model_id=str(model_id), indicator_set_path=ind_path)
                 except Exception:
-                    lineage_vals = None
-                _log_audit(
-                    path=path,
-                    method=request.method,
-                    status=int(getattr(response, 'status_code', 0)),
-                    user_id=None,
-                    client=str(request.client.host) if getattr(request, 'client', None) else None,
-                    pack_id=pack_id,
-                    model_id=model_id,
-                    lineage=lineage_vals,
-                    payload=payload,
-                )
+                    body = None
+                # aput: a full queue never blocks the event loop (SIGMA_AUDIT_BLOCK_MS waits off-loop)
+                await _audit_queue.aput({
+                    'at': datetime.now(timezone.utc),
+                    'path': path,
+                    'method': request.method,
+                    'status': int(getattr(response, 'status_code', 0)),
+                    'user_id': None,
+                    'client': str(request.client.host) if getattr(request, 'client', None) else None,
+                    'body': body,
+                })
     except Exception as e:
         _logging.getLogger(__name__).warning("audit middleware error: %s", e)
     return response
@@ -293,10 +298,10 @@ def _ensure_policy_exists(model_id: str, pack_id: str) -> Optional[str]:
 
 
 
-def _train_model(csv_path: str, *, allowed_hours: Optional[List[int]], target: Optional[str], calibration: Optional[str], model_out: Path, features_list: Optional[List[str]] = None) -> Dict[str, Any]:
+def _train_model(csv_path: str, *, allowed_hours: Optional[List[int]], target: Optional[str], calibration: Optional[str], model_out: Path, features_list: Optional[List[str]] = None, early_stopping: bool = False, warm_start: bool = False) -> Dict[str, Any]:
     if select_features_train is None or XGBClassifier is None or LabelEncoder is None:
         raise RuntimeError(f"Training dependencies missing")
-    df = pd.read_csv(csv_path)
+    df = read_matrix(csv_path, columns=(list(features_list) + ["date", "hour_et", target or "y", "y_syn"]) if features_list else None)
     if allowed_hours and "hour_et" in df.columns:
         df = df[df["hour_et"].isin(allowed_hours)].copy()
     y_col = target or ("y" if "y" in df.columns and df["y"].notna().any() else "y_syn")
@@ -305,6 +310,19 @@ def _train_model(csv_path: str, *, allowed_hours: Optional[List[int]], target: O
     for c in missing:
         if c.startswith("calls_sold_d") or c.startswith("puts_sold_d"):
             df[c] = 0.0
+    if early_stopping or warm_start:
+        if train_booster is None:
+            raise RuntimeError("Training dependencies missing")
+        prev = None
+        if warm_start and model_out.exists():
+            try:
+                prev = joblib.load(model_out)
+            except Exception:
+                prev = None
+        bundle, info = train_booster(df, features, y_col, calibration=calibration, allowed_hours=allowed_hours, warm_from=prev)
+        model_out.parent.mkdir(parents=True, exist_ok=True)
+        joblib.dump(bundle, model_out)
+        return {"ok": True, "model_out": str(model_out), "rows": int(len(df)), "training": info}
     X = df[features].fillna(0.0).values
     y_raw = df[y_col].astype(str).values
     le = LabelEncoder(); y = le.fit_transform(y_raw)
@@ -389,19 +407,6 @@ def _load_policy(model_id: str, pack_id: str) -> Dict[str, Any]:
     return data or {}
 
 
-def _to_float(x: Any) -> Optional[float]:
-    try:
-        if x is None:
-            return None
-        v = float(x)
-        import numpy as _np
-        if _np.isfinite(v):
-            return v
-    except Exception:
-        pass
-    return None
-
-
 @app.get("/validate_policy")
 def validate_policy(model_id: str = Query(...), pack_id: str = Query("zerosigma")):
     pol_path = _workspace_paths(model_id, pack_id)["policy"]
@@ -431,6 +436,10 @@ class ScanRequest(BaseModel):
     adx_min: Optional[float] = 18.0
     # Brackets toggle (optional override)
     brackets_enabled: Optional[bool] = None
+    # Concurrent hourly bar fetches
+    workers: Optional[int] = 8
+    # Fetch only the indicator set's lookback before `end` (False: the whole start..end range)
+    latest_only: Optional[bool] = True
 
 
 def _resolve_indicator_set_path_api(pack_id: str, model_id: str, indicator_set_name: Optional[str]) -> Path:
@@ -506,29 +515,17 @@ def scan_ep(payload: ScanRequest):
         else:
             return JSONResponse({"ok": False, "error": "Provide tickers or universe_csv"}, status_code=400)
 
-        # Build and collect latest rows
-        latest_rows: list[pd.DataFrame] = []
-        base_dir = WS_DIR / 'matrices' / model_id
-        base_dir.mkdir(parents=True, exist_ok=True)
-        for t in tickers:
-            out_csv = base_dir / f"{t}_scan.csv"
-            build_stock_matrix_range(
-                start_date=payload.start,
-                end_date=payload.end,
-                out_csv=str(out_csv),
-                ticker=t,
-                indicator_set_path=str(ind_path) if ind_path else None,
-                label_kind='none',
-            )
-            df = pd.read_csv(out_csv)
-            if len(df) == 0:
-                continue
-            last = df.iloc[[-1]].copy(); last['ticker'] = t
-            latest_rows.append(last)
-        if not latest_rows:
-            return JSONResponse({"ok": False, "error": "No data built for provided universe"}, status_code=400)
-
-        latest = pd.concat(latest_rows, ignore_index=True)
+        # Latest row per ticker from one batched fetch + grouped indicator pass (no per-ticker CSVs)
+        latest, fetch_errors = build_stock_universe_latest(
+            tickers,
+            payload.start,
+            payload.end,
+            indicator_set_path=str(ind_path) if ind_path else None,
+            workers=int(payload.workers or 8),
+            latest_only=payload.latest_only is not False,
+        )
+        if latest.empty:
+            return JSONResponse({"ok": False, "error": "No data built for provided universe", "errors": fetch_errors}, status_code=400)
         scored = _compute_breakout_momentum_score_inline(
             latest,
             epsilon=float(payload.epsilon or 0.002),
@@ -583,35 +580,17 @@ def scan_ep(payload: ScanRequest):
         # Optional DB upsert
         if db_upsert_signals is not None:
             try:
-                # shape rows for DB
-                records = []
-                for _, r in picked.iterrows():
-                    rec = {
-                        'date': pd.to_datetime(r.get('date')).date() if pd.notna(r.get('date')) else None,
-                        'model_id': model_id,
-                        'ticker': r.get('ticker'),
-                        'side': r.get('side', 'buy'),
-                        'entry_mode': r.get('entry_mode'),
-                        'entry_ref_px': _to_float(r.get('entry_ref_px')),
-                        'stop_px': _to_float(r.get('stop_px')),
-                        'target_px': _to_float(r.get('target_px')),
-                        'time_stop_minutes': int(r.get('time_stop_minutes')) if pd.notna(r.get('time_stop_minutes')) else None,
-                        'rr': _to_float(r.get('rr')),
-                        'score_total': _to_float(r.get('score_total')),
-                        'rank': int(r.get('rank')) if pd.notna(r.get('rank')) else None,
-                        'score_breakout': _to_float(r.get('score_breakout')),
-                        'score_momentum': _to_float(r.get('score_momentum')),
-                        'score_trend_quality': _to_float(r.get('score_trend_quality')),
-                        'score_alignment': _to_float(r.get('score_alignment')),
-                        'pack_id': pack_id,
-                        'policy_version': policy_version,
-                        'pack_sha': lineage_vals.get('pack_sha'),
-                        'indicator_set_sha': lineage_vals.get('indicator_set_sha'),
-                        'model_config_sha': lineage_vals.get('model_config_sha'),
-                        'policy_sha': lineage_vals.get('policy_sha'),
-                    }
-                    records.append(rec)
-                if records:
+                # shape rows for DB (columnar; upsert_signals COPYs the frame)
+                num_cols = ['entry_ref_px', 'stop_px', 'target_px', 'time_stop_minutes', 'rr', 'score_total', 'rank',
+                            'score_breakout', 'score_momentum', 'score_trend_quality', 'score_alignment']
+                records = picked.reindex(columns=['date', 'ticker', 'side', 'entry_mode', *num_cols, 'pack_id', 'policy_version',
+                                                  'pack_sha', 'indicator_set_sha', 'model_config_sha', 'policy_sha'])
+                records['date'] = pd.to_datetime(records['date'], errors='coerce').dt.date
+                records['model_id'] = model_id
+                if 'side' not in picked.columns:
+                    records['side'] = 'buy'
+                records[num_cols] = records[num_cols].apply(pd.to_numeric, errors='coerce')
+                if len(records):
                     db_upsert_signals(records)
             except Exception:
                 pass
@@ -622,6 +601,7 @@ def scan_ep(payload: ScanRequest):
             'count': int(len(picked)),
             'signals_csv': str(out_csv),
             'top': picked[keep_cols].head(min(5, len(picked))).to_dict(orient='records'),
+            'skipped': fetch_errors,
         }
     except Exception as e:
         return JSONResponse({"ok": False, "error": str(e)}, status_code=500)
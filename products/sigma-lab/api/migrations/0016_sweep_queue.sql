@@ -0,0 +1,11 @@
+-- Resumable sweep queue: backtest_sweeps rows are jobs, sweep_results rows are completed variants
+ALTER TABLE backtest_sweeps ADD COLUMN IF NOT EXISTS total_variants INT;
+ALTER TABLE backtest_sweeps ADD COLUMN IF NOT EXISTS error TEXT;
+ALTER TABLE sweep_results ADD COLUMN IF NOT EXISTS variant_key TEXT;
+
+-- One result per variant so a resumed sweep never records a variant twice
+CREATE UNIQUE INDEX IF NOT EXISTS ux_sweep_results_sweep_variant
+  ON sweep_results(sweep_id, variant_key);
+
+CREATE INDEX IF NOT EXISTS ix_backtest_sweeps_status
+  ON backtest_sweeps(status, created_at);
@@ -0,0 +1,54 @@
+-- Execution outcome fields on signals (optional; live metrics prefer pnl over rr)
+ALTER TABLE signals ADD COLUMN IF NOT EXISTS pnl DOUBLE PRECISION;
+ALTER TABLE signals ADD COLUMN IF NOT EXISTS status TEXT;
+ALTER TABLE signals ADD COLUMN IF NOT EXISTS slippage DOUBLE PRECISION;
+
+-- Daily per-model rollup of signals, refreshed by upsert_signals for the (model_id, date) keys it
+-- touches. Moment sums (pnl_n/pnl_sq, neg_*) let period Sharpe/Sortino be computed from day rows;
+-- equity/peak are the cumulative pnl and its running max over the model's whole history.
+CREATE TABLE IF NOT EXISTS signals_daily (
+  model_id TEXT NOT NULL,
+  date DATE NOT NULL,
+  trades INT NOT NULL DEFAULT 0,
+  status_n INT NOT NULL DEFAULT 0,
+  filled INT NOT NULL DEFAULT 0,
+  canceled INT NOT NULL DEFAULT 0,
+  pending INT NOT NULL DEFAULT 0,
+  pnl DOUBLE PRECISION NOT NULL DEFAULT 0,
+  pnl_n INT NOT NULL DEFAULT 0,
+  pnl_sq DOUBLE PRECISION NOT NULL DEFAULT 0,
+  neg_n INT NOT NULL DEFAULT 0,
+  neg_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+  neg_sq DOUBLE PRECISION NOT NULL DEFAULT 0,
+  slippage_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+  slippage_n INT NOT NULL DEFAULT 0,
+  last_ts TIMESTAMPTZ,
+  equity DOUBLE PRECISION,
+  peak DOUBLE PRECISION,
+  updated_at TIMESTAMPTZ DEFAULT now(),
+  PRIMARY KEY (model_id, date)
+);
+
+-- Backfill from existing signals
+INSERT INTO signals_daily (model_id, date, trades, status_n, filled, canceled, pending, pnl, pnl_n, pnl_sq,
+                           neg_n, neg_sum, neg_sq, slippage_sum, slippage_n, last_ts)
+SELECT model_id, date, COUNT(*), COUNT(status),
+       COUNT(*) FILTER (WHERE lower(status) = 'filled'),
+       COUNT(*) FILTER (WHERE lower(status) = 'canceled'),
+       COUNT(*) FILTER (WHERE lower(status) = 'pending'),
+       COALESCE(SUM(COALESCE(pnl, rr)), 0), COUNT(COALESCE(pnl, rr)), COALESCE(SUM(COALESCE(pnl, rr) ^ 2), 0),
+       COUNT(*) FILTER (WHERE COALESCE(pnl, rr) < 0),
+       COALESCE(SUM(COALESCE(pnl, rr)) FILTER (WHERE COALESCE(pnl, rr) < 0), 0),
+       COALESCE(SUM(COALESCE(pnl, rr) ^ 2) FILTER (WHERE COALESCE(pnl, rr) < 0), 0),
+       COALESCE(SUM(slippage), 0), COUNT(slippage), MAX(created_at)
+FROM signals
+GROUP BY model_id, date
+ON CONFLICT (model_id, date) DO NOTHING;
+
+UPDATE signals_daily d
+SET equity = r.equity, peak = r.peak
+FROM (
+  SELECT model_id, date, equity, MAX(equity) OVER (PARTITION BY model_id ORDER BY date) AS peak
+  FROM (SELECT model_id, date, SUM(pnl) OVER (PARTITION BY model_id ORDER BY date) AS equity FROM signals_daily) e
+) r
+WHERE d.model_id = r.model_id AND d.date = r.date;
@@ -6,6 +6,10 @@ try:
     from sigma_platform.audit import fetch_audit as _fetch_audit
 except Exception:
     _fetch_audit = None
+try:
+    from sigma_platform.audit import audit_queue as _audit_queue
+except Exception:
+    _audit_queue = None
 
 router = APIRouter()
 
@@ -42,3 +46,11 @@ def audit_list(
         if 'Database env vars missing' in msg or 'psycopg2' in msg:
             return {'ok': True, 'rows': [], 'count': 0, 'limit': int(limit), 'offset': int(offset), 'next_offset': int(offset), 'warning': msg}
         return {'ok': False, 'error': msg}
+
+
+@router.get('/audit/queue')
+def audit_queue_stats():
+    """Counters of the background audit writer (enqueued/written/dropped/blocked/failed, depth)."""
+    if _audit_queue is None:
+        return {'ok': False, 'error': 'audit queue unavailable'}
+    return {'ok': True, **_audit_queue().stats()}
@@ -6,11 +6,13 @@ from datetime import datetime
 import pandas as pd
 
 from sigma_core.backtest.engine import run_backtest
+from sigma_core.backtest.brackets import bracket_parity
+from sigma_core.data.matrix_io import read_matrix
 from sigma_core.registry.backtest_registry import create_backtest_run, leaderboard as db_leaderboard, create_backtest_folds
 from sigma_core.services.io import workspace_paths, PACKS_DIR
 from api.services.store_db import get_policy_db
 try:
-    from sigma_core.services.lineage import compute_lineage as _compute_lineage
+    from sigma_core.services.lineage import compute_lineage_db as _compute_lineage
 except Exception:
     _compute_lineage = None
 try:
@@ -40,6 +42,7 @@ class BacktestRequest(BaseModel):
     momentum_gate: Optional[bool] = None
     momentum_min: Optional[float] = None
     momentum_column: Optional[str] = None
+    workers: Optional[int] = None  # fold processes; None -> SIGMA_BACKTEST_WORKERS (default serial)
     save: Optional[bool] = True
     tag: Optional[str] = None
 
@@ -91,7 +94,7 @@ def backtest_ep(payload: BacktestRequest):
     csv = payload.csv or str(paths['matrices'] / 'training_matrix_built.csv')
     started_at = datetime.utcnow()
     try:
-        df = pd.read_csv(csv)
+        df = read_matrix(csv)
         target_col = payload.target or ('y' if 'y' in df.columns and df['y'].notna().any() else 'y_syn')
         # Normalize numeric targets to textual 'UP'/'DOWN' expected by engine
         try:
@@ -140,6 +143,7 @@ def backtest_ep(payload: BacktestRequest):
             momentum_gate=bool(mgate),
             momentum_min=float(mmin),
             momentum_column=str(mcol),
+            workers=payload.workers,
         )
         finished_at = datetime.utcnow()
         # Leaderboard convenience
@@ -191,7 +195,7 @@ def backtest_ep(payload: BacktestRequest):
                 if _compute_lineage is not None:
                     try:
                         pack_dir = PACKS_DIR / pack_id
-                        lineage_vals = _compute_lineage(pack_dir=pack_dir, model_id=model_id, indicator_set_path=ind_path)
+                        lineage_vals = _compute_lineage(pack_dir=pack_dir, pack_id=pack_id, model_id=model_id, indicator_set_path=ind_path)
                         params_store['lineage'] = lineage_vals
                     except Exception:
                         pass
@@ -261,7 +265,7 @@ def backtest_ep(payload: BacktestRequest):
                 if _compute_lineage is not None and 'lineage' not in locals():
                     try:
                         ind_path = resolve_indicator_set_path(pack_id, model_id)
-                        lineage_vals = _compute_lineage(pack_dir=PACKS_DIR / pack_id, model_id=model_id, indicator_set_path=ind_path)
+                        lineage_vals = _compute_lineage(pack_dir=PACKS_DIR / pack_id, pack_id=pack_id, model_id=model_id, indicator_set_path=ind_path)
                     except Exception:
                         lineage_vals = None
                 write_model_card(
@@ -309,115 +313,4 @@ def leaderboard_api(
     except Exception as e:
         return {'ok': False, 'error': str(e)}
 def _parity_bracket_next_session_open(df: pd.DataFrame, br: Dict[str, Any]) -> Dict[str, Any]:
-    try:
-        d = df.copy()
-        # Ensure datetime and date columns
-        ts_col = None
-        for c in ('datetime','timestamp','ts','dt'):
-            if c in d.columns:
-                ts_col = c; break
-        if ts_col is None:
-            # try to compose from date + hour
-            if 'date' in d.columns and 'hour_et' in d.columns:
-                d['_ts'] = pd.to_datetime(d['date'].astype(str)) + pd.to_timedelta(pd.to_numeric(d['hour_et'], errors='coerce').fillna(0).astype(int), unit='h')
-                ts_col = '_ts'
-            else:
-                d['_ts'] = pd.to_datetime(d.index)
-                ts_col = '_ts'
-        d['_date'] = pd.to_datetime(d[ts_col]).dt.date
-        # Identify last index of each session and first index of next session
-        groups = d.groupby('_date')
-        last_idx = groups.tail(1).index
-        # map from a date to first index of that date
-        first_idx_by_date = groups.head(1).reset_index().set_index('_date')['index'].to_dict() if hasattr(groups, 'head') else {r['_date']: r.name for _, r in d.groupby('_date')}
-        # Bracket params
-        atr_period = int(br.get('atr_period', 14))
-        atr_mult_stop = float(br.get('atr_mult_stop', 1.5))
-        atr_mult_target = float(br.get('atr_mult_target', 3.0))
-        time_stop_minutes = int(br.get('time_stop_minutes', 120))
-        bars_stop = max(1, int(round(time_stop_minutes / 60.0)))
-        # ATR source
-        if any(d.columns.str.startswith('atr_')):
-            atr_series = pd.to_numeric(d.filter(like='atr_').iloc[:,0], errors='coerce')
-        else:
-            # simple ATR proxy from high-low
-            hi = pd.to_numeric(d.get('high', d.get('close')), errors='coerce')
-            lo = pd.to_numeric(d.get('low', d.get('close')), errors='coerce')
-            atr_series = (hi - lo).abs().rolling(atr_period, min_periods=1).mean()
-
-        opens = pd.to_numeric(d.get('open', d.get('close')), errors='coerce')
-        highs = pd.to_numeric(d.get('high', d.get('close')), errors='coerce')
-        lows = pd.to_numeric(d.get('low', d.get('close')), errors='coerce')
-
-        trades = 0
-        hits = 0
-        pnl_sum = 0.0
-        rr_sum = 0.0
-        # Build dates once
-        dates = sorted(d['_date'].unique())
-        date_to_pos = {dt: k for k, dt in enumerate(dates)}
-        for i in last_idx:
-            cur_date = d.loc[i, '_date']
-            pos = date_to_pos.get(cur_date, None)
-            if pos is None or pos+1 >= len(dates):
-                continue
-            next_date = dates[pos+1]
-            j = first_idx_by_date.get(next_date)
-            if j is None:
-                continue
-            entry = float(opens.loc[j]) if pd.notna(opens.loc[j]) else None
-            if entry is None:
-                continue
-            atr = float(atr_series.loc[j]) if pd.notna(atr_series.loc[j]) else None
-            if atr is None:
-                continue
-            stop = entry - atr_mult_stop * atr
-            target = entry + atr_mult_target * atr
-            # iterate bars of next_date only, or up to bars_stop
-            k = j
-            bars = 0
-            hit = None
-            while k < len(d) and d.loc[k, '_date'] == next_date and bars < bars_stop:
-                h = float(highs.loc[k]) if pd.notna(highs.loc[k]) else entry
-                l = float(lows.loc[k]) if pd.notna(lows.loc[k]) else entry
-                if h >= target:
-                    hit = True; break
-                if l <= stop:
-                    hit = False; break
-                bars += 1
-                k += 1
-            trades += 1
-            if hit is True:
-                hits += 1
-                rr = (target - entry) / max(1e-9, entry - stop)
-                rr_sum += rr
-                pnl_sum += (target - entry) / max(1e-9, entry)
-            elif hit is False:
-                rr = (target - entry) / max(1e-9, entry - stop)
-                rr_sum += -1.0
-                pnl_sum += (stop - entry) / max(1e-9, entry)
-            else:
-                # time stop without hit: close at last available close of session window
-                lastk = min(k, len(d)-1)
-                close_last = float(d.get('close', opens).loc[lastk])
-                rr = (close_last - entry) / max(1e-9, entry - stop)
-                rr_sum += rr
-                pnl_sum += (close_last - entry) / max(1e-9, entry)
-        if trades == 0:
-            return {'ok': False, 'trades': 0}
-        hit_rate = hits / trades
-        avg_rr = rr_sum / trades
-        avg_ret = pnl_sum / trades
-        return {
-            'ok': True,
-            'trades': int(trades),
-            'hit_rate': float(hit_rate),
-            'avg_rr': float(avg_rr),
-            'avg_return_pct': float(avg_ret*100.0),
-            'entry_mode': 'next_session_open',
-            'atr_mult_stop': float(br.get('atr_mult_stop', 1.5)),
-            'atr_mult_target': float(br.get('atr_mult_target', 3.0)),
-            'time_stop_minutes': int(br.get('time_stop_minutes', 120)),
-        }
-    except Exception:
-        return {'ok': False}
+    return bracket_parity(df, br)
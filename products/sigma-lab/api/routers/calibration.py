@@ -2,8 +2,10 @@ from __future__ import annotations
 from typing import Optional
 from fastapi import APIRouter
 from pydantic import BaseModel
+import numpy as np
 import pandas as pd
 from pathlib import Path as _Path
+from sigma_core.data.matrix_io import read_matrix
 
 router = APIRouter()
 PRODUCT_DIR = _Path(__file__).resolve().parents[2]
@@ -26,15 +28,16 @@ def calibrate_thresholds_ep(payload: CalibrateThresholdsRequest):
         use_path = str(live_signals if live_signals.exists() else csv_path)
         grid_raw = payload.grid or '0.50,0.55,0.60,0.65,0.70'
         grid_vals = [float(x) for x in grid_raw.split(',') if str(x).strip()]
-        df = pd.read_csv(use_path)
         col = payload.column or 'score_total'
+        df = read_matrix(use_path, columns=[col])
         if col not in df.columns:
             raise ValueError(f"column '{col}' not in CSV: {use_path}")
         top_n = int(payload.top_n or 50)
-        counts = []
-        for thr in grid_vals:
-            cnt = int((pd.to_numeric(df[col], errors='coerce') >= thr).sum())
-            counts.append((thr, cnt, abs(cnt - top_n)))
+        # One sort, then every threshold's count is a binary search (dense grids stay cheap)
+        vals = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=float)
+        vals = np.sort(vals[~np.isnan(vals)])
+        cnts = len(vals) - np.searchsorted(vals, np.asarray(grid_vals, dtype=float), side='left')
+        counts = [(thr, int(cnt), abs(int(cnt) - top_n)) for thr, cnt in zip(grid_vals, cnts)]
         if counts:
             thr_best, cnt_best, _ = sorted(counts, key=lambda t: t[2])[0]
         else:
@@ -32,6 +32,7 @@ class BuildMatrixRequest(BaseModel):
     dump_raw: bool = False
     raw_out: Optional[str] = None
     ticker: Optional[str] = None
+    incremental: bool = False
 
     @validator('start', 'end', pre=True)
     def _validate_dates(cls, v):  # type: ignore
@@ -115,6 +116,7 @@ def build_matrix_ep(payload: BuildMatrixRequest):
             ticker=str((payload.ticker) or cfgm.get('ticker', 'SPY')),
             indicator_set_path=str(indicator_set_path),
             label_config=(cfgm.get('labels') or cfgm.get('label') or None),
+            incremental=bool(payload.incremental),
         )
         # Write model card for build
         # Basic metrics for model card and DB row
@@ -137,6 +139,7 @@ def build_matrix_ep(payload: BuildMatrixRequest):
                         'distance_max': int(payload.distance_max),
                         'dump_raw': bool(payload.dump_raw),
                         'ticker': (payload.ticker or cfgm.get('ticker', 'SPY')),
+                        'incremental': bool(payload.incremental),
                     },
                     metrics={
                         'columns_count': len(cols),
@@ -151,10 +154,10 @@ def build_matrix_ep(payload: BuildMatrixRequest):
             lineage_vals = None
             try:
                 if write_model_card is not None:
-                    from sigma_core.services.lineage import compute_lineage as _compute_lineage  # type: ignore
+                    from sigma_core.services.lineage import compute_lineage_db as _compute_lineage  # type: ignore
                     ind_path = resolve_indicator_set_path(payload.pack_id or 'zerosigma', model_id)
                     from sigma_core.services.io import PACKS_DIR as _PACKS_DIR  # type: ignore
-                    lineage_vals = _compute_lineage(pack_dir=_PACKS_DIR / (payload.pack_id or 'zerosigma'), model_id=model_id, indicator_set_path=ind_path)
+                    lineage_vals = _compute_lineage(pack_dir=_PACKS_DIR / (payload.pack_id or 'zerosigma'), pack_id=(payload.pack_id or 'zerosigma'), model_id=model_id, indicator_set_path=ind_path)
             except Exception:
                 pass
             # snapshot policy for reproducibility
@@ -171,6 +174,7 @@ def build_matrix_ep(payload: BuildMatrixRequest):
                 'distance_max': int(payload.distance_max),
                 'dump_raw': bool(payload.dump_raw),
                 'ticker': (payload.ticker or cfgm.get('ticker', 'SPY')),
+                'incremental': bool(payload.incremental),
                 'policy_snapshot': pol_snap,
             }
             finished_at = datetime.utcnow()
@@ -218,7 +222,7 @@ def build_matrix_ep(payload: BuildMatrixRequest):
                 conn.commit()
         except Exception:
             pass
-        return {"ok": True, "out_csv": out_csv}
+        return {"ok": True, "out_csv": out_csv, "incremental": bool(payload.incremental)}
     except Exception as e:
         return {"ok": False, "error": str(e)}
 
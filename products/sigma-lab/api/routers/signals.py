@@ -7,10 +7,34 @@ try:
     from sigma_core.registry.signals_registry import fetch_signals as db_fetch_signals
 except Exception:
     db_fetch_signals = None
+try:
+    from sigma_core.registry.signals_registry import leaderboard_metrics as db_leaderboard_metrics
+except Exception:
+    db_leaderboard_metrics = None
+try:
+    from sigma_core.registry.signals_registry import fetch_daily_rollups as db_fetch_daily_rollups
+except Exception:
+    db_fetch_daily_rollups = None
 
 router = APIRouter()
 
 
+def _rollup_metrics(root, model_id: str, start: Optional[str], end: Optional[str]):
+    """Period metrics from daily rollups (signals_daily when configured, else the cached CSV rollup); None if neither has rows."""
+    from sigma_platform.signals_live import load_daily_rollup_csv, metrics_from_rollup, rollup_window
+    if db_fetch_daily_rollups is not None:
+        try:
+            daily = db_fetch_daily_rollups(model_id=model_id, start=start, end=end)
+            if daily:
+                return metrics_from_rollup(pd.DataFrame(daily))
+        except Exception:
+            pass
+    daily = rollup_window(load_daily_rollup_csv(root, model_id), start, end)
+    if daily is not None and not daily.empty:
+        return metrics_from_rollup(daily)
+    return None
+
+
 @router.get("/signals")
 def list_signals(
     model_id: Optional[str] = Query(None),
@@ -53,24 +77,26 @@ def signals_summary(
         from sigma_platform.signals_live import load_signals_csv, compute_live_metrics
         from pathlib import Path as _Path
         root = _Path(__file__).resolve().parents[2]
-        # Prefer DB if available; fallback to CSV
+        metrics = _rollup_metrics(root, model_id, start, end)
+        # No rollups: aggregate raw rows (DB if available; fallback to CSV)
         df = None
-        if db_fetch_signals is not None:
+        if metrics is None and db_fetch_signals is not None:
             try:
                 rows = db_fetch_signals(model_id=model_id, start=start, end=end, limit=100000, offset=0)
                 import pandas as _pd
                 df = _pd.DataFrame(rows) if rows else None
             except Exception:
                 df = None
-        if df is None:
-            df = load_signals_csv(root, model_id)
-        if df is not None and not df.empty and (start or end) and "ts" in df.columns:
-            ts = pd.to_datetime(df["ts"], errors="coerce", utc=True)
-            if start:
-                df = df[ts >= pd.Timestamp(start).tz_localize("UTC")]
-            if end:
-                df = df[ts <= pd.Timestamp(end).tz_localize("UTC")]
-        metrics = compute_live_metrics(df) if df is not None else None
+        if metrics is None:
+            if df is None:
+                df = load_signals_csv(root, model_id)
+            if df is not None and not df.empty and (start or end) and "ts" in df.columns:
+                ts = pd.to_datetime(df["ts"], errors="coerce", utc=True)
+                if start:
+                    df = df[ts >= pd.Timestamp(start).tz_localize("UTC")]
+                if end:
+                    df = df[ts <= pd.Timestamp(end).tz_localize("UTC")]
+            metrics = compute_live_metrics(df) if df is not None else None
         out = {
             "ok": True,
             "model_id": model_id,
@@ -100,6 +126,7 @@ def signals_leaderboard(
     risk_profile: Optional[str] = Query(None),
     start: Optional[str] = Query(None),
     end: Optional[str] = Query(None),
+    order_by: str = Query("sharpe"),
     limit: int = Query(50),
     offset: int = Query(0),
 ):
@@ -108,12 +135,9 @@ def signals_leaderboard(
         from sigma_core.services.signals_live import leaderboard_from_csv
         from pathlib import Path as _Path
         root = _Path(__file__).resolve().parents[2]
-        # If DB is available, compute over models discovered in packs and aggregate in-memory
-        if db_fetch_signals is not None:
+        # If DB is available, aggregate models discovered in packs in one query (paginated in SQL)
+        if db_leaderboard_metrics is not None:
             try:
-                import os
-                import pandas as _pd
-                # Discover models
                 models: list[str] = []
                 packs_dir = root / "packs"
                 for pack_dir in packs_dir.iterdir() if packs_dir.exists() else []:
@@ -122,37 +146,29 @@ def signals_leaderboard(
                     cfg_dir = pack_dir / "model_configs"
                     for f in cfg_dir.glob("*.yaml") if cfg_dir.exists() else []:
                         models.append(f.stem)
+                lb = db_leaderboard_metrics(model_ids=models, start=start, end=end, order_by=order_by, limit=limit, offset=offset)
                 rows = []
-                for mid in models:
-                    try:
-                        sig = db_fetch_signals(model_id=mid, start=start, end=end, limit=100000, offset=0)
-                        df = _pd.DataFrame(sig) if sig else _pd.DataFrame()
-                        if df.empty:
-                            continue
-                        m = compute_live_metrics(df)
-                        rows.append({
-                            "model_id": mid,
-                            "risk_profile": risk_profile or "balanced",
-                            "period": {"start": start, "end": end},
-                            "metrics": {
-                                "sharpe": m.sharpe,
-                                "sortino": m.sortino,
-                                "cum_return": m.cum_return,
-                                "win_rate": m.win_rate,
-                                "trades": m.trades,
-                                "fill_rate": m.fill_rate,
-                                "avg_slippage": m.avg_slippage,
-                                "capacity": m.capacity,
-                                "coverage_pct": m.coverage_pct,
-                                "freshness_sec": m.freshness_sec,
-                            },
-                            "lineage": {},
-                        })
-                    except Exception:
-                        continue
-                total = len(rows)
-                rows = rows[int(offset): int(offset)+int(limit)]
-                return {"ok": True, "rows": rows, "total": total}
+                for m in lb["rows"]:
+                    rows.append({
+                        "model_id": m["model_id"],
+                        "risk_profile": risk_profile or "balanced",
+                        "period": {"start": start, "end": end},
+                        "metrics": {
+                            "sharpe": m["sharpe"],
+                            "sortino": m["sortino"],
+                            "cum_return": m["cum_return"],
+                            "win_rate": None,
+                            "trades": m["trades"],
+                            "max_dd": m["max_dd"],
+                            "fill_rate": None,
+                            "avg_slippage": None,
+                            "capacity": None,
+                            "coverage_pct": m["coverage_pct"],
+                            "freshness_sec": m["freshness_sec"],
+                        },
+                        "lineage": {},
+                    })
+                return {"ok": True, "rows": rows, "total": lb["total"]}
             except Exception:
                 pass
         # Fallback to CSV scan
@@ -171,14 +187,16 @@ def model_performance(model_id: str, risk_profile: Optional[str] = Query(None),
         from sigma_platform.signals_live import load_signals_csv, compute_live_metrics
         from pathlib import Path as _Path
         root = _Path(__file__).resolve().parents[2]
-        df = load_signals_csv(root, model_id)
-        if df is not None and not df.empty and (start or end) and "ts" in df.columns:
-            ts = pd.to_datetime(df["ts"], errors="coerce", utc=True)
-            if start:
-                df = df[ts >= pd.Timestamp(start).tz_localize("UTC")]
-            if end:
-                df = df[ts <= pd.Timestamp(end).tz_localize("UTC")]
-        metrics = compute_live_metrics(df) if df is not None else None
+        metrics = _rollup_metrics(root, model_id, start, end)
+        if metrics is None:
+            df = load_signals_csv(root, model_id)
+            if df is not None and not df.empty and (start or end) and "ts" in df.columns:
+                ts = pd.to_datetime(df["ts"], errors="coerce", utc=True)
+                if start:
+                    df = df[ts >= pd.Timestamp(start).tz_localize("UTC")]
+                if end:
+                    df = df[ts <= pd.Timestamp(end).tz_localize("UTC")]
+            metrics = compute_live_metrics(df) if df is not None else None
         backtest = None
         # Best-effort: if db_leaderboard exists, fetch latest entry for model
         try:
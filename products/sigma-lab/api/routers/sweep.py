@@ -1,19 +1,21 @@
 from __future__ import annotations
 from typing import Optional, List, Dict, Any
-from fastapi import APIRouter
+from fastapi import APIRouter, Path
 from pydantic import BaseModel
 import pandas as pd
+import threading
 from datetime import datetime
 
 from sigma_core.services.io import workspace_paths, resolve_indicator_set_path, PACKS_DIR
 from sigma_core.services.policy import load_policy
+from sigma_core.data.matrix_io import matrix_columns, read_matrix
 from api.routers.backtest import _parity_bracket_next_session_open
-from sigma_core.backtest.engine import run_backtest
-from sigma_core.registry.backtest_registry import create_backtest_run, create_backtest_folds
-from sigma_core.storage.relational import get_db
-
 try:
-    from sigma_core.services.lineage import compute_lineage as _compute_lineage
+    from sigma_workers import sweeps as _sweeps
+except Exception:
+    _sweeps = None
+try:
+    from sigma_core.services.lineage import compute_lineage_db as _compute_lineage
 except Exception:
     _compute_lineage = None
 
@@ -36,16 +38,70 @@ class BacktestSweepRequest(BaseModel):
     # Guardrails
     min_trades: int = 0
     min_sharpe: Optional[float] = None
+    # Queue semantics: return the sweep id at once (default) or block until every variant ran
+    wait: bool = False
+    workers: Optional[int] = None
+
+
+_SUBMIT_COLS = {'y', 'y_syn', 'datetime', 'timestamp', 'ts', 'dt', 'date', 'hour_et', 'open', 'high', 'low', 'close'}
+
+# Sweeps currently executing in this process (guards against double resume)
+_ACTIVE: set = set()
+_ACTIVE_LOCK = threading.Lock()
+
+
+def _write_report(model_id: str, status: Dict[str, Any]) -> Optional[str]:
+    try:
+        from pathlib import Path as _P
+        import json as _json
+        out_dir = _P('products/sigma-lab/reports'); out_dir.mkdir(parents=True, exist_ok=True)
+        ts = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
+        out_path = out_dir / f'backtest_sweep_{model_id}_{ts}.json'
+        out_path.write_text(_json.dumps(status, indent=2, default=str), encoding='utf-8')
+        return str(out_path)
+    except Exception:
+        return None
+
+
+def _run_sweep(sweep_id: int, model_id: str, workers: Optional[int]) -> Dict[str, Any]:
+    try:
+        res = _sweeps.run_sweep(sweep_id, workers=workers)
+        if res.get('ok'):
+            res['report_path'] = _write_report(model_id, _sweeps.sweep_status(sweep_id, limit=50))
+        return res
+    finally:
+        with _ACTIVE_LOCK:
+            _ACTIVE.discard(sweep_id)
+
+
+def _start_sweep(sweep_id: int, model_id: str, workers: Optional[int], *, wait: bool) -> Optional[Dict[str, Any]]:
+    with _ACTIVE_LOCK:
+        if sweep_id in _ACTIVE:
+            return {'ok': False, 'error': f'sweep {sweep_id} is already running'}
+        _ACTIVE.add(sweep_id)
+    if wait:
+        return _run_sweep(sweep_id, model_id, workers)
+    try:
+        threading.Thread(target=_run_sweep, args=(sweep_id, model_id, workers), daemon=True, name=f'sweep-{sweep_id}').start()
+    except Exception as e:
+        with _ACTIVE_LOCK:
+            _ACTIVE.discard(sweep_id)
+        return {'ok': False, 'error': f'failed to start sweep {sweep_id}: {e}'}
+    return None
 
 
 @router.post('/backtest_sweep')
 def backtest_sweep_ep(payload: BacktestSweepRequest):
+    """Queue a sweep (one job, variants run on the sigma-workers pool); poll GET /backtest_sweep/{id}."""
+    if _sweeps is None:
+        return {'ok': False, 'error': 'sigma_workers unavailable'}
     model_id = payload.model_id
     pack_id = payload.pack_id or 'zerosigma'
     paths = workspace_paths(model_id, pack_id)
     csv = str(paths['matrices'] / 'training_matrix_built.csv')
     try:
-        df = pd.read_csv(csv)
+        # Only the target and the bracket-parity inputs are needed here; workers load features themselves
+        df = read_matrix(csv, columns=[c for c in matrix_columns(csv) if c in _SUBMIT_COLS or str(c).startswith('atr_')])
     except Exception as e:
         return {"ok": False, "error": f"failed to read matrix: {e}", "csv": csv}
 
@@ -60,165 +116,6 @@ def backtest_sweep_ep(payload: BacktestSweepRequest):
     # Load policy once for gates
     pol = load_policy(model_id, pack_id)
     exec_pol = pol.get('execution', {}) if isinstance(pol.get('execution', {}), dict) else {}
-    mgate = bool(exec_pol.get('momentum_gate', False))
-    mmin = float(exec_pol.get('momentum_min', 0.0))
-    mcol = str(exec_pol.get('momentum_column', 'momentum_score_total'))
-
-    started_global = datetime.utcnow()
-    # Create sweep record
-    sweep_id = None
-    try:
-        with get_db() as conn:  # type: ignore
-            with conn.cursor() as cur:
-                spec = {
-                    'thresholds_variants': variants_thr,
-                    'allowed_hours_variants': variants_hours,
-                    'top_pct_variants': variants_top,
-                    'splits': int(payload.splits),
-                    'embargo': float(payload.embargo),
-                }
-                cur.execute(
-                    """
-                    INSERT INTO backtest_sweeps (pack_id, model_id, spec, tag, status, started_at)
-                    VALUES (%s,%s,%s,%s,%s,%s)
-                    RETURNING id
-                    """,
-                    (pack_id, model_id, spec, payload.tag, 'running', started_global),
-                )
-                row = cur.fetchone(); sweep_id = int(row[0]) if row else None
-            conn.commit()
-    except Exception:
-        sweep_id = None
-    runs: List[Dict[str, Any]] = []
-
-    def run_one(params: Dict[str, Any]) -> Dict[str, Any]:
-        # Normalize numeric targets to textual 'UP'/'DOWN' expected by engine
-        tgt = params.get('target_col')
-        dlocal = df
-        try:
-            if tgt and (tgt in dlocal.columns):
-                s = pd.to_numeric(dlocal[tgt], errors='ignore')
-                if pd.api.types.is_numeric_dtype(s):
-                    uniq = set([v for v in pd.Series(s).dropna().unique().tolist()])
-                    if uniq.issubset({0,1}):
-                        dlocal = dlocal.copy(); dlocal['_y_txt'] = dlocal[tgt].map(lambda v: 'UP' if float(v) == 1.0 else 'DOWN'); tgt = '_y_txt'
-                    elif uniq.issubset({-1,0,1}):
-                        dlocal = dlocal.copy(); dlocal['_y_txt'] = dlocal[tgt].map(lambda v: 'UP' if float(v) > 0 else 'DOWN'); tgt = '_y_txt'
-        except Exception:
-            pass
-        res = run_backtest(
-            dlocal,
-            tgt,
-            params.get('thresholds'),
-            splits=int(params.get('splits', payload.splits)),
-            embargo=float(params.get('embargo', payload.embargo)),
-            top_pct=params.get('top_pct'),
-            plots_dir=str(paths['plots']),
-            allowed_hours=params.get('allowed_hours'),
-            slippage_bps=float(exec_pol.get('slippage_bps', 1.0)),
-            size_by_conf=bool(exec_pol.get('size_by_conf', False)),
-            conf_cap=float(exec_pol.get('conf_cap', 1.0)),
-            per_hour_thresholds=False,
-            per_hour_select_by='sharpe',
-            calibration='sigmoid',
-            momentum_gate=bool(mgate),
-            momentum_min=float(mmin),
-            momentum_column=str(mcol),
-        )
-        # parity (if brackets enabled)
-        parity = None
-        try:
-            br = exec_pol.get('brackets', {}) if isinstance(exec_pol.get('brackets', {}), dict) else {}
-            if br:
-                parity = _parity_bracket_next_session_open(df, br)
-        except Exception:
-            parity = None
-
-        # store in DB (optional)
-        run_row_id = None
-        if bool(payload.save):
-            try:
-                params_store = {k: v for k, v in params.items() if k not in ('target_col',)}
-                lineage_vals = None
-                if _compute_lineage is not None:
-                    try:
-                        ind_path = resolve_indicator_set_path(pack_id, model_id)
-                        lineage_vals = _compute_lineage(pack_dir=PACKS_DIR / pack_id, model_id=model_id, indicator_set_path=ind_path)
-                        params_store['lineage'] = lineage_vals
-                    except Exception:
-                        pass
-                th = res.get('threshold_results') or []
-                best_sharpe = None
-                best_cum = None
-                try:
-                    if th:
-                        best_sharpe = float(max((r.get('sharpe_hourly', 0.0) for r in th)))
-                        best_cum = float(max((r.get('cum_ret', 0.0) for r in th)))
-                except Exception:
-                    pass
-                run_row = create_backtest_run(
-                    pack_id=pack_id,
-                    model_id=model_id,
-                    started_at=started_global,
-                    finished_at=datetime.utcnow(),
-                    params=params_store,
-                    metrics={'best_sharpe_hourly': best_sharpe, 'best_cum_ret': best_cum, 'parity': parity},
-                    plots_uri=str(paths['plots']),
-                    data_csv_uri=csv,
-                    best_sharpe_hourly=best_sharpe,
-                    best_cum_ret=best_cum,
-                    trades_total=None,
-                    tag=payload.tag,
-                )
-                run_row_id = int(run_row['id'])
-                folds = res.get('threshold_results') or []
-                rows = []
-                for i, r in enumerate(folds):
-                    rows.append({'fold': i, 'thr': r.get('thr'), 'cum_ret': r.get('cum_ret'), 'sharpe_hourly': r.get('sharpe_hourly'), 'trades': r.get('trades')})
-                if rows:
-                    create_backtest_folds(int(run_row['id']), rows)
-            except Exception:
-                pass
-        # Persist sweep result row
-        try:
-            if sweep_id is not None:
-                metrics = {
-                    'best_sharpe_hourly': res.get('best_sharpe_hourly'),
-                    'best_cum_ret': res.get('best_cum_ret'),
-                    'summary': res.get('_summary'),
-                }
-                with get_db() as conn:  # type: ignore
-                    with conn.cursor() as cur:
-                        cur.execute(
-                            """
-                            INSERT INTO sweep_results (sweep_id, kind, params, metrics, csv_uri, backtest_run_id)
-                            VALUES (%s,%s,%s,%s,%s,%s)
-                            """,
-                            (
-                                sweep_id,
-                                ('thresholds' if 'thresholds' in params else ('top_pct' if 'top_pct' in params else 'other')),
-                                {k: v for k, v in params.items() if k != 'target_col'},
-                                metrics,
-                                csv,
-                                run_row_id,
-                            ),
-                        )
-                    conn.commit()
-        except Exception:
-            pass
-        # attach quick summary fields for the client
-        try:
-            th = res.get('threshold_results') or []
-            total_trades = int(sum(int(r.get('trades') or 0) for r in th)) if th else None
-        except Exception:
-            total_trades = None
-        res['_summary'] = {
-            'best_sharpe_hourly': res.get('best_sharpe_hourly'),
-            'best_cum_ret': res.get('best_cum_ret'),
-            'total_trades': total_trades,
-            'parity': parity,
-        }
-        return res
 
     # Determine target column once
     try:
@@ -226,74 +123,80 @@ def backtest_sweep_ep(payload: BacktestSweepRequest):
     except Exception:
         target_col = 'y'
 
-    # threshold variants
-    for th in variants_thr:
-        for hours in variants_hours:
-            allowed = [int(x) for x in hours.split(',')] if hours else None
-            params = {'target_col': target_col, 'thresholds': [float(x) for x in th.split(',')], 'allowed_hours': allowed, 'splits': payload.splits, 'embargo': payload.embargo}
-            res = run_one(params)
-            runs.append({'kind': 'thresholds', 'thresholds': th, 'allowed_hours': hours, 'result': res})
-
-    # top-pct variants
-    for tp in variants_top:
-        for hours in variants_hours:
-            allowed = [int(x) for x in hours.split(',')] if hours else None
-            params = {'target_col': target_col, 'top_pct': float(tp), 'allowed_hours': allowed, 'splits': payload.splits, 'embargo': payload.embargo}
-            res = run_one(params)
-            runs.append({'kind': 'top_pct', 'top_pct': float(tp), 'allowed_hours': hours, 'result': res})
-
-    # Best summary
-    def best_of(res: Dict[str, Any]) -> float:
+    # Parity and lineage do not depend on the variant: compute once and carry them in the spec
+    parity = None
+    try:
+        br = exec_pol.get('brackets', {}) if isinstance(exec_pol.get('brackets', {}), dict) else {}
+        if br:
+            parity = _parity_bracket_next_session_open(df, br)
+    except Exception:
+        parity = None
+    lineage_vals = None
+    if _compute_lineage is not None and bool(payload.save):
         try:
-            v = res.get('best_sharpe_hourly')
-            return float(v) if v is not None else -1e9
+            ind_path = resolve_indicator_set_path(pack_id, model_id)
+            lineage_vals = _compute_lineage(pack_dir=PACKS_DIR / pack_id, pack_id=pack_id, model_id=model_id, indicator_set_path=ind_path)
         except Exception:
-            return -1e9
-
-    # Apply guardrails to outgoing list
-    def passes_guards(r: Dict[str, Any]) -> bool:
-        res = r.get('result', {})
-        summ = res.get('_summary', {}) if isinstance(res, dict) else {}
-        total_tr = summ.get('total_trades')
-        if total_tr is not None and int(total_tr) < int(payload.min_trades):
-            return False
-        if payload.min_sharpe is not None:
-            try:
-                bs = float(summ.get('best_sharpe_hourly') if summ.get('best_sharpe_hourly') is not None else res.get('best_sharpe_hourly'))
-                if bs < float(payload.min_sharpe):
-                    return False
-            except Exception:
-                return False
-        return True
-
-    filtered = [r for r in runs if passes_guards(r)]
-    ranked = sorted(filtered, key=lambda r: best_of(r['result']), reverse=True)
-
-    # Persist a sweep summary report
+            lineage_vals = None
+
+    spec = {
+        'thresholds_variants': variants_thr,
+        'allowed_hours_variants': variants_hours,
+        'top_pct_variants': variants_top,
+        'splits': int(payload.splits),
+        'embargo': float(payload.embargo),
+        'csv': csv,
+        'target_col': target_col,
+        # Variants sharing an hour filter reuse one set of fold predictions (fit once, evaluate many)
+        'oof_cache_dir': str(paths['matrices'] / 'oof_cache'),
+        'plots_dir': str(paths['plots']),
+        'execution': {
+            'slippage_bps': float(exec_pol.get('slippage_bps', 1.0)),
+            'size_by_conf': bool(exec_pol.get('size_by_conf', False)),
+            'conf_cap': float(exec_pol.get('conf_cap', 1.0)),
+            'momentum_gate': bool(exec_pol.get('momentum_gate', False)),
+            'momentum_min': float(exec_pol.get('momentum_min', 0.0)),
+            'momentum_column': str(exec_pol.get('momentum_column', 'momentum_score_total')),
+        },
+        'parity': parity,
+        'lineage': lineage_vals,
+        'save': bool(payload.save),
+        'min_trades': int(payload.min_trades),
+        'min_sharpe': payload.min_sharpe,
+    }
     try:
-        from pathlib import Path as _P
-        import json as _json
-        out_dir = _P('products/sigma-lab/reports'); out_dir.mkdir(parents=True, exist_ok=True)
-        ts = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
-        out_path = out_dir / f'backtest_sweep_{model_id}_{ts}.json'
-        # only keep top 50 to avoid huge files
-        data = {"ok": True, "count": len(runs), "filtered": len(filtered), "runs": ranked[:50]}
-        out_path.write_text(_json.dumps(data, indent=2), encoding='utf-8')
-        report_path = str(out_path)
-    except Exception:
-        report_path = None
-
-    # mark sweep completed
+        sub = _sweeps.submit_sweep(pack_id=pack_id, model_id=model_id, spec=spec, tag=payload.tag)
+    except Exception as e:
+        return {"ok": False, "error": f"failed to queue sweep: {e}"}
+    sweep_id = sub['sweep_id']
+    done = _start_sweep(sweep_id, model_id, payload.workers, wait=bool(payload.wait))
+    if done is not None:
+        return done
+    return {"ok": True, "sweep_id": sweep_id, "status": "queued", "total": sub['total']}
+
+
+@router.get('/backtest_sweep/{sweep_id}')
+def backtest_sweep_status_ep(sweep_id: int = Path(..., ge=1), limit: int = 10):
+    if _sweeps is None:
+        return {'ok': False, 'error': 'sigma_workers unavailable'}
     try:
-        if sweep_id is not None:
-            with get_db() as conn:  # type: ignore
-                with conn.cursor() as cur:
-                    cur.execute(
-                        "UPDATE backtest_sweeps SET status=%s, finished_at=%s WHERE id=%s",
-                        ('completed', datetime.utcnow(), sweep_id),
-                    )
-                conn.commit()
-    except Exception:
-        pass
+        return _sweeps.sweep_status(sweep_id, limit=int(limit))
+    except Exception as e:
+        return {'ok': False, 'error': str(e)}
 
-    return {"ok": True, "runs": ranked[:10], "count": len(runs), "filtered": len(filtered), "report_path": report_path, "sweep_id": sweep_id}
+
+@router.post('/backtest_sweep/{sweep_id}/resume')
+def backtest_sweep_resume_ep(sweep_id: int = Path(..., ge=1), workers: Optional[int] = None, wait: bool = False):
+    """Re-run the variants of a sweep that have no result yet (e.g. after a restart)."""
+    if _sweeps is None:
+        return {'ok': False, 'error': 'sigma_workers unavailable'}
+    try:
+        sweep = _sweeps.default_store().get_sweep(sweep_id)
+        if not sweep:
+            return {'ok': False, 'error': f'sweep not found: {sweep_id}'}
+        done = _start_sweep(sweep_id, sweep['model_id'], workers, wait=wait)
+        if done is not None:
+            return done
+        return {'ok': True, 'sweep_id': sweep_id, 'status': 'running'}
+    except Exception as e:
+        return {'ok': False, 'error': str(e)}
@@ -10,13 +10,18 @@ from sigma_core.features.builder import select_features as select_features_train
 from xgboost import XGBClassifier
 from sklearn.calibration import CalibratedClassifierCV
 from sklearn.preprocessing import LabelEncoder
+try:
+    from sigma_core.models.booster import train_booster
+except Exception:
+    train_booster = None
 from sigma_core.services.io import workspace_paths, sanitize_out_path, PACKS_DIR
+from sigma_core.data.matrix_io import matrix_columns, read_matrix
 from api.services.store_db import get_model_config_db, get_indicator_set_model_db, get_indicator_set_pack_db, get_policy_db
 import yaml as _yaml
 from api.services.indicator_cache import materialize_indicator_set
 from sigma_core.storage.relational import get_db
 try:
-    from sigma_core.services.lineage import compute_lineage as _compute_lineage
+    from sigma_core.services.lineage import compute_lineage_db as _compute_lineage
 except Exception:
     _compute_lineage = None
 try:
@@ -27,10 +32,11 @@ except Exception:
 router = APIRouter()
 
 
-def _train_model(csv_path: str, *, allowed_hours: Optional[List[int]], target: Optional[str], calibration: Optional[str], model_out: _Path, features_list: Optional[List[str]] = None) -> Dict[str, Any]:
+def _train_model(csv_path: str, *, allowed_hours: Optional[List[int]], target: Optional[str], calibration: Optional[str], model_out: _Path, features_list: Optional[List[str]] = None, early_stopping: bool = False, warm_start: bool = False) -> Dict[str, Any]:
     if select_features_train is None or XGBClassifier is None or LabelEncoder is None:
         raise RuntimeError('Training dependencies missing')
-    df = pd.read_csv(csv_path)
+    # With an explicit feature list only those columns (plus target/hour) are loaded
+    df = read_matrix(csv_path, columns=(list(features_list) + ['date', 'hour_et', target or 'y', 'y_syn']) if features_list else None)
     if allowed_hours and 'hour_et' in df.columns:
         df = df[df['hour_et'].isin(allowed_hours)].copy()
     y_col = target or ('y' if 'y' in df.columns and df['y'].notna().any() else 'y_syn')
@@ -39,6 +45,19 @@ def _train_model(csv_path: str, *, allowed_hours: Optional[List[int]], target: O
     for c in missing:
         if c.startswith('calls_sold_d') or c.startswith('puts_sold_d'):
             df[c] = 0.0
+    if early_stopping or warm_start:
+        if train_booster is None:
+            raise RuntimeError('Training dependencies missing')
+        prev = None
+        if warm_start and model_out.exists():
+            try:
+                prev = joblib.load(model_out)
+            except Exception:
+                prev = None
+        bundle, info = train_booster(df, features, y_col, calibration=calibration, allowed_hours=allowed_hours, warm_from=prev)
+        model_out.parent.mkdir(parents=True, exist_ok=True)
+        joblib.dump(bundle, model_out)
+        return {'ok': True, 'model_out': str(model_out), 'rows': int(len(df)), 'training': info}
     X = df[features].fillna(0.0).values
     y_raw = df[y_col].astype(str).values
     le = LabelEncoder(); y = le.fit_transform(y_raw)
@@ -64,6 +83,10 @@ class TrainRequest(BaseModel):
     model_out: Optional[str] = None
     target: Optional[str] = None
     pack_id: Optional[str] = 'zerosigma'
+    # Single-pass training: early stopping on the latest sessions, calibration on that held-out tail
+    early_stopping: Optional[bool] = False
+    # Continue the existing gbm.pkl booster when the matrix only gained new sessions
+    warm_start: Optional[bool] = False
 
     @validator('allowed_hours', pre=True)
     def _coerce_hours(cls, v):  # type: ignore
@@ -109,8 +132,7 @@ def train_ep(payload: TrainRequest):
     from datetime import datetime
     started_at = datetime.utcnow()
     try:
-        df_tmp = pd.read_csv(csv, nrows=1000)
-        cols = set(df_tmp.columns)
+        cols = set(matrix_columns(csv))
     except Exception:
         cols = set()
     selected: List[str] = []
@@ -149,8 +171,30 @@ def train_ep(payload: TrainRequest):
             for h in horizons:
                 maybe_add([f'close_vol_{h}'])
     selected = sorted(set(selected))
+    # Prefer indicator set from DB
+    ind_data = (get_indicator_set_model_db(payload.pack_id or 'zerosigma', model_id) or None)
+    if ind_data is None and cfgm:
+        name = None
+        try:
+            name = (cfgm.get('indicator_set_name') or cfgm.get('indicator_set') or cfgm.get('features', {}).get('indicator_set'))
+        except Exception:
+            name = None
+        if name:
+            ind_data = get_indicator_set_pack_db(payload.pack_id or 'zerosigma', str(name))
+    if ind_data is not None:
+        tmp_ind = materialize_indicator_set(paths['reports'], model_id, ind_data)
+        ind_path = tmp_ind
+    else:
+        return {'ok': False, 'error': 'missing indicator_set in DB; use PUT /indicator_set'}
     try:
-        res = _train_model(csv, allowed_hours=allowed_hours, target=payload.target, calibration=calib, model_out=out_path, features_list=(selected or None))
+        res = _train_model(csv, allowed_hours=allowed_hours, target=payload.target, calibration=calib, model_out=out_path, features_list=(selected or None), early_stopping=bool(payload.early_stopping), warm_start=bool(payload.warm_start))
+        # Lineage once for the model card and the training run (configs are DB-backed here)
+        lineage_vals = None
+        if _compute_lineage is not None:
+            try:
+                lineage_vals = _compute_lineage(pack_dir=PACKS_DIR / (payload.pack_id or 'zerosigma'), pack_id=(payload.pack_id or 'zerosigma'), model_id=model_id, indicator_set_path=ind_path)
+            except Exception:
+                pass
         # Write model card for training
         try:
             feats = None
@@ -159,34 +203,13 @@ def train_ep(payload: TrainRequest):
                 feats = bundle.get('features') if isinstance(bundle, dict) else None
             except Exception:
                 feats = selected or None
-            lineage_vals = None
-            if _compute_lineage is not None:
-                try:
-        # Prefer indicator set from DB
-        ind_data = (get_indicator_set_model_db(payload.pack_id or 'zerosigma', model_id) or None)
-        if ind_data is None and cfgm:
-            name = None
-            try:
-                name = (cfgm.get('indicator_set_name') or cfgm.get('indicator_set') or cfgm.get('features', {}).get('indicator_set'))
-            except Exception:
-                name = None
-            if name:
-                ind_data = get_indicator_set_pack_db(payload.pack_id or 'zerosigma', str(name))
-        if ind_data is not None:
-            tmp_ind = materialize_indicator_set(paths['reports'], model_id, ind_data)
-            ind_path = tmp_ind
-        else:
-            return {'ok': False, 'error': 'missing indicator_set in DB; use PUT /indicator_set'}
-                    lineage_vals = _compute_lineage(pack_dir=PACKS_DIR / (payload.pack_id or 'zerosigma'), model_id=model_id, indicator_set_path=ind_path)
-                except Exception:
-                    pass
             if write_model_card is not None:
                 write_model_card(
                     pack_id=(payload.pack_id or 'zerosigma'),
                     model_id=model_id,
                     event='train',
-                    params={'csv': csv, 'allowed_hours': allowed_hours, 'calibration': calib, 'target': payload.target},
-                    metrics={'rows': res.get('rows')},
+                    params={'csv': csv, 'allowed_hours': allowed_hours, 'calibration': calib, 'target': payload.target, 'early_stopping': bool(payload.early_stopping), 'warm_start': bool(payload.warm_start)},
+                    metrics={'rows': res.get('rows'), **({'training': res['training']} if res.get('training') else {})},
                     features=feats,
                     lineage=lineage_vals,
                 )
@@ -194,21 +217,14 @@ def train_ep(payload: TrainRequest):
             pass
         # Store training run in DB (best-effort)
         try:
-            lineage_vals = None
-            try:
-                from sigma_core.services.lineage import compute_lineage as _compute_lineage  # type: ignore
-                    ind_path = resolve_indicator_set_path(payload.pack_id or 'zerosigma', model_id)
-                lineage_vals = _compute_lineage(pack_dir=PACKS_DIR / (payload.pack_id or 'zerosigma'), model_id=model_id, indicator_set_path=ind_path)
-            except Exception:
-                pass
             # policy snapshot
             try:
                 from sigma_core.services.policy import load_policy as _load_policy  # type: ignore
                 pol_snap = _load_policy(model_id, payload.pack_id or 'zerosigma')
             except Exception:
                 pol_snap = None
-            params_store = {'csv': csv, 'allowed_hours': allowed_hours, 'calibration': calib, 'target': payload.target, 'policy_snapshot': pol_snap}
-            metrics_store = {'rows': res.get('rows')}
+            params_store = {'csv': csv, 'allowed_hours': allowed_hours, 'calibration': calib, 'target': payload.target, 'early_stopping': bool(payload.early_stopping), 'warm_start': bool(payload.warm_start), 'policy_snapshot': pol_snap}
+            metrics_store = {'rows': res.get('rows'), **({'training': res['training']} if res.get('training') else {})}
             features = None
             try:
                 bundle = joblib.load(out_path)
@@ -17,7 +17,8 @@ def main():
         product_root = here.parents[1]
         core_root = product_root.parent / 'sigma-core'
         platform_root = product_root.parent / 'sigma-platform'
-        for p in [product_root, core_root, platform_root]:
+        workers_root = product_root.parent / 'sigma-workers'
+        for p in [product_root, core_root, platform_root, workers_root]:
             if str(p) not in sys.path:
                 sys.path.insert(0, str(p))
 
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark FeatureBuilder.add_base_features against the previous per-distance loop.
+
+Usage:
+  python scripts/bench_base_features.py [--days 252] [--distance_max 7] [--repeat 3]
+
+Builds a synthetic raw 0DTE flow frame shaped like fetch_0dte_flow output
+(days x 7 hours x (2*distance_max+1) strikes, with premium and inferred premium)
+and reports wall time and tracemalloc peak for both implementations.
+"""
+
+from __future__ import annotations
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+HERE = Path(__file__).resolve()
+CORE_DIR = HERE.parents[3] / 'sigma-core'
+if str(CORE_DIR) not in sys.path:
+    sys.path.insert(0, str(CORE_DIR))
+
+from sigma_core.features.builder import FeatureBuilder
+
+
+def legacy_add_base_features(df: pd.DataFrame, distance_max: int) -> pd.DataFrame:
+    """Previous implementation (one column at a time), kept here for comparison only."""
+    df = df.copy()
+    for d in range(-distance_max, distance_max + 1):
+        df[f"calls_sold_d{d}"] = np.where(np.round(df["price_level"] - df["spy_prev_close"]) == d, df["calls_sold"], 0.0)
+        df[f"puts_sold_d{d}"] = np.where(np.round(df["price_level"] - df["spy_prev_close"]) == d, df["puts_sold"], 0.0)
+        df[f"calls_premium_d{d}"] = np.where(np.round(df["price_level"] - df["spy_prev_close"]) == d, df["calls_premium"], 0.0)
+        df[f"puts_premium_d{d}"] = np.where(np.round(df["price_level"] - df["spy_prev_close"]) == d, df["puts_premium"], 0.0)
+    df["calls_sold_total"] = df[[f"calls_sold_d{d}" for d in range(-distance_max, distance_max + 1)]].sum(axis=1)
+    df["puts_sold_total"] = df[[f"puts_sold_d{d}" for d in range(-distance_max, distance_max + 1)]].sum(axis=1)
+    df["pc_ratio"] = (df["puts_sold_total"] + 1e-6) / (df["calls_sold_total"] + 1e-6)
+    df["imbalance"] = df["calls_sold_total"] - df["puts_sold_total"]
+    df["calls_premium_total"] = df[[c for c in df.columns if c.startswith("calls_premium_d")]].sum(axis=1)
+    df["puts_premium_total"] = df[[c for c in df.columns if c.startswith("puts_premium_d")]].sum(axis=1)
+    for d in range(-distance_max, distance_max + 1):
+        df[f"calls_premium_inf_sold_d{d}"] = np.where(np.round(df["price_level"] - df["spy_prev_close"]) == d, df["calls_premium_inf_sold"], 0.0)
+        df[f"puts_premium_inf_sold_d{d}"] = np.where(np.round(df["price_level"] - df["spy_prev_close"]) == d, df["puts_premium_inf_sold"], 0.0)
+    df["day_of_week"] = pd.to_datetime(df["date"]).dt.dayofweek
+    return df
+
+
+def synthetic_flow(days: int, distance_max: int, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2024-01-02', periods=days).date
+    prev = 450.0 + np.cumsum(rng.normal(0, 3, size=days))
+    rows = []
+    for d, pc in zip(dates, prev):
+        anchor = int(np.round(pc))
+        for lvl in range(anchor - distance_max, anchor + distance_max + 1):
+            for h in range(9, 16):
+                rows.append((d, lvl, float(pc), h))
+    df = pd.DataFrame(rows, columns=['date', 'price_level', 'spy_prev_close', 'hour_et'])
+    n = len(df)
+    for c in ('calls_sold', 'puts_sold'):
+        df[c] = rng.integers(0, 5000, size=n).astype(float)
+    for c in ('calls_premium', 'puts_premium', 'calls_premium_inf_sold', 'puts_premium_inf_sold'):
+        df[c] = rng.random(n) * 1e5
+    return df
+
+
+def _measure(fn, repeat: int):
+    times = []
+    peak = 0
+    out = None
+    for _ in range(repeat):
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        out = fn()
+        times.append(time.perf_counter() - t0)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return min(times), peak, out
+
+
+def main():
+    ap = argparse.ArgumentParser(description='Benchmark add_base_features (vectorized vs legacy loop)')
+    ap.add_argument('--days', type=int, default=252)
+    ap.add_argument('--distance_max', type=int, default=7)
+    ap.add_argument('--repeat', type=int, default=3)
+    args = ap.parse_args()
+
+    raw = synthetic_flow(args.days, args.distance_max)
+    fb = FeatureBuilder(distance_max=args.distance_max)
+    t_old, m_old, old = _measure(lambda: legacy_add_base_features(raw, args.distance_max), args.repeat)
+    t_new, m_new, new = _measure(lambda: fb.add_base_features(raw), args.repeat)
+    pd.testing.assert_frame_equal(old, new[old.columns], check_dtype=False)
+    print(f"rows={len(raw)} distance_max={args.distance_max} columns_added={new.shape[1] - raw.shape[1]}")
+    print(f"legacy     : {t_old*1000:8.1f} ms  peak {m_old/2**20:7.1f} MiB")
+    print(f"vectorized : {t_new*1000:8.1f} ms  peak {m_new/2**20:7.1f} MiB")
+    print(f"speedup    : {t_old/max(t_new,1e-9):.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Benchmark the vectorized bracket simulator against the previous per-session .loc walk.
+
+Usage:
+  python scripts/bench_brackets.py [--years 5] [--bars 7] [--repeat 3]
+
+Builds a synthetic hourly OHLC matrix (years x 252 sessions x bars per session, with an atr_14
+column), checks that both implementations report the same parity summary and prints wall times.
+"""
+
+from __future__ import annotations
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+
+HERE = Path(__file__).resolve()
+CORE_DIR = HERE.parents[3] / 'sigma-core'
+if str(CORE_DIR) not in sys.path:
+    sys.path.insert(0, str(CORE_DIR))
+
+from sigma_core.backtest.brackets import bracket_parity
+
+
+def legacy_parity(df: pd.DataFrame, br: Dict[str, Any]) -> Dict[str, Any]:
+    """Previous /backtest implementation (scalar .loc walk), kept here for comparison only."""
+    try:
+        d = df.copy()
+        # Ensure datetime and date columns
+        ts_col = None
+        for c in ('datetime','timestamp','ts','dt'):
+            if c in d.columns:
+                ts_col = c; break
+        if ts_col is None:
+            # try to compose from date + hour
+            if 'date' in d.columns and 'hour_et' in d.columns:
+                d['_ts'] = pd.to_datetime(d['date'].astype(str)) + pd.to_timedelta(pd.to_numeric(d['hour_et'], errors='coerce').fillna(0).astype(int), unit='h')
+                ts_col = '_ts'
+            else:
+                d['_ts'] = pd.to_datetime(d.index)
+                ts_col = '_ts'
+        d['_date'] = pd.to_datetime(d[ts_col]).dt.date
+        # Identify last index of each session and first index of next session
+        groups = d.groupby('_date')
+        last_idx = groups.tail(1).index
+        # map from a date to first index of that date
+        first_idx_by_date = groups.head(1).reset_index().set_index('_date')['index'].to_dict() if hasattr(groups, 'head') else {r['_date']: r.name for _, r in d.groupby('_date')}
+        # Bracket params
+        atr_period = int(br.get('atr_period', 14))
+        atr_mult_stop = float(br.get('atr_mult_stop', 1.5))
+        atr_mult_target = float(br.get('atr_mult_target', 3.0))
+        time_stop_minutes = int(br.get('time_stop_minutes', 120))
+        bars_stop = max(1, int(round(time_stop_minutes / 60.0)))
+        # ATR source
+        if any(d.columns.str.startswith('atr_')):
+            atr_series = pd.to_numeric(d.filter(like='atr_').iloc[:,0], errors='coerce')
+        else:
+            # simple ATR proxy from high-low
+            hi = pd.to_numeric(d.get('high', d.get('close')), errors='coerce')
+            lo = pd.to_numeric(d.get('low', d.get('close')), errors='coerce')
+            atr_series = (hi - lo).abs().rolling(atr_period, min_periods=1).mean()
+
+        opens = pd.to_numeric(d.get('open', d.get('close')), errors='coerce')
+        highs = pd.to_numeric(d.get('high', d.get('close')), errors='coerce')
+        lows = pd.to_numeric(d.get('low', d.get('close')), errors='coerce')
+
+        trades = 0
+        hits = 0
+        pnl_sum = 0.0
+        rr_sum = 0.0
+        # Build dates once
+        dates = sorted(d['_date'].unique())
+        date_to_pos = {dt: k for k, dt in enumerate(dates)}
+        for i in last_idx:
+            cur_date = d.loc[i, '_date']
+            pos = date_to_pos.get(cur_date, None)
+            if pos is None or pos+1 >= len(dates):
+                continue
+            next_date = dates[pos+1]
+            j = first_idx_by_date.get(next_date)
+            if j is None:
+                continue
+            entry = float(opens.loc[j]) if pd.notna(opens.loc[j]) else None
+            if entry is None:
+                continue
+            atr = float(atr_series.loc[j]) if pd.notna(atr_series.loc[j]) else None
+            if atr is None:
+                continue
+            stop = entry - atr_mult_stop * atr
+            target = entry + atr_mult_target * atr
+            # iterate bars of next_date only, or up to bars_stop
+            k = j
+            bars = 0
+            hit = None
+            while k < len(d) and d.loc[k, '_date'] == next_date and bars < bars_stop:
+                h = float(highs.loc[k]) if pd.notna(highs.loc[k]) else entry
+                l = float(lows.loc[k]) if pd.notna(lows.loc[k]) else entry
+                if h >= target:
+                    hit = True; break
+                if l <= stop:
+                    hit = False; break
+                bars += 1
+                k += 1
+            trades += 1
+            if hit is True:
+                hits += 1
+                rr = (target - entry) / max(1e-9, entry - stop)
+                rr_sum += rr
+                pnl_sum += (target - entry) / max(1e-9, entry)
+            elif hit is False:
+                rr = (target - entry) / max(1e-9, entry - stop)
+                rr_sum += -1.0
+                pnl_sum += (stop - entry) / max(1e-9, entry)
+            else:
+                # time stop without hit: close at last available close of session window
+                lastk = min(k, len(d)-1)
+                close_last = float(d.get('close', opens).loc[lastk])
+                rr = (close_last - entry) / max(1e-9, entry - stop)
+                rr_sum += rr
+                pnl_sum += (close_last - entry) / max(1e-9, entry)
+        if trades == 0:
+            return {'ok': False, 'trades': 0}
+        hit_rate = hits / trades
+        avg_rr = rr_sum / trades
+        avg_ret = pnl_sum / trades
+        return {
+            'ok': True,
+            'trades': int(trades),
+            'hit_rate': float(hit_rate),
+            'avg_rr': float(avg_rr),
+            'avg_return_pct': float(avg_ret*100.0),
+            'entry_mode': 'next_session_open',
+            'atr_mult_stop': float(br.get('atr_mult_stop', 1.5)),
+            'atr_mult_target': float(br.get('atr_mult_target', 3.0)),
+            'time_stop_minutes': int(br.get('time_stop_minutes', 120)),
+        }
+    except Exception:
+        return {'ok': False}
+
+
+def synthetic_hourly(years: int, bars: int, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2019-01-02', periods=252 * years).date
+    n = len(dates) * bars
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0, 0.004, n)))
+    opens = np.r_[close[0], close[:-1]] * (1 + rng.normal(0, 0.001, n))
+    spread = np.abs(rng.normal(0, 0.004, n)) * close
+    return pd.DataFrame({
+        'date': np.repeat(dates, bars),
+        'hour_et': np.tile(np.arange(min(9, 24 - bars), min(9, 24 - bars) + bars), len(dates)),
+        'open': opens,
+        'high': np.maximum(opens, close) + spread,
+        'low': np.minimum(opens, close) - spread,
+        'close': close,
+        'atr_14': pd.Series(2 * spread).rolling(14, min_periods=1).mean().to_numpy(),
+    })
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--years', type=int, default=5)
+    ap.add_argument('--bars', type=int, default=7)
+    ap.add_argument('--repeat', type=int, default=3)
+    args = ap.parse_args()
+
+    df = synthetic_hourly(args.years, args.bars)
+    br = {'atr_mult_stop': 1.0, 'atr_mult_target': 1.5, 'time_stop_minutes': 240}
+    timings = {}
+    results = {}
+    for name, fn in (('legacy', legacy_parity), ('vectorized', bracket_parity)):
+        best = float('inf')
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            results[name] = fn(df, br)
+            best = min(best, time.perf_counter() - t0)
+        timings[name] = best
+    a, b = results['legacy'], results['vectorized']
+    assert a.keys() == b.keys() and all(np.isclose(a[k], b[k]) if isinstance(a[k], float) else a[k] == b[k] for k in a), (a, b)
+    print(f"rows={len(df)} trades={b['trades']} hit_rate={b['hit_rate']:.4f} avg_rr={b['avg_rr']:.4f}")
+    for name, sec in timings.items():
+        print(f"{name:>10}: {sec * 1000:.1f} ms")
+    print(f"speedup: {timings['legacy'] / timings['vectorized']:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -25,6 +25,10 @@ try:
     from sigma_core.registry.signals_registry import upsert_signals as db_upsert_signals
 except Exception:
     db_upsert_signals = None
+try:
+    from sigma_core.data.matrix_io import matrix_exists, read_matrix
+except Exception:
+    matrix_exists = read_matrix = None
 import numpy as np
 
 
@@ -48,9 +52,13 @@ def main():
         raise SystemExit('Invalid model artifact (missing model or features)')
 
     csv_path = Path(args.csv) if args.csv else (root / 'matrices' / args.model_id / 'training_matrix_built.csv')
-    if not csv_path.exists():
+    if not (matrix_exists(csv_path) if matrix_exists else csv_path.exists()):
         raise SystemExit(f"Matrix CSV not found: {csv_path}")
-    df = pd.read_csv(csv_path)
+    if read_matrix is not None:
+        # Only model features plus the columns the alert rows carry
+        df = read_matrix(csv_path, columns=list(features) + ['date', 'hour_et', 'close', 'atr_14'])
+    else:
+        df = pd.read_csv(csv_path)
     # Filter to allowed hours if provided
     if args.allowed_hours and 'hour_et' in df.columns:
         hours = [int(x) for x in str(args.allowed_hours).split(',') if x]
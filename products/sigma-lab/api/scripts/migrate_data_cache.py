@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Convert legacy JSON Polygon caches into the columnar cache layout.
+
+Usage:
+  python scripts/migrate_data_cache.py --root data_cache --backend parquet [--remove] [--dry-run]
+
+Recognised files: option aggregates, trades/, quotes/, snapshot/ and hourly bar caches.
+Files that already have a columnar copy are skipped, so the tool is safe to re-run.
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import sys
+from pathlib import Path
+
+HERE = Path(__file__).resolve()
+CORE_DIR = HERE.parents[3] / 'sigma-core'
+if str(CORE_DIR) not in sys.path:
+    sys.path.insert(0, str(CORE_DIR))
+
+from sigma_core.data.sources.cache import migrate_json_cache
+
+
+def main():
+    ap = argparse.ArgumentParser(description='Migrate JSON data_cache files to Parquet/Arrow')
+    ap.add_argument('--root', default='data_cache', help='Cache directory (default: data_cache)')
+    ap.add_argument('--backend', default='parquet', choices=['parquet', 'arrow'])
+    ap.add_argument('--remove', action='store_true', help='Delete JSON files after a successful conversion')
+    ap.add_argument('--dry-run', action='store_true', help='Only count files that would be migrated')
+    args = ap.parse_args()
+
+    if not Path(args.root).is_dir():
+        raise SystemExit(f"Cache directory not found: {args.root}")
+    stats = migrate_json_cache(args.root, backend=args.backend, remove=args.remove, dry_run=args.dry_run)
+    print(json.dumps(stats, indent=2))
+    if stats.get('failed'):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -26,6 +26,7 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from sigma_core.data.datasets import build_matrix as build_matrix_range
+from sigma_core.data.matrix_io import read_matrix
 
 
 def resolve_indicator_set_path(pack_id: str, model_id: str) -> Path:
@@ -48,6 +49,7 @@ def main():
     ap.add_argument('--start', required=True)
     ap.add_argument('--end', required=True)
     ap.add_argument('--out', default=None)
+    ap.add_argument('--latest_only', action='store_true', help='build only the indicator lookback before --end')
     args = ap.parse_args()
 
     paths = {
@@ -68,8 +70,9 @@ def main():
         distance_max=5,
         ticker=args.model_id.split('_')[0].upper(),
         indicator_set_path=str(ind_path) if ind_path else None,
+        latest_only=args.latest_only,
     )
-    df = pd.read_csv(out_csv)
+    df = read_matrix(out_csv)
     n = max(1, len(df))
     nan_stats = [{
         'column': c,
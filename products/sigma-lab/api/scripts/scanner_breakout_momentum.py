@@ -17,7 +17,7 @@ if str(ROOT) not in sys.path:
 import pandas as pd
 import numpy as np
 
-from sigma_core.data.stocks import build_stock_matrix as build_stock_matrix_range
+from sigma_core.data.stocks import build_stock_universe_latest
 
 
 def resolve_indicator_set_path(pack_id: str, model_id: str, indicator_set_name: str | None = None) -> Path | None:
@@ -118,6 +118,8 @@ def main():
     ap.add_argument('--indicator_set', default='swing_eq_breakout_scanner')
     ap.add_argument('--config', default=str(ROOT / 'docs' / 'Improvements' / 'breakout_momentum_scanner_assets' / 'scanner_config.json'))
     ap.add_argument('--top_n', type=int, default=50)
+    ap.add_argument('--workers', type=int, default=8, help='concurrent hourly bar fetches')
+    ap.add_argument('--full_history', action='store_true', help='fetch the whole start..end range instead of the indicator lookback')
     ap.add_argument('--out', default=None)
     args = ap.parse_args()
 
@@ -143,34 +145,20 @@ def main():
     else:
         raise SystemExit("Provide --tickers or --universe_csv")
 
-    # Build per-ticker matrices and keep latest row per ticker
-    rows = []
-    for t in tickers:
-        out_csv = ROOT / 'matrices' / args.model_id / f"{t}_scan.csv"
-        out_csv.parent.mkdir(parents=True, exist_ok=True)
-        build_stock_matrix_range(
-            start_date=args.start,
-            end_date=args.end,
-            out_csv=str(out_csv),
-            ticker=t,
-            indicator_set_path=(str(ind_path) if ind_path else None),
-            label_kind='none',
-        )
-        try:
-            df = pd.read_csv(out_csv)
-            if len(df) == 0:
-                continue
-            last = df.iloc[[-1]].copy()
-            last['ticker'] = t
-            rows.append(last)
-        except Exception:
-            continue
-
-    if not rows:
+    # Latest row per ticker from one batched fetch + grouped indicator pass
+    latest, errors = build_stock_universe_latest(
+        tickers,
+        args.start,
+        args.end,
+        indicator_set_path=(str(ind_path) if ind_path else None),
+        workers=args.workers,
+        latest_only=not args.full_history,
+    )
+    for t, err in errors.items():
+        print(f"WARN: skipped {t}: {err}", file=sys.stderr)
+    if latest.empty:
         print(json.dumps({'ok': False, 'error': 'No data built for provided tickers'}, indent=2))
         sys.exit(1)
-
-    latest = pd.concat(rows, ignore_index=True)
     scored = compute_breakout_momentum_score(latest, cfg)
     # Keep only rows that pass gates if available
     if '_gates_pass' in scored.columns:
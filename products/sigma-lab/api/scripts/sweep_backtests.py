@@ -23,6 +23,9 @@ def main():
     ap.add_argument('--embargo', type=float, default=0.0)
     ap.add_argument('--tag', default='sweep')
     ap.add_argument('--limit', type=int, default=20)
+    ap.add_argument('--workers', type=int, default=None)  # server-side pool size (default: SIGMA_SWEEP_WORKERS)
+    ap.add_argument('--poll', type=float, default=5.0)
+    ap.add_argument('--resume', type=int, default=None)  # sweep id to resume instead of submitting
     args = ap.parse_args()
 
     base = args.base_url.rstrip('/')
@@ -35,86 +38,59 @@ def main():
     if not avars:
         avars = ['13,14,15']
 
-    results: list[dict] = []
     out_dir = Path('products/sigma-lab/reports')
     out_dir.mkdir(parents=True, exist_ok=True)
     ts = time.strftime('%Y%m%d_%H%M%S')
     out_json = out_dir / f'sweep_{args.model_id}_{ts}.json'
 
-    def do_post(payload: dict) -> dict:
+    # One queued job server-side; variants run on the worker pool and survive client timeouts
+    if args.resume:
+        sub = req.post(f'{base}/backtest_sweep/{int(args.resume)}/resume', params={'workers': args.workers} if args.workers else None, timeout=30).json()
+        sweep_id = int(args.resume)
+    else:
+        payload = {
+            'model_id': args.model_id,
+            'pack_id': args.pack_id,
+            'thresholds_variants': tvars,
+            'allowed_hours_variants': avars,
+            'top_pct_variants': [float(tp) for tp in pvars],
+            'splits': int(args.splits),
+            'embargo': float(args.embargo),
+            'tag': args.tag,
+            'workers': args.workers,
+        }
+        sub = req.post(f'{base}/backtest_sweep', json=payload, timeout=120).json()
+        sweep_id = sub.get('sweep_id')
+    if not sub.get('ok') or not sweep_id:
+        print('[sweep] Submit failed:', sub.get('error'))
+        return
+    print(f'[sweep] Sweep {sweep_id} queued ({sub.get("total", "?")} variants)')
+
+    status: dict = {}
+    while True:
         try:
-            r = req.post(f'{base}/backtest', json=payload, timeout=300)
-            r.raise_for_status()
-            return r.json()
+            status = req.get(f'{base}/backtest_sweep/{sweep_id}', params={'limit': 50}, timeout=30).json()
         except Exception as e:
-            return {'ok': False, 'error': str(e)}
-
-    # thresholds-based sweeps
-    for th in tvars:
-        for ah in avars:
-            payload = {
-                'model_id': args.model_id,
-                'pack_id': args.pack_id,
-                'thresholds': th,
-                'splits': int(args.splits),
-                'embargo': float(args.embargo),
-                'allowed_hours': ah,
-                'tag': args.tag,
-            }
-            res = do_post(payload)
-            results.append({'kind': 'thresholds', 'thresholds': th, 'allowed_hours': ah, 'res': res})
-
-    # top-pct sweeps
-    for tp in pvars:
-        for ah in avars:
-            try:
-                topv = float(tp)
-            except Exception:
-                continue
-            payload = {
-                'model_id': args.model_id,
-                'pack_id': args.pack_id,
-                'top_pct': topv,
-                'splits': int(args.splits),
-                'embargo': float(args.embargo),
-                'allowed_hours': ah,
-                'tag': args.tag,
-            }
-            res = do_post(payload)
-            results.append({'kind': 'top_pct', 'top_pct': topv, 'allowed_hours': ah, 'res': res})
+            print('[sweep] Status poll failed:', e)
+        else:
+            print(f"[sweep] {status.get('status')}: {status.get('done')}/{status.get('total')}")
+            if status.get('status') in ('completed', 'failed') or not status.get('ok'):
+                break
+        time.sleep(max(1.0, float(args.poll)))
 
     # Persist raw sweep results
     try:
-        out_json.write_text(json.dumps({'runs': results}, indent=2), encoding='utf-8')
+        out_json.write_text(json.dumps(status, indent=2), encoding='utf-8')
         print(f'[sweep] Wrote {out_json}')
     except Exception:
         pass
+    if status.get('status') == 'failed':
+        print(f"[sweep] Failed: {status.get('error')} (resume with --resume {sweep_id})")
 
-    # Print a tidy summary and show leaderboard top-N
-    def best_of(r: dict) -> float:
-        if not isinstance(r, dict):
-            return -1e9
-        v = r.get('best_sharpe_hourly')
-        if v is not None:
-            try:
-                return float(v)
-            except Exception:
-                return -1e9
-        res = r.get('res', {}) if 'res' in r else r
-        if isinstance(res, dict):
-            v = res.get('best_sharpe_hourly')
-            if v is not None:
-                try:
-                    return float(v)
-                except Exception:
-                    return -1e9
-        return -1e9
-
-    ranked = sorted(results, key=lambda x: best_of(x['res']), reverse=True)
     print('[sweep] Top combos (by best_sharpe_hourly):')
-    for i, row in enumerate(ranked[:10]):
-        r = row['res']
-        print(f"  {i+1}. kind={row.get('kind')}, thr={row.get('thresholds')}, top_pct={row.get('top_pct')}, hours={row.get('allowed_hours')}, best_sharpe={r.get('best_sharpe_hourly')}, best_cum={r.get('best_cum_ret')}")
+    for i, row in enumerate((status.get('runs') or [])[:10]):
+        p, m = row.get('params') or {}, row.get('metrics') or {}
+        print(f"  {i+1}. kind={row.get('kind')}, thr={p.get('thresholds')}, top_pct={p.get('top_pct')}, hours={p.get('allowed_hours')}, best_sharpe={m.get('best_sharpe_hourly')}, best_cum={m.get('best_cum_ret')}")
 
     # Leaderboard fetch
     try:
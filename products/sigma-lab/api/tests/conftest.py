@@ -5,7 +5,8 @@ from pathlib import Path
 HERE = Path(__file__).resolve()
 PRODUCT_ROOT = HERE.parents[2]  # products/sigma-lab
 CORE_ROOT = PRODUCT_ROOT.parent / 'sigma-core'
-for p in (PRODUCT_ROOT, CORE_ROOT):
+WORKERS_ROOT = PRODUCT_ROOT.parent / 'sigma-workers'
+for p in (PRODUCT_ROOT, CORE_ROOT, WORKERS_ROOT):
     if str(p) not in sys.path:
         sys.path.insert(0, str(p))
 
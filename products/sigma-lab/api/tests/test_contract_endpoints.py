@@ -82,3 +82,23 @@ def test_contract_audit_shape():
     assert "ok" in data
     assert "rows" in data and isinstance(data["rows"], list)
     assert "limit" in data and "offset" in data and "next_offset" in data
+
+
+def test_contract_signals_leaderboard_single_query(monkeypatch):
+    import importlib
+    app = _get_app()
+    mod = importlib.import_module("api.routers.signals")
+    calls = []
+
+    def fake_leaderboard(**kw):
+        calls.append(kw)
+        return {"rows": [{"model_id": "gbm_stock_hourly", "trades": 3, "cum_return": 0.5, "sharpe": 1.2, "sortino": None,
+                          "max_dd": -0.1, "coverage_pct": 75.0, "freshness_sec": 60}], "total": 7}
+
+    monkeypatch.setattr(mod, "db_leaderboard_metrics", fake_leaderboard)
+    r = TestClient(app).get("/signals/leaderboard?pack=zerosigma&limit=1&offset=2")
+    data = r.json()
+    assert data["ok"] is True and data["total"] == 7
+    assert len(calls) == 1 and calls[0]["limit"] == 1 and calls[0]["offset"] == 2
+    assert "gbm_stock_hourly" in calls[0]["model_ids"]
+    assert data["rows"][0]["metrics"]["sharpe"] == 1.2
@@ -0,0 +1,128 @@
+import numpy as np
+import pandas as pd
+
+from sigma_workers import sweeps
+
+
+def _spec(tmp_path, **kw):
+    rng = np.random.default_rng(5)
+    n = 150
+    x = rng.normal(size=(n, 3))
+    df = pd.DataFrame(x, columns=['f1', 'f2', 'f3'])
+    df['hour_et'] = np.tile([13, 14, 15], n // 3)
+    df['y'] = np.where(x[:, 0] + 0.5 * rng.normal(size=n) > 0, 1, 0)
+    csv = tmp_path / 'training_matrix_built.csv'
+    df.to_csv(csv, index=False)
+    spec = {
+        'thresholds_variants': ['0.50,0.55', '0.60'],
+        'allowed_hours_variants': ['13,14,15', '13,14'],
+        'top_pct_variants': [0.2],
+        'splits': 3, 'embargo': 0.0,
+        'csv': str(csv), 'target_col': 'y', 'oof_cache_dir': str(tmp_path / 'oof'), 'save': False,
+    }
+    spec.update(kw)
+    return spec
+
+
+def test_sweep_runs_all_variants_and_resume_skips_completed(tmp_path):
+    store = sweeps.MemorySweepStore()
+    spec = _spec(tmp_path)
+    sub = sweeps.submit_sweep(pack_id='p', model_id='m', spec=spec, store=store)
+    assert sub['total'] == 6 and store.get_sweep(sub['sweep_id'])['status'] == 'queued'
+    # Pretend an earlier worker finished one variant before being interrupted
+    first = sweeps.expand_variants(spec)[0]
+    store.record_sweep_result(sub['sweep_id'], variant_key=first['key'], kind=first['kind'], params={}, metrics={}, csv_uri=None)
+    res = sweeps.run_sweep(sub['sweep_id'], workers=1, store=store)
+    assert res['ok'] and res['status'] == 'completed'
+    assert (res['resumed_skipped'], res['ran'], res['done'], res['pending']) == (1, 5, 6, 0)
+    # Nothing left to do on a second resume
+    again = sweeps.run_sweep(sub['sweep_id'], workers=1, store=store)
+    assert again['ran'] == 0 and again['done'] == 6
+    # Two hour filters -> two fold fits cached, shared by every variant
+    assert len(list((tmp_path / 'oof').glob('*.npz'))) == 2
+
+
+def test_sweep_pool_matches_inline(tmp_path):
+    spec = _spec(tmp_path, top_pct_variants=[], min_trades=0)
+    inline, pooled = sweeps.MemorySweepStore(), sweeps.MemorySweepStore()
+    for store, workers in ((inline, 1), (pooled, 2)):
+        sid = sweeps.submit_sweep(pack_id='p', model_id='m', spec=spec, store=store)['sweep_id']
+        assert sweeps.run_sweep(sid, workers=workers, store=store)['workers'] == workers
+    by_key = lambda store: {r['variant_key']: r['metrics']['threshold_results'] for r in store.sweep_results(1)}
+    assert by_key(inline) == by_key(pooled)
+
+
+def test_guardrails_filter_status_rows(tmp_path):
+    store = sweeps.MemorySweepStore()
+    spec = _spec(tmp_path, min_trades=10**6)
+    sid = sweeps.submit_sweep(pack_id='p', model_id='m', spec=spec, store=store)['sweep_id']
+    sweeps.run_sweep(sid, workers=1, store=store)
+    st = sweeps.sweep_status(sid, store=store)
+    assert st['done'] == 6 and st['filtered'] == 0 and st['runs'] == []
+
+
+def test_thread_budget_splits_cores_and_reaches_xgboost(tmp_path, monkeypatch):
+    monkeypatch.setattr(sweeps.os, 'cpu_count', lambda: 16)
+    for workers, splits in ((1, 5), (2, 3), (4, 5), (16, 5), (32, 2)):
+        fold_workers, n_jobs = sweeps.thread_budget(workers, splits)
+        assert fold_workers <= splits and (min(workers, 16) * fold_workers * n_jobs <= 16 or n_jobs == fold_workers == 1)
+    assert sweeps.thread_budget(2, 3) == (3, 2)
+    seen = []
+    import sigma_core.backtest.engine as engine
+    real = engine.fit_oof
+    monkeypatch.setattr(engine, 'fit_oof', lambda *a, **kw: seen.append((kw['workers'], kw['n_jobs'])) or real(*a, **kw))
+    store = sweeps.MemorySweepStore()
+    sid = sweeps.submit_sweep(pack_id='p', model_id='m', spec=_spec(tmp_path), store=store)['sweep_id']
+    sweeps.run_sweep(sid, workers=1, store=store)
+    assert seen and set(seen) == {(3, 5)}
+
+
+def test_grid_sweep_matches_per_variant_run_backtest(tmp_path, monkeypatch):
+    import sigma_core.backtest.engine as engine
+    spec = _spec(tmp_path, execution={'momentum_gate': True, 'momentum_min': -0.5, 'size_by_conf': True})
+    calls = []
+    monkeypatch.setattr(engine, 'evaluate_grid', lambda *a, _real=engine.evaluate_grid, **kw: calls.append(kw) or _real(*a, **kw))
+    store = sweeps.MemorySweepStore()
+    sid = sweeps.submit_sweep(pack_id='p', model_id='m', spec=spec, store=store)['sweep_id']
+    sweeps.run_sweep(sid, workers=1, store=store)
+    # One grid pass per hour filter covering every threshold and top_pct of the task
+    assert len(calls) == 2 and calls[0]['thresholds'] == [0.5, 0.55, 0.6] and calls[0]['top_pcts'] == [0.2]
+    df, tgt = sweeps._load_matrix(spec['csv'], spec['target_col'])
+    for row in store.sweep_results(sid):
+        p = row['params']
+        ref = engine.run_backtest(df, tgt, p.get('thresholds'), splits=p['splits'], embargo=p['embargo'], top_pct=p.get('top_pct'),
+                                  allowed_hours=p['allowed_hours'], calibration='sigmoid', size_by_conf=True,
+                                  momentum_gate=True, momentum_min=-0.5, oof_cache_dir=spec['oof_cache_dir'])
+        ref = sweeps._jsonable(ref)
+        assert row['metrics']['threshold_results'] == ref['threshold_results']
+        assert row['metrics']['top_pct_result'] == ref['top_pct_result']
+
+
+def test_failed_run_save_is_logged_and_recorded(tmp_path, monkeypatch, caplog):
+    import sigma_core.registry.backtest_registry as reg
+
+    def boom(**kw):
+        raise RuntimeError('db down')
+    monkeypatch.setattr(reg, 'create_backtest_run', boom)
+    store = sweeps.MemorySweepStore()
+    sid = sweeps.submit_sweep(pack_id='p', model_id='m', spec=_spec(tmp_path, save=True, top_pct_variants=[]), store=store)['sweep_id']
+    with caplog.at_level('WARNING', logger='sigma_workers.sweeps'):
+        assert sweeps.run_sweep(sid, workers=1, store=store)['ok']
+    rows = store.sweep_results(sid)
+    assert rows and all(r['metrics']['save_error'] == 'db down' and r['backtest_run_id'] is None for r in rows)
+    assert 'db down' in caplog.text
+
+
+def test_sweep_thread_start_failure_releases_id(monkeypatch):
+    from api.routers import sweep as router
+
+    class _NoThread:
+        def __init__(self, *a, **kw):
+            pass
+
+        def start(self):
+            raise RuntimeError("can't start new thread")
+    monkeypatch.setattr(router.threading, 'Thread', _NoThread)
+    res = router._start_sweep(991, 'm', None, wait=False)
+    assert not res['ok'] and "can't start new thread" in res['error']
+    assert 991 not in router._ACTIVE
@@ -1,8 +1,33 @@
-"""Workers CLI (skeleton stub)."""
+"""Workers CLI.
+
+  python -m sigma_workers.cli sweep <sweep_id> [--workers N]   run or resume one queued sweep
+  python -m sigma_workers.cli sweeps [--workers N]             resume every queued/running/failed sweep
+"""
+import argparse
+import json
+
 
 def main():
-    print("workers cli: TODO")
+    ap = argparse.ArgumentParser(description='Sigma background workers')
+    sub = ap.add_subparsers(dest='cmd')
+    one = sub.add_parser('sweep', help='run or resume a backtest sweep')
+    one.add_argument('sweep_id', type=int)
+    one.add_argument('--workers', type=int, default=None)
+    all_ = sub.add_parser('sweeps', help='resume unfinished backtest sweeps')
+    all_.add_argument('--workers', type=int, default=None)
+    args = ap.parse_args()
+
+    from sigma_workers import sweeps
+    if args.cmd == 'sweep':
+        print(json.dumps(sweeps.run_sweep(args.sweep_id, workers=args.workers), default=str))
+    elif args.cmd == 'sweeps':
+        store = sweeps.default_store()
+        for s in store.list_sweeps(statuses=['queued', 'running', 'failed']):
+            res = sweeps.run_sweep(int(s['id']), workers=args.workers, store=store)
+            print(json.dumps({k: res.get(k) for k in ('sweep_id', 'status', 'done', 'total', 'error')}, default=str))
+    else:
+        ap.print_help()
+
 
 if __name__ == "__main__":
     main()
-
@@ -0,0 +1,389 @@
+"""Resumable backtest sweeps on a local process pool.
+
+A sweep is a queued job (a `backtest_sweeps` row whose spec holds everything a worker needs) and
+each finished variant is a `sweep_results` row keyed by its variant key, so a restarted sweep only
+runs what is still missing. Variants sharing a fold layout (allowed hours, splits, embargo) form one
+task: the worker fits the fold models once through the OOF cache and scores every threshold and
+top_pct of the task in one grid pass over those predictions, so tasks spread across cores without
+ever fitting the same folds twice. Pool workers stream each finished variant back to be recorded
+right away, so an interrupted sweep keeps every variant it completed. Cores are split once across
+sweep processes, fold processes and XGBoost threads (`thread_budget`).
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+import pandas as pd
+
+from sigma_core.data.matrix_io import read_matrix
+
+try:
+    from sigma_core.registry import sweep_registry as _db_store
+except Exception:
+    _db_store = None
+
+logger = logging.getLogger(__name__)
+
+
+def expand_variants(spec: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Deterministic variant list for a sweep spec; each carries a stable `key`."""
+    hours_variants = list(spec.get('allowed_hours_variants') or []) or [None]
+    splits, embargo = int(spec.get('splits', 5)), float(spec.get('embargo', 0.0))
+    out: List[Dict[str, Any]] = []
+    axes = [('thresholds', th) for th in spec.get('thresholds_variants') or []]
+    axes += [('top_pct', float(tp)) for tp in spec.get('top_pct_variants') or []]
+    for kind, value in axes:
+        for hours in hours_variants:
+            allowed = [int(x) for x in str(hours).split(',') if x.strip()] if hours else None
+            v: Dict[str, Any] = {'kind': kind, 'allowed_hours': allowed, 'splits': splits, 'embargo': embargo}
+            if kind == 'thresholds':
+                v['thresholds'] = [float(x) for x in str(value).split(',') if x.strip()]
+            else:
+                v['top_pct'] = value
+            v['key'] = json.dumps([kind, v.get('thresholds', value), allowed, splits, embargo])
+            out.append(v)
+    return out
+
+
+def resolve_sweep_workers(workers: Optional[int], n_tasks: int) -> int:
+    """Pool size: explicit value, else SIGMA_SWEEP_WORKERS (0 = all cores, the default); capped at n_tasks."""
+    if workers is None:
+        try:
+            workers = int(os.getenv('SIGMA_SWEEP_WORKERS', '0'))
+        except Exception:
+            workers = 0
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    return max(1, min(int(workers), max(1, n_tasks)))
+
+
+class MemorySweepStore:
+    """In-process stand-in for `sweep_registry` when no database is configured (not persistent)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sweeps: Dict[int, Dict[str, Any]] = {}
+        self._results: Dict[int, List[Dict[str, Any]]] = {}
+
+    def create_sweep(self, *, pack_id: str, model_id: str, spec: Dict[str, Any], tag: Optional[str], total_variants: int, status: str = 'queued') -> int:
+        with self._lock:
+            sweep_id = len(self._sweeps) + 1
+            self._sweeps[sweep_id] = {
+                'id': sweep_id, 'pack_id': pack_id, 'model_id': model_id, 'tag': tag, 'status': status, 'spec': spec,
+                'total_variants': int(total_variants), 'error': None, 'started_at': None, 'finished_at': None,
+                'created_at': datetime.utcnow(),
+            }
+            self._results[sweep_id] = []
+            return sweep_id
+
+    def get_sweep(self, sweep_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._sweeps.get(int(sweep_id))
+            return dict(row) if row else None
+
+    def set_sweep_status(self, sweep_id: int, status: str, *, started_at: Optional[datetime] = None,
+                         finished_at: Optional[datetime] = None, error: Optional[str] = None) -> None:
+        with self._lock:
+            row = self._sweeps[int(sweep_id)]
+            row.update(status=status, finished_at=finished_at, error=error)
+            if started_at is not None:
+                row['started_at'] = started_at
+
+    def completed_variant_keys(self, sweep_id: int) -> Set[str]:
+        with self._lock:
+            return {r['variant_key'] for r in self._results.get(int(sweep_id), [])}
+
+    def record_sweep_result(self, sweep_id: int, *, variant_key: str, kind: str, params: Dict[str, Any], metrics: Dict[str, Any],
+                            csv_uri: Optional[str], backtest_run_id: Optional[int] = None) -> bool:
+        with self._lock:
+            rows = self._results.setdefault(int(sweep_id), [])
+            if any(r['variant_key'] == variant_key for r in rows):
+                return False
+            rows.append({'id': len(rows) + 1, 'variant_key': variant_key, 'kind': kind, 'params': params, 'metrics': metrics,
+                         'csv_uri': csv_uri, 'backtest_run_id': backtest_run_id, 'created_at': datetime.utcnow()})
+            return True
+
+    def sweep_results(self, sweep_id: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(r) for r in self._results.get(int(sweep_id), [])]
+
+    def list_sweeps(self, *, statuses: Optional[List[str]] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = [dict(r) for r in self._sweeps.values() if not statuses or r['status'] in statuses]
+            return rows[:int(limit)]
+
+
+_memory_store = MemorySweepStore()
+_store_choice: Optional[Any] = None
+
+
+def default_store():
+    """`sweep_registry` when the database is reachable, else a process-local MemorySweepStore."""
+    global _store_choice
+    if _store_choice is None:
+        _store_choice = _memory_store
+        if _db_store is not None:
+            try:
+                _db_store.list_sweeps(limit=1)
+                _store_choice = _db_store
+            except Exception:
+                pass
+    return _store_choice
+
+
+def submit_sweep(*, pack_id: str, model_id: str, spec: Dict[str, Any], tag: Optional[str] = None, store=None) -> Dict[str, Any]:
+    """Queue a sweep; returns {'sweep_id', 'total'} without running anything."""
+    store = store or default_store()
+    total = len(expand_variants(spec))
+    sweep_id = store.create_sweep(pack_id=pack_id, model_id=model_id, spec=_jsonable(spec), tag=tag, total_variants=total)
+    return {'sweep_id': sweep_id, 'total': total}
+
+
+# Per-process matrix cache: a pool worker loads the matrix once however many tasks it runs
+_MATRIX: Dict[Tuple[str, str], Tuple[pd.DataFrame, str]] = {}
+
+
+def _load_matrix(csv: str, target_col: str) -> Tuple[pd.DataFrame, str]:
+    key = (csv, target_col)
+    if key not in _MATRIX:
+        df = read_matrix(csv)
+        tgt = target_col
+        # Normalize numeric targets to textual 'UP'/'DOWN' expected by the engine
+        try:
+            if tgt in df.columns and pd.api.types.is_numeric_dtype(df[tgt]):
+                uniq = set(df[tgt].dropna().unique().tolist())
+                if uniq.issubset({0, 1}):
+                    df['_y_txt'] = df[tgt].map(lambda v: 'UP' if float(v) == 1.0 else 'DOWN'); tgt = '_y_txt'
+                elif uniq.issubset({-1, 0, 1}):
+                    df['_y_txt'] = df[tgt].map(lambda v: 'UP' if float(v) > 0 else 'DOWN'); tgt = '_y_txt'
+        except Exception:
+            pass
+        _MATRIX.clear()
+        _MATRIX[key] = (df, tgt)
+    return _MATRIX[key]
+
+
+def _summarize(res: Dict[str, Any], parity: Any) -> Dict[str, Any]:
+    th = res.get('threshold_results') or []
+    try:
+        best_sharpe = float(max(r.get('sharpe_hourly', 0.0) for r in th)) if th else None
+        best_cum = float(max(r.get('cum_ret', 0.0) for r in th)) if th else None
+        total_trades = int(sum(int(r.get('trades') or 0) for r in th)) if th else None
+    except Exception:
+        best_sharpe = best_cum = total_trades = None
+    return {'best_sharpe_hourly': best_sharpe, 'best_cum_ret': best_cum, 'total_trades': total_trades, 'parity': parity}
+
+
+def thread_budget(workers: int, splits: int) -> Tuple[int, int]:
+    """(fold processes, XGBoost threads per fit) for each of `workers` sweep processes.
+
+    The cores are split once across sweep processes x fold processes x tree threads, so a sweep
+    never runs more than cpu_count threads in total (at least one of each).
+    """
+    cpu = os.cpu_count() or 1
+    fold_workers = max(1, min(cpu // max(1, workers), int(splits)))
+    return fold_workers, max(1, cpu // (max(1, workers) * fold_workers))
+
+
+def run_variants(spec: Dict[str, Any], variants: List[Dict[str, Any]], fold_workers: int = 1,
+                 n_jobs: Optional[int] = None) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """Backtest variants that share a fold layout; yields (variant, result) per variant.
+
+    The folds are fitted once (`fit_oof`, through the OOF cache) and every threshold and top_pct
+    point of the task is scored in one `evaluate_grid` pass; each variant then reads its result off
+    the grid, identical to what `run_backtest` returns for it.
+    """
+    from sigma_core.backtest import engine
+
+    df, tgt = _load_matrix(spec['csv'], spec['target_col'])
+    ex = spec.get('execution') or {}
+    layout = variants[0]
+    hours = layout.get('allowed_hours')
+    if hours and 'hour_et' in df.columns:
+        df = df[df['hour_et'].isin(hours)]
+    oof = engine.fit_oof(df, tgt, splits=int(layout['splits']), embargo=float(layout['embargo']), allowed_hours=hours,
+                         calibration='sigmoid', workers=fold_workers, cache_dir=spec.get('oof_cache_dir'), n_jobs=n_jobs)
+    gate_vals = engine.momentum_gate_values(df, bool(ex.get('momentum_gate', False)), float(ex.get('momentum_min', 0.0)),
+                                            str(ex.get('momentum_column', 'momentum_score_total')))
+    grid = engine.evaluate_grid(
+        oof,
+        thresholds=sorted({float(t) for v in variants for t in (v.get('thresholds') or [])}),
+        top_pcts=sorted({float(v['top_pct']) for v in variants if v.get('top_pct') is not None}),
+        slippage_bps=float(ex.get('slippage_bps', 1.0)),
+        size_by_conf=bool(ex.get('size_by_conf', False)),
+        conf_cap=float(ex.get('conf_cap', 1.0)),
+        gate_vals=gate_vals,
+    )
+    fold_timings = [{"fold": fp.fold, "seconds": round(fp.seconds, 3)} for fp in oof.folds]
+    for v in variants:
+        results = engine.results_from_grid(grid, oof, thresholds=v.get('thresholds'), top_pct=v.get('top_pct'))
+        res = {'threshold_results': results, 'top_pct_result': engine.best_fold_result(results),
+               'fold_timings': fold_timings, 'workers': oof.workers, 'oof_cached': oof.cached}
+        res['_summary'] = _summarize(res, spec.get('parity'))
+        yield v, _jsonable(res)
+
+
+def _run_task(spec: Dict[str, Any], variants: List[Dict[str, Any]], workers: int, results) -> int:
+    # Each variant goes back to the parent as soon as it finishes, so it is recorded (and survives an
+    # interrupted sweep) without waiting for the rest of the task
+    fold_workers, n_jobs = thread_budget(workers, int(variants[0]['splits']))
+    n = 0
+    for item in run_variants(spec, variants, fold_workers, n_jobs):
+        results.put(item)
+        n += 1
+    return n
+
+
+def _group_variants(variants: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    groups: Dict[Any, List[Dict[str, Any]]] = {}
+    for v in variants:
+        layout = (tuple(v['allowed_hours'] or ()), v['splits'], v['embargo'])
+        groups.setdefault(layout, []).append(v)
+    return list(groups.values())
+
+
+def _iter_results(spec: Dict[str, Any], tasks: List[List[Dict[str, Any]]], workers: int):
+    if workers <= 1:
+        for task in tasks:
+            yield from run_variants(spec, task, *thread_budget(1, int(task[0]['splits'])))
+        return
+    ctx = get_context('spawn')
+    with ctx.Manager() as mgr, ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as ex:
+        results = mgr.Queue()
+        running = {ex.submit(_run_task, spec, task, workers, results) for task in tasks}
+        while running:
+            try:
+                yield results.get(timeout=0.2)
+                continue
+            except queue.Empty:
+                pass
+            for fut in [f for f in running if f.done()]:
+                running.discard(fut)
+                fut.result()  # re-raise a worker failure
+        # Items a task queued just before finishing
+        while True:
+            try:
+                yield results.get_nowait()
+            except queue.Empty:
+                break
+
+
+def _save_backtest_run(sweep: Dict[str, Any], variant: Dict[str, Any], res: Dict[str, Any]) -> Tuple[Optional[int], Optional[str]]:
+    """Record the variant as a backtest run; returns (run id, None) or (None, error)."""
+    spec = sweep['spec']
+    try:
+        from sigma_core.registry.backtest_registry import create_backtest_run, create_backtest_folds
+
+        params = {k: v for k, v in variant.items() if k != 'key'}
+        if spec.get('lineage') is not None:
+            params['lineage'] = spec['lineage']
+        summ = res['_summary']
+        row = create_backtest_run(
+            pack_id=sweep['pack_id'],
+            model_id=sweep['model_id'],
+            started_at=sweep.get('started_at'),
+            finished_at=datetime.utcnow(),
+            params=params,
+            metrics={'best_sharpe_hourly': summ['best_sharpe_hourly'], 'best_cum_ret': summ['best_cum_ret'], 'parity': summ['parity']},
+            plots_uri=spec.get('plots_dir'),
+            data_csv_uri=spec['csv'],
+            best_sharpe_hourly=summ['best_sharpe_hourly'],
+            best_cum_ret=summ['best_cum_ret'],
+            trades_total=summ['total_trades'],
+            tag=sweep.get('tag'),
+        )
+        folds = [{'fold': i, 'thr': r.get('thr'), 'cum_ret': r.get('cum_ret'), 'sharpe_hourly': r.get('sharpe_hourly'), 'trades': r.get('trades')}
+                 for i, r in enumerate(res.get('threshold_results') or [])]
+        create_backtest_folds(int(row['id']), folds)
+        return int(row['id']), None
+    except Exception as e:
+        logger.warning("sweep %s: saving backtest run for %s failed: %s", sweep.get('id'), variant.get('key'), e)
+        return None, str(e)
+
+
+def run_sweep(sweep_id: int, *, workers: Optional[int] = None, store=None) -> Dict[str, Any]:
+    """Run (or resume) a queued sweep to completion; variants already recorded are skipped."""
+    store = store or default_store()
+    sweep = store.get_sweep(sweep_id)
+    if not sweep:
+        return {'ok': False, 'error': f'sweep not found: {sweep_id}'}
+    spec = sweep['spec'] if isinstance(sweep['spec'], dict) else json.loads(sweep['spec'])
+    sweep['spec'] = spec
+    done = store.completed_variant_keys(sweep_id)
+    pending = [v for v in expand_variants(spec) if v['key'] not in done]
+    tasks = _group_variants(pending)
+    n_workers = resolve_sweep_workers(workers, len(tasks))
+    store.set_sweep_status(sweep_id, 'running', started_at=sweep.get('started_at') or datetime.utcnow())
+    try:
+        for variant, res in _iter_results(spec, tasks, n_workers):
+            run_id, save_error = _save_backtest_run(sweep, variant, res) if spec.get('save', True) else (None, None)
+            metrics = dict(res['_summary'])
+            metrics['threshold_results'] = res.get('threshold_results')
+            metrics['top_pct_result'] = res.get('top_pct_result')
+            if save_error is not None:
+                metrics['save_error'] = save_error
+            store.record_sweep_result(
+                sweep_id,
+                variant_key=variant['key'],
+                kind=variant['kind'],
+                params={k: v for k, v in variant.items() if k != 'key'},
+                metrics=metrics,
+                csv_uri=spec.get('csv'),
+                backtest_run_id=run_id,
+            )
+    except Exception as e:
+        store.set_sweep_status(sweep_id, 'failed', finished_at=datetime.utcnow(), error=str(e))
+        return {'ok': False, 'sweep_id': sweep_id, 'error': str(e)}
+    store.set_sweep_status(sweep_id, 'completed', finished_at=datetime.utcnow())
+    out = sweep_status(sweep_id, store=store)
+    out.update(resumed_skipped=len(done), ran=len(pending), workers=n_workers)
+    return out
+
+
+def _passes_guards(metrics: Dict[str, Any], spec: Dict[str, Any]) -> bool:
+    total_tr = metrics.get('total_trades')
+    if total_tr is not None and int(total_tr) < int(spec.get('min_trades') or 0):
+        return False
+    if spec.get('min_sharpe') is not None:
+        bs = metrics.get('best_sharpe_hourly')
+        if bs is None or float(bs) < float(spec['min_sharpe']):
+            return False
+    return True
+
+
+def sweep_status(sweep_id: int, *, store=None, limit: int = 10) -> Dict[str, Any]:
+    """Progress plus the best completed variants (guardrails from the spec applied)."""
+    store = store or default_store()
+    sweep = store.get_sweep(sweep_id)
+    if not sweep:
+        return {'ok': False, 'error': f'sweep not found: {sweep_id}'}
+    spec = sweep['spec'] if isinstance(sweep['spec'], dict) else json.loads(sweep['spec'])
+    results = store.sweep_results(sweep_id)
+    total = sweep.get('total_variants')
+    if total is None:
+        total = len(expand_variants(spec))
+    filtered = [r for r in results if _passes_guards(r.get('metrics') or {}, spec)]
+    ranked = sorted(filtered, key=lambda r: (r.get('metrics') or {}).get('best_sharpe_hourly') or -1e9, reverse=True)
+    return {
+        'ok': True,
+        'sweep_id': int(sweep_id),
+        'status': sweep.get('status'),
+        'error': sweep.get('error'),
+        'total': int(total),
+        'done': len(results),
+        'pending': max(0, int(total) - len(results)),
+        'filtered': len(filtered),
+        'runs': [{'kind': r['kind'], 'params': r['params'], 'metrics': r['metrics'], 'backtest_run_id': r.get('backtest_run_id')} for r in ranked[:limit]],
+    }
+
+
+def _jsonable(obj: Any) -> Any:
+    return json.loads(json.dumps(obj, default=lambda o: o.item() if hasattr(o, 'item') else str(o)))